@@ -120,7 +120,10 @@ def source_build():
           install_requires=inst_req,
           setup_requires=setup_req,
           entry_points={'gui_scripts':
-                        ['videomass = videomass.gui_app:main']},
+                        ['videomass = videomass.vdms_sys.argparser:main'],
+                        'console_scripts':
+                        ['videomass-cli = videomass.vdms_sys.argparser:main'],
+                        },
           classifiers=[
         'Environment :: X11 Applications :: GTK',
         'Development Status :: 5 - Production/Stable',
@@ -0,0 +1,105 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the batch_journal.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import subprocess
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.batch_journal import BatchJournal
+    from videomass.vdms_threads.job_engine import (JobEngine, Batch,
+                                                   Job, Step)
+except ImportError as error:
+    sys.exit(error)
+
+
+def make_batch(outdir):
+    """Returns a batch of a measure job and two encoding jobs"""
+    measure = Job([Step('measure', 'File 1/2 - Pass One')])
+    encode = Job([Step('encode', 'File 1/2 - Pass Two', 'a.mkv',
+                       os.path.join(outdir, 'a.mp4'))],
+                 sources=['a.mkv'], requires=measure)
+    other = Job([Step('encode', 'File 2/2', 'b.mkv',
+                      os.path.join(outdir, 'b.mp4'))], sources=['b.mkv'])
+    return Batch([measure, encode, other], 'test.log')
+
+
+class TestBatchJournal(unittest.TestCase):
+    """Test case for the BatchJournal class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journaldir = os.path.join(self.tmp.name, 'journal')
+        self.params = {'panel': 'Presets Manager', 'args': ['onepass']}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume(self):
+        batch = make_batch(self.tmp.name)
+        journal = BatchJournal.create(self.journaldir, batch, self.params)
+        journal.update(0, 'running')
+        journal.update(0, 'done')
+        journal.update(2, 'running')
+        journal.update(2, 'done')
+        journal.update(1, 'running')
+        with open(os.path.join(self.tmp.name, 'a.mp4'), 'w') as fout:
+            fout.write('partial')
+        with open(journal.filename, 'a') as fjournal:  # truncated record
+            fjournal.write('{"record": "job", "ind')
+
+        journals = BatchJournal.unfinished(self.journaldir)
+        self.assertEqual(len(journals), 1)
+        self.assertEqual(journals[0].params, self.params)
+        self.assertEqual(journals[0].unfinished_jobs(), [1])
+        self.assertEqual(journals[0].remove_partial_outputs(),
+                         [os.path.join(self.tmp.name, 'a.mp4')])
+
+        rebuilt = make_batch(self.tmp.name)
+        journals[0].restore(rebuilt)
+        # the measure job is required again by the unfinished job
+        self.assertEqual([job.state for job in rebuilt.jobs],
+                         ['queued', 'queued', 'done'])
+
+    @unittest.skipUnless(hasattr(os, 'killpg'), 'requires os.killpg')
+    def test_leftover_processes(self):
+        batch = make_batch(self.tmp.name)
+        journal = BatchJournal.create(self.journaldir, batch, self.params)
+        program = os.path.basename(sys.executable)
+        with subprocess.Popen([sys.executable, '-c',
+                               'import time; time.sleep(30)'],
+                              start_new_session=True) as proc:
+            journal.update(1, 'running')
+            journal.started(1, proc.pid, program)
+            journal.update(2, 'running')
+            journal.started(2, os.getpid(), 'ffmpeg')  # a reused pid
+            loaded = BatchJournal.load(journal.filename)
+            self.assertEqual(loaded.jobs[1]['process'], [proc.pid, program])
+            self.assertEqual(loaded.leftover_processes(), [proc.pid])
+            self.assertEqual(loaded.kill_leftover_processes(), [proc.pid])
+            self.assertEqual(proc.wait(5), -9)
+        self.assertEqual(loaded.leftover_processes(), [])
+
+    def test_close_on_batch_end(self):
+        batch = Batch([Job([Step(f'"{sys.executable}" -c "pass"',
+                                 'File 1/1', progress=False)],
+                           sources=['a.mkv'])],
+                      os.path.join(self.tmp.name, 'test.log'))
+        batch.journal = BatchJournal.create(self.journaldir, batch,
+                                            self.params)
+        engine = JobEngine(lambda topic, **kwargs: None)
+        engine.submit(batch)
+        engine.join()
+        self.assertFalse(os.path.exists(batch.journal.filename))
+        self.assertEqual(BatchJournal.unfinished(self.journaldir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the disk_space.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import time
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.disk_space import (DiskGuard, SizeHistory,
+                                                   bitrate_size, MIB)
+    from videomass.vdms_threads.job_engine import JobEngine, Batch, Job, Step
+    from videomass.vdms_threads.output_staging import OutputStaging
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestDiskGuard(unittest.TestCase):
+    """Test case for the DiskGuard class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def job(self, name, cmd='-crf 23', duration=60000, size=MIB):
+        """returns the job of a source of `size` bytes"""
+        src = os.path.join(self.tmp.name, f'{name}.mkv')
+        with open(src, 'wb') as fsrc:
+            fsrc.truncate(size)
+        out = os.path.join(self.tmp.name, 'out', f'{name}.webm')
+        return Job([Step(f'"ffmpeg" -i "{src}" {cmd} "{out}"', name, src,
+                         out, duration, progress=False)], sources=[src])
+
+    def test_estimate(self):
+        self.assertEqual(bitrate_size('-b:v 2M -b:a 128k', 8000), 2128000)
+        self.assertEqual(bitrate_size('-crf 23 -c:a copy', 8000), 0)
+        history = SizeHistory(self.tmp.name)
+        guard = DiskGuard(0, history)
+        self.assertEqual(guard.estimate(self.job('a')), int(MIB * 1.1))
+        self.assertEqual(guard.estimate(self.job('b', '-b:v 1M', 8000)),
+                         1100000)
+        history.record(' -i  -crf 23 ', 2000000, 10000)  # 200 kB/s
+        self.assertEqual(SizeHistory(self.tmp.name).rate(' -i  -crf 23 '),
+                         200000)
+        self.assertEqual(guard.estimate(self.job('c')), 13200000)
+
+    def test_engine(self):
+        guard = DiskGuard(10 * MIB)
+        guard.free_space = lambda folder: 12 * MIB  # room for one job
+        messages = []
+        jobs = []
+        for name in ('a', 'b'):
+            job = self.job(name)
+            job.steps[0].cmd = (f'"{sys.executable}" -c "import time; '
+                                f'time.sleep(0.5)"')
+            jobs.append(job)
+        engine = JobEngine(lambda topic, **kwargs: messages.append(kwargs),
+                           max_workers=2, tmpdir=self.tmp.name,
+                           diskguard=guard)
+        start = time.monotonic()
+        engine.submit(Batch(jobs, os.path.join(self.tmp.name, 'test.log')))
+        engine.join()
+        self.assertEqual([job.state for job in jobs], ['done', 'done'])
+        self.assertGreater(time.monotonic() - start, 1.0)  # one at a time
+        notices = [x['output'] for x in messages
+                   if 'Not enough free space' in x.get('output', '')]
+        self.assertEqual(len(notices), 1)
+        self.assertEqual(guard.active, {})
+
+        guard.free_space = lambda folder: 5 * MIB  # below the reserve
+        job = self.job('c')
+        messages.clear()
+        engine = JobEngine(lambda topic, **kwargs: messages.append(kwargs),
+                           tmpdir=self.tmp.name, diskguard=guard)
+        engine.submit(Batch([job], os.path.join(self.tmp.name, 'test.log')))
+        engine.join()  # nothing would free the space
+        self.assertEqual(job.state, 'failed')
+        self.assertTrue(any('cannot be started' in x.get('output', '')
+                            for x in messages))
+        self.assertEqual(guard.shortage, {})
+
+    def test_scratch(self):
+        scratch = os.path.join(self.tmp.name, 'scratch')
+        guard = DiskGuard(10 * MIB, staging=OutputStaging(
+            os.path.join(scratch, 'new')))
+        spaces = {self.tmp.name: 100 * MIB, scratch: 5 * MIB}
+        guard.free_space = spaces.get
+        self.assertTrue(guard.acquire(self.job('a')))  # same volume
+        guard.release(self.job('a'))
+
+        os.makedirs(scratch)
+        guard.device = lambda folder: 2 if folder == scratch else 1
+        job = self.job('b')
+        job.ident = 1
+        self.assertFalse(guard.acquire(job))  # the scratch volume is full
+        self.assertTrue(guard.stuck(job))
+        self.assertIn('cannot be started', guard.hold(job))
+        spaces[scratch] = 50 * MIB
+        self.assertTrue(guard.acquire(job))
+        self.assertEqual(guard.active[job.ident][0], [1, 2])
+
+        other = self.job('c')
+        other.ident = 2
+        spaces[scratch] = 12 * MIB  # room for one output
+        self.assertFalse(guard.acquire(other))
+        self.assertFalse(guard.stuck(other))  # waits for `job`
+        self.assertTrue(guard.acquire(job))  # not waiting for itself
+
+    def test_staged_progress(self):
+        guard = DiskGuard(10 * MIB, staging=OutputStaging())
+        guard.free_space = lambda folder: 12 * MIB  # room for one job
+        first, second = self.job('a'), self.job('b')
+        first.ident, second.ident = 1, 2
+        self.assertTrue(guard.acquire(first))
+        self.assertFalse(guard.acquire(second))
+        os.makedirs(os.path.join(self.tmp.name, 'out'))
+        with open(guard.active[1][1], 'wb') as part:  # written by ffmpeg
+            part.truncate(int(MIB * 1.1))
+        self.assertTrue(guard.acquire(second))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the engine_core.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import pickle
+import tempfile
+import subprocess
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.engine_core import EngineSettings, QueueSink
+    from videomass.vdms_threads.generic_task import FFmpegGenericTask
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestEngineCore(unittest.TestCase):
+    """Test case for the settings and the event sinks."""
+
+    def test_settings(self):
+        appdata = {'ffmpeg_cmd': 'ffmpeg', 'ffthreads': '-threads 4',
+                   'getpath': lambda path: path}  # not picklable
+        settings = EngineSettings.from_appdata(appdata)
+        self.assertEqual(settings, {'ffmpeg_cmd': 'ffmpeg',
+                                    'ffthreads': '-threads 4'})
+        self.assertEqual(pickle.loads(pickle.dumps(settings)), settings)
+
+    def test_no_wx(self):
+        code = ('import sys; '
+                'import videomass.vdms_threads.volumedetect; '
+                'import videomass.vdms_threads.generic_task; '
+                'import videomass.vdms_threads.split_stitch; '
+                'import videomass.vdms_threads.two_pass_ebu; '
+                'sys.exit("wx" in sys.modules or "pubsub" in sys.modules)')
+        proc = subprocess.run([sys.executable, '-c', code], check=False,
+                              cwd=os.path.dirname(os.path.dirname(PATH)))
+        self.assertEqual(proc.returncode, 0)
+
+    def test_generic_task(self):
+        sink = QueueSink()
+        settings = EngineSettings(ffmpeg_cmd=sys.executable,
+                                  ffmpeg_default_args='-c')
+        with tempfile.TemporaryDirectory() as tmp:
+            thread = FFmpegGenericTask('"import sys; sys.exit(3)"',
+                                       settings, 'Test',
+                                       os.path.join(tmp, 'generic.log'),
+                                       sink)
+            thread.join()
+        self.assertEqual(thread.status, 'FFmpeg Unrecognized error')
+        self.assertEqual(list(sink.drain()), [('RESULT_EVT', {'status': ''})])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the ffmpeg_progress.py module.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.ffmpeg_progress import (iter_progress,
+                                                        with_progress)
+except ImportError as error:
+    sys.exit(error)
+
+OUTPUT = """frame=1178
+fps=155.00
+stream_0_0_q=29.0
+bitrate= 435.0kbits/s
+total_size=2121728
+out_time_us=39020000
+out_time=00:00:39.020000
+dup_frames=0
+drop_frames=0
+speed=5.15x
+progress=continue
+frame=1200
+fps=N/A
+bitrate=N/A
+total_size=N/A
+out_time_us=N/A
+speed=N/A
+progress=end
+"""
+
+
+class TestFFmpegProgress(unittest.TestCase):
+    """Test case for the -progress output parsing."""
+
+    def test_iter_progress(self):
+        first, last = iter_progress(OUTPUT.splitlines(True), 78040)
+        self.assertEqual((first.frame, first.fps, first.total_size),
+                         (1178, 155.0, 2121728))
+        self.assertEqual((first.msec, first.percent(), first.speed),
+                         (39020, 50, 5.15))
+        self.assertEqual(first.eta(), round(39020 / 5.15))
+        self.assertEqual(first.bitrate, '435.0kbits/s')
+        self.assertEqual((last.msec, last.percent(), last.eta()),
+                         (0, 100, 0))
+
+    def test_unknown_duration(self):
+        first = next(iter_progress(OUTPUT.splitlines(True)))
+        self.assertEqual((first.percent(), first.eta()), (100, None))
+
+    def test_discount(self):
+        first = next(iter_progress(OUTPUT.splitlines(True), 78040))
+        first.discount(10, 0)
+        self.assertEqual(first.speed, 5.15)
+        first.discount(10, 5)  # paused for half of the time
+        self.assertEqual((first.speed, first.values['speed']),
+                         (10.3, '10.3x'))
+        self.assertEqual(first.eta(), round(39020 / 10.3))
+
+    def test_with_progress(self):
+        self.assertEqual(with_progress('"/usr/bin/ffmpeg" -loglevel info '
+                                       '-stats -i "in put.mkv" out.mkv'),
+                         '"/usr/bin/ffmpeg" -progress pipe:1 -nostats '
+                         '-loglevel info -nostats -i "in put.mkv" out.mkv')
+        self.assertEqual(with_progress(['ffmpeg', '-stats', '-i', 'in']),
+                         ['ffmpeg', '-progress', 'pipe:1', '-nostats',
+                          '-nostats', '-i', 'in'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the headless.py module.
+# Rev: 17.Oct.2026
+
+import sys
+import io
+import json
+import os.path
+import subprocess
+import unittest
+import contextlib
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_sys.headless import Reporter, output_files
+    from videomass.vdms_threads.ffmpeg_progress import Progress
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestHeadless(unittest.TestCase):
+    """Test case for the headless batch processing."""
+
+    def test_no_wx(self):
+        code = ('import sys; import videomass.vdms_sys.headless; '
+                'sys.exit("wx" in sys.modules)')
+        proc = subprocess.run([sys.executable, '-c', code], check=False,
+                              cwd=os.path.dirname(os.path.dirname(PATH)))
+        self.assertEqual(proc.returncode, 0)
+
+    def test_output_files(self):
+        self.assertEqual(output_files(['/a/b.mkv', '/a/c.avi'], '/out',
+                                      'mp4'),
+                         ['/out/b.mp4', '/out/c.mp4'])
+        self.assertEqual(output_files(['/a/b.mkv'], '/out', ''),
+                         ['/out/b.mkv'])
+
+    def test_json_lines(self):
+        report = Reporter(jsonlines=True)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            report('COUNT_EVT', count='File 1/1', fsource='Source:  "a.mkv"',
+                   destination='Destination:  "a.mp4"', duration=2000,
+                   end='')
+            for usec in (500000, 600000):  # the second one is too early
+                report('UPDATE_EVT', output='', duration=2000, status=0,
+                       progress=Progress({'out_time_us': str(usec),
+                                          'speed': '2x'}, 2000))
+            report('COUNT_EVT', count='', fsource='', destination='',
+                   duration=2000, end='Done')
+            report('END_EVT', msg=['a.mkv'], batch=1)
+        events = [json.loads(line) for line in stdout.getvalue().split('\n')
+                  if line]
+        self.assertEqual([x['event'] for x in events],
+                         ['start', 'progress', 'done', 'end'])
+        self.assertEqual(events[0]['destination'], 'a.mp4')
+        self.assertEqual((events[1]['percent'], events[1]['eta']), (25, 750))
+
+
+if __name__ == '__main__':
+    unittest.main()
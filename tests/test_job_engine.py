@@ -0,0 +1,214 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the job_engine.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import threading
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.job_engine import (JobEngine, Batch,
+                                                   Job, Step)
+except ImportError as error:
+    sys.exit(error)
+
+
+FAKE_FFMPEG = """#!{python}
+import sys
+import time
+if sys.argv[1:3] != ['-progress', 'pipe:1']:
+    sys.exit(2)
+if sys.argv[-1] == 'sleep':
+    time.sleep(30)
+sys.stderr.write('Input #0, matroska, from in.mkv\\n')
+for usec in (500000, 1000000):
+    print(f'frame=25\\nout_time_us={{usec}}\\nspeed=2.0x\\n'
+          f'progress=continue', flush=True)
+print('out_time_us=1000000\\nprogress=end', flush=True)
+sys.exit(1 if sys.argv[-1] == 'fail' else 0)
+"""
+TMPDIR = tempfile.TemporaryDirectory()
+SUCCESS = FAILURE = SLEEP = None
+
+
+def setUpModule():
+    """writes a fake ffmpeg executable which supports -progress"""
+    global SUCCESS, FAILURE, SLEEP
+    fake = os.path.join(TMPDIR.name, 'ffmpeg')
+    with open(fake, 'w', encoding='utf8') as script:
+        script.write(FAKE_FFMPEG.format(python=sys.executable))
+    os.chmod(fake, 0o755)
+    SUCCESS, FAILURE, SLEEP = [f'"{fake}" -stats -i "in.mkv" {action}'
+                               for action in ('ok', 'fail', 'sleep')]
+
+
+def tearDownModule():
+    TMPDIR.cleanup()
+
+
+class TestJobEngine(unittest.TestCase):
+    """Test case for the JobEngine class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.logname = os.path.join(self.tmp.name, 'test.log')
+        self.messages = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def notify(self, topic, **kwargs):
+        """collects the messages of the engine"""
+        with self.lock:
+            self.messages.append((topic, kwargs))
+
+    def ends(self):
+        """returns the arguments of the END_EVT messages"""
+        return [kw for topic, kw in self.messages if topic == 'END_EVT']
+
+    def test_batch_done(self):
+        engine = JobEngine(self.notify, max_workers=2, tmpdir=self.tmp.name)
+        jobs = [Job([Step(SUCCESS, f'File {n}/3')], sources=[f'f{n}'],
+                    label=f'File {n}/3') for n in range(1, 4)]
+        batch = engine.submit(Batch(jobs, self.logname))
+        engine.join()
+        self.assertEqual([job.state for job in jobs], ['done'] * 3)
+        self.assertEqual(self.ends(), [{'msg': ['f1', 'f2', 'f3'],
+                                        'batch': batch.ident}])
+        self.assertFalse(engine.is_alive())
+
+    def test_failure_and_requires(self):
+        engine = JobEngine(self.notify)
+        measure = Job([Step(FAILURE, 'File 1/1 - Pass One')],
+                      sources=['f1'])
+        encode = Job([Step(SUCCESS, 'File 1/1 - Pass Two')],
+                     sources=['f1'], requires=measure)
+        engine.submit(Batch([measure, encode], self.logname))
+        engine.join()
+        self.assertEqual(measure.state, 'failed')
+        self.assertEqual(encode.state, 'skipped')
+        self.assertEqual(self.ends()[0]['msg'], [])
+
+    def test_end_callback_error(self):
+        def on_end(job):
+            raise OSError('No space left on device')
+        engine = JobEngine(self.notify)
+        job = Job([Step(SUCCESS, 'File 1/1')], sources=['f1'],
+                  label='File 1/1', on_end=on_end)
+        engine.submit(Batch([job], self.logname))
+        engine.join()
+        self.assertEqual(self.ends()[0]['msg'], ['f1'])  # not hanging
+        with open(self.logname, encoding='utf8') as log:
+            self.assertIn('No space left on device', log.read())
+
+    def test_missing_ffmpeg(self):
+        engine = JobEngine(self.notify)
+        engine.stop_on_error = False  # as the worker daemon
+        missing = os.path.join(self.tmp.name, 'missing', 'ffmpeg')
+        jobs = [Job([Step(f'"{missing}" -i in.mkv', 'File 1/2')],
+                    sources=['f1']),
+                Job([Step(SUCCESS, 'File 2/2')], sources=['f2'])]
+        engine.submit(Batch(jobs, self.logname))
+        engine.join()
+        self.assertEqual([job.state for job in jobs], ['failed', 'done'])
+        self.assertFalse(engine.stopped)
+
+    def test_priority(self):
+        engine = JobEngine(self.notify, max_workers=1)
+        order = []
+        low = Batch([Job([Step(SUCCESS, 'low')],
+                         on_end=lambda job: order.append('low'))],
+                    self.logname, priority=Batch.LOW)
+        high = Batch([Job([Step(SUCCESS, 'high')],
+                          on_end=lambda job: order.append('high'))],
+                     self.logname, priority=Batch.HIGH)
+        with engine.cond:  # queue both batches before starting
+            engine.submit(low)
+            engine.submit(high)
+        engine.join()
+        self.assertEqual(order, ['high', 'low'])
+
+    def test_progress(self):
+        engine = JobEngine(self.notify)
+        step = Step(SUCCESS, 'File 1/1', duration=2000)
+        engine.submit(Batch([Job([step])], self.logname))
+        engine.join()
+        progress = [kw['progress'] for topic, kw in self.messages
+                    if topic == 'UPDATE_EVT' and kw.get('progress')]
+        self.assertEqual([(x.msec, x.percent(), x.eta()) for x in progress],
+                         [(500, 25, 750), (1000, 50, 500), (1000, 100, 0)])
+        with open(self.logname, encoding='utf8') as log:
+            self.assertIn('[FFMPEG]: Input #0', log.read())
+
+    def test_skipped_step(self):
+        engine = JobEngine(self.notify)
+        job = Job([Step(lambda job: None, 'File 1/1', skipmsg='cached')],
+                  sources=['f1'])
+        engine.submit(Batch([job], self.logname))
+        engine.join()
+        self.assertEqual(job.state, 'done')
+        counts = [kw for topic, kw in self.messages if topic == 'COUNT_EVT']
+        self.assertEqual(counts[0]['destination'], 'cached')
+
+    def test_workdir(self):
+        engine = JobEngine(self.notify, tmpdir=self.tmp.name)
+        paths = []
+        first = Job([Step(SUCCESS, 'first')], workdir=True,
+                    on_end=lambda job: paths.append(job.path))
+        second = Job([Step(SUCCESS, 'second')], workdir=first,
+                     requires=first,
+                     on_end=lambda job: paths.append(job.path))
+        engine.submit(Batch([first, second], self.logname))
+        engine.join()
+        self.assertEqual(paths[0], paths[1])
+        self.assertFalse(os.path.exists(paths[0]))
+
+    def test_stop(self):
+        engine = JobEngine(self.notify, max_workers=1)
+        jobs = [Job([Step(SLEEP, f'File {n}/2')], sources=[f'f{n}'])
+                for n in range(1, 3)]
+        engine.submit(Batch(jobs, self.logname))
+        while jobs[0].state != 'running':
+            threading.Event().wait(.05)
+        engine.stop()
+        engine.join()
+        self.assertEqual([job.state for job in jobs], ['aborted'] * 2)
+        self.assertEqual(self.ends()[0]['msg'], [])
+
+    @unittest.skipUnless(JobEngine.CAN_PAUSE, 'SIGSTOP not supported')
+    def test_pause(self):
+        engine = JobEngine(self.notify, max_workers=1)
+        jobs = [Job([Step(SLEEP, f'File {n}/2')], sources=[f'f{n}'])
+                for n in range(1, 3)]
+        engine.submit(Batch(jobs, self.logname))
+        while engine.running.get(jobs[0].ident) is None:
+            threading.Event().wait(.05)
+        proc = engine.running[jobs[0].ident]
+
+        def state():
+            with open(f'/proc/{proc.pid}/stat', encoding='utf8') as stat:
+                return stat.read().rsplit(')', 1)[1].split()[0]
+
+        engine.pause()
+        threading.Event().wait(.2)
+        if os.path.exists(f'/proc/{proc.pid}'):
+            self.assertEqual(state(), 'T')
+        self.assertGreater(engine.paused_time(jobs[0]), .1)
+        engine.resume()
+        if os.path.exists(f'/proc/{proc.pid}'):
+            self.assertNotEqual(state(), 'T')
+        engine.pause()  # stop also works on paused jobs
+        engine.stop()
+        engine.join()
+        self.assertEqual([job.state for job in jobs], ['aborted'] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the log_sink.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.log_sink import LogSink
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestLogSink(unittest.TestCase):
+    """Test case for the LogSink class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.logname = os.path.join(self.tmp.name, 'test.log')
+        self.sink = LogSink(interval=60)
+        self.sink.start()
+
+    def tearDown(self):
+        self.sink.flush(close=True, wait=True)
+        self.tmp.cleanup()
+
+    def test_buffered_write(self):
+        for num in range(1000):
+            self.sink.write(self.logname, f'line {num}\n')
+        self.sink.flush(self.logname, wait=True)
+        self.assertEqual(list(self.sink.files), [self.logname])
+        with open(self.logname, encoding='utf8') as log:
+            lines = log.readlines()
+        self.assertEqual(len(lines), 1000)
+        self.assertEqual(lines[-1], 'line 999\n')
+
+    def test_close(self):
+        self.sink.write(self.logname, 'first\n')
+        self.sink.flush(self.logname, close=True, wait=True)
+        self.assertEqual(self.sink.files, {})
+        self.sink.write(self.logname, 'second\n')  # reopened
+        self.sink.flush(wait=True)
+        with open(self.logname, encoding='utf8') as log:
+            self.assertEqual(log.read(), 'first\nsecond\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
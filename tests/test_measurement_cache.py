@@ -0,0 +1,83 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the measurement_cache.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.measurement_cache import MeasurementCache
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestMeasurementCache(unittest.TestCase):
+    """Test case for the MeasurementCache class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, 'source.wav')
+        with open(self.source, 'wb') as fsrc:
+            fsrc.write(b'0' * 16)
+        self.cache = MeasurementCache(self.tmp.name, maxentries=2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_set(self):
+        params = ('-map 0:a:0', ('', ''))
+        self.assertIsNone(self.cache.get(self.source, 'volumedetect',
+                                         *params))
+        self.cache.set(self.source, 'volumedetect', ['-1 dB', '-20 dB'],
+                       *params)
+        self.assertEqual(self.cache.get(self.source, 'volumedetect',
+                                        *params), ['-1 dB', '-20 dB'])
+        self.assertIsNone(self.cache.get(self.source, 'volumedetect',
+                                         '-map 0:a:1', ('', '')))
+        self.assertIsNone(self.cache.get(self.source, 'loudnorm', *params))
+
+    def test_invalidation(self):
+        self.cache.set(self.source, 'loudnorm', {'a': '1'})
+        with open(self.source, 'ab') as fsrc:
+            fsrc.write(b'1')
+        self.assertIsNone(self.cache.get(self.source, 'loudnorm'))
+        self.cache.set(self.source, 'volumedetect', ['1', '2'])
+        os.remove(self.source)
+        self.assertEqual(self.cache.prune(), 1)
+
+    def test_eviction(self):
+        for num in range(3):
+            self.cache.set(self.source, 'volumedetect', [num], num)
+        self.assertIsNone(self.cache.get(self.source, 'volumedetect', 0))
+        self.assertEqual(self.cache.get(self.source, 'volumedetect', 2), [2])
+
+    def test_write_errors(self):
+        os.makedirs(self.cache.filename)  # cannot be replaced
+        self.cache.set(self.source, 'volumedetect', [0], 0)
+        self.assertEqual(self.cache.get(self.source, 'volumedetect', 0), [0])
+        self.assertEqual(len(os.listdir(self.tmp.name)), 2)  # no tmp left
+
+    def test_lookups(self):
+        self.cache.set(self.source, 'volumedetect', [0], 0)
+        self.cache.set(self.source, 'volumedetect', [1], 1)
+        stamp = os.stat(self.cache.filename).st_mtime_ns
+        self.cache.get(self.source, 'volumedetect', 0).append('changed')
+        self.assertEqual(self.cache.get(self.source, 'volumedetect', 0), [0])
+        self.assertEqual(os.stat(self.cache.filename).st_mtime_ns, stamp)
+        self.cache.set(self.source, 'volumedetect', [2], 2)  # evicts [1]
+        self.assertIsNone(self.cache.get(self.source, 'volumedetect', 1))
+        self.assertEqual(self.cache.get(self.source, 'volumedetect', 0), [0])
+
+        other = MeasurementCache(self.tmp.name, maxentries=2)
+        other.set(self.source, 'loudnorm', {'a': '1'})  # read again
+        self.assertEqual(self.cache.get(self.source, 'loudnorm'), {'a': '1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the output_manifest.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.output_manifest import OutputManifest, recipe
+    from videomass.vdms_threads.job_engine import JobEngine, Batch, Job, Step
+    from videomass.vdms_threads.engine_core import EngineSettings
+except ImportError as error:
+    sys.exit(error)
+
+
+FAKE_FFMPEG = """#!{python}
+import sys
+with open(sys.argv[0] + '.runs', 'a', encoding='utf8') as runs:
+    runs.write(sys.argv[-1] + '\\n')
+with open(sys.argv[-1], 'w', encoding='utf8') as out:
+    out.write(sys.argv[1])
+"""
+
+
+class TestOutputManifest(unittest.TestCase):
+    """Test case for the OutputManifest class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fake = os.path.join(self.tmp.name, 'ffmpeg')
+        with open(self.fake, 'w', encoding='utf8') as script:
+            script.write(FAKE_FFMPEG.format(python=sys.executable))
+        os.chmod(self.fake, 0o755)
+        self.sources = []
+        for num in range(1, 4):
+            self.add_source(f'in{num}.mkv')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add_source(self, name, text='video'):
+        """writes a source file"""
+        src = os.path.join(self.tmp.name, name)
+        with open(src, 'w', encoding='utf8') as fsrc:
+            fsrc.write(text)
+        if src not in self.sources:
+            self.sources.append(src)
+
+    def notify(self, topic, **kwargs):
+        """keeps the sources of the successful jobs"""
+        if topic == 'END_EVT':
+            self.filedone.extend(kwargs['msg'])
+
+    def run_batch(self, options='-crf 23', measure=False):
+        """
+        converts the sources with a fresh manifest, returns
+        the outputs skipped and the sources converted
+        """
+        self.filedone = []
+        if os.path.exists(f'{self.fake}.runs'):
+            os.remove(f'{self.fake}.runs')
+        jobs = []
+        for src in self.sources:
+            out = f'{os.path.splitext(src)[0]}.webm'
+            cmd = f'"{self.fake}" "{options}" -i "{src}" -y "{out}"'
+            first = None
+            if measure:
+                first = Job([Step(f'"{self.fake}" "" "{out}.pass"', 'one',
+                                  src, out, progress=False)])
+                jobs.append(first)
+            jobs.append(Job([Step(cmd, 'File', src, out, progress=False)],
+                            sources=[src], requires=first))
+        batch = Batch(jobs, os.path.join(self.tmp.name, 'test.log'))
+        skipped = OutputManifest().apply(batch)
+        engine = JobEngine(self.notify, tmpdir=self.tmp.name)
+        engine.submit(batch)
+        engine.join()
+        self.assertTrue(all(job.state == 'done' for job in batch.jobs))
+        if not os.path.exists(f'{self.fake}.runs'):
+            return skipped, []
+        with open(f'{self.fake}.runs', encoding='utf8') as runs:
+            return skipped, [line.strip() for line in runs]
+
+    def test_incremental(self):
+        skipped, done = self.run_batch()
+        self.assertEqual((len(skipped), len(done)), (0, 3))
+        skipped, done = self.run_batch()
+        self.assertEqual((len(skipped), done), (3, []))
+        self.assertEqual(self.filedone, [])  # not moved to the trash
+
+        self.add_source('in4.mkv')  # a new file
+        self.add_source('in1.mkv', 'changed video')
+        skipped, done = self.run_batch()
+        self.assertEqual(len(skipped), 2)
+        self.assertEqual(sorted(os.path.basename(x) for x in done),
+                         ['in1.webm', 'in4.webm'])
+
+        os.remove(os.path.join(self.tmp.name, 'in2.webm'))  # output lost
+        skipped, done = self.run_batch()
+        self.assertEqual([os.path.basename(x) for x in done], ['in2.webm'])
+
+        skipped, done = self.run_batch(options='-crf 30')  # new options
+        self.assertEqual((len(skipped), len(done)), (0, 4))
+
+    def test_required_jobs(self):
+        skipped, done = self.run_batch(measure=True)
+        self.assertEqual(len(done), 6)
+        skipped, done = self.run_batch(measure=True)  # no first passes
+        self.assertEqual((len(skipped), done), (3, []))
+
+    def test_recipe(self):
+        def template(cmd):
+            def resolve(job):
+                return cmd.format(job)
+            return resolve
+        self.assertEqual(recipe(template('-crf 23')),
+                         recipe(template('-crf 23')))
+        self.assertNotEqual(recipe(template('-crf 23')),
+                            recipe(template('-crf 30')))
+        self.assertEqual(recipe(['a', 1, None]), "['a',1,None]")
+        settings = EngineSettings({'ffthreads': '-threads 4',
+                                   'logdir': '/logs'})
+        self.assertNotEqual(recipe(settings), recipe(EngineSettings(
+            settings, ffthreads='-threads 8')))
+        self.assertEqual(recipe(settings), recipe(EngineSettings(
+            settings, logdir='/other')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the output_staging.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.output_staging import OutputStaging
+    from videomass.vdms_threads.job_engine import JobEngine, Batch, Job, Step
+    from videomass.vdms_io.batch_journal import BatchJournal
+except ImportError as error:
+    sys.exit(error)
+
+
+FAKE_FFMPEG = """#!{python}
+import sys
+with open(sys.argv[-1], 'w', encoding='utf8') as out:
+    out.write('half')
+sys.exit(int(sys.argv[1]))
+"""
+
+
+class TestOutputStaging(unittest.TestCase):
+    """Test case for the OutputStaging class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fake = os.path.join(self.tmp.name, 'ffmpeg')
+        with open(self.fake, 'w', encoding='utf8') as script:
+            script.write(FAKE_FFMPEG.format(python=sys.executable))
+        os.chmod(self.fake, 0o755)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stage(self):
+        staging = OutputStaging()
+        out = os.path.join(self.tmp.name, 'clip.mkv')
+        part = os.path.join(self.tmp.name, '.clip.part.mkv')
+        self.assertEqual(staging.stage(f'ffmpeg -i "a.mkv" -y "{out}"', out),
+                         (f'ffmpeg -i "a.mkv" -y "{part}"', part))
+        self.assertEqual(staging.stage(['x', f'-y "{out}"'], out)[0],
+                         ['x', f'-y "{part}"'])
+        for dest in ('relative.mkv', self.tmp.name,
+                     os.path.join(self.tmp.name, 'img%03d.png')):
+            self.assertEqual(staging.stage(f'-y "{dest}"', dest),
+                             (f'-y "{dest}"', None))
+        cmd = f'-i "{out}" -y "{out}"'  # not a single output
+        self.assertEqual(staging.stage(cmd, out), (cmd, None))
+
+    def test_scratch(self):
+        scratch = os.path.join(self.tmp.name, 'scratch')
+        staging = OutputStaging(scratch)
+        out = os.path.join(self.tmp.name, 'clip.mkv')
+        cmd, part = staging.stage(f'-y "{out}"', out)
+        self.assertEqual(os.path.dirname(part), scratch)
+        with open(part, 'w', encoding='utf8') as fpart:
+            fpart.write('video')
+        staging.commit(part, out)
+        self.assertEqual(os.listdir(scratch), [])
+        self.assertEqual([x for x in os.listdir(self.tmp.name)
+                          if x.startswith('.')], [])  # no partials
+        with open(out, encoding='utf8') as fout:
+            self.assertEqual(fout.read(), 'video')
+
+    def test_engine(self):
+        jobs = []
+        for num, status in enumerate((0, 1)):
+            out = os.path.join(self.tmp.name, f'out{num}.mkv')
+            jobs.append(Job([Step(f'"{self.fake}" {status} -y "{out}"',
+                                  f'File {num}', '', out, progress=False)]))
+        engine = JobEngine(lambda topic, **kwargs: None, max_workers=2,
+                           tmpdir=self.tmp.name, staging=OutputStaging())
+        engine.submit(Batch(jobs, os.path.join(self.tmp.name, 'test.log')))
+        engine.join()
+        self.assertEqual([job.state for job in jobs], ['done', 'failed'])
+        self.assertEqual(sorted(x for x in os.listdir(self.tmp.name)
+                                if x.endswith('.mkv')), ['out0.mkv'])
+
+    def test_journal(self):
+        out = os.path.join(self.tmp.name, 'out.mkv')
+        job = Job([Step(f'ffmpeg -y "{out}"', 'File', '', out)])
+        journal = BatchJournal.create(os.path.join(self.tmp.name, 'jrn'),
+                                      Batch([job], 'test.log'), {})
+        journal.update(0, 'running')  # interrupted
+        part = OutputStaging().partname(out)
+        for name in (out, part):
+            with open(name, 'w', encoding='utf8') as fout:
+                fout.write('half')
+        self.assertEqual(journal.partial_outputs(temporary=True), [part])
+        self.assertEqual(journal.remove_partial_outputs(), [out, part])
+        journal.close()
+
+        staging = OutputStaging(os.path.join(self.tmp.name, 'scratch'))
+        journal = BatchJournal.create(os.path.join(self.tmp.name, 'jrn'),
+                                      Batch([job], 'test.log'), {}, staging)
+        journal.update(0, 'running')
+        journal = BatchJournal.load(journal.filename)
+        part = staging.partname(out)  # in the scratch folder
+        os.makedirs(staging.scratch)
+        for name in (out, part):
+            with open(name, 'w', encoding='utf8') as fout:
+                fout.write('half')
+        self.assertEqual(journal.remove_partial_outputs(temporary=True),
+                         [part])
+        self.assertTrue(os.path.exists(out))
+        journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
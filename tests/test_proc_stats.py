@@ -0,0 +1,123 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the proc_stats.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import time
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.proc_stats import (ResourceMonitor, Usage,
+                                                   read_proc, usage_table,
+                                                   CLOCK_TICKS, MIB)
+    from videomass.vdms_threads.job_engine import JobEngine, Batch, Job, Step
+except ImportError as error:
+    sys.exit(error)
+
+HAS_PROC = os.path.isdir('/proc/self')
+BUSY = 'import time; end = time.time() + 0.6\nwhile time.time() < end: pass'
+
+
+class TestProcStats(unittest.TestCase):
+    """Test case for the proc_stats functions and classes."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fake_proc(self, pid, utime, stime, rss_kb, peak_kb):
+        """writes the /proc files of a fake process"""
+        path = os.path.join(self.tmp.name, str(pid))
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'stat'), 'w', encoding='utf8') as fst:
+            fst.write(f'{pid} (ff mpeg) R 1 1 1 0 -1 0 0 0 0 0 '
+                      f'{utime} {stime} 0 0 20 0 4 0 100\n')
+        with open(os.path.join(path, 'status'), 'w', encoding='utf8') as fst:
+            fst.write(f'Name:\tffmpeg\nVmHWM:\t{peak_kb} kB\n'
+                      f'VmRSS:\t{rss_kb} kB\nvoluntary_ctxt_switches:\t7\n'
+                      f'nonvoluntary_ctxt_switches:\t3\n')
+        with open(os.path.join(path, 'io'), 'w', encoding='utf8') as fio:
+            fio.write('rchar: 99\nread_bytes: 4096\nwrite_bytes: 8192\n')
+
+    def test_read_proc(self):
+        self.fake_proc(42, 3 * CLOCK_TICKS, CLOCK_TICKS, 2048, 4096)
+        values = read_proc(42, self.tmp.name)
+        self.assertEqual(values, {'cpu': 4.0, 'rss': 2 * MIB,
+                                  'peak_rss': 4 * MIB, 'voluntary': 7,
+                                  'involuntary': 3, 'read_bytes': 4096,
+                                  'write_bytes': 8192})
+        self.assertIsNone(read_proc(43, self.tmp.name))
+        if HAS_PROC:
+            self.assertGreater(read_proc(os.getpid())['rss'], 0)
+
+    def test_usage(self):
+        usage = Usage({'cpu': 3.0, 'rss': 100 * MIB, 'voluntary': 5}, 2.0)
+        self.assertEqual(usage.cpu_percent(), 150)
+        self.assertEqual(usage.peak_rss, 100 * MIB)
+        self.assertEqual(usage.summary(), 'cpu: 150% | rss: 100 MiB')
+        usage.add(Usage({'cpu': 1.0, 'rss': 50 * MIB,
+                         'write_bytes': MIB}, 2.0))
+        self.assertEqual(usage.cpu_percent(), 100)
+        self.assertEqual(usage.peak_rss, 100 * MIB)
+        self.assertEqual(usage.write_bytes, MIB)
+        self.assertEqual(usage.voluntary, 5)
+        self.assertEqual(Usage().cpu_percent(), 0)
+
+        job = Job([Step('ffmpeg', 'File 1/1', '', '', 0)], label='a.mkv')
+        self.assertEqual(usage_table([job]), '')
+        job.usage = usage
+        table = usage_table([job]).splitlines()
+        self.assertEqual(len(table), 3)
+        self.assertTrue(table[2].startswith('a.mkv'))
+        self.assertEqual(table[2].split()[1:5], ['4.0', '4.0', '100', '100'])
+
+    def test_monitor(self):
+        self.fake_proc(42, 0, 0, 1024, 1024)
+        monitor = ResourceMonitor(interval=0.05, procdir=self.tmp.name)
+        monitor.watch('job', 42)
+        self.fake_proc(42, CLOCK_TICKS, 0, 3072, 3072)
+        time.sleep(0.3)
+        self.assertEqual(monitor.current('job').cpu, 1.0)
+        os.remove(os.path.join(self.tmp.name, '42', 'status'))  # ending
+        monitor.refresh('job')
+        usage = monitor.unwatch('job')
+        self.assertEqual(usage.peak_rss, 3 * MIB)
+        self.assertIsNone(monitor.current('job'))
+        self.assertIsNone(monitor.unwatch('job'))
+        time.sleep(0.2)
+        self.assertIsNone(monitor.thread)  # nothing left to sample
+
+    @unittest.skipUnless(HAS_PROC, 'requires the /proc file system')
+    def test_engine(self):
+        messages = []
+        logname = os.path.join(self.tmp.name, 'test.log')
+        cmd = f'"{sys.executable}" -c "{BUSY}"'
+        job = Job([Step(cmd, 'File 1/1', '', '', 0, progress=False)],
+                  label='busy')
+        engine = JobEngine(lambda topic, **kwargs: messages.append(kwargs),
+                           tmpdir=self.tmp.name,
+                           monitor=ResourceMonitor(interval=0.1))
+        engine.submit(Batch([job], logname))
+        engine.join()
+        self.assertEqual(job.state, 'done')
+        self.assertGreater(job.usage.cpu, 0.2)
+        self.assertGreater(job.usage.peak_rss, 0)
+        tables = [x['output'] for x in messages
+                  if 'Resource usage' in x.get('output', '')]
+        self.assertEqual(len(tables), 1)
+        with open(logname, encoding='utf8') as log:
+            text = log.read()
+        self.assertIn('[RESOURCES]: ', text)
+        self.assertIn('Resource usage of the jobs:', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
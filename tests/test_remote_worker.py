@@ -0,0 +1,133 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the remote_worker.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import threading
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.remote_worker import (WorkerDaemon,
+                                                      RemoteWorker,
+                                                      parse_workers,
+                                                      map_paths,
+                                                      command_args,
+                                                      is_loopback,
+                                                      TOKEN_ENV)
+    from videomass.vdms_threads.job_engine import (JobEngine, Batch,
+                                                   Job, Step)
+except ImportError as error:
+    sys.exit(error)
+
+
+FAKE_FFMPEG = """#!{python}
+import sys
+if sys.argv[1:3] != ['-progress', 'pipe:1']:
+    sys.exit(2)
+sys.stderr.write(f'Input: {{sys.argv[-2]}}\\n')
+print('out_time_us=500000\\nprogress=continue', flush=True)
+print('out_time_us=1000000\\nprogress=end', flush=True)
+sys.exit(1 if sys.argv[-1] == 'fail' else 0)
+"""
+
+
+class TestRemoteWorker(unittest.TestCase):
+    """Test case for the worker daemons on localhost."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        fake = os.path.join(self.tmp.name, 'ffmpeg')
+        with open(fake, 'w', encoding='utf8') as script:
+            script.write(FAKE_FFMPEG.format(python=sys.executable))
+        os.chmod(fake, 0o755)
+        self.cmd = f'"{fake}" -stats -i "/local/in.mkv" %s'
+        settings = {'ffmpeg_cmd': fake, 'cachedir': self.tmp.name}
+        self.daemons = [WorkerDaemon('127.0.0.1:0', settings, jobs=2)
+                        for n in range(2)]
+        for daemon in self.daemons:
+            threading.Thread(target=daemon.serve_forever,
+                             daemon=True).start()
+        self.messages = []
+        self.logname = os.path.join(self.tmp.name, 'test.log')
+
+    def tearDown(self):
+        for daemon in self.daemons:
+            daemon.shutdown()
+        self.tmp.cleanup()
+
+    def notify(self, topic, **kwargs):
+        """collects the messages of the engine"""
+        self.messages.append((topic, kwargs))
+
+    def remotes(self, offline=False):
+        """returns the RemoteWorker of the daemons"""
+        workers = ','.join(f'127.0.0.1:{daemon.address[1]}*2'
+                           for daemon in self.daemons)
+        if offline:
+            workers += ',127.0.0.1:9'  # nobody listening
+        return parse_workers(workers, '/local=/remote')
+
+    def test_helpers(self):
+        self.assertEqual(command_args('"/usr/bin/ffmpeg" -i "a.mkv"'),
+                         '-i "a.mkv"')
+        self.assertEqual(map_paths('-i "/local/a.mkv" -y "/other/b.mkv"',
+                                   [('/local', '/mnt')]),
+                         '-i "/mnt/a.mkv" -y "/other/b.mkv"')
+        remote = parse_workers('node1:8765*4 /run/vdms.sock')
+        self.assertEqual([(x.address, x.slots) for x in remote],
+                         [('node1:8765', 4), ('/run/vdms.sock', 1)])
+
+    def test_token(self):
+        self.assertTrue(is_loopback('127.0.0.1'))
+        self.assertTrue(is_loopback('localhost'))
+        self.assertFalse(is_loopback('0.0.0.0'))
+        settings = {'ffmpeg_cmd': 'ffmpeg', 'cachedir': self.tmp.name}
+        token = os.environ.pop(TOKEN_ENV, None)
+        try:
+            with self.assertRaises(PermissionError):
+                WorkerDaemon('0.0.0.0:0', settings)
+            os.environ[TOKEN_ENV] = 'secret'
+            daemon = WorkerDaemon('0.0.0.0:0', settings)
+            threading.Thread(target=daemon.serve_forever,
+                             daemon=True).start()
+            daemon.shutdown()
+        finally:
+            os.environ.pop(TOKEN_ENV, None)
+            if token is not None:
+                os.environ[TOKEN_ENV] = token
+
+    def test_batch(self):
+        engine = JobEngine(self.notify, max_workers=1,
+                           remotes=self.remotes(offline=True))
+        jobs = [Job([Step(self.cmd % ('fail' if n == 5 else 'ok'),
+                          f'File {n}/8', duration=1000)],
+                    sources=[f'f{n}']) for n in range(1, 9)]
+        engine.submit(Batch(jobs, self.logname))
+        engine.join()
+        self.assertEqual([job.state for job in jobs].count('done'), 7)
+        self.assertEqual(jobs[4].state, 'failed')
+        self.assertTrue(engine.remotes[-1].offline)
+        progress = [kw['progress'] for topic, kw in self.messages
+                    if kw.get('progress')]
+        self.assertIn(100, [x.percent() for x in progress])
+        with open(self.logname, encoding='utf8') as log:
+            self.assertIn('Input: /remote/in.mkv', log.read())
+
+    def test_cancel(self):
+        remote = RemoteWorker(f'127.0.0.1:{self.daemons[0].address[1]}')
+        engine = JobEngine(self.notify, remotes=[remote])
+        job = Job([Step(self.cmd % 'ok', 'File 1/1')])
+        engine.submit(Batch([job], self.logname))
+        engine.stop()
+        engine.join()
+        self.assertIn(job.state, ('aborted', 'done'))
+
+
+if __name__ == '__main__':
+    unittest.main()
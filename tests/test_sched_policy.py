@@ -0,0 +1,96 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the sched_policy.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import platform
+import subprocess
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.sched_policy import (SchedPolicy,
+                                                     parse_cpus,
+                                                     format_cpus, threads)
+    from videomass.vdms_threads.job_engine import JobEngine, Batch, Job, Step
+except ImportError as error:
+    sys.exit(error)
+
+REPORT = ('import os, resource, sys; sys.stdin.readline(); '
+          'print(os.nice(0), sorted(os.sched_getaffinity(0)), '
+          'resource.getrlimit(resource.RLIMIT_AS)[0])')
+
+
+class TestSchedPolicy(unittest.TestCase):
+    """Test case for the SchedPolicy class."""
+
+    def test_cpus(self):
+        self.assertEqual(parse_cpus('0-3; 4,6-7 ;'),
+                         [{0, 1, 2, 3}, {4, 6, 7}])
+        self.assertEqual(parse_cpus(''), [])
+        self.assertEqual(format_cpus({0, 1, 2, 5, 7, 8}), '0-2,5,7-8')
+        for wrong in ('a-b', '3-1', '-1'):
+            with self.assertRaises(ValueError):
+                parse_cpus(wrong)
+
+    def test_settings(self):
+        self.assertIsNone(SchedPolicy.from_settings({}))
+        policy = SchedPolicy.from_settings({'job_nice': 40,
+                                            'job_affinity': 'wrong'})
+        self.assertEqual(policy.nice, 19)
+        self.assertEqual(policy.groups, [])
+        self.assertEqual(policy.describe(), 'nice 19')
+
+    @unittest.skipUnless(platform.system() == 'Linux', 'Linux only')
+    def test_groups(self):
+        policy = SchedPolicy(cpus='0; 0; 99999')  # 99999: not available
+        self.assertEqual(len(policy.groups), 2)
+        groups = [policy.acquire() for num in range(3)]
+        self.assertEqual(groups, [0, 1, 0])
+        policy.release(1)
+        self.assertEqual(policy.acquire(), 1)
+        self.assertEqual(policy.describe(1), 'CPUs 0')
+
+    @unittest.skipUnless(platform.system() == 'Linux', 'Linux only')
+    def test_child(self):
+        policy = SchedPolicy(nice=5, ioclass='idle', cpus='0',
+                             memlimit=4096)
+        base = os.nice(0)
+        with subprocess.Popen([sys.executable, '-c', REPORT],
+                              stdin=subprocess.PIPE,
+                              stdout=subprocess.PIPE,
+                              universal_newlines=True,
+                              **policy.popen_args(0)) as proc:
+            policy.apply(proc.pid, 0)
+            output = proc.communicate('\n')[0]
+        self.assertEqual(output.split(None, 1)[0], str(min(19, base + 5)))
+        self.assertIn('[0]', output)
+        self.assertTrue(output.strip().endswith(str(4096 * 1048576)))
+        self.assertEqual(os.nice(0), base)  # the parent is unchanged
+        self.assertIn(os.getpid(), threads(os.getpid()))
+        policy.apply(proc.pid, 0)  # ended, ignored
+
+    @unittest.skipUnless(platform.system() == 'Linux', 'Linux only')
+    def test_engine_log(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            logname = os.path.join(tmp, 'test.log')
+            engine = JobEngine(lambda topic, **kwargs: None,
+                               tmpdir=tmp,
+                               policy=SchedPolicy(nice=3, cpus='0'))
+            cmd = f'"{sys.executable}" -c "pass"'
+            step = Step(cmd, 'File 1/1', progress=False)
+            batch = engine.submit(Batch([Job([step])], logname))
+            engine.join()
+            self.assertEqual(batch.jobs[0].state, 'done')
+            self.assertEqual(engine.policy.users, [0])
+            with open(logname, encoding='utf8') as log:
+                self.assertIn('[POLICY]: nice 3, CPUs 0', log.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
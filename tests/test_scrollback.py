@@ -0,0 +1,57 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the scrollback.py object.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.scrollback import ScrollBack
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestScrollBack(unittest.TestCase):
+    """Test case for the ScrollBack class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.view = ScrollBack(os.path.join(self.tmp.name, 'view.jsonl'),
+                               maxlines=10)
+
+    def tearDown(self):
+        self.view.close()
+        self.tmp.cleanup()
+
+    def test_bounded_view(self):
+        removed = [self.view.append('INFO' if num % 2 else 'WARN',
+                                    f'line {num}\n') for num in range(16)]
+        self.assertEqual(removed[:15], [0] * 15)  # 10 + 5 lines allowed
+        self.assertEqual(removed[15], len('line 0\n') * 6)
+        self.assertEqual(self.view.lines, 10)
+        self.assertEqual(self.view.blocks[0], ('WARN', 'line 6\n'))
+
+    def test_earlier(self):
+        for num in range(16):
+            self.view.append('TXT3', f'line {num}\n')
+        self.assertEqual(self.view.earlier(4),
+                         [('TXT3', f'line {num}\n') for num in range(2, 6)])
+        self.assertEqual(self.view.earlier(4),
+                         [('TXT3', 'line 0\n'), ('TXT3', 'line 1\n')])
+        self.assertEqual(self.view.earlier(4), [])
+        self.assertEqual(self.view.lines, 16)
+        # the loaded lines are removed again without being saved twice
+        for num in range(16, 40):
+            self.view.append('TXT3', f'line {num}\n')
+        self.assertEqual(self.view.first, len(self.view.offsets) - 1)
+        self.assertEqual(self.view.earlier(1), [('TXT3', 'line 29\n')])
+
+
+if __name__ == '__main__':
+    unittest.main()
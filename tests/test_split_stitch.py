@@ -0,0 +1,57 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the split_stitch.py module.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.split_stitch import (split_points,
+                                                     split_stitch_batch)
+except ImportError as error:
+    sys.exit(error)
+
+APPDATA = {'ffmpeg_cmd': 'ffmpeg',
+           'ffmpeg_default_args': '-loglevel info -stats',
+           'ffthreads': '-threads 4',
+           'split_segments': 4,
+           }
+
+
+class TestSplitStitch(unittest.TestCase):
+    """Test case for the split and stitch encoding jobs."""
+
+    def test_split_points(self):
+        self.assertEqual(split_points(400000, 4), [100.0, 200.0, 300.0])
+        self.assertEqual(split_points(150000, 4), [75.0])  # 2 segments
+        self.assertEqual(split_points(90000, 4), [])
+        self.assertEqual(split_points('N/A', 4), [])
+
+    def test_batch(self):
+        args = ('split_stitch', ['long.mkv', 'short.mkv'], 'mp4',
+                ['long.mp4', 'short.mp4'], '-c:v libx264 -c:a aac',
+                ['-c:v libx264', '-c:a aac', '-sn'], [True, True],
+                ['', ''], 'test.log', 2)
+        batch = split_stitch_batch(APPDATA, 'test.log', [400000, 30000],
+                                   ('', ''), *args)
+        # split, 4 segments, audio and joining + the short file
+        self.assertEqual(len(batch.jobs), 8)
+        splitter, stitch = batch.jobs[0], batch.jobs[6]
+        self.assertEqual(stitch.required(), batch.jobs[1:6])
+        self.assertTrue(all(job.owner() is splitter
+                            for job in batch.jobs[1:7]))
+        self.assertEqual(batch.filedone(), [])
+        self.assertEqual([job.sources for job in batch.jobs if job.sources],
+                         [['long.mkv'], ['short.mkv']])
+        self.assertEqual(batch.jobs[7].steps[0].cmd,
+                         '"ffmpeg"  -loglevel info -stats -i "short.mkv"  '
+                         '-c:v libx264 -c:a aac  -threads 4 -y "short.mp4"')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the stream_copy.py functions.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.stream_copy import can_copy, copy_plan
+    from videomass.vdms_threads.one_pass import one_pass_batch
+    from videomass.vdms_threads.split_stitch import split_stitch_batch
+except ImportError as error:
+    sys.exit(error)
+
+
+APPDATA = {'ffmpeg_cmd': 'ffmpeg', 'ffmpeg_default_args': '',
+           'ffthreads': '', 'split_segments': 4}
+
+
+def options(**kwargs):
+    """returns the options of `AV_Conv` of a H.264/AAC MP4"""
+    opt = {"VideoCodec": "-c:v libx264", "OutputFormat": "mp4",
+           "Profile": "", "Level": "", "PixFmt": "-pix_fmt yuv420p",
+           "VideoBitrate": "", "MinRate": "", "MaxRate": "",
+           "VFilters": "", "AspectRatio": "", "FPS": "",
+           "Vidstabdetect": "", "WebOptim": "-movflags faststart",
+           "SubtitleMap": "-sn", "AudioCodec": ["-c:a:", "aac"],
+           "AudioMap": ["-map 0:a:?", ""], "AudioBitrate": ["", ""],
+           "AudioRate": ["", ""], "AudioChannel": ["", ""],
+           "AudioDepth": ["", ""]}
+    opt.update(kwargs)
+    return opt
+
+
+def probe(vcodec='h264', acodec='aac', **kwargs):
+    """returns the ffprobe data of a source file"""
+    video = {'codec_type': 'video', 'codec_name': vcodec,
+             'profile': 'High', 'level': 40, 'pix_fmt': 'yuv420p',
+             'bit_rate': '4000000'}
+    video.update(kwargs)
+    audio = {'codec_type': 'audio', 'codec_name': acodec,
+             'sample_rate': '48000', 'channels': 2, 'bit_rate': '128000'}
+    return {'streams': [video, audio],
+            'format': {'bit_rate': '4200000'}}
+
+
+class TestStreamCopy(unittest.TestCase):
+    """Test case for the stream_copy functions."""
+
+    def test_can_copy(self):
+        self.assertTrue(can_copy(options(), probe()))
+        self.assertFalse(can_copy(options(), probe('hevc')))
+        self.assertFalse(can_copy(options(), probe(acodec='mp3')))
+        self.assertFalse(can_copy(options(), probe(pix_fmt='yuv422p')))
+        self.assertFalse(can_copy(options(VFilters='-vf scale=640:-1'),
+                                  probe()))
+        self.assertFalse(can_copy(options(), probe(), volume='-af volume=2'))
+        self.assertFalse(can_copy(options(), probe(),
+                                  timeseq='-ss 00:01:00 -t 00:00:10'))
+
+    def test_limits(self):
+        self.assertTrue(can_copy(options(Profile='-profile:v high',
+                                         Level='-level 4.1'), probe()))
+        self.assertFalse(can_copy(options(Profile='-profile:v main'),
+                                  probe()))
+        self.assertTrue(can_copy(options(Profile='-profile:v baseline'),
+                                 probe(profile='Constrained Baseline')))
+        self.assertTrue(can_copy(options(VideoCodec='-c:v libx265',
+                                         Profile='-profile:v main10'),
+                                 probe('hevc', profile='Main 10')))
+        self.assertFalse(can_copy(options(Level='-level 3.1'), probe()))
+        self.assertTrue(can_copy(options(MaxRate='-maxrate 5000k'),
+                                 probe()))
+        self.assertFalse(can_copy(options(VideoBitrate='-b:v 2000k'),
+                                  probe()))
+        self.assertTrue(can_copy(options(MaxRate='-maxrate 5M'),
+                                 probe(bit_rate=None)))  # file bitrate
+        self.assertFalse(can_copy(options(MinRate='-minrate 5M'), probe()))
+        self.assertTrue(can_copy(options(AudioRate=['', '-ar 48000']),
+                                 probe()))
+        self.assertFalse(can_copy(options(AudioChannel=['', '-ac 1']),
+                                  probe()))
+        self.assertFalse(can_copy(options(AudioBitrate=['', '-b:a 96k']),
+                                  probe()))
+
+    def test_audio(self):
+        self.assertTrue(can_copy(options(AudioCodec=['', '']), probe()))
+        self.assertFalse(can_copy(options(AudioCodec=['', ''],
+                                          OutputFormat='mkv'), probe()))
+        self.assertTrue(can_copy(options(AudioCodec=['', 'copy']),
+                                 probe(acodec='mp3')))
+        self.assertTrue(can_copy(options(AudioCodec=['', '-an'],
+                                         AudioMap=['', '']),
+                                 probe(acodec='mp3')))
+        data = probe()
+        data['streams'].append({'codec_type': 'audio', 'codec_name': 'ac3'})
+        self.assertFalse(can_copy(options(), data))
+        self.assertTrue(can_copy(options(AudioMap=['-map 0:a:0?', '']),
+                                 data))  # only the first audio stream
+
+    def test_batch(self):
+        files = ['/videos/a.mp4', '/videos/b.mkv']
+        dests = ['/out/a.mp4', '/out/b.mp4']
+        commands, copied = copy_plan(options(), [probe(), probe('mpeg4')],
+                                     '-c:v libx264 -crf 23')
+        self.assertEqual(copied, [0])
+        self.assertTrue(commands[0].startswith('-c:v copy -map 0:v?'))
+        self.assertIn('-c:a copy -map 0:a:? -movflags faststart',
+                      commands[0])
+        args = ('onepass', files, 'mp4', dests, commands, None, '', [],
+                'test.log', 2)
+        batch = one_pass_batch(APPDATA, 'test.log', [60000, 60000],
+                               ('', ''), *args)
+        self.assertIn('-c:v copy', batch.jobs[0].steps[0].cmd)
+        self.assertIn('-c:v libx264', batch.jobs[1].steps[0].cmd)
+
+        args = ('split_stitch', files, 'mp4', dests, commands,
+                ['-c:v libx264 -crf 23', '-c:a aac', ''], [True, True],
+                [], 'test.log', 2)
+        batch = split_stitch_batch(APPDATA, 'test.log', [3600000, 3600000],
+                                   ('', ''), *args)
+        self.assertEqual(batch.jobs[0].steps[0].destination, '/out/a.mp4')
+        self.assertIn('-c:v copy', batch.jobs[0].steps[0].cmd)
+        self.assertGreater(len(batch.jobs), 2)  # b.mkv is split
+
+
+if __name__ == '__main__':
+    unittest.main()
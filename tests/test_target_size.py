@@ -0,0 +1,101 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the target_size.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import math
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.target_size import (TargetSizeThread,
+                                                    with_crf,
+                                                    candidates,
+                                                    sample_starts,
+                                                    fit_model,
+                                                    predict_crf,
+                                                    MIB)
+except ImportError as error:
+    sys.exit(error)
+
+
+# writes 100 kB per second at CRF 0, halved every 6 CRF
+FAKE_FFMPEG = """#!{python}
+import sys, math
+args = sys.argv
+crf = float(args[args.index('-crf') + 1])
+length = float(args[args.index('-t') + 1])
+with open(args[-1], 'wb') as out:
+    out.truncate(int(100000 * math.exp(-crf * math.log(2) / 6) * length))
+"""
+
+
+class TestTargetSize(unittest.TestCase):
+    """Test case for the target_size functions and thread."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fake = os.path.join(self.tmp.name, 'ffmpeg')
+        with open(self.fake, 'w', encoding='utf8') as script:
+            script.write(FAKE_FFMPEG.format(python=sys.executable))
+        os.chmod(self.fake, 0o755)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_functions(self):
+        self.assertEqual(with_crf('-c:v libx264 -crf 23 -preset fast', 30),
+                         '-c:v libx264 -crf 30 -preset fast')
+        self.assertEqual(with_crf('-c:v libvpx-vp9 -b:v 0', 31),
+                         '-c:v libvpx-vp9 -b:v 0 -crf 31')
+        self.assertEqual(candidates(51), (18, 26, 34))
+        self.assertEqual(sample_starts(10000), [(0, 10000)])
+        self.assertEqual(sample_starts(60000, 5000),
+                         [(13000, 4000), (33000, 4000), (53000, 4000)])
+        points = [(crf, 1000 * math.exp(-0.1 * crf)) for crf in (20, 30)]
+        model = fit_model(points)
+        self.assertAlmostEqual(model[1], -0.1)
+        self.assertIsNone(fit_model(points[:1]))
+        self.assertIsNone(fit_model([(20, 100), (30, 200)]))
+        # 1000 * exp(-2.5) = 82.1 bytes per second at CRF 25
+        crf, size = predict_crf(model, 83 * 100 / 0.97, 100000, 51)
+        self.assertEqual(crf, 25)
+        self.assertLessEqual(size, 83 * 100)
+        self.assertEqual(predict_crf(model, 1, 100000, 51)[0], 51)
+
+    def test_thread(self):
+        src = os.path.join(self.tmp.name, 'clip.mkv')
+        with open(src, 'w', encoding='utf8') as fsrc:
+            fsrc.write('video')
+        args = ([src], [120000], '-c:v libx264 -crf 23', 'mkv', 3 * MIB,
+                51, self.fake, self.tmp.name, self.tmp.name)
+        thread = TargetSizeThread(*args)
+        thread.join()
+        results, status = thread.data
+        self.assertIsNone(status)
+        self.assertEqual(thread.total, 9)  # 3 samples at 3 CRF values
+        crf = results[0][0]
+        expected = math.ceil(6 * math.log2(100000 * 120 / (3 * MIB * 0.97)))
+        self.assertEqual(crf, expected)
+        self.assertLessEqual(results[0][1], 3 * MIB)
+
+        thread = TargetSizeThread(*args[:4], MIB, *args[5:])  # from cache
+        thread.join()
+        self.assertEqual(thread.total, 0)
+        self.assertGreater(thread.data[0][0][0], crf)
+
+        thread = TargetSizeThread([src], [120000], '-crf 23', 'mkv', MIB, 51,
+                                  os.path.join(self.tmp.name, 'missing'),
+                                  self.tmp.name, self.tmp.name)
+        thread.join()
+        self.assertIsNone(thread.data[0])
+        self.assertTrue(thread.data[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
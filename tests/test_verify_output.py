@@ -0,0 +1,108 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the verify_output.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import json
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.verify_output import OutputVerifier, compare
+    from videomass.vdms_threads.job_engine import JobEngine, Batch, Job, Step
+except ImportError as error:
+    sys.exit(error)
+
+
+FAKE_FFPROBE = """#!{python}
+import sys
+with open(sys.argv[-1], encoding='utf8') as media:
+    sys.stdout.write(media.read())
+"""
+FAKE_FFMPEG = """#!{python}
+import sys
+with open(sys.argv[-1], 'w', encoding='utf8') as out:
+    out.write(sys.argv[1])
+"""
+
+
+def probe(duration, *codecs):
+    """returns ffprobe data of a file with streams of `codecs`"""
+    kinds = {'h264': 'video', 'vp9': 'video', 'aac': 'audio',
+             'opus': 'audio', 'mjpeg': 'video'}
+    return {'format': {'duration': str(duration)},
+            'streams': [{'codec_type': kinds[x], 'codec_name': x,
+                         'disposition': {'attached_pic': int(x == 'mjpeg')}}
+                        for x in codecs]}
+
+
+class TestOutputVerifier(unittest.TestCase):
+    """Test case for the OutputVerifier class."""
+
+    def test_compare(self):
+        source = probe(60.0, 'h264', 'aac', 'aac')
+        self.assertEqual(compare('out.webm', probe(60.4, 'vp9', 'opus'),
+                                 source, 60000, '-c:v libvpx-vp9'), [])
+        self.assertEqual(len(compare('out.webm', probe(31.0, 'vp9', 'opus'),
+                                     source, 60000)), 1)  # truncated
+        self.assertEqual(compare('out.webm', probe(30.0, 'vp9', 'opus'),
+                                 source, 60000, '-filter:v setpts=0.5*PTS'),
+                         [])
+        self.assertEqual(len(compare('out.mkv', probe(60, 'h264', 'aac'),
+                                     source, 60000, '-map 0 -c copy')), 1)
+        self.assertEqual(len(compare('out.mkv', probe(60, 'vp9', 'aac'),
+                                     source, 60000, '-c:v copy')), 1)
+        self.assertEqual(len(compare('out.mkv', probe(60, 'h264', 'aac'),
+                                     source, 60000, '-vcodec copy')), 0)
+        self.assertEqual(len(compare('out.mp4', probe(60, 'vp9', 'mjpeg'),
+                                     source, 60000)), 1)  # no audio
+        self.assertEqual(compare('out.gif', probe(60, 'vp9'), source,
+                                 60000), [])
+        self.assertEqual(compare('out.mp3', probe(60, 'opus'), source,
+                                 60000, '-vn'), [])
+        self.assertEqual(len(compare('out.mp3', probe(0), source,
+                                     60000, '-vn')), 3)  # empty file
+
+    def test_engine(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            scripts = []
+            for name, text in (('ffprobe', FAKE_FFPROBE),
+                               ('ffmpeg', FAKE_FFMPEG)):
+                scripts.append(os.path.join(tmp, name))
+                with open(scripts[-1], 'w', encoding='utf8') as script:
+                    script.write(text.format(python=sys.executable))
+                os.chmod(scripts[-1], 0o755)
+            jobs, sources = [], []
+            for num, duration in enumerate((60, 20)):
+                sources.append(os.path.join(tmp, f'in{num}.mkv'))
+                with open(sources[-1], 'w', encoding='utf8') as src:
+                    json.dump(probe(60, 'h264', 'aac'), src)
+                output = json.dumps(probe(duration, 'vp9', 'opus'))
+                cmd = (f'"{scripts[1]}" \'{output}\' -i "{sources[-1]}" '
+                       f'"{tmp}/out{num}.webm"')
+                jobs.append(Job([Step(cmd, f'File {num}', sources[-1],
+                                      f'{tmp}/out{num}.webm', 60000,
+                                      progress=False)],
+                                sources=[sources[-1]], label=f'File {num}'))
+            messages = []
+            engine = JobEngine(lambda topic, **kw: messages.append((topic,
+                                                                    kw)),
+                               max_workers=2, tmpdir=tmp,
+                               verifier=OutputVerifier(scripts[0]))
+            engine.submit(Batch(jobs, os.path.join(tmp, 'test.log')))
+            engine.join()
+            self.assertEqual([job.state for job in jobs], ['done', 'failed'])
+            ends = [kw for topic, kw in messages if topic == 'END_EVT']
+            self.assertEqual(ends[0]['msg'], sources[:1])  # to the trash
+            failed = [kw['output'] for topic, kw in messages
+                      if topic == 'UPDATE_EVT' and kw['status']]
+            self.assertIn('duration 20.0 s', failed[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
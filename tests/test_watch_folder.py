@@ -0,0 +1,127 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the watch_folder.py objects.
+# Rev: 17.Oct.2026
+
+import sys
+import os.path
+import time
+import tempfile
+import unittest
+from threading import Thread
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.watch_folder import FolderWatcher, HotFolder
+    from videomass.vdms_threads.job_engine import JobEngine, Batch, Job, Step
+except ImportError as error:
+    sys.exit(error)
+
+
+def wait_ready(watcher, timeout=5.0):
+    """returns the first files ready within `timeout` seconds"""
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        files = watcher.ready()
+        if files:
+            return files
+    return []
+
+
+class TestFolderWatcher(unittest.TestCase):
+    """Test case for the FolderWatcher and HotFolder classes."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = os.path.join(self.tmp.name, 'in')
+        os.mkdir(self.folder)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text='video'):
+        """appends `text` to a file of the watched folder"""
+        with open(os.path.join(self.folder, name), 'a',
+                  encoding='utf8') as fout:
+            fout.write(text)
+        return os.path.join(self.folder, name)
+
+    def check_watcher(self, polling):
+        """new files are returned once they stopped growing"""
+        old = self.write('old.mkv')
+        watcher = FolderWatcher([self.folder], ['mkv'], settle=0.4,
+                                interval=0.1, polling=polling)
+        self.addCleanup(watcher.close)
+        self.write('.hidden.mkv')
+        self.write('clip.mkv.part')
+        self.write('notes.txt')
+        self.assertEqual(wait_ready(watcher), [old])
+        new = self.write('new.mkv')
+        start = time.monotonic()
+        for num in range(5):  # still growing
+            self.assertEqual(watcher.ready(), [])
+            self.write('new.mkv')
+        self.assertEqual(wait_ready(watcher), [new])
+        self.assertGreater(time.monotonic() - start, 0.4)
+        self.assertEqual(wait_ready(watcher, 1.0), [])  # once only
+
+    def test_polling(self):
+        self.check_watcher(polling=True)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'Linux only')
+    def test_inotify(self):
+        watcher = FolderWatcher([self.folder])
+        self.assertIsNotNone(watcher.inotify)
+        watcher.close()
+        self.check_watcher(polling=False)
+
+    def test_hot_folder(self):
+        archive = os.path.join(self.tmp.name, 'archive')
+        outdir = os.path.join(self.tmp.name, 'out')
+        os.mkdir(outdir)
+        errors = []
+
+        def make_batch(files):
+            jobs = []
+            for src in files:
+                if 'bad' in src:
+                    errors.append(src)
+                    continue
+                out = os.path.join(outdir, os.path.basename(src))
+                cmd = (f'"{sys.executable}" -c "import shutil; '
+                       f'shutil.copy(\'{src}\', \'{out}\')"')
+                jobs.append(Job([Step(cmd, 'File', src, out,
+                                      progress=False)], sources=[src]))
+            return Batch(jobs, os.path.join(self.tmp.name, 'test.log'))
+
+        self.write('clip.mkv')
+        self.write('bad.mkv')
+        self.write('other.mkv')
+        os.mkdir(archive)
+        with open(os.path.join(archive, 'clip.mkv'), 'w',
+                  encoding='utf8') as fout:
+            fout.write('archived before')
+        engine = JobEngine(lambda topic, **kwargs: None, max_workers=2,
+                           tmpdir=self.tmp.name)
+        watcher = FolderWatcher([self.folder], settle=0.2, interval=0.1)
+        hot = HotFolder(watcher, engine, make_batch, archive=archive)
+        thread = Thread(target=hot.run)
+        thread.start()
+        end = time.monotonic() + 10
+        while len(os.listdir(archive)) < 3 and time.monotonic() < end:
+            time.sleep(0.1)
+        hot.stop()
+        thread.join()
+        engine.join()
+        self.assertEqual(sorted(os.listdir(archive)),
+                         ['clip (1).mkv', 'clip.mkv', 'other.mkv'])
+        self.assertEqual(os.listdir(self.folder), ['bad.mkv'])
+        self.assertEqual(sorted(os.listdir(outdir)),
+                         ['clip.mkv', 'other.mkv'])
+        self.assertEqual(len(errors), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Jan.13.2023
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -37,6 +37,7 @@ from videomass.vdms_sys.argparser import arguments
 from videomass.vdms_sys.configurator import DataSource
 from videomass.vdms_sys import app_const as appC
 from videomass.vdms_utils.utils import del_filecontents
+from videomass.vdms_io.measurement_cache import MeasurementCache
 
 # add translation macro to builtin similar to what gettext does
 builtins.__dict__['_'] = wx.GetTranslation
@@ -205,6 +206,9 @@ class Videomass(wx.App):
                     elif os.path.isdir:
                         rmtree(fcache)
 
+        # drop the measurements of modified or removed files
+        MeasurementCache(self.appset['cachedir']).prune()
+
         if self.appset['clearlogfiles']:
             logdir = self.appset['logdir']
             if os.path.exists(logdir):
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: July.17.2023
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -30,7 +30,7 @@ from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import clockset
 from videomass.vdms_io.make_filelog import make_log_template
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.wx_adapter import generic_task
 
 
 class ColorEQ(wx.Dialog):
@@ -276,7 +276,7 @@ class ColorEQ(wx.Dialog):
         eql = '' if not equalizer else f'-vf "{equalizer}"'
         arg = (f'{sseg} -i "{self.filename}" -f image2 '
                f'-update 1 -frames:v 1 {eql} -y "{pathtosave}"')
-        thread = FFmpegGenericTask(arg, 'ColorEQ', logfile)
+        thread = generic_task(arg, 'ColorEQ', logfile)
         thread.join()  # wait end thread
         error = thread.status
         if error:
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: July.17.2023
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -29,7 +29,7 @@ import wx
 import wx.lib.statbmp
 import wx.lib.colourselect as csel
 from pubsub import pub
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.wx_adapter import generic_task
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import clockset
@@ -409,7 +409,7 @@ class Crop(wx.Dialog):
 
         arg = (f'{sseg} -i "{self.filename}" -f image2 '
                f'-update 1 -frames:v 1 -y "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Crop', logfile)
+        thread = generic_task(arg, 'Crop', logfile)
         thread.join()  # wait end thread
         error = thread.status
         if error:
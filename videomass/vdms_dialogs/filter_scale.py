@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.21.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -30,7 +30,7 @@ import webbrowser
 import wx
 from videomass.vdms_io import io_tools
 from videomass.vdms_dialogs.widget_utils import NormalTransientPopup
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.wx_adapter import generic_task
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_io.make_filelog import make_log_template
@@ -352,7 +352,7 @@ class Scale(wx.Dialog):
         scale = '' if not concat else f'-vf "{concat}"'
         arg = (f'{sseg} -i "{self.filename}" -f image2 -update 1 '
                f'-frames:v 1 {scale} -y "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Scale', logfile)
+        thread = generic_task(arg, 'Scale', logfile)
         error = thread.status
         if error:
             return error
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.18.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -32,7 +32,7 @@ from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import clockset
 from videomass.vdms_io import io_tools
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.wx_adapter import generic_task
 from videomass.vdms_dialogs.widget_utils import PopupDialog
 from videomass.vdms_io.make_filelog import make_log_template
 
@@ -531,10 +531,10 @@ class VidstabSet(wx.Dialog):
         else:
             return None
 
-        thread = FFmpegGenericTask(argstr,
-                                   procname=f'VidStab - {mode}',
-                                   logfile=self.logfile,
-                                   )
+        thread = generic_task(argstr,
+                              procname=f'VidStab - {mode}',
+                              logfile=self.logfile,
+                              )
         dlgload = PopupDialog(self, _("Videomass - Loading..."),
                               _("Please wait,\nThis process will "
                                 "take a few seconds."))
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: July.17.2023
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -27,7 +27,7 @@ This file is part of Videomass.
 import os
 from math import pi as pigreco
 import wx
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.wx_adapter import generic_task
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_io.make_filelog import make_log_template
@@ -165,7 +165,7 @@ class Transpose(wx.Dialog):
             sseg = f'-ss {stime}'
         arg = (f'{sseg} -i "{self.video}" -f image2 '
                f'-update 1 -frames:v 1 -y "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Transpose', logfile)
+        thread = generic_task(arg, 'Transpose', logfile)
         thread.join()  # wait end thread
         error = thread.status
         if error:
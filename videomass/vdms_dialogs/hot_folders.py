@@ -0,0 +1,358 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: hot_folders.py
+Porpose: hot folders setup and monitor
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import time
+from threading import Thread
+import wx
+from pubsub import pub
+from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.presets_manager_prop import json_data
+from videomass.vdms_io.watch_folder import FolderWatcher, HotFolder
+from videomass.vdms_sys.headless import (batch_maker,
+                                         supported_extensions,
+                                         Reporter)
+from videomass.vdms_sys.settings_manager import ConfigManager
+from videomass.vdms_threads.engine_core import EventSink
+from videomass.vdms_threads.job_engine import JobEngine
+from videomass.vdms_threads.sched_policy import SchedPolicy
+from videomass.vdms_threads.verify_output import OutputVerifier
+from videomass.vdms_threads.disk_space import DiskGuard
+from videomass.vdms_threads.output_staging import OutputStaging
+from videomass.vdms_threads.proc_stats import ResourceMonitor
+
+
+class DialogSink(EventSink):
+    """
+    Sends the messages of the engine to the
+    `on_event` method of the dialog.
+    """
+    def __init__(self, dialog):
+        self.dialog = dialog
+
+    def send(self, topic, **kwargs):
+        wx.CallAfter(self.dialog.on_event, topic, kwargs)
+
+
+class HotFolders(wx.Dialog):
+    """
+    Converts the files copied into one or more watched folders
+    with a profile of the Presets Manager, while this window
+    is open (see `HotFolder`). The folders, the profile and the
+    archive folder are saved to the settings, being also the
+    defaults of `videomass watch`.
+    """
+    def __init__(self, parent):
+        """
+        Attributes defined here:
+        self.hot > the running `HotFolder`, None if stopped
+        self.engine > the `JobEngine` of the hot folders
+        """
+        get = wx.GetApp()  # get data from bootstrap
+        self.appdata = get.appset
+        colorscheme = self.appdata['icontheme'][1]
+        vidicon = get.iconset['videomass']
+        self.prstdir = os.path.join(self.appdata['confdir'], 'presets')
+        self.hot = None
+        self.engine = None
+
+        wx.Dialog.__init__(self, None,
+                           style=wx.DEFAULT_DIALOG_STYLE
+                           | wx.RESIZE_BORDER
+                           | wx.DIALOG_NO_PARENT
+                           )
+        # ----------------------Layout----------------------#
+        sizer_base = wx.BoxSizer(wx.VERTICAL)
+        labfold = wx.StaticText(self, label=_('Watched folders'))
+        sizer_base.Add(labfold, 0, wx.ALL, 5)
+        boxfold = wx.BoxSizer(wx.HORIZONTAL)
+        self.lbox_folders = wx.ListBox(self, wx.ID_ANY,
+                                       choices=self.appdata['watch_folders'],
+                                       style=wx.LB_SINGLE)
+        self.lbox_folders.SetMinSize((500, 90))
+        boxfold.Add(self.lbox_folders, 1, wx.EXPAND)
+        boxbtn = wx.BoxSizer(wx.VERTICAL)
+        self.btn_add = wx.Button(self, wx.ID_ADD, "")
+        boxbtn.Add(self.btn_add, 0, wx.EXPAND)
+        self.btn_remove = wx.Button(self, wx.ID_REMOVE, "")
+        boxbtn.Add(self.btn_remove, 0, wx.TOP | wx.EXPAND, 5)
+        boxfold.Add(boxbtn, 0, wx.LEFT, 5)
+        sizer_base.Add(boxfold, 0, wx.ALL | wx.EXPAND, 5)
+
+        gridprof = wx.FlexGridSizer(3, 3, 5, 5)
+        gridprof.Add(wx.StaticText(self, label=_('Preset')), 0,
+                     wx.ALIGN_CENTER_VERTICAL)
+        presets = sorted(os.path.splitext(x)[0]
+                         for x in os.listdir(self.prstdir)
+                         if x.endswith('.json'))
+        self.cmbx_preset = wx.ComboBox(self, wx.ID_ANY, choices=presets,
+                                       style=wx.CB_DROPDOWN | wx.CB_READONLY)
+        gridprof.Add(self.cmbx_preset, 0, wx.EXPAND)
+        gridprof.Add((5, 5))
+        gridprof.Add(wx.StaticText(self, label=_('Profile')), 0,
+                     wx.ALIGN_CENTER_VERTICAL)
+        self.cmbx_profile = wx.ComboBox(self, wx.ID_ANY, choices=[],
+                                        style=wx.CB_DROPDOWN | wx.CB_READONLY)
+        gridprof.Add(self.cmbx_profile, 0, wx.EXPAND)
+        gridprof.Add((5, 5))
+        gridprof.Add(wx.StaticText(self, label=_('Archive folder')), 0,
+                     wx.ALIGN_CENTER_VERTICAL)
+        self.txtctrl_archive = wx.TextCtrl(self, wx.ID_ANY,
+                                           self.appdata['watch_archive'],
+                                           style=wx.TE_READONLY)
+        gridprof.Add(self.txtctrl_archive, 0, wx.EXPAND)
+        self.btn_archive = wx.Button(self, wx.ID_ANY, _('Browse..'))
+        gridprof.Add(self.btn_archive, 0)
+        gridprof.AddGrowableCol(1)
+        sizer_base.Add(gridprof, 0, wx.ALL | wx.EXPAND, 5)
+        tip = (_('The converted source files are moved to the archive '
+                 'folder, leave it empty to leave them in place. The '
+                 'files are saved to the output folder of the settings.'))
+        self.txtctrl_archive.SetToolTip(tip)
+
+        self.textdata = wx.TextCtrl(self, wx.ID_ANY, "",
+                                    style=wx.TE_MULTILINE
+                                    | wx.TE_READONLY
+                                    | wx.TE_RICH2,
+                                    )
+        self.textdata.SetMinSize((600, 200))
+        self.textdata.SetBackgroundColour(colorscheme['BACKGRD'])
+        self.textdata.SetDefaultStyle(wx.TextAttr(colorscheme['TXT3']))
+        sizer_base.Add(self.textdata, 1, wx.ALL | wx.EXPAND, 5)
+        # ----- confirm buttons section
+        grdBtn = wx.GridSizer(1, 2, 0, 0)
+        self.btn_start = wx.ToggleButton(self, wx.ID_ANY, _('Start'))
+        grdBtn.Add(self.btn_start, 0, wx.ALL, 5)
+        button_close = wx.Button(self, wx.ID_CLOSE, "")
+        grdBtn.Add(button_close, flag=wx.ALL | wx.ALIGN_RIGHT, border=5)
+        sizer_base.Add(grdBtn, 0, wx.ALL | wx.EXPAND, 0)
+        # set caption and min size
+        self.SetTitle(_('Hot folders'))
+        self.SetMinSize((700, 500))
+        icon = wx.Icon()
+        icon.CopyFromBitmap(wx.Bitmap(vidicon, wx.BITMAP_TYPE_ANY))
+        self.SetIcon(icon)
+        # ------ set sizer
+        self.SetSizer(sizer_base)
+        self.Fit()
+        self.Layout()
+
+        if self.appdata['watch_preset'] in presets:
+            self.cmbx_preset.SetValue(self.appdata['watch_preset'])
+            self.on_preset(self)
+            if self.appdata['watch_profile'] in self.cmbx_profile.GetItems():
+                self.cmbx_profile.SetValue(self.appdata['watch_profile'])
+
+        # ----------------------Binding (EVT)----------------------#
+        self.Bind(wx.EVT_BUTTON, self.on_add, self.btn_add)
+        self.Bind(wx.EVT_BUTTON, self.on_remove, self.btn_remove)
+        self.Bind(wx.EVT_COMBOBOX, self.on_preset, self.cmbx_preset)
+        self.Bind(wx.EVT_BUTTON, self.on_archive, self.btn_archive)
+        self.Bind(wx.EVT_TOGGLEBUTTON, self.on_start, self.btn_start)
+        self.Bind(wx.EVT_BUTTON, self.on_close, button_close)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+    # ----------------------Event handler (callback)----------------------#
+
+    def write(self, message):
+        """
+        Appends a timed message to the text control
+        """
+        self.textdata.AppendText(f'{time.strftime("%X")}  {message}\n')
+    # --------------------------------------------------------------------#
+
+    def on_event(self, topic, kwargs):
+        """
+        Displays the start, the end and the failures
+        of the jobs sent by the engine (see `DialogSink`).
+        """
+        if topic == 'COUNT_EVT':
+            if kwargs['end'] == 'Done':
+                return
+            if kwargs['destination'].startswith('Destination:'):
+                self.write(_('Converting "{0}"').format(
+                    Reporter.pathname(kwargs['fsource'])))
+        elif topic == 'UPDATE_EVT' and kwargs['status']:
+            self.write(_('Failed: {0}').format(kwargs['output'].strip()))
+        elif topic == 'END_EVT':
+            for name in kwargs['msg']:
+                self.write(_('Done "{0}"').format(name))
+    # --------------------------------------------------------------------#
+
+    def on_add(self, event):
+        """
+        Adds a folder to the watched ones
+        """
+        dlg = wx.DirDialog(self, _("Choose a folder to watch"), "",
+                           wx.DD_DEFAULT_STYLE)
+        if dlg.ShowModal() == wx.ID_OK:
+            if dlg.GetPath() not in self.lbox_folders.GetItems():
+                self.lbox_folders.Append(dlg.GetPath())
+        dlg.Destroy()
+    # --------------------------------------------------------------------#
+
+    def on_remove(self, event):
+        """
+        Removes the selected folder
+        """
+        sel = self.lbox_folders.GetSelection()
+        if sel != wx.NOT_FOUND:
+            self.lbox_folders.Delete(sel)
+    # --------------------------------------------------------------------#
+
+    def on_preset(self, event):
+        """
+        Lists the profiles of the selected preset
+        """
+        path = os.path.join(self.prstdir,
+                            f'{self.cmbx_preset.GetValue()}.json')
+        collections = json_data(path)
+        self.cmbx_profile.Clear()
+        if collections != 'error':
+            self.cmbx_profile.Append([x['Name'] for x in collections])
+    # --------------------------------------------------------------------#
+
+    def on_archive(self, event):
+        """
+        Sets the archive folder, none if cancelled
+        """
+        dlg = wx.DirDialog(self, _("Choose the archive folder"),
+                           self.txtctrl_archive.GetValue(),
+                           wx.DD_DEFAULT_STYLE)
+        path = dlg.GetPath() if dlg.ShowModal() == wx.ID_OK else ''
+        self.txtctrl_archive.SetValue(path)
+        dlg.Destroy()
+    # --------------------------------------------------------------------#
+
+    def save_settings(self):
+        """
+        Writes the hot folders setup to the settings
+        """
+        options = {'watch_folders': self.lbox_folders.GetItems(),
+                   'watch_preset': self.cmbx_preset.GetValue(),
+                   'watch_profile': self.cmbx_profile.GetValue(),
+                   'watch_archive': self.txtctrl_archive.GetValue(),
+                   }
+        confmanager = ConfigManager(self.appdata['fileconfpath'])
+        settings = confmanager.read_options()
+        settings.update(options)
+        confmanager.write_options(**settings)
+        self.appdata.update(options)
+    # --------------------------------------------------------------------#
+
+    def start(self):
+        """
+        Starts watching the folders, returns False
+        if the setup is not complete.
+        """
+        folders = self.lbox_folders.GetItems()
+        name = self.cmbx_profile.GetValue()
+        if not folders or not name:
+            wx.MessageBox(_('Add the folders to watch and select a '
+                            'profile'), 'Videomass', wx.ICON_INFORMATION,
+                          self)
+            return False
+        if os.path.abspath(self.appdata['outputdir']) in folders:
+            wx.MessageBox(_('The output folder must not be a watched '
+                            'folder'), 'Videomass', wx.ICON_WARNING, self)
+            return False
+        path = os.path.join(self.prstdir,
+                            f'{self.cmbx_preset.GetValue()}.json')
+        collections = json_data(path)
+        if collections == 'error':
+            return False
+        profile = [x for x in collections if x['Name'] == name][0]
+        self.save_settings()
+
+        appdata = self.appdata
+        logname = make_log_template('hot_folders.log', appdata['logdir'])
+        self.engine = JobEngine(DialogSink(self),
+                                max_workers=appdata['concurrent_jobs'],
+                                tmpdir=os.path.join(appdata['cachedir'],
+                                                    'tmp'),
+                                policy=SchedPolicy.from_settings(appdata),
+                                verifier=(OutputVerifier(
+                                    appdata['ffprobe_cmd'])
+                                    if appdata['verify_outputs'] else None),
+                                diskguard=DiskGuard.from_settings(appdata),
+                                staging=OutputStaging.from_settings(appdata),
+                                monitor=ResourceMonitor.from_settings(appdata))
+        watcher = FolderWatcher(folders, supported_extensions(profile))
+
+        def on_error(message):
+            wx.CallAfter(self.write, message)
+
+        self.hot = HotFolder(watcher, self.engine,
+                             batch_maker(appdata, profile,
+                                         appdata['outputdir'], logname,
+                                         on_error=on_error),
+                             archive=self.txtctrl_archive.GetValue() or None,
+                             on_error=on_error)
+        Thread(target=self.hot.run, daemon=True).start()
+        self.write(_('Watching: {0}').format(', '.join(folders)))
+        return True
+    # --------------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Stops watching and aborts the running jobs
+        """
+        if self.hot is not None:
+            self.hot.stop(abort=True)
+            self.hot = None
+            self.write(_('Stopped'))
+    # --------------------------------------------------------------------#
+
+    def on_start(self, event):
+        """
+        Starts or stops the hot folders
+        """
+        if self.btn_start.GetValue():
+            if not self.start():
+                self.btn_start.SetValue(False)
+                return
+            self.btn_start.SetLabel(_('Stop'))
+        else:
+            self.stop()
+            self.btn_start.SetLabel(_('Start'))
+        for ctrl in (self.lbox_folders, self.btn_add, self.btn_remove,
+                     self.cmbx_preset, self.cmbx_profile, self.btn_archive):
+            ctrl.Enable(not self.btn_start.GetValue())
+    # ------------------------------------------------------------------#
+
+    def on_close(self, event):
+        """
+        Stops the hot folders, if confirmed,
+        and destroys this window
+        """
+        if self.hot is not None:
+            if wx.MessageBox(_('The hot folders are running, are you '
+                               'sure you want to stop them?'), "Videomass",
+                             wx.ICON_QUESTION | wx.CANCEL | wx.YES_NO,
+                             self) != wx.YES:
+                return
+            self.stop()
+        pub.sendMessage("DESTROY_ORPHANED_WINDOWS", msg='HotFolders')
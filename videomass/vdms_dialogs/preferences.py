@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.08.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -51,6 +51,7 @@ class SetUp(wx.Dialog):
                      ("verbose (Same as `info`, except more verbose)"),
                      ("debug (Show everything, including debugging info)")
                      ]
+    IOCLASSES = ['', 'best-effort', 'idle']  # `job_ionice` values
     # -----------------------------------------------------------------
 
     def __init__(self, parent):
@@ -191,6 +192,63 @@ class SetUp(wx.Dialog):
         self.txtctrl_trash.AppendText(self.appdata['user_trashdir'])
         self.btn_trash = wx.Button(tabTwo, wx.ID_ANY, "...", size=(35, -1))
         sizetrash.Add(self.btn_trash, 0, wx.RIGHT | wx.ALIGN_CENTER, 5)
+        descr = _("Skip the files already converted with the same\n"
+                  "settings, if their sources have not changed")
+        self.ckbx_incremental = wx.CheckBox(tabTwo, wx.ID_ANY, (descr))
+        sizerFiles.Add(self.ckbx_incremental, 0, wx.ALL, 5)
+        self.ckbx_incremental.SetToolTip(
+            _('Running a batch again over the same files converts only '
+              'the new or changed ones. Each output folder keeps a '
+              'record of its converted files.'))
+        descr = _("Verify the output files with FFprobe before\n"
+                  "considering them successful")
+        self.ckbx_verify = wx.CheckBox(tabTwo, wx.ID_ANY, (descr))
+        sizerFiles.Add(self.ckbx_verify, 0, wx.ALL, 5)
+        self.ckbx_verify.SetToolTip(
+            _('The duration and the streams of each output file are '
+              'compared with its source, e.g. to detect the files '
+              'truncated by a full disk. The source files are moved '
+              'to the trash only if the check succeeds.'))
+        boxreserve = wx.BoxSizer(wx.HORIZONTAL)
+        sizerFiles.Add(boxreserve, 0, wx.EXPAND)
+        msg = _("Free space to keep on the destination in MiB "
+                "(0 to disable):")
+        labreserve = wx.StaticText(tabTwo, wx.ID_ANY, msg)
+        boxreserve.Add(labreserve, 0, wx.LEFT | wx.ALIGN_CENTER, 5)
+        self.spinctrl_reserve = wx.SpinCtrl(tabTwo, wx.ID_ANY,
+                                            f"{self.appdata['disk_reserve']}",
+                                            size=(-1, -1), min=0,
+                                            max=1048576,
+                                            style=wx.TE_PROCESS_ENTER
+                                            )
+        boxreserve.Add(self.spinctrl_reserve, 0, wx.ALL | wx.ALIGN_CENTER, 5)
+        self.spinctrl_reserve.SetToolTip(
+            _('Each file is processed only if its estimated size fits in '
+              'the free space of the destination, leaving this space '
+              'free. Otherwise it waits until some space is freed, '
+              'instead of failing as all the next ones.'))
+        descr = _("Write the output files to temporary names, renamed\n"
+                  "only when the processing succeeds")
+        self.ckbx_staged = wx.CheckBox(tabTwo, wx.ID_ANY, (descr))
+        sizerFiles.Add(self.ckbx_staged, 0, wx.ALL, 5)
+        self.ckbx_staged.SetToolTip(
+            _('A stopped or failed processing never leaves a truncated '
+              'file with the final name, e.g. for the programs which '
+              'watch the output folder. The temporary files are hidden '
+              'and removed on errors.'))
+        sizescratch = wx.BoxSizer(wx.HORIZONTAL)
+        sizerFiles.Add(sizescratch, 0, wx.EXPAND)
+        self.txtctrl_scratch = wx.TextCtrl(tabTwo, wx.ID_ANY,
+                                           self.appdata['scratch_dir'],
+                                           style=wx.TE_READONLY
+                                           )
+        sizescratch.Add(self.txtctrl_scratch, 1, wx.ALL, 5)
+        self.txtctrl_scratch.SetToolTip(
+            _('Optional folder where the temporary files are written, '
+              'e.g. on a fast local disk, then copied to the output '
+              'folder. Leave empty to write them to the output folder.'))
+        self.btn_scratch = wx.Button(tabTwo, wx.ID_ANY, "...", size=(35, -1))
+        sizescratch.Add(self.btn_scratch, 0, wx.RIGHT | wx.ALIGN_CENTER, 5)
         sizerFiles.Add((0, 15))
         line0 = wx.StaticLine(tabTwo, wx.ID_ANY, pos=wx.DefaultPosition,
                               size=wx.DefaultSize, style=wx.LI_HORIZONTAL,
@@ -275,6 +333,133 @@ class SetUp(wx.Dialog):
                                             style=wx.TE_PROCESS_ENTER
                                             )
         gridSizopt.Add(self.spinctrl_threads, 1, wx.ALL | wx.ALIGN_CENTER, 5)
+        gridSizjobs = wx.BoxSizer(wx.HORIZONTAL)
+        sizerFFmpeg.Add(gridSizjobs, 0, wx.EXPAND)
+        msg = _("Files processed simultaneously (from 1 to 32):")
+        labFFjobs = wx.StaticText(tabThree, wx.ID_ANY, (msg))
+        gridSizjobs.Add(labFFjobs, 0, wx.LEFT | wx.ALIGN_CENTER, 5)
+        self.spinctrl_jobs = wx.SpinCtrl(tabThree, wx.ID_ANY,
+                                         f"{self.appdata['concurrent_jobs']}",
+                                         size=(-1, -1), min=1, max=32,
+                                         style=wx.TE_PROCESS_ENTER
+                                         )
+        gridSizjobs.Add(self.spinctrl_jobs, 1, wx.ALL | wx.ALIGN_CENTER, 5)
+        gridSizsplit = wx.BoxSizer(wx.HORIZONTAL)
+        sizerFFmpeg.Add(gridSizsplit, 0, wx.EXPAND)
+        msg = _("Split long videos into segments encoded "
+                "simultaneously (0 to disable):")
+        labFFsplit = wx.StaticText(tabThree, wx.ID_ANY, (msg))
+        gridSizsplit.Add(labFFsplit, 0, wx.LEFT | wx.ALIGN_CENTER, 5)
+        self.spinctrl_split = wx.SpinCtrl(tabThree, wx.ID_ANY,
+                                          f"{self.appdata['split_segments']}",
+                                          size=(-1, -1), min=0, max=64,
+                                          style=wx.TE_PROCESS_ENTER
+                                          )
+        gridSizsplit.Add(self.spinctrl_split, 1, wx.ALL | wx.ALIGN_CENTER, 5)
+        tip = (_('One pass video conversions only: long files are split '
+                 'at keyframes, the segments are encoded by the files '
+                 'processed simultaneously and then joined together.'))
+        self.spinctrl_split.SetToolTip(tip)
+        descr = _("Copy the streams of the files which already match\n"
+                  "the video conversion settings, instead of encoding them")
+        self.ckbx_streamcopy = wx.CheckBox(tabThree, wx.ID_ANY, (descr))
+        sizerFFmpeg.Add(self.ckbx_streamcopy, 0, wx.ALL, 5)
+        self.ckbx_streamcopy.SetToolTip(
+            _('One pass video conversions only: the files which already '
+              'have the selected codec, profile, pixel format and '
+              'bitrate limits are remuxed at disk speed, if no filter '
+              'is enabled.'))
+        msg = _("Worker daemons of other hosts (host:port*jobs, ...):")
+        labremote = wx.StaticText(tabThree, wx.ID_ANY, msg)
+        sizerFFmpeg.Add(labremote, 0, wx.LEFT | wx.TOP, 5)
+        self.txtctrl_remote = wx.TextCtrl(tabThree, wx.ID_ANY,
+                                          self.appdata['remote_workers'])
+        sizerFFmpeg.Add(self.txtctrl_remote, 0, wx.EXPAND | wx.ALL, 5)
+        tip = (_('The batch jobs are also executed by the "videomass '
+                 'worker" daemons of the given hosts, e.g. '
+                 '"node1:8765*4, node2:8765" where *4 is the number of '
+                 'jobs executed at the same time by the node. Leave '
+                 'empty to use this computer only.'))
+        self.txtctrl_remote.SetToolTip(tip)
+        msg = _("Shared folders as seen by the workers (local=remote; ...):")
+        labpathmap = wx.StaticText(tabThree, wx.ID_ANY, msg)
+        sizerFFmpeg.Add(labpathmap, 0, wx.LEFT | wx.TOP, 5)
+        self.txtctrl_pathmap = wx.TextCtrl(tabThree, wx.ID_ANY,
+                                           self.appdata['remote_pathmap'])
+        sizerFFmpeg.Add(self.txtctrl_pathmap, 0, wx.EXPAND | wx.ALL, 5)
+        tip = (_('The source and destination files must be on folders '
+                 'shared with the worker nodes, e.g. '
+                 '"/home/user/Videos=/mnt/videos".'))
+        self.txtctrl_pathmap.SetToolTip(tip)
+        gridSizsched = wx.BoxSizer(wx.HORIZONTAL)
+        sizerFFmpeg.Add(gridSizsched, 0, wx.EXPAND)
+        msg = _("Priority of the processes, niceness (from 0 to 19):")
+        labFFnice = wx.StaticText(tabThree, wx.ID_ANY, (msg))
+        gridSizsched.Add(labFFnice, 0, wx.LEFT | wx.ALIGN_CENTER, 5)
+        self.spinctrl_nice = wx.SpinCtrl(tabThree, wx.ID_ANY,
+                                         f"{self.appdata['job_nice']}",
+                                         size=(-1, -1), min=0, max=19,
+                                         style=wx.TE_PROCESS_ENTER
+                                         )
+        gridSizsched.Add(self.spinctrl_nice, 0, wx.ALL | wx.ALIGN_CENTER, 5)
+        labFFionice = wx.StaticText(tabThree, wx.ID_ANY, _("I/O:"))
+        gridSizsched.Add(labFFionice, 0, wx.LEFT | wx.ALIGN_CENTER, 5)
+        self.cmbx_ionice = wx.ComboBox(tabThree, wx.ID_ANY,
+                                       choices=[_('Default'),
+                                                _('Best effort'),
+                                                _('Idle'),
+                                                ],
+                                       size=(-1, -1),
+                                       style=wx.CB_DROPDOWN | wx.CB_READONLY
+                                       )
+        self.cmbx_ionice.SetSelection(SetUp.IOCLASSES.index(
+            self.appdata['job_ionice']
+            if self.appdata['job_ionice'] in SetUp.IOCLASSES else ''))
+        gridSizsched.Add(self.cmbx_ionice, 0, wx.ALL | wx.ALIGN_CENTER, 5)
+        tip = (_('Lower the priority of the FFmpeg processes of the '
+                 'jobs, to leave the CPUs and the disks to the other '
+                 'services of this computer. The I/O class is '
+                 'supported on Linux only.'))
+        self.spinctrl_nice.SetToolTip(tip)
+        self.cmbx_ionice.SetToolTip(tip)
+        msg = _("Groups of CPUs of the files processed simultaneously "
+                "(e.g. 0-3; 4-7):")
+        labaffinity = wx.StaticText(tabThree, wx.ID_ANY, msg)
+        sizerFFmpeg.Add(labaffinity, 0, wx.LEFT | wx.TOP, 5)
+        self.txtctrl_affinity = wx.TextCtrl(tabThree, wx.ID_ANY,
+                                            self.appdata['job_affinity'])
+        sizerFFmpeg.Add(self.txtctrl_affinity, 0, wx.EXPAND | wx.ALL, 5)
+        tip = (_('Linux only: each job is pinned to the less used group '
+                 'of CPUs, so that the files processed simultaneously '
+                 'run on separate cores. Leave empty to use all the '
+                 'CPUs.'))
+        self.txtctrl_affinity.SetToolTip(tip)
+        gridSizmem = wx.BoxSizer(wx.HORIZONTAL)
+        sizerFFmpeg.Add(gridSizmem, 0, wx.EXPAND)
+        msg = _("Memory limit of the processes in MiB (0 to disable):")
+        labFFmem = wx.StaticText(tabThree, wx.ID_ANY, (msg))
+        gridSizmem.Add(labFFmem, 0, wx.LEFT | wx.ALIGN_CENTER, 5)
+        self.spinctrl_memlimit = wx.SpinCtrl(tabThree, wx.ID_ANY,
+                                             f"{self.appdata['job_memlimit']}",
+                                             size=(-1, -1), min=0,
+                                             max=1048576,
+                                             style=wx.TE_PROCESS_ENTER
+                                             )
+        gridSizmem.Add(self.spinctrl_memlimit, 1, wx.ALL | wx.ALIGN_CENTER, 5)
+        tip = (_('Not available on MS Windows. The limit applies to the '
+                 'address space of each FFmpeg process, which is larger '
+                 'than the memory actually used, the processes which '
+                 'exceed it fail.'))
+        self.spinctrl_memlimit.SetToolTip(tip)
+        descr = _("Show and log the CPU, memory and I/O usage "
+                  "of the processes")
+        self.ckbx_telemetry = wx.CheckBox(tabThree, wx.ID_ANY, (descr))
+        sizerFFmpeg.Add(self.ckbx_telemetry, 0, wx.ALL, 5)
+        self.ckbx_telemetry.SetToolTip(
+            _('Linux only: the usage of each FFmpeg process is sampled '
+              'every two seconds, shown in the progress of the jobs, '
+              'written to their log and summed up in a table at the '
+              'end of the batch.'))
         # ----
         tabThree.SetSizer(sizerFFmpeg)
         notebook.AddPage(tabThree, _("FFmpeg"))
@@ -476,10 +661,26 @@ class SetUp(wx.Dialog):
         self.Bind(wx.EVT_RADIOBOX, self.logging_ffplay, self.rdbFFplay)
         self.Bind(wx.EVT_RADIOBOX, self.logging_ffmpeg, self.rdbFFmpeg)
         self.Bind(wx.EVT_SPINCTRL, self.on_threads, self.spinctrl_threads)
+        self.Bind(wx.EVT_SPINCTRL, self.on_jobs, self.spinctrl_jobs)
+        self.Bind(wx.EVT_SPINCTRL, self.on_split, self.spinctrl_split)
+        self.Bind(wx.EVT_CHECKBOX, self.on_streamcopy, self.ckbx_streamcopy)
+        self.Bind(wx.EVT_TEXT, self.on_remote, self.txtctrl_remote)
+        self.Bind(wx.EVT_TEXT, self.on_pathmap, self.txtctrl_pathmap)
+        self.Bind(wx.EVT_SPINCTRL, self.on_nice, self.spinctrl_nice)
+        self.Bind(wx.EVT_COMBOBOX, self.on_ionice, self.cmbx_ionice)
+        self.Bind(wx.EVT_TEXT, self.on_affinity, self.txtctrl_affinity)
+        self.Bind(wx.EVT_SPINCTRL, self.on_memlimit, self.spinctrl_memlimit)
+        self.Bind(wx.EVT_CHECKBOX, self.on_telemetry, self.ckbx_telemetry)
         self.Bind(wx.EVT_BUTTON, self.on_outputdir, self.btn_fsave)
         self.Bind(wx.EVT_CHECKBOX, self.set_Samedest, self.ckbx_dir)
         self.Bind(wx.EVT_TEXT, self.set_Suffix, self.text_suffix)
         self.Bind(wx.EVT_CHECKBOX, self.on_file_to_trash, self.ckbx_trash)
+        self.Bind(wx.EVT_CHECKBOX, self.on_incremental,
+                  self.ckbx_incremental)
+        self.Bind(wx.EVT_CHECKBOX, self.on_verify, self.ckbx_verify)
+        self.Bind(wx.EVT_SPINCTRL, self.on_reserve, self.spinctrl_reserve)
+        self.Bind(wx.EVT_CHECKBOX, self.on_staged, self.ckbx_staged)
+        self.Bind(wx.EVT_BUTTON, self.on_scratch, self.btn_scratch)
         self.Bind(wx.EVT_BUTTON, self.on_browse_trash, self.btn_trash)
         self.Bind(wx.EVT_CHECKBOX, self.exeFFmpeg, self.checkbox_exeFFmpeg)
         self.Bind(wx.EVT_BUTTON, self.open_path_ffmpeg, self.btn_ffmpeg)
@@ -523,6 +724,13 @@ class SetUp(wx.Dialog):
         self.checkbox_exit.SetValue(self.appdata['warnexiting'])
         self.checkbox_logclr.SetValue(self.appdata['clearlogfiles'])
         self.ckbx_trash.SetValue(self.settings['move_file_to_trash'])
+        self.ckbx_incremental.SetValue(self.appdata['incremental'])
+        self.ckbx_verify.SetValue(self.appdata['verify_outputs'])
+        self.ckbx_staged.SetValue(self.appdata['staged_outputs'])
+        self.ckbx_streamcopy.SetValue(self.appdata['auto_stream_copy'])
+        self.ckbx_telemetry.SetValue(self.appdata['job_telemetry'])
+        self.txtctrl_scratch.Enable(self.appdata['staged_outputs'])
+        self.btn_scratch.Enable(self.appdata['staged_outputs'])
         self.ckbx_playlist.SetValue(self.appdata['playlistsubfolder'])
         self.checkbox_ytdlp.SetValue(self.settings['use-downloader'])
 
@@ -617,6 +825,58 @@ class SetUp(wx.Dialog):
         self.settings['ffthreads'] = f'-threads {sett}'
     # ---------------------------------------------------------------------#
 
+    def on_jobs(self, event):
+        """set how many files are processed at the same time"""
+        self.settings['concurrent_jobs'] = self.spinctrl_jobs.GetValue()
+    # ---------------------------------------------------------------------#
+
+    def on_split(self, event):
+        """set in how many segments the long videos are split"""
+        split = self.spinctrl_split.GetValue()
+        self.settings['split_segments'] = 0 if split == 1 else split
+    # ---------------------------------------------------------------------#
+
+    def on_streamcopy(self, event):
+        """enable/disable the stream copy of the matching files"""
+        self.settings['auto_stream_copy'] = self.ckbx_streamcopy.IsChecked()
+    # ---------------------------------------------------------------------#
+
+    def on_remote(self, event):
+        """set the worker daemons of other hosts"""
+        self.settings['remote_workers'] = self.txtctrl_remote.GetValue()
+    # ---------------------------------------------------------------------#
+
+    def on_pathmap(self, event):
+        """set the shared folders as seen by the worker daemons"""
+        self.settings['remote_pathmap'] = self.txtctrl_pathmap.GetValue()
+    # ---------------------------------------------------------------------#
+
+    def on_nice(self, event):
+        """set the niceness of the ffmpeg processes"""
+        self.settings['job_nice'] = self.spinctrl_nice.GetValue()
+    # ---------------------------------------------------------------------#
+
+    def on_ionice(self, event):
+        """set the I/O scheduling class of the ffmpeg processes"""
+        sel = self.cmbx_ionice.GetSelection()
+        self.settings['job_ionice'] = SetUp.IOCLASSES[sel]
+    # ---------------------------------------------------------------------#
+
+    def on_affinity(self, event):
+        """set the groups of CPUs of the concurrent jobs"""
+        self.settings['job_affinity'] = self.txtctrl_affinity.GetValue()
+    # ---------------------------------------------------------------------#
+
+    def on_memlimit(self, event):
+        """set the memory limit of the ffmpeg processes"""
+        self.settings['job_memlimit'] = self.spinctrl_memlimit.GetValue()
+    # ---------------------------------------------------------------------#
+
+    def on_telemetry(self, event):
+        """enable/disable the resource usage of the processes"""
+        self.settings['job_telemetry'] = self.ckbx_telemetry.IsChecked()
+    # ---------------------------------------------------------------------#
+
     def on_outputdir(self, event):
         """set up a custom user path for file exporting"""
 
@@ -675,6 +935,50 @@ class SetUp(wx.Dialog):
             self.settings['filesuffix'] = ""
     # --------------------------------------------------------------------#
 
+    def on_incremental(self, event):
+        """
+        enable/disable skipping the files already converted
+        """
+        self.settings['incremental'] = self.ckbx_incremental.IsChecked()
+    # --------------------------------------------------------------------#
+
+    def on_verify(self, event):
+        """
+        enable/disable the verification of the output files
+        """
+        self.settings['verify_outputs'] = self.ckbx_verify.IsChecked()
+    # --------------------------------------------------------------------#
+
+    def on_reserve(self, event):
+        """
+        set the free space to keep on the destination
+        """
+        self.settings['disk_reserve'] = self.spinctrl_reserve.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_staged(self, event):
+        """
+        enable/disable the temporary names of the output files
+        """
+        self.settings['staged_outputs'] = self.ckbx_staged.IsChecked()
+        self.txtctrl_scratch.Enable(self.ckbx_staged.IsChecked())
+        self.btn_scratch.Enable(self.ckbx_staged.IsChecked())
+    # --------------------------------------------------------------------#
+
+    def on_scratch(self, event):
+        """
+        Browse to set the folder of the temporary
+        output files, none if cancelled.
+        """
+        dlg = wx.DirDialog(self, _("Choose a scratch folder"),
+                           self.txtctrl_scratch.GetValue(),
+                           wx.DD_DEFAULT_STYLE)
+        path = dlg.GetPath() if dlg.ShowModal() == wx.ID_OK else ''
+        self.txtctrl_scratch.SetValue(path)
+        self.settings['scratch_dir'] = path
+        dlg.Destroy()
+    # --------------------------------------------------------------------#
+
     def on_file_to_trash(self, event):
         """
         enable/disable "Move file to trash" after successful encoding
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: July.17.2023
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -36,8 +36,10 @@ class ShowLogs(wx.Dialog):
     """
     # list of logs files to include
     LOGNAMES = ('volumedected.log',
+                'target_size.log',
                 'AV_conversions.log',
                 'presets_manager.log',
+                'hot_folders.log',
                 'ffplay.log',
                 'concatenate_demuxer.log',
                 'from_movie_to_pictures.log',
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Nov.27.2021
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -83,8 +83,12 @@ class PopupDialog(wx.Dialog):
                                   )
             loadDlg.ShowModal()
             loadDlg.Destroy()
+
+    The message can be updated by the thread using pubsub
+    "POPUP_MSG_EVT" protocol. If a `stopcall` callable is
+    given, a Stop button is added which calls it.
     """
-    def __init__(self, parent, title, msg):
+    def __init__(self, parent, title, msg, stopcall=None):
         # Create a dialog
         wx.Dialog.__init__(self, parent, -1, title, size=(350, 150),
                            style=wx.CAPTION)
@@ -98,9 +102,15 @@ class PopupDialog(wx.Dialog):
             ai.Start()
             box2.Add(ai, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL | wx.ALL, 10)
         # Add the message
-        message = wx.StaticText(self, -1, msg, style=wx.ALIGN_CENTRE_VERTICAL)
-        box2.Add(message, 0, wx.EXPAND | wx.ALL, 10)
+        self.message = wx.StaticText(self, -1, msg,
+                                     style=wx.ALIGN_CENTRE_VERTICAL)
+        box2.Add(self.message, 0, wx.EXPAND | wx.ALL, 10)
         box.Add(box2, 0, wx.EXPAND)
+        self.stopcall = stopcall
+        if stopcall:
+            self.btn_stop = wx.Button(self, wx.ID_STOP, "")
+            box.Add(self.btn_stop, 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+            self.Bind(wx.EVT_BUTTON, self.on_stop, self.btn_stop)
         # Add an Info graphic
         bitmap = wx.Bitmap(48, 48)
         bitmap = wx.ArtProvider.GetBitmap(wx.ART_INFORMATION,
@@ -115,6 +125,24 @@ class PopupDialog(wx.Dialog):
         self.Layout()
 
         pub.subscribe(self.getMessage, "RESULT_EVT")
+        pub.subscribe(self.update_message, "POPUP_MSG_EVT")
+    # ----------------------------------------------------------#
+
+    def update_message(self, msg):
+        """
+        Riceive a new message to display from thread.
+        """
+        self.message.SetLabel(msg)
+        self.Fit()
+        self.Layout()
+    # ----------------------------------------------------------#
+
+    def on_stop(self, event):
+        """
+        Calls the `stopcall` callable to stop the process
+        """
+        self.btn_stop.Disable()
+        self.stopcall()
     # ----------------------------------------------------------#
 
     def getMessage(self, status):
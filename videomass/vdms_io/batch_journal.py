@@ -0,0 +1,306 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: batch_journal.py
+Porpose: write-ahead journal of the batch processing
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import glob
+import json
+import signal
+import time
+from threading import Lock
+from videomass.vdms_threads.output_staging import OutputStaging
+
+
+def is_leftover(pid, program):
+    """
+    Returns True if `pid` is still running as the leader of its
+    process group and its executable is `program`, as far as the
+    platform can tell, so that a reused pid is not mistaken for
+    a process left by the interrupted batch.
+    """
+    if not hasattr(os, 'killpg'):
+        return False  # MS Windows, the processes are not detached
+    try:
+        if os.getpgid(pid) != pid:
+            return False
+    except OSError:
+        return False
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as fcmd:
+            argv0 = fcmd.read().split(b'\0')[0]
+    except OSError:
+        return True  # without /proc
+    return os.path.basename(os.fsdecode(argv0)) == program
+
+
+class BatchJournal:
+    """
+    Write-ahead journal of a batch of jobs, stored as a JSON
+    lines file in the journal directory. The first record
+    describes the batch: the parameters needed to rebuild it
+    (`params`, which must be JSON serializable), and for each
+    job its label, commands, sources, output pathnames and the
+    temporary names of the outputs (see `OutputStaging`). Each
+    change of state of a job is appended as a new record and
+    synced to disk before the job goes on, as the pid of the
+    processes it starts in their own session.
+
+    The journal is removed when the batch ends, therefore any
+    journal found on the next start belongs to a batch that was
+    interrupted unexpectedly (crash, power failure) and can be
+    resumed.
+
+    Usage:
+        >>> journal = BatchJournal.create(journaldir, batch, params,
+        ...                               staging)
+        >>> journal.update(index, 'running')
+        >>> journal.close()
+        >>> for journal in BatchJournal.unfinished(journaldir):
+        ...     journal.kill_leftover_processes()
+        ...     journal.remove_partial_outputs()
+        ...     journal.restore(rebuilt_batch)
+    """
+    SUFFIX = '.journal'
+
+    def __init__(self, filename, params=None, jobs=None):
+        """
+        Use the `create` and `load` class methods to
+        get an instance.
+        """
+        self.filename = filename
+        self.params = params
+        self.jobs = jobs or []  # [{label, commands, ..., state}]
+        self.lock = Lock()
+
+    @classmethod
+    def create(cls, journaldir, batch, params, staging=None):
+        """
+        Writes the first record of the `batch` journal and
+        returns the new instance. `staging` is the `OutputStaging`
+        of the engine which executes the batch, if any.
+        """
+        os.makedirs(journaldir, exist_ok=True)
+        filename = os.path.join(journaldir, f'batch-{time.time_ns()}-'
+                                f'{os.getpid()}{BatchJournal.SUFFIX}')
+        jobs = []
+        for job in batch.jobs:
+            commands = [step.cmd if isinstance(step.cmd, (str, list))
+                        else None for step in job.steps]
+            outputs = [step.destination for step in job.steps
+                       if step.destination]
+            parts = []
+            for out in outputs if staging is not None else ():
+                for name in (staging.partname(out),  # scratch or local
+                             staging.partname(out, local=False)):
+                    if name not in parts:
+                        parts.append(name)
+            jobs.append({'label': job.label,
+                         'commands': commands,
+                         'sources': job.sources,
+                         'outputs': outputs,
+                         'parts': parts,
+                         'state': job.state,
+                         })
+        journal = cls(filename, params, jobs)
+        journal.append({'record': 'batch', 'params': params, 'jobs': jobs})
+        return journal
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Reads an existing journal file. A truncated last record
+        (the application died while writing it) is ignored.
+        Returns None if the file is unreadable.
+        """
+        journal = None
+        try:
+            with open(filename, 'r', encoding='utf-8') as fjournal:
+                for line in fjournal:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if record.get('record') == 'batch':
+                        journal = cls(filename, record['params'],
+                                      record['jobs'])
+                    elif record.get('record') == 'job' and journal:
+                        index = record['index']
+                        if 0 <= index < len(journal.jobs):
+                            journal.jobs[index]['state'] = record['state']
+                    elif record.get('record') == 'process' and journal:
+                        index = record['index']
+                        if 0 <= index < len(journal.jobs):
+                            journal.jobs[index]['process'] = [
+                                record['pid'], record['program']]
+        except (OSError, KeyError, TypeError):
+            return None
+        return journal
+
+    @classmethod
+    def unfinished(cls, journaldir):
+        """
+        Returns the list of journals left by interrupted
+        batches, oldest first. Unreadable journals are removed.
+        """
+        journals = []
+        for name in sorted(glob.glob(os.path.join(journaldir,
+                                                  f'*{cls.SUFFIX}'))):
+            journal = cls.load(name)
+            if journal is None or not journal.unfinished_jobs():
+                os.remove(name)
+                continue
+            journals.append(journal)
+        return journals
+
+    def append(self, record):
+        """
+        Appends a record to the journal file, making
+        sure it is written to disk.
+        """
+        with self.lock:
+            with open(self.filename, 'a', encoding='utf-8') as fjournal:
+                fjournal.write(json.dumps(record) + '\n')
+                fjournal.flush()
+                os.fsync(fjournal.fileno())
+
+    def update(self, index, state):
+        """
+        Records the new `state` of the job at `index`
+        """
+        self.jobs[index]['state'] = state
+        self.append({'record': 'job', 'index': index, 'state': state})
+
+    def started(self, index, pid, program):
+        """
+        Records the `pid` of the process started by the job at
+        `index`, whose executable is `program` (basename). The
+        process runs in its own session (see `JobEngine.suspend`)
+        thus it survives an unexpected end of Videomass.
+        """
+        self.jobs[index]['process'] = [pid, program]
+        self.append({'record': 'process', 'index': index, 'pid': pid,
+                     'program': program})
+
+    def leftover_processes(self):
+        """
+        Returns the pids of the processes started by the jobs
+        which were running when the batch was interrupted and
+        which are still running, writing the partial outputs.
+        """
+        return [job['process'][0] for job in self.jobs
+                if job['state'] == 'running' and job.get('process')
+                and is_leftover(*job['process'])]
+
+    def kill_leftover_processes(self, timeout=5):
+        """
+        Kills the process groups of the `leftover_processes`,
+        waiting up to `timeout` seconds for them to end, before
+        their outputs are removed or written again.
+        Returns the list of the killed pids.
+        """
+        killed = []
+        for pid in self.leftover_processes():
+            try:
+                os.killpg(pid, signal.SIGKILL)  # even if stopped
+            except OSError:
+                continue
+            killed.append(pid)
+        end = time.monotonic() + timeout
+        programs = {job['process'][0]: job['process'][1]
+                    for job in self.jobs if job.get('process')}
+        while (any(is_leftover(pid, programs[pid]) for pid in killed)
+               and time.monotonic() < end):
+            time.sleep(0.1)
+        return killed
+
+    def unfinished_jobs(self):
+        """
+        Returns the indexes of the jobs not successfully completed
+        """
+        return [index for index, job in enumerate(self.jobs)
+                if job['state'] != 'done']
+
+    def partial_outputs(self, temporary=False):
+        """
+        Returns the output files of the jobs which were running
+        when the batch was interrupted (half-written files), the
+        temporary ones only (see `OutputStaging`) if `temporary`,
+        since the final outputs of the staged jobs are complete.
+        """
+        partials = []
+        for job in self.jobs:
+            if job['state'] != 'running':
+                continue
+            names = [] if temporary else list(job['outputs'])
+            if job.get('parts'):
+                names.extend(job['parts'])
+            else:  # without staging, or journal of a previous version
+                names.extend(OutputStaging().partname(out)
+                             for out in job['outputs'])
+            partials.extend(x for x in names if os.path.isfile(x))
+        return partials
+
+    def remove_partial_outputs(self, temporary=False):
+        """
+        Removes the half-written output files, the temporary
+        ones only if `temporary`. Returns the list of removed
+        files.
+        """
+        removed = []
+        for out in self.partial_outputs(temporary):
+            try:
+                os.remove(out)
+            except OSError:
+                continue
+            removed.append(out)
+        return removed
+
+    def restore(self, batch):
+        """
+        Sets the state of the already completed jobs of a `batch`
+        rebuilt with the same parameters, so that only unfinished
+        jobs are executed. A completed job is executed again if an
+        unfinished job requires it (e.g. a measurement pass).
+        """
+        if len(batch.jobs) != len(self.jobs):  # can't match the jobs
+            return
+        done = [job for job, rec in zip(batch.jobs, self.jobs)
+                if rec['state'] == 'done']
+        required = [job for job in batch.jobs if job not in done]
+        while required:
+            for job in required.pop().required():
+                if job in done:
+                    done.remove(job)
+                required.append(job)
+        for job in done:
+            job.state = 'done'
+
+    def close(self):
+        """
+        Removes the journal file at the end of the batch
+        """
+        with self.lock:
+            if os.path.exists(self.filename):
+                os.remove(self.filename)
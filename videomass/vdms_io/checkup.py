@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: April.17.2023
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -35,6 +35,10 @@ def check_inout(file_sources, file_dest):
     return tuple([file_sources], [file_dest]).
     return None otherwise.
 
+    With the incremental setting, the existing files which
+    are up to date are skipped by the batch instead of being
+    overwritten (see `OutputManifest`).
+
     """
     # --------------- CHECK FOR OVERWRITING:
     files_ow = []  # already exist file LIST
@@ -44,7 +48,11 @@ def check_inout(file_sources, file_dest):
             files_ow.append(f'"{files}"')
 
     if files_ow:
-        msg = _('Files already exist, do you want to overwrite them?')
+        if wx.GetApp().appset['incremental']:
+            msg = _('Files already exist: those up to date will be '
+                    'skipped, do you want to overwrite the others?')
+        else:
+            msg = _('Files already exist, do you want to overwrite them?')
         with ListWarning(None,
                          dict.fromkeys(files_ow, _('Already exist')),
                          caption=_('Please Confirm'),
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.17.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -29,6 +29,8 @@ import wx
 from videomass.vdms_threads.ffplay_file import FilePlay
 from videomass.vdms_threads import generic_downloads
 from videomass.vdms_threads.volumedetect import VolumeDetectThread
+from videomass.vdms_threads.target_size import TargetSizeThread
+from videomass.vdms_threads.wx_adapter import WxSink
 from videomass.vdms_threads.check_bin import (ff_conf,
                                               ff_formats,
                                               ff_codecs,
@@ -110,11 +112,15 @@ def volume_detect_process(filelist, timeseq, audiomap, parent=None):
                                 filelist,
                                 audiomap,
                                 get.appset['logdir'],
-                                get.appset['ffmpeg_cmd']
+                                get.appset['ffmpeg_cmd'],
+                                get.appset['cachedir'],
+                                notify=WxSink(),
                                 )
     dlgload = PopupDialog(parent,
                           _("Videomass - Loading..."),
-                          _("Wait....\nAudio peak analysis."))
+                          _("Wait....\nAudio peak analysis."),
+                          stopcall=thread.stop,
+                          )
     dlgload.ShowModal()
     # thread.join()
     data = thread.data
@@ -124,6 +130,39 @@ def volume_detect_process(filelist, timeseq, audiomap, parent=None):
 # -------------------------------------------------------------------------#
 
 
+def target_size_process(filelist, durations, command, extension, budget,
+                        crfmax, offset=0, parent=None):
+    """
+    Run thread to choose the CRF values at which the files
+    fit in the `budget` size in bytes and show a pop-up
+    dialog with message (see `TargetSizeThread`).
+    """
+    get = wx.GetApp()
+    thread = TargetSizeThread(filelist,
+                              durations,
+                              command,
+                              extension,
+                              budget,
+                              crfmax,
+                              get.appset['ffmpeg_cmd'],
+                              get.appset['logdir'],
+                              get.appset['cachedir'],
+                              offset=offset,
+                              notify=WxSink(),
+                              )
+    dlgload = PopupDialog(parent,
+                          _("Videomass - Loading..."),
+                          _("Wait....\nSample encodes."),
+                          stopcall=thread.stop,
+                          )
+    dlgload.ShowModal()
+    data = thread.data
+    dlgload.Destroy()
+
+    return data
+# -------------------------------------------------------------------------#
+
+
 def test_conf():
     """
     Call `check_bin.ffmpeg_conf` to get data to test the building
@@ -0,0 +1,137 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: log_sink.py
+Porpose: buffered asynchronous writing of the log files
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import atexit
+import queue
+from threading import Thread, Event, Lock
+
+
+class LogSink(Thread):
+    """
+    A thread which writes the messages to the log files, keeping
+    a single buffered file object for each log file. The buffers
+    are flushed every `interval` seconds, on request (e.g. at the
+    end of each job) and when the program exits, so that the
+    callers (worker threads, GUI) never wait for the disk I/O.
+
+        >>> sink = log_sink()
+        >>> sink.write('/path/to/file.log', 'message\\n')
+        >>> sink.flush('/path/to/file.log', close=True)
+    """
+    def __init__(self, interval=1.0):
+        Thread.__init__(self, daemon=True)
+        self.interval = interval
+        self.requests = queue.SimpleQueue()
+        self.files = {}  # {logname: file object}
+        self.dirty = set()  # lognames with data not yet flushed
+
+    def write(self, logname, text):
+        """
+        Queues `text` to append to the `logname` file
+        """
+        self.requests.put((logname, text, None))
+
+    def flush(self, logname=None, close=False, wait=False):
+        """
+        Queues a flush of the `logname` file, or of all files
+        if None. With `close` the file object is also closed,
+        e.g. when the log is no longer used. With `wait` this
+        method returns when the queued messages are written.
+        """
+        done = Event()
+        self.requests.put((logname, None, (close, done)))
+        if wait:
+            done.wait()
+
+    def run(self):
+        """
+        Thread loop
+        """
+        while True:
+            try:
+                logname, text, flush = self.requests.get(
+                    timeout=self.interval)
+            except queue.Empty:
+                self.flush_files(list(self.dirty))
+                continue
+            if flush is None:
+                self.append(logname, text)
+                continue
+            close, done = flush
+            names = list(self.files) if logname is None else [logname]
+            self.flush_files(names, close)
+            done.set()
+
+    def append(self, logname, text):
+        """
+        Appends `text` to the buffer of the `logname` file
+        """
+        try:
+            if logname not in self.files:
+                self.files[logname] = open(logname, "a", encoding='utf8')
+            self.files[logname].write(text)
+            self.dirty.add(logname)
+        except OSError as err:  # e.g. the log directory was removed
+            print(f'Videomass: log error: {err}')
+
+    def flush_files(self, names, close=False):
+        """
+        Flushes the buffers of the `names` files and
+        closes them if `close` is True
+        """
+        for name in names:
+            self.dirty.discard(name)
+            if close:
+                fobj = self.files.pop(name, None)
+            else:
+                fobj = self.files.get(name)
+            if fobj is None:
+                continue
+            try:
+                if close:
+                    fobj.close()
+                else:
+                    fobj.flush()
+            except OSError as err:
+                print(f'Videomass: log error: {err}')
+
+
+SINK = None  # the running LogSink
+SINK_LOCK = Lock()
+
+
+def log_sink():
+    """
+    Returns the shared `LogSink` thread, started on first
+    use. All its buffers are written when the program exits.
+    """
+    global SINK
+    with SINK_LOCK:
+        if SINK is None:
+            SINK = LogSink()
+            SINK.start()
+            atexit.register(SINK.flush, close=True, wait=True)
+    return SINK
@@ -2,11 +2,11 @@
 """
 File Name: make_filelog.py
 Porpose: log file generator
-Compatibility: Python3, Python2
+Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.20.2022
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -27,20 +27,21 @@ This file is part of Videomass.
 
 import time
 import os
+from videomass.vdms_io.log_sink import log_sink
 
 
 def logwrite(cmd, stderr, logfile):
     """
     This function writes status messages
     to a given `logfile` during a process.
+    The writing is asynchronous, see `LogSink`.
     """
     if stderr:
         apnd = f"...{stderr}\n\n"
     else:
         apnd = f"{cmd}\n\n"
 
-    with open(logfile, "a", encoding='utf8') as log:
-        log.write(apnd)
+    log_sink().write(logfile, apnd)
 
 
 def make_log_template(logname, logdir, mode="a"):
@@ -56,6 +57,7 @@ def make_log_template(logname, logdir, mode="a"):
     """
     current_date = time.strftime("%c")  # date/time
     logfile = os.path.join(logdir, logname)
+    log_sink().flush(logfile, close=True, wait=True)  # pending messages
 
     with open(logfile, mode, encoding='utf8') as log:
         log.write(f"""
@@ -0,0 +1,236 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: measurement_cache.py
+Porpose: persistent cache of the audio measurements
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import time
+import copy
+import hashlib
+import tempfile
+from threading import Lock
+
+
+def file_fingerprint(filename):
+    """
+    Returns the identity of `filename` as a list of
+    [absolute pathname, size in bytes, modification time in ns],
+    None if the file does not exist.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [os.path.abspath(filename), stat.st_size, stat.st_mtime_ns]
+
+
+class MeasurementCache:
+    """
+    On-disk cache of the results of the analysis passes
+    (e.g. loudnorm and volumedetect measurements), stored
+    as JSON file in the cache directory of the application.
+
+    Each result is keyed by the `kind` of measurement, the
+    fingerprint of the source file (path, size and mtime) and
+    any other parameter that affects the result such as the
+    audio map and the time segment (-ss/-t).
+
+    A result is invalidated as soon as the source file changes
+    (the fingerprint no longer matches); the entries of files
+    that have been modified or removed are dropped by `prune`.
+    When the number of entries exceeds `maxentries`, the least
+    recently used are evicted. The entries are kept in memory
+    until the cache file is changed by another instance, and
+    the last use of the entries read by `get` is written along
+    with the next change only, so that the lookups of parallel
+    workers do not wait for each other's disk writes.
+
+    Usage:
+        >>> cache = MeasurementCache('/path/to/cachedir')
+        >>> cache.get('file.mkv', 'volumedetect', '-map 0:a:0', ('', ''))
+        >>> cache.set('file.mkv', 'volumedetect', ['-1.0 dB', '-20.5 dB'],
+                      '-map 0:a:0', ('', ''))
+    """
+    FILENAME = 'measurements.json'
+    MAXENTRIES = 2000
+
+    def __init__(self, cachedir, maxentries=MAXENTRIES):
+        """
+        `cachedir` is the directory in which the cache file
+        is stored, it is created if it does not exist.
+        """
+        self.filename = os.path.join(cachedir, MeasurementCache.FILENAME)
+        self.maxentries = maxentries
+        self.lock = Lock()
+        self.data = {}  # the entries of the cache file, when `stamp`
+        self.stamp = None  # fingerprint of the cache file read
+        self.atimes = {}  # {key: last use} not yet written
+        os.makedirs(cachedir, exist_ok=True)
+
+    def _read(self):
+        """
+        Returns the cached entries, an empty dict if the
+        cache file does not exist or is corrupted. The file
+        is read again only if it has been changed.
+        """
+        stamp = file_fingerprint(self.filename)
+        if stamp is not None and stamp == self.stamp:
+            return self.data
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as fcache:
+                data = json.load(fcache)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        self.data = data if isinstance(data, dict) else {}
+        self.stamp = stamp
+        for key, atime in self.atimes.items():  # not lost on reloads
+            if key in self.data:
+                self.data[key]['atime'] = max(self.data[key]['atime'], atime)
+        return self.data
+
+    def _write(self, data):
+        """
+        Writes the entries atomically to the cache file,
+        with the last use of the entries read since the
+        previous write. The cache is a best effort: the
+        write is dropped on errors (e.g. full disk).
+        """
+        try:
+            fdesc, tmp = tempfile.mkstemp(
+                suffix='.tmp', dir=os.path.dirname(self.filename))
+        except OSError:
+            return
+        try:
+            with open(fdesc, 'w', encoding='utf-8') as fcache:
+                json.dump(data, fcache, indent=1)
+            os.replace(tmp, self.filename)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self.data = data
+        self.stamp = file_fingerprint(self.filename)
+        self.atimes.clear()
+
+    @staticmethod
+    def make_key(fingerprint, kind, params):
+        """
+        Returns the key string of the given fingerprint,
+        kind of measurement and list of parameters.
+        """
+        raw = json.dumps([kind, fingerprint, params])
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, filename, kind, *params):
+        """
+        Returns the cached result of `kind` for `filename`
+        and the given parameters, None otherwise.
+        """
+        fingerprint = file_fingerprint(filename)
+        if fingerprint is None:
+            return None
+        key = MeasurementCache.make_key(fingerprint, kind, list(params))
+        with self.lock:
+            entry = self._read().get(key)
+            if entry is None:
+                return None
+            entry['atime'] = self.atimes[key] = time.time()
+            return copy.deepcopy(entry['value'])
+
+    def set(self, filename, kind, value, *params):
+        """
+        Stores the `value` result of `kind` for `filename` and
+        the given parameters. Any result of the same file with a
+        different fingerprint is invalidated.
+        """
+        fingerprint = file_fingerprint(filename)
+        if fingerprint is None:
+            return
+        key = MeasurementCache.make_key(fingerprint, kind, list(params))
+        with self.lock:
+            data = self._read()
+            for oldkey in [k for k, v in data.items()
+                           if v['fingerprint'][0] == fingerprint[0]
+                           and v['fingerprint'] != fingerprint]:
+                del data[oldkey]
+            data[key] = {'fingerprint': fingerprint,
+                         'kind': kind,
+                         'value': value,
+                         'atime': time.time(),
+                         }
+            self._evict(data)
+            self._write(data)
+
+    def _evict(self, data):
+        """
+        Removes the least recently used entries exceeding
+        `maxentries`.
+        """
+        exceeding = len(data) - self.maxentries
+        if exceeding > 0:
+            lru = sorted(data, key=lambda k: data[k]['atime'])
+            for key in lru[:exceeding]:
+                del data[key]
+
+    def prune(self):
+        """
+        Removes the entries of the files that no longer exist
+        or have been modified. Returns the number of removed
+        entries.
+        """
+        with self.lock:
+            data = self._read()
+            stale = [k for k, v in data.items()
+                     if file_fingerprint(v['fingerprint'][0])
+                     != v['fingerprint']]
+            for key in stale:
+                del data[key]
+            if stale:
+                self._write(data)
+        return len(stale)
+
+    def invalidate(self, filename):
+        """
+        Removes all the entries of `filename`.
+        """
+        path = os.path.abspath(filename)
+        with self.lock:
+            data = self._read()
+            keys = [k for k, v in data.items()
+                    if v['fingerprint'][0] == path]
+            for key in keys:
+                del data[key]
+            if keys:
+                self._write(data)
+
+    def clear(self):
+        """
+        Removes the cache file.
+        """
+        with self.lock:
+            if os.path.exists(self.filename):
+                os.remove(self.filename)
+            self.data, self.stamp = {}, None
+            self.atimes.clear()
@@ -0,0 +1,247 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: output_manifest.py
+Porpose: skips the jobs whose output files are up to date
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import hashlib
+import builtins
+from threading import Lock
+from videomass.vdms_threads.engine_core import EngineSettings
+from videomass.vdms_io.measurement_cache import file_fingerprint
+
+# translation macro (see gui_app), untranslated strings otherwise
+_ = builtins.__dict__.get('_', lambda msg: msg)
+
+
+def recipe(obj, depth=0):
+    """
+    Returns a string which describes how `obj` makes a command
+    line: the value of the plain data, the name and the captured
+    variables of the functions, e.g. of the steps whose command
+    is resolved when the job runs (see `Step`). The settings are
+    described by the values which are part of the command lines
+    (see `EngineSettings.COMMAND_KEYS`), other objects (caches)
+    by their type only.
+    """
+    if depth > 5:
+        return '...'
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return repr(obj)
+    if isinstance(obj, (list, tuple)):
+        return f"[{','.join(recipe(x, depth + 1) for x in obj)}]"
+    if isinstance(obj, EngineSettings):
+        return recipe([[key, obj.get(key)]
+                       for key in EngineSettings.COMMAND_KEYS], depth)
+    if callable(obj) and hasattr(obj, '__code__'):
+        cells = []
+        for cell in obj.__closure__ or ():
+            try:
+                cells.append(cell.cell_contents)
+            except ValueError:  # not yet assigned
+                continue
+        return f'{obj.__qualname__}({recipe(cells, depth + 1)})'
+    return type(obj).__name__
+
+
+def closure(jobs):
+    """
+    Returns the `jobs` along with the jobs they
+    require, directly or not.
+    """
+    found = []
+    pending = list(jobs)
+    while pending:
+        job = pending.pop()
+        if job not in found:
+            found.append(job)
+            pending.extend(job.required())
+    return found
+
+
+class OutputManifest:
+    """
+    Records how each output file was made: a hash of the
+    commands of its jobs and of the fingerprint (pathname, size
+    and modification time, see `file_fingerprint`) of its sources,
+    along with the fingerprint of the output itself. The records
+    are kept in a JSON lines file in the folder of the outputs
+    (`NAME`), the last record of an output being the valid one.
+
+    An output is up to date if it is newer than its sources and
+    both the hash and its fingerprint match the record, so that
+    a batch can be run again over the same files to process only
+    the new or the changed ones, like `make` does (see `apply`).
+
+        >>> manifest = OutputManifest()
+        >>> skipped = manifest.apply(batch)
+    """
+    NAME = '.videomass-manifest.jsonl'
+
+    def __init__(self):
+        self.folders = {}  # {folder: {output name: record}}
+        self.lock = Lock()
+
+    def records(self, folder):
+        """
+        Returns the records of the outputs of `folder`,
+        which are read once. The file is compacted if
+        it is mostly made of obsolete records.
+        """
+        if folder in self.folders:
+            return self.folders[folder]
+        records, lines = {}, 0
+        filename = os.path.join(folder, OutputManifest.NAME)
+        try:
+            with open(filename, 'r', encoding='utf-8') as fman:
+                for line in fman:
+                    try:
+                        record = json.loads(line)
+                        records[record['output']] = record
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    lines += 1
+        except OSError:
+            pass
+        self.folders[folder] = records
+        if lines > 2 * len(records) + 100:
+            try:
+                with open(f'{filename}.tmp', 'w', encoding='utf-8') as fman:
+                    fman.writelines(f'{json.dumps(x)}\n'
+                                    for x in records.values())
+                os.replace(f'{filename}.tmp', filename)
+            except OSError:
+                pass
+        return records
+
+    @staticmethod
+    def output(job):
+        """
+        Returns the output file of a job which delivers
+        processed files, None for other jobs.
+        """
+        if not job.sources or not job.steps:
+            return None
+        dest = job.steps[-1].destination
+        if not dest or os.path.isdir(dest):
+            return None
+        return os.path.abspath(dest)
+
+    @staticmethod
+    def key(job):
+        """
+        Returns the hash of the commands of the `job` and its
+        required jobs and of the fingerprint of its sources,
+        None if a source file is missing.
+        """
+        sources = [file_fingerprint(src) for src in job.sources]
+        if None in sources:
+            return None
+        digest = hashlib.sha256(json.dumps(sources).encode('utf8'))
+        for item in closure([job]):
+            for step in item.steps:
+                digest.update(recipe(step.cmd).encode('utf8'))
+        return digest.hexdigest()
+
+    def up_to_date(self, output, key, sources):
+        """
+        Returns True if the `output` file was made by the
+        same commands (`key`) from the same `sources`.
+        """
+        record = self.records(os.path.dirname(output)).get(
+            os.path.basename(output))
+        current = file_fingerprint(output)
+        if not record or not current or record.get('key') != key:
+            return False
+        newest = max((file_fingerprint(src)[2] for src in sources), default=0)
+        return record.get('fingerprint') == current and current[2] >= newest
+
+    def record(self, output, key):
+        """
+        Appends the record of a new `output` file made
+        by the commands of `key`.
+        """
+        folder, name = os.path.split(output)
+        record = {'output': name, 'key': key,
+                  'fingerprint': file_fingerprint(output)}
+        with self.lock:
+            self.records(folder)[name] = record
+            try:
+                with open(os.path.join(folder, OutputManifest.NAME), 'a',
+                          encoding='utf-8') as fman:
+                    fman.write(f'{json.dumps(record)}\n')
+            except OSError:
+                pass
+
+    def recorder(self, output, key, on_end):
+        """
+        Returns the `on_end` callable of a job which records
+        its `output` when the job is done, then calls the
+        previous `on_end`, if any.
+        """
+        def end(job):
+            if job.state == 'done':
+                self.record(output, key)
+            if on_end:
+                on_end(job)
+        return end
+
+    def apply(self, batch, skipmsg=None):
+        """
+        Sets the jobs of `batch` whose outputs are up to date to
+        be skipped, displaying `skipmsg`, and removes the jobs
+        required by them only (e.g. the first passes). The other
+        jobs record their outputs when they are done. Must be
+        called before the batch is submitted. Returns the list
+        of the skipped output files.
+        """
+        skipmsg = skipmsg or _('Already up to date, skipped.')
+        targets = {}  # {job: (output, key)}
+        for job in batch.jobs:
+            output = self.output(job)
+            key = self.key(job) if output else None
+            if key and job.state == 'queued':  # not done on resume
+                targets[job] = (output, key)
+        fresh = [job for job, (output, key) in targets.items()
+                 if self.up_to_date(output, key, job.sources)]
+        inputs = closure(fresh)  # fresh jobs and the jobs they require
+        needed = closure([job for job in batch.jobs if job not in inputs])
+        for job in fresh[:]:
+            if any(x.workdir is job for x in needed):
+                fresh.remove(job)  # its working directory is used
+                needed = closure(needed + [job])
+
+        for job, (output, key) in targets.items():
+            if job not in fresh:
+                job.on_end = self.recorder(output, key, job.on_end)
+        for job in fresh:
+            step = job.steps[-1]
+            step.cmd, step.skipmsg, step.duration = None, skipmsg, 0
+            step.destination = targets[job][0]
+            job.steps = [step]
+            job.requires, job.workdir = None, False
+        batch.jobs = [job for job in batch.jobs
+                      if job in needed or job in fresh]
+        return [targets[job][0] for job in fresh]
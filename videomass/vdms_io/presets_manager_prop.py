@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Gen.22.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -26,8 +26,8 @@ This file is part of Videomass.
 """
 
 import os
+import sys
 import json
-import wx
 
 
 def supported_formats(supp, file_sources):
@@ -46,6 +46,7 @@ def supported_formats(supp, file_sources):
             for xex in exclude:
                 file_sources.remove(xex)
             if not file_sources:
+                import wx  # not needed by the headless mode
                 wx.MessageBox(_("The selected profile is not suitable to "
                                 "convert the following file formats:"
                                 "\n\n%s\n\n") % ('\n'.join(exclude)),
@@ -58,7 +59,21 @@ def supported_formats(supp, file_sources):
 # ----------------------------------------------------------------------#
 
 
-def json_data(arg):
+def error_message(message, headless=False):
+    """
+    Shows an error `message` with a message box,
+    or prints it on stderr in `headless` mode
+    (e.g. `videomass batch`, which doesn't use wx).
+    """
+    if headless:
+        sys.stderr.write(f'Videomass: {message}\n')
+        return
+    import wx
+    wx.MessageBox(message, ("Videomass"), wx.ICON_ERROR | wx.OK, None)
+# ----------------------------------------------------------------------#
+
+
+def json_data(arg, headless=False):
     """
     Used by presets_mng_panel.py to get JSON data files.
     The `arg` parameter refer to each file name to parse. Return a list
@@ -73,6 +88,8 @@ def json_data(arg):
       "Output_extension": ""
     }]
 
+    With `headless` the errors are printed on stderr
+    instead of being shown by message box.
     """
     try:
         with open(arg, 'r', encoding='utf8') as fln:
@@ -84,8 +101,7 @@ def json_data(arg):
                 'You can try to restore it or import a correct one, '
                 'otherwise it is recommended to remove it.'
                 )
-        wx.MessageBox(f'\nERROR: {err}\n\nFILE: "{arg}"\n\n{msg}',
-                      ("Videomass"), wx.ICON_ERROR | wx.OK, None)
+        error_message(f'\nERROR: {err}\n\nFILE: "{arg}"\n\n{msg}', headless)
 
         return 'error'
 
@@ -94,8 +110,7 @@ def json_data(arg):
                 'Presets Manager panel, go to the presets column and try '
                 'to click the "Restore all..." button'
                 )
-        wx.MessageBox(f'\nERROR: {err}\n\n{msg}',
-                      ("Videomass"), wx.ICON_ERROR | wx.OK, None)
+        error_message(f'\nERROR: {err}\n\n{msg}', headless)
 
         return 'error'
 
@@ -0,0 +1,135 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: scrollback.py
+Porpose: bounded output view with scrollback on disk
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import collections
+from videomass.vdms_io.log_sink import log_sink
+
+
+class ScrollBack:
+    """
+    Keeps track of the text blocks shown by a bounded output
+    view (e.g. the process log of `LogOut`), which displays the
+    last `maxlines` lines only. Each block is a (color, text)
+    tuple, where color is any JSON serializable value (e.g. a
+    color scheme key). The blocks removed from the top of the
+    view are saved to `filename` (JSON lines) and can be loaded
+    back on demand by segments, see `earlier`.
+
+        >>> view = ScrollBack('/tmp/view.jsonl', maxlines=1000)
+        >>> remove = view.append('INFO', 'some text\\n')
+
+    `remove` is the number of characters to remove from the
+    beginning of the view before appending the text.
+    """
+    def __init__(self, filename, maxlines=5000):
+        self.filename = filename
+        self.maxlines = maxlines
+        self.blocks = collections.deque()  # [(color, text), ...] shown
+        self.lines = 0  # number of lines shown
+        self.extra = 0  # lines loaded from file since the last trim
+        self.first = 0  # index of the first block shown
+        self.offsets = [0]  # file offset of each saved block + end
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+    def clear(self):
+        """
+        Clears the view and removes the saved blocks
+        """
+        log_sink().flush(self.filename, close=True, wait=True)
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+        self.blocks.clear()
+        self.lines = self.extra = self.first = 0
+        self.offsets = [0]
+
+    def close(self):
+        """
+        Removes the saved blocks, to call when
+        the view is no longer used.
+        """
+        self.clear()
+
+    def append(self, color, text):
+        """
+        Adds a block to the end of the view. Returns the number
+        of characters removed from the beginning of the view,
+        0 if nothing was removed. The lines loaded from file
+        remain visible for a while (half `maxlines` at least),
+        before being removed again.
+        """
+        self.blocks.append((color, text))
+        self.lines += text.count('\n')
+        if self.lines <= self.maxlines + self.extra + self.maxlines // 2:
+            return 0
+        remove = 0
+        while self.lines > self.maxlines and len(self.blocks) > 1:
+            block = self.blocks.popleft()
+            if self.first == len(self.offsets) - 1:  # not yet saved
+                self.save(block)
+            self.first += 1
+            self.lines -= block[1].count('\n')
+            remove += len(block[1])
+        self.extra = 0
+        return remove
+
+    def save(self, block):
+        """
+        Appends a removed block to the file
+        """
+        record = f'{json.dumps(block)}\n'
+        log_sink().write(self.filename, record)
+        size = len(record.encode('utf8')) - 1 + len(os.linesep)
+        self.offsets.append(self.offsets[-1] + size)
+
+    def earlier(self, maxlines=None):
+        """
+        Loads from file the blocks which precede the first
+        one shown, up to `maxlines` lines (default `maxlines`
+        of the view). Returns the list of loaded blocks, to
+        insert at the beginning of the view, in order.
+        """
+        if not self.first:
+            return []
+        maxlines = maxlines or self.maxlines
+        start = self.offsets[max(0, self.first - maxlines)]
+        log_sink().flush(self.filename, wait=True)
+        with open(self.filename, 'rb') as fspool:
+            fspool.seek(start)
+            data = fspool.read(self.offsets[self.first] - start)
+        records = [tuple(json.loads(line)) for line in data.splitlines()]
+        blocks, lines = [], 0
+        for block in reversed(records):
+            if blocks and lines + block[1].count('\n') > maxlines:
+                break
+            blocks.insert(0, block)
+            lines += block[1].count('\n')
+        self.first -= len(blocks)
+        self.blocks.extendleft(reversed(blocks))
+        self.lines += lines
+        self.extra += lines
+        return blocks
@@ -0,0 +1,321 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: watch_folder.py
+Porpose: converts the files dropped into hot folders
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import time
+import errno
+import shutil
+import struct
+import select
+import ctypes
+import platform
+import builtins
+from threading import Event
+from videomass.vdms_io.measurement_cache import file_fingerprint
+
+# translation macro (see gui_app), untranslated strings otherwise
+_ = builtins.__dict__.get('_', lambda msg: msg)
+
+IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x8, 0x80, 0x100
+EVENT = struct.Struct('iIII')  # struct inotify_event, without the name
+TEMPORARY = ('.part', '.tmp', '.crdownload', '.partial', '~')
+
+
+class Inotify:
+    """
+    Minimal interface to the inotify API of Linux by ctypes,
+    which reports the files created, moved into or written
+    in the watched folders. Raises OSError if not available.
+    """
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self):
+        if platform.system() != 'Linux':
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.add_watch = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.watches = {}  # {watch descriptor: folder}
+
+    def watch(self, folder):
+        """
+        Adds a `folder` to the watched ones
+        """
+        wdesc = self.add_watch(self.fd, os.fsencode(folder), self.MASK)
+        if wdesc < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), folder)
+        self.watches[wdesc] = folder
+
+    def read(self, timeout):
+        """
+        Returns the pathnames of the files reported,
+        waiting up to `timeout` seconds for them.
+        """
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        names, pos = [], 0
+        while pos + EVENT.size <= len(data):
+            wdesc, mask, cookie, length = EVENT.unpack_from(data, pos)
+            pos += EVENT.size
+            name = data[pos:pos + length].rstrip(b'\0')
+            pos += length
+            if wdesc in self.watches and name:
+                names.append(os.path.join(self.watches[wdesc],
+                                          os.fsdecode(name)))
+        return names
+
+    def close(self):
+        """
+        Releases the inotify instance
+        """
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """
+    Watches one or more folders (not their subfolders) for new
+    or changed files, which are returned by `ready` once they
+    have stopped growing for `settle` seconds, i.e. once they
+    are completely copied. The folders are watched by inotify
+    on Linux, with a scan every `rescan` seconds for the changes
+    not reported (e.g. on network shares), and scanned every
+    `interval` seconds otherwise or if `polling` is True. The
+    hidden files, the temporary files of the downloads and the
+    files whose extension is not one of `extensions` (if given)
+    are ignored. The existing files are returned too.
+
+        >>> watcher = FolderWatcher(['/srv/ingest'], ['mov', 'mxf'])
+        >>> while True:
+        ...     files = watcher.ready()
+    """
+    def __init__(self, folders, extensions=None, settle=5.0, interval=2.0,
+                 polling=False, rescan=30.0):
+        self.folders = [os.path.abspath(x) for x in folders]
+        self.extensions = {x.lower().lstrip('.') for x in extensions or ()}
+        self.settle = settle
+        self.interval = interval
+        self.rescan = rescan
+        self.pending = {}  # {pathname: [fingerprint, unchanged since]}
+        self.seen = {}  # {pathname: fingerprint} files already returned
+        self.lastscan = None
+        self.inotify = None
+        if not polling:
+            try:
+                self.inotify = Inotify()
+                for folder in self.folders:
+                    self.inotify.watch(folder)
+            except (OSError, AttributeError):  # AttributeError: no libc
+                if self.inotify is not None:
+                    self.inotify.close()
+                self.inotify = None
+
+    def accepts(self, pathname):
+        """
+        Returns True if the file `pathname` is to be watched
+        """
+        name = os.path.basename(pathname)
+        if name.startswith('.') or name.lower().endswith(TEMPORARY):
+            return False
+        ext = os.path.splitext(name)[1][1:].lower()
+        return not self.extensions or ext in self.extensions
+
+    def notice(self, pathname, now):
+        """
+        Adds a new or changed file to the pending ones
+        """
+        if not os.path.isfile(pathname):  # e.g. a new folder
+            return
+        current = file_fingerprint(pathname)
+        if current is None or self.seen.get(pathname) == current:
+            return
+        if pathname not in self.pending:
+            self.pending[pathname] = [current, now]
+
+    def scan(self, now):
+        """
+        Lists the files of the folders, forgetting
+        the ones which have been removed.
+        """
+        found = set()
+        for folder in self.folders:
+            try:
+                with os.scandir(folder) as entries:
+                    found.update(entry.path for entry in entries
+                                 if entry.is_file()
+                                 and self.accepts(entry.path))
+            except OSError:  # not mounted yet, try again later
+                continue
+        self.seen = {key: val for key, val in self.seen.items()
+                     if key in found}
+        for pathname in found:
+            self.notice(pathname, now)
+        self.lastscan = now
+
+    def ready(self):
+        """
+        Waits for the changes up to `interval` seconds, then
+        returns the sorted pathnames of the files which have
+        stopped growing, if any.
+        """
+        now = time.monotonic()
+        if self.inotify is None:
+            if self.lastscan is not None:
+                time.sleep(self.interval)
+                now = time.monotonic()
+            self.scan(now)
+        else:
+            if self.lastscan is None or now - self.lastscan >= self.rescan:
+                self.scan(now)
+            for pathname in self.inotify.read(self.interval):
+                if self.accepts(pathname):
+                    self.notice(pathname, time.monotonic())
+            now = time.monotonic()
+
+        files = []
+        for pathname, (previous, since) in list(self.pending.items()):
+            current = file_fingerprint(pathname)
+            if current is None:
+                del self.pending[pathname]
+            elif current != previous:  # still growing
+                self.pending[pathname] = [current, now]
+            elif now - since >= self.settle:
+                del self.pending[pathname]
+                self.seen[pathname] = current
+                files.append(pathname)
+        return sorted(files)
+
+    def close(self):
+        """
+        Stops watching the folders
+        """
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+
+class HotFolder:
+    """
+    Converts the files appearing in the folders of a `watcher`
+    (see `FolderWatcher`) by the batches returned by the
+    `make_batch` callable, called with the list of the new files,
+    which are submitted to the `engine` (see `JobEngine`), so
+    that they are converted by the workers of the engine at the
+    same time. The sources of the successful jobs are moved to
+    the `archive` folder, if given. `make_batch` may return None
+    or raise OSError, `on_error` is then called with the message.
+
+        >>> hot = HotFolder(watcher, engine, make_batch, '/srv/done')
+        >>> Thread(target=hot.run).start()
+        >>> hot.stop()
+    """
+    def __init__(self, watcher, engine, make_batch, archive=None,
+                 on_error=None):
+        self.watcher = watcher
+        self.engine = engine
+        self.make_batch = make_batch
+        self.archive = archive
+        self.on_error = on_error or (lambda msg: None)
+        self.stopped = Event()
+
+    def archiver(self, on_end):
+        """
+        Returns the `on_end` callable of a job which moves its
+        sources to the archive folder when the job is done, then
+        calls the previous `on_end`, if any.
+        """
+        def end(job):
+            if job.state == 'done':
+                for src in job.sources:
+                    try:
+                        self.move(src)
+                    except OSError as err:
+                        self.on_error(_('Cannot archive "{0}": {1}'
+                                        ).format(src, err))
+            if on_end:
+                on_end(job)
+        return end
+
+    def move(self, pathname):
+        """
+        Moves a file to the archive folder, with a
+        numbered name if the name is already used.
+        Returns the new pathname.
+        """
+        os.makedirs(self.archive, exist_ok=True)
+        base, ext = os.path.splitext(os.path.basename(pathname))
+        dest = os.path.join(self.archive, f'{base}{ext}')
+        num = 1
+        while os.path.exists(dest):
+            dest = os.path.join(self.archive, f'{base} ({num}){ext}')
+            num += 1
+        return shutil.move(pathname, dest)
+
+    def queue(self, files):
+        """
+        Submits the batch which converts the new `files`
+        """
+        try:
+            batch = self.make_batch(files)
+        except OSError as err:
+            self.on_error(str(err))
+            return
+        if batch is None or not batch.jobs:
+            return
+        if self.archive:
+            for job in batch.jobs:
+                if job.sources:
+                    job.on_end = self.archiver(job.on_end)
+        self.engine.submit(batch)
+
+    def run(self):
+        """
+        Watches the folders until `stop`
+        """
+        try:
+            while not self.stopped.is_set():
+                files = self.watcher.ready()
+                if files and not self.stopped.is_set():
+                    self.queue(files)
+        finally:
+            self.watcher.close()
+
+    def stop(self, abort=False):
+        """
+        Stops watching the folders, within `interval` seconds
+        of the watcher. With `abort` the pending jobs are
+        aborted too, the queued ones are completed otherwise.
+        """
+        self.stopped.set()
+        if abort:
+            self.engine.stop()
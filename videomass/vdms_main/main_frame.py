@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.17.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -41,6 +41,7 @@ from videomass.vdms_dialogs.ffmpeg_formats import FFmpegFormats
 from videomass.vdms_ytdlp.main_ytdlp import MainYtdl
 from videomass.vdms_dialogs.mediainfo import MediaStreams
 from videomass.vdms_dialogs.showlogs import ShowLogs
+from videomass.vdms_dialogs.hot_folders import HotFolders
 from videomass.vdms_dialogs.ffmpeg_help import FFmpegHelp
 from videomass.vdms_miniframes import timeline
 from videomass.vdms_panels import choose_topic
@@ -52,6 +53,7 @@ from videomass.vdms_panels import sequence_to_video
 from videomass.vdms_panels.long_processing_task import LogOut
 from videomass.vdms_panels import presets_manager
 from videomass.vdms_io import io_tools
+from videomass.vdms_io.batch_journal import BatchJournal
 from videomass.vdms_sys.msg_info import current_release
 from videomass.vdms_sys.settings_manager import ConfigManager
 from videomass.vdms_sys.argparser import info_this_platform
@@ -103,6 +105,7 @@ class MainFrame(wx.Frame):
         self.emptylist = self.appdata['move_file_to_trash']
         self.mediastreams = False
         self.showlogs = False
+        self.hotfolders = False
         self.helptopic = False
         self.whileplay = False
         self.ffmpegconf = False
@@ -202,6 +205,8 @@ class MainFrame(wx.Frame):
         pub.subscribe(self.check_modeless_window, "DESTROY_ORPHANED_WINDOWS")
         pub.subscribe(self.process_terminated, "PROCESS TERMINATED")
 
+        wx.CallAfter(self.check_unfinished_batches)
+
     # -------------------Status bar settings--------------------#
 
     def statusbar_msg(self, msg, bcolor, fcolor=None):
@@ -263,6 +268,9 @@ class MainFrame(wx.Frame):
         elif msg == 'ShowLogs':
             self.showlogs.Destroy()
             self.showlogs = False
+        elif msg == 'HotFolders':
+            self.hotfolders.Destroy()
+            self.hotfolders = False
         elif msg == 'HelpTopic':
             self.helptopic.Destroy()
             self.helptopic = False
@@ -310,6 +318,10 @@ class MainFrame(wx.Frame):
         if self.showlogs:
             self.showlogs.Destroy()
             self.showlogs = False
+        if self.hotfolders:
+            self.hotfolders.stop()
+            self.hotfolders.Destroy()
+            self.hotfolders = False
         if self.helptopic:
             self.helptopic.Destroy()
             self.helptopic = False
@@ -339,12 +351,11 @@ class MainFrame(wx.Frame):
         its children programmatically, saving the size
         and position of the window.
         """
-        if self.ProcessPanel.IsShown():
-            if self.ProcessPanel.thread_type is not None:
-                wx.MessageBox(_('There are still processes running. if you '
-                                'want to stop them, use the "Abort" button.'),
-                              _('Videomass'), wx.ICON_WARNING, self)
-                return
+        if self.ProcessPanel.thread_type is not None:
+            wx.MessageBox(_('There are still processes running. if you '
+                            'want to stop them, use the "Abort" button.'),
+                          _('Videomass'), wx.ICON_WARNING, self)
+            return
 
         if self.appdata['warnexiting']:
             if wx.MessageBox(_('Are you sure you want to exit '
@@ -482,6 +493,11 @@ class MainFrame(wx.Frame):
                    "options"))
         searchtopic = toolsButton.Append(wx.ID_ANY, dscrp[0], dscrp[1])
         toolsButton.AppendSeparator()
+        dscrp = (_("Hot folders"),
+                 _("Automatically convert the files copied into some "
+                   "folders with a preset"))
+        hotfolders = toolsButton.Append(wx.ID_ANY, dscrp[0], dscrp[1])
+        toolsButton.AppendSeparator()
         prstpage = '<https://github.com/jeanslack/Videomass-presets>'
         dscrp = (_("Check preset updates"),
                  _("Check for new presets updates from {0}").format(prstpage))
@@ -635,6 +651,7 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, self.Quiet, exitItem)
         # ----TOOLS----
         self.Bind(wx.EVT_MENU, self.Search_topic, searchtopic)
+        self.Bind(wx.EVT_MENU, self.hot_folders, hotfolders)
         self.Bind(wx.EVT_MENU, self.prst_downloader, self.prstdownload)
         self.Bind(wx.EVT_MENU, self.prst_checkversion, self.prstcheck)
         # ---- VIEW ----
@@ -776,6 +793,17 @@ class MainFrame(wx.Frame):
         self.helptopic.Show()
     # -------------------------------------------------------------------#
 
+    def hot_folders(self, event):
+        """
+        Show the hot folders dialog in modeless way (non-modal)
+        """
+        if self.hotfolders:
+            self.hotfolders.Raise()
+            return
+        self.hotfolders = HotFolders(self)
+        self.hotfolders.Show()
+    # -------------------------------------------------------------------#
+
     def prst_checkversion(self, event):
         """
         compare the installed version of the presets
@@ -1534,7 +1562,8 @@ class MainFrame(wx.Frame):
         """
         This method is called by start methods of any
         topic. It call `ProcessPanel.topic_thread`
-        method assigning the corresponding thread.
+        method which queues the corresponding batch of
+        jobs, also while other batches are running.
         """
         if args[0] == 'Viewing last log':
             self.statusbar_msg(_('Viewing last log'), None)
@@ -1565,8 +1594,13 @@ class MainFrame(wx.Frame):
             self.clearall.Enable(False)
             self.menu_items(enable=False)  # disable menu items
             self.openmedia.Enable(False)
-            [self.toolbar.EnableTool(x, True) for x in (6, 8)]
-            [self.toolbar.EnableTool(x, False) for x in (3, 5)]
+            # Back stays enabled to queue further tasks
+            [self.toolbar.EnableTool(x, True) for x in (3, 6, 8)]
+            self.toolbar.EnableTool(5, False)
+        elif self.ProcessPanel.thread_type is not None:  # still running
+            self.openmedia.Enable(False)
+            [self.toolbar.EnableTool(x, True) for x in (3, 8)]
+            self.toolbar.EnableTool(5, False)
         self.logpan.Enable(False)
         [self.toolbar.EnableTool(x, False) for x in (4, 7, 9)]
 
@@ -1574,6 +1608,46 @@ class MainFrame(wx.Frame):
         self.Layout()
     # ------------------------------------------------------------------#
 
+    def check_unfinished_batches(self):
+        """
+        Looks for batches interrupted unexpectedly in the previous
+        session (see `BatchJournal`) and offers to resume their
+        unfinished jobs, otherwise the journals are discarded.
+        """
+        journaldir = os.path.join(self.appdata['cachedir'], 'journal')
+        journals = BatchJournal.unfinished(journaldir)
+        if not journals:
+            return
+        for journal in journals:  # ffmpeg may still be running
+            journal.kill_leftover_processes()
+        jobs = sum(len(journal.unfinished_jobs()) for journal in journals)
+        if wx.MessageBox(_('The previous session was interrupted before '
+                           'completing {0} processing task(s): {1} jobs '
+                           'are unfinished.\n\nDo you want to resume the '
+                           'unfinished jobs now? Any half-written output '
+                           'file will be deleted first.'
+                           ).format(len(journals), jobs),
+                         _('Videomass'), wx.ICON_QUESTION | wx.YES_NO,
+                         self) != wx.YES:
+            for journal in journals:
+                journal.remove_partial_outputs(temporary=True)
+                journal.close()
+            return
+
+        self.topicname = journals[-1].params['panel']
+        self.SetTitle(_('Videomass - FFmpeg message monitor'))
+        self.ChooseTopic.Hide()
+        self.ProcessPanel.Show()
+        self.menu_items(enable=False)  # disable menu items
+        self.openmedia.Enable(False)
+        [self.toolbar.EnableTool(x, True) for x in (3, 6, 8)]
+        [self.toolbar.EnableTool(x, False) for x in (4, 5, 7, 9)]
+        self.statusbar_msg(_('Processing...'), None)
+        for journal in journals:
+            self.ProcessPanel.resume_batch(journal)
+        self.Layout()
+    # ------------------------------------------------------------------#
+
     def click_start(self, event):
         """
         Click Start toolbar event, calls the `on_start` method
@@ -1611,9 +1685,10 @@ class MainFrame(wx.Frame):
         pub/sub protocol. see `long_processing_task.end_proc()`)
         """
         self.menu_items(enable=True)  # enable all menu items
-        self.openmedia.Enable(False)
-        [self.toolbar.EnableTool(x, True) for x in (3, 5)]
-        self.toolbar.EnableTool(8, False)
+        if self.ProcessPanel.IsShown():
+            self.openmedia.Enable(False)
+            [self.toolbar.EnableTool(x, True) for x in (3, 5)]
+            self.toolbar.EnableTool(8, False)
 
         if self.emptylist:
             self.fileDnDTarget.delete_all(self)
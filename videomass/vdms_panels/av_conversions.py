@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.13.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -31,13 +31,16 @@ import wx.lib.scrolledpanel as scrolled
 import wx.lib.agw.floatspin as FS
 from pubsub import pub
 from videomass.vdms_utils.get_bmpfromsvg import get_bmp
-from videomass.vdms_utils.utils import get_volume_data
+from videomass.vdms_utils.utils import get_volume_data, time_to_integer
 from videomass.vdms_panels.libaom import AV1Pan
 from videomass.vdms_panels.webm import WebMPan
 from videomass.vdms_panels.hevc_avc import Hevc_Avc
 from videomass.vdms_io.io_tools import volume_detect_process
+from videomass.vdms_io.io_tools import target_size_process
 from videomass.vdms_io.io_tools import stream_play
 from videomass.vdms_io.checkup import check_files
+from videomass.vdms_threads.stream_copy import copy_plan
+from videomass.vdms_threads.target_size import with_crf, MIB
 from videomass.vdms_dialogs.epilogue import Formula
 from videomass.vdms_dialogs import audiodialogs
 from videomass.vdms_dialogs import presets_addnew
@@ -185,7 +188,7 @@ class AV_Conv(wx.Panel):
             "Passing": "1 pass", "InputDir": "", "OutputDir": "",
             "VideoSize": "", "AspectRatio": "", "FPS": "", "Preset": "",
             "Profile": "", "Level": "", "Tune": "", "VideoBitrate": "",
-            "CRF": "", "WebOptim": "",
+            "CRF": "", "TargetSize": "", "WebOptim": "",
             "MinRate": "", "MaxRate": "", "Bufsize": "", "AudioCodStr": "",
             "AudioIndex": "", "AudioMap": ["-map 0:a:?", ""],
             "SubtitleMap": "-map 0:s?", "AudioCodec": ["", ""],
@@ -268,7 +271,7 @@ class AV_Conv(wx.Panel):
                                                 name="panelscroll",
                                                 )
         self.box_Vcod.Add(self.codVpanel, 0, wx.CENTER)
-        grid_sx_Vcod = wx.FlexGridSizer(11, 2, 0, 0)
+        grid_sx_Vcod = wx.FlexGridSizer(12, 2, 0, 0)
         txtVcod = wx.StaticText(self.codVpanel, wx.ID_ANY, 'Encoder')
         grid_sx_Vcod.Add(txtVcod, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         self.cmb_Vcod = wx.ComboBox(self.codVpanel, wx.ID_ANY,
@@ -289,6 +292,14 @@ class AV_Conv(wx.Panel):
                                     | wx.SL_LABELS,
                                     )
         grid_sx_Vcod.Add(self.slider_CRF, 0, wx.ALL, 5)
+        txtTsize = wx.StaticText(self.codVpanel, wx.ID_ANY,
+                                 'Target Size (MiB)')
+        grid_sx_Vcod.Add(txtTsize, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_Tsize = wx.SpinCtrl(self.codVpanel, wx.ID_ANY,
+                                      "-1", min=-1, max=1048576,
+                                      style=wx.TE_PROCESS_ENTER
+                                      )
+        grid_sx_Vcod.Add(self.spin_Tsize, 0, wx.ALL, 5)
         txtVbrate = wx.StaticText(self.codVpanel, wx.ID_ANY, 'Bit Rate (kb)')
         grid_sx_Vcod.Add(txtVbrate, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
         self.spin_Vbrate = wx.SpinCtrl(self.codVpanel, wx.ID_ANY,
@@ -643,6 +654,11 @@ class AV_Conv(wx.Panel):
         tip = (_('Constant rate factor. Lower values = higher quality and '
                  'a larger file size. Set to -1 to disable this control.'))
         self.slider_CRF.SetToolTip(tip)
+        tip = (_('Size of each output file. Before the conversion, some '
+                 'short samples of each file are encoded to choose the '
+                 'CRF value at which it fits this size. One pass CRF '
+                 'encoding only, set to -1 to disable this control.'))
+        self.spin_Tsize.SetToolTip(tip)
         tip = _('Preview video filters')
         self.btn_preview.SetToolTip(tip)
         tip = _("Clear all enabled filters ")
@@ -696,6 +712,7 @@ class AV_Conv(wx.Panel):
         self.Bind(wx.EVT_CHECKBOX, self.on_WebOptimize, self.ckbx_web)
         self.Bind(wx.EVT_SPINCTRL, self.on_Vbitrate, self.spin_Vbrate)
         self.Bind(wx.EVT_COMMAND_SCROLL, self.on_Crf, self.slider_CRF)
+        self.Bind(wx.EVT_SPINCTRL, self.on_TargetSize, self.spin_Tsize)
         self.Bind(wx.EVT_BUTTON, self.on_saveprst, self.btn_saveprst)
         self.Bind(wx.EVT_BUTTON, self.on_Set_scale, self.btn_videosize)
         self.Bind(wx.EVT_BUTTON, self.on_Set_crop, self.btn_crop)
@@ -939,6 +956,9 @@ class AV_Conv(wx.Panel):
             else:
                 self.slider_CRF.Disable()
                 self.spin_Vbrate.Enable()
+        self.spin_Tsize.Enable(self.slider_CRF.IsEnabled()
+                               and self.opt["Passing"] == "1 pass")
+        self.on_TargetSize(self)
     # ------------------------------------------------------------------#
 
     def on_Vbitrate(self, event):
@@ -976,6 +996,17 @@ class AV_Conv(wx.Panel):
 
     # ------------------------------------------------------------------#
 
+    def on_TargetSize(self, event):
+        """
+        Here the size of the output files is set, the CRF
+        values which meet it are chosen before converting
+        (see `target_size_process`).
+        """
+        val = self.spin_Tsize.GetValue()
+        enabled = self.spin_Tsize.IsEnabled() and val > 0
+        self.opt["TargetSize"] = val if enabled else ""
+    # ------------------------------------------------------------------#
+
     def on_audio_preview(self, event):
         """
         It allows a direct evaluation of the sound results given
@@ -1789,6 +1820,8 @@ class AV_Conv(wx.Panel):
         else:
             self.opt["Bufsize"] = ''
 
+        self.on_TargetSize(self)
+
         if self.cmb_Pixfrm.GetValue() == 'None':
             self.opt["PixFmt"] = ''
         else:
@@ -2016,13 +2049,38 @@ class AV_Conv(wx.Panel):
             command = " ".join(command.split())  # mi formatta la stringa
             if logname == 'save as profile':
                 return command, '', self.opt["OutputFormat"]
-            valupdate = self.update_dict(len(f_src), [''])
+            summary = []
+            if self.opt["TargetSize"] and self.opt["CRF"]:
+                command, sizes = self.target_size_plan(f_src, command)
+                if command is None:
+                    return None
+                summary.append((_("Target Size CRF"), sizes))
+            elif self.appdata['auto_stream_copy']:  # sources already matching
+                commands, copied = copy_plan(self.opt,
+                                             self.parent.data_files,
+                                             command,
+                                             [vol[5] for vol in audnorm],
+                                             self.parent.time_seq,
+                                             )
+                if copied:
+                    command = commands
+                    summary.append((_("Stream Copy (remux)"),
+                                    [os.path.basename(f_src[x])
+                                     for x in copied]))
+            valupdate = self.update_dict(len(f_src), [''], summary)
             ending = Formula(self, valupdate[0], valupdate[1], (600, 400),
                              self.parent.movetotrash, self.parent.emptylist,
                              )
             if ending.ShowModal() == wx.ID_OK:
                 end = ending.getvalue()
                 self.parent.movetotrash, self.parent.emptylist = end[0], end[1]
+                if (self.appdata['split_segments'] > 1
+                        and not self.parent.time_seq
+                        and not (self.opt["TargetSize"]  # CRF of each file
+                                 and self.opt["CRF"])):
+                    self.video_split_stitch(f_src, f_dest, logname, command,
+                                            audnorm)
+                    return None
                 self.parent.switch_to_processing('onepass',
                                                  f_src,
                                                  self.opt["OutputFormat"],
@@ -2037,6 +2095,86 @@ class AV_Conv(wx.Panel):
         return None
     # ------------------------------------------------------------------#
 
+    def target_size_plan(self, f_src, command):
+        """
+        Returns the one pass `command` of each file with the
+        CRF value at which it fits the target size, chosen by
+        sample encodes (see `target_size_process`), and the
+        lines of the summary. Returns (None, None) if the
+        sample encodes fail or are interrupted.
+        """
+        if self.parent.time_seq:
+            tseq = self.parent.time_seq.split()
+            offset = time_to_integer(tseq[1])
+            durations = [min(time_to_integer(tseq[3]), max(0, dur - offset))
+                         for dur in self.parent.duration]
+        else:
+            offset, durations = 0, self.parent.duration
+        data = target_size_process(f_src,
+                                   durations,
+                                   command,
+                                   self.opt["OutputFormat"],
+                                   self.opt["TargetSize"] * MIB,
+                                   self.slider_CRF.GetMax(),
+                                   offset=offset,
+                                   parent=self.GetParent(),
+                                   )
+        if not data or data[1]:
+            if data:
+                wx.MessageBox(f"{data[1]}", "Videomass", wx.ICON_ERROR, self)
+            return None, None
+        commands = [with_crf(command, crf) for crf, size in data[0]]
+        sizes = [_('{0}: CRF {1} (about {2:.1f} MiB)').format(
+            os.path.basename(src), crf, size / MIB)
+            for src, (crf, size) in zip(f_src, data[0])]
+        return commands, sizes
+    # ------------------------------------------------------------------#
+
+    def video_split_stitch(self, f_src, f_dest, logname, command, audnorm):
+        """
+        One pass video conversion in which the long files are
+        split at keyframes and the segments are encoded at the
+        same time (see `split_stitch` module). The video, audio
+        and muxing options are given separately, `command` is
+        used for the files too short to be split.
+        """
+        video = (
+            f'{self.opt["VideoCodec"]} {self.opt["VideoBitrate"]} '
+            f'{self.opt["MinRate"]} {self.opt["MaxRate"]} '
+            f'{self.opt["Bufsize"]} {self.opt["CRF"]} '
+            f'{self.opt["Deadline"]} {self.opt["Usage"]} '
+            f'{self.opt["CpuUsed"]} {self.opt["RowMthreading"]} '
+            f'{self.opt["GOP"]} {self.opt["Preset"]} '
+            f'{self.opt["Profile"]} {self.opt["Level"]} '
+            f'{self.opt["Tune"]} {self.opt["AspectRatio"]} '
+            f'{self.opt["FPS"]} {self.opt["VFilters"]} '
+            f'{self.opt["PixFmt"]}'
+        )
+        audio = (
+            f'{self.opt["AudioCodec"][0]} {self.opt["AudioCodec"][1]} '
+            f'{self.opt["AudioBitrate"][1]} {self.opt["AudioRate"][1]} '
+            f'{self.opt["AudioChannel"][1]} {self.opt["AudioDepth"][1]} '
+            f'{self.opt["AudioMap"][0]}'
+        )
+        muxing = f'{self.opt["SubtitleMap"]} {self.opt["WebOptim"]}'
+        hasaudio = [any(stream.get('codec_type') == 'audio'
+                        for stream in data.get('streams', []))
+                    for data in self.parent.data_files]
+        self.parent.switch_to_processing('split_stitch',
+                                         f_src,
+                                         self.opt["OutputFormat"],
+                                         f_dest,
+                                         command,
+                                         [" ".join(video.split()),
+                                          " ".join(audio.split()),
+                                          " ".join(muxing.split())],
+                                         hasaudio,
+                                         [vol[5] for vol in audnorm],
+                                         logname,
+                                         len(f_src),
+                                         )
+    # ------------------------------------------------------------------#
+
     def video_ebu_2pass(self, f_src, f_dest, logname):
         """
         Define the ffmpeg command strings for batch process with
@@ -2238,9 +2376,12 @@ class AV_Conv(wx.Panel):
         return None
     # ------------------------------------------------------------------#
 
-    def update_dict(self, countmax, prof):
+    def update_dict(self, countmax, prof, summary=()):
         """
-        Update all settings before send to epilogue
+        Update all settings before send to epilogue,
+        `summary` are further (label, [lines]) of the
+        video conversions, e.g. the files converted by
+        stream copy (see `video_stdProc`).
         """
         numfile = _("{} file in queue").format(str(countmax))
         if self.opt["PEAK"]:
@@ -2332,6 +2473,9 @@ class AV_Conv(wx.Panel):
                         f'{self.cmb_A_outMap.GetValue()}\n'
                         f'{self.cmb_Submap.GetValue()}\n{time}'
                         )
+            for label, lines in summary:
+                formula += f'\n{label}' + '\n' * (len(lines) - 1)
+                dictions += '\n' + '\n'.join(lines)
         return formula, dictions
 # ------------------------------------------------------------------#
 
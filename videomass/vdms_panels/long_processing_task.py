@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Jan.21.2023
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -32,14 +32,26 @@ from pubsub import pub
 import wx
 from videomass.vdms_dialogs.widget_utils import notification_area
 from videomass.vdms_io.make_filelog import make_log_template
-from videomass.vdms_threads.one_pass import OnePass
-from videomass.vdms_threads.two_pass import TwoPass
-from videomass.vdms_threads.two_pass_ebu import Loudnorm
-from videomass.vdms_threads.picture_exporting import PicturesFromVideo
-from videomass.vdms_threads.video_stabilization import VidStab
-from videomass.vdms_threads.concat_demuxer import ConcatDemuxer
-from videomass.vdms_threads.slideshow import SlideshowMaker
-from videomass.vdms_utils.utils import (time_to_integer, integer_to_time)
+from videomass.vdms_io.batch_journal import BatchJournal
+from videomass.vdms_io.output_manifest import OutputManifest
+from videomass.vdms_io.scrollback import ScrollBack
+from videomass.vdms_threads.job_engine import JobEngine, Job
+from videomass.vdms_threads.engine_core import EngineSettings, QueueSink
+from videomass.vdms_threads.remote_worker import parse_workers
+from videomass.vdms_threads.sched_policy import SchedPolicy
+from videomass.vdms_threads.verify_output import OutputVerifier
+from videomass.vdms_threads.disk_space import DiskGuard
+from videomass.vdms_threads.output_staging import OutputStaging
+from videomass.vdms_threads.proc_stats import ResourceMonitor
+from videomass.vdms_threads.one_pass import one_pass_batch
+from videomass.vdms_threads.two_pass import two_pass_batch
+from videomass.vdms_threads.two_pass_ebu import loudnorm_batch
+from videomass.vdms_threads.picture_exporting import pictures_batch
+from videomass.vdms_threads.video_stabilization import vidstab_batch
+from videomass.vdms_threads.concat_demuxer import concat_batch
+from videomass.vdms_threads.slideshow import slideshow_batch
+from videomass.vdms_threads.split_stitch import split_stitch_batch
+from videomass.vdms_utils.utils import integer_to_time
 
 
 def delete_file_source(flist, trashdir):
@@ -64,33 +76,16 @@ def delete_file_source(flist, trashdir):
             move(name, dest)
 
 
-def pairwise(iterable):
+def estimated_time(progress):
     """
-    Return a zip object from iterable.
-    This function is used by the update_display method.
-    ----
-    USE:
-
-    after splitting ffmpeg's progress strings such as:
-    output = "frame= 1178 fps=155 q=29.0 size=    2072kB time=00:00:39.02
-              bitrate= 435.0kbits/s speed=5.15x  "
-    in a list as:
-    iterable = ['frame', '1178', 'fps', '155', 'q', '29.0', 'size', '2072kB',
-                'time', '00:00:39.02', 'bitrate', '435.0kbits/s', speed',
-                '5.15x']
-    1)
-        for x, y in pairwise(iterable):
-            x, y
-    2)
-        dict(pairwise(iterable))
-
-    Return: a zip object pairs from list iterable object.
-
-    <https://stackoverflow.com/questions/5389507/iterating-over-every-
-    two-elements-in-a-list>
+    Given a `Progress` object of an ffmpeg process, returns
+    the estimated time of arrival (ETA) as a string, e.g.
+    "   ETA: 00:01:22.500"
     """
-    itobj = iter(iterable)  # list_iterator object
-    return zip(itobj, itobj)  # zip object pairs from list iterable object
+    eta = progress.eta()
+    if eta is None:
+        return "   ETA: N/A"
+    return f"   ETA: {integer_to_time(eta)}"
 # ----------------------------------------------------------------------#
 
 
@@ -98,9 +93,20 @@ class LogOut(wx.Panel):
     """
     displays a text control for the output logging, a progress bar
     and a progressive percentage text label. This panel is used
-    in combination with separated threads for long processing tasks.
+    in combination with the `JobEngine` for long processing tasks.
+    New batches can be queued while others are running: the
+    `thread_type` attribute is the running engine, None otherwise.
     It also implements stop and close buttons to stop the current
-    process and close the panel at the end.
+    process and close the panel at the end, and a pause button
+    which suspends the running processes (see `on_pause`).
+
+    The messages of the engine are not delivered to the main
+    thread one by one: the worker threads put them in a queue
+    (`QueueSink`) which is drained by a timer (see `deliver_messages`) a few
+    times per second, so that a busy batch can't flood the
+    event loop. The text control keeps the last `MAXLINES` lines
+    of output only, the earlier ones are loaded back from disk on
+    demand (see `write_view`).
 
     """
     # used msg on text
@@ -111,10 +117,14 @@ class LogOut(wx.Panel):
     MSG_interrupted = _('Interrupted Process !')
     MSG_completed = _('Successfully completed !')
     MSG_unfinished = _('Not everything was successful.')
+    MSG_paused = _('[Videomass]: Paused')
+    MSG_resumed = _('[Videomass]: Resumed')
 
     WHITE = '#fbf4f4'  # white for background status bar
     BLACK = '#060505'  # black for background status bar
     YELLOW = '#bd9f00'
+    MAXLINES = 5000  # number of output lines kept by the text control
+    REFRESH = 66  # delivery interval of the engine messages in ms (~15 Hz)
     # ------------------------------------------------------------------#
 
     def __init__(self, parent):
@@ -129,14 +139,21 @@ class LogOut(wx.Panel):
         self.appdata = get.appset
         self.parent = parent  # main frame
         self.thread_type = None  # the instantiated thread
-        self.with_eta = True  # create estimated time of arrival (ETA)
         self.abort = False  # if True set to abort current process
         self.error = False  # if True, all the tasks was failed
         self.previus = None  # panel name from which it starts
         self.logname = None  # log pathname, None otherwise
         self.result = []  # result of the final process
         self.count = 0  # keeps track of the counts (see `update_count`)
+        self.jobs = {}  # running jobs on concurrent processing
+        self.batchtotal = 0  # overall duration of the batch in ms
+        self.batchdone = 0  # duration of the finished jobs in ms
+        self.batches = {}  # {batch ident: move to trash} of queued batches
         self.clr = self.appdata['icontheme'][1]
+        self.messages = QueueSink()  # messages of the engine
+        self.view = ScrollBack(os.path.join(self.appdata['cachedir'], 'tmp',
+                                            f'logview-{os.getpid()}.jsonl'),
+                               maxlines=LogOut.MAXLINES)
 
         wx.Panel.__init__(self, parent=parent)
 
@@ -144,6 +161,10 @@ class LogOut(wx.Panel):
         lbl = wx.StaticText(self, label=infolbl)
         if self.appdata['ostype'] != 'Darwin':
             lbl.SetLabelMarkup(f"<b>{infolbl}</b>")
+        self.btn_earlier = wx.Button(self, wx.ID_ANY, _("Earlier output"))
+        self.btn_earlier.Disable()
+        self.btn_pause = wx.ToggleButton(self, wx.ID_ANY, _("Pause"))
+        self.btn_pause.Disable()
         self.txtout = wx.TextCtrl(self, wx.ID_ANY, "",
                                   style=wx.TE_MULTILINE
                                   | wx.TE_READONLY
@@ -154,7 +175,12 @@ class LogOut(wx.Panel):
         self.labffmpeg = wx.StaticText(self, label="")
         sizer = wx.BoxSizer(wx.VERTICAL)
         sizer.Add((0, 10))
-        sizer.Add(lbl, 0, wx.ALL, 5)
+        boxlbl = wx.BoxSizer(wx.HORIZONTAL)
+        sizer.Add(boxlbl, 0, wx.EXPAND)
+        boxlbl.Add(lbl, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+        boxlbl.AddStretchSpacer()
+        boxlbl.Add(self.btn_earlier, 0, wx.ALL, 5)
+        boxlbl.Add(self.btn_pause, 0, wx.ALL, 5)
         sizer.Add(self.txtout, 1, wx.EXPAND | wx.ALL, 5)
         sizer.Add(self.barprog, 0, wx.EXPAND | wx.ALL, 5)
         sizer.Add(self.labprog, 0, wx.ALL, 5)
@@ -166,9 +192,22 @@ class LogOut(wx.Panel):
         sizer.Add(line, 0, wx.ALL | wx.EXPAND, 5)
         # set_properties:
         self.txtout.SetBackgroundColour(self.clr['BACKGRD'])
+        self.btn_earlier.SetToolTip(_('Load the previous lines of the '
+                                      'output, which are no longer shown '
+                                      'but are kept on disk.'))
+        self.btn_pause.SetToolTip(_('Suspend the running processes to '
+                                    'free the CPU for a while, without '
+                                    'losing the work done. No other '
+                                    'file is started until resumed.'))
         self.SetSizerAndFit(sizer)
+        self.timer = wx.Timer(self)
         # ------------------------------------------
 
+        self.Bind(wx.EVT_TIMER, self.deliver_messages, self.timer)
+        self.Bind(wx.EVT_BUTTON, self.on_earlier, self.btn_earlier)
+        self.Bind(wx.EVT_TOGGLEBUTTON, self.on_pause, self.btn_pause)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+        self.txtout.Bind(wx.EVT_MOUSEWHEEL, self.on_wheel)
         pub.subscribe(self.update_display, "UPDATE_EVT")
         pub.subscribe(self.update_count, "COUNT_EVT")
         pub.subscribe(self.end_proc, "END_EVT")
@@ -176,7 +215,8 @@ class LogOut(wx.Panel):
 
     def topic_thread(self, panel, durs, tseq, *args):
         """
-        This method is resposible to create the Thread instance.
+        This method is resposible to submit the batch of jobs to
+        the `JobEngine`, which is created if it is not running.
         *args: type tuple data object
         durs: list of file durations or partial if tseq is setted
         """
@@ -185,43 +225,233 @@ class LogOut(wx.Panel):
         if args[0] == 'Viewing last log':
             return
 
-        self.txtout.Clear()
-        self.labprog.SetLabel('')
-        self.labffmpeg.SetLabel('')
+        self.queue_batch(panel, durs, tseq, args, self.parent.movetotrash)
+    # ----------------------------------------------------------------------
+
+    def resume_batch(self, journal):
+        """
+        Resumes the unfinished jobs of a batch interrupted
+        unexpectedly, see `BatchJournal`. The half-written
+        output files are removed first: the temporary ones only
+        if the outputs are staged, the final ones are complete.
+        """
+        params = journal.params
+        self.previus = params['panel']
+        for fname in journal.remove_partial_outputs(
+                temporary=self.appdata['staged_outputs']):
+            self.write_view(_('Removed partial file: "{0}"\n'
+                              ).format(fname), 'WARN')
+        self.queue_batch(params['panel'], params['durs'], params['tseq'],
+                         params['args'], params['movetotrash'], journal)
+        journal.close()
+    # ----------------------------------------------------------------------
+
+    def queue_batch(self, panel, durs, tseq, args, movetotrash,
+                    journal=None):
+        """
+        Builds the batch of jobs of the `args[0]` topic and submits
+        it to the `JobEngine`, which is created if it is not running.
+        A write-ahead journal of the batch is kept in the cache
+        directory so that it can be resumed after a crash. If a
+        previous `journal` is given, its completed jobs are not
+        executed again.
+        """
+        if self.thread_type is None:  # no running processes
+            self.clear_view()
+            self.labprog.SetLabel('')
+            self.labffmpeg.SetLabel('')
+            self.thread_type = JobEngine(
+                self.messages,
+                max_workers=self.appdata['concurrent_jobs'],
+                tmpdir=os.path.join(self.appdata['cachedir'], 'tmp'),
+                remotes=parse_workers(self.appdata['remote_workers'],
+                                      self.appdata['remote_pathmap']),
+                policy=SchedPolicy.from_settings(self.appdata),
+                verifier=(OutputVerifier(self.appdata['ffprobe_cmd'])
+                          if self.appdata['verify_outputs'] else None),
+                diskguard=DiskGuard.from_settings(self.appdata),
+                staging=OutputStaging.from_settings(self.appdata),
+                monitor=ResourceMonitor.from_settings(self.appdata))
+            self.timer.Start(LogOut.REFRESH)
+            self.btn_pause.Enable(JobEngine.CAN_PAUSE
+                                  or bool(self.thread_type.remotes))
 
         self.logname = make_log_template(args[8], self.appdata['logdir'])
+        builder = {'onepass': one_pass_batch,
+                   'twopass': two_pass_batch,
+                   'two pass EBU': loudnorm_batch,
+                   'video_to_sequence': pictures_batch,
+                   'sequence_to_video': slideshow_batch,
+                   'libvidstab': vidstab_batch,
+                   'concat_demuxer': concat_batch,
+                   'split_stitch': split_stitch_batch,
+                   }[args[0]]
+
+        batch = builder(EngineSettings.from_appdata(self.appdata),
+                        self.logname, durs, tseq, *args)
+        if journal is not None:
+            journal.restore(batch)
+        if self.appdata['incremental']:
+            OutputManifest().apply(batch)
+        if self.thread_type.verifier:  # the sources are already probed
+            self.thread_type.verifier.add_sources(
+                {os.path.abspath(x['format']['filename']): x
+                 for x in self.parent.data_files})
+        params = {'panel': panel,
+                  'durs': durs,
+                  'tseq': tseq,
+                  'args': args,
+                  'movetotrash': movetotrash,
+                  }
+        batch.journal = BatchJournal.create(
+            os.path.join(self.appdata['cachedir'], 'journal'), batch, params,
+            self.thread_type.staging)
+        self.batchtotal += sum(job.duration for job in batch.jobs
+                               if job.state not in Job.FINAL)
+        self.thread_type.submit(batch)
+        self.batches[batch.ident] = movetotrash
+    # ----------------------------------------------------------------------
+
+    def deliver_messages(self, event):
+        """
+        Timer handler which drains the queue of the engine
+        messages and delivers them by pubsub protocol, in the
+        order they were sent, with these exceptions:
+
+            - only the latest progress of each job is delivered;
+            - consecutive ffmpeg output lines are appended to
+              the text control in blocks (see `append_output`).
 
-        if args[0] == 'onepass':
-            self.thread_type = OnePass(self.logname, durs, tseq, *args)
+        Pending progress and lines are always delivered before
+        any other message, e.g. before the end of their job.
+        """
+        progress = {}  # {jobid: kwargs} latest progress of each job
+        lines = []  # [(jobid, line), ...] output lines to append
+
+        def flush():
+            self.append_output(lines)
+            lines.clear()
+            for kwargs in progress.values():
+                if kwargs['jobid'] is None or kwargs['jobid'] in self.jobs:
+                    pub.sendMessage("UPDATE_EVT", **kwargs)
+            progress.clear()
+
+        for topic, kwargs in self.messages.drain():
+            if topic == 'UPDATE_EVT' and kwargs['status'] == 0:
+                jobid = kwargs.setdefault('jobid', None)
+                if kwargs.get('progress') is not None:
+                    progress[jobid] = kwargs
+                elif 'time=' not in kwargs['output']:
+                    lines.append((jobid, kwargs['output']))
+                continue
+            flush()
+            pub.sendMessage(topic, **kwargs)
+        flush()
+    # ----------------------------------------------------------------------
+
+    @staticmethod
+    def line_color(output):
+        """
+        Returns the color scheme key of an ffmpeg
+        output line according to its content.
+        """
+        if [x for x in ('info', 'Info') if x in output]:
+            return 'INFO'
+        if [x for x in ('Failed', 'failed', 'Error', 'error') if x in output]:
+            return 'ERR0'
+        if [x for x in ('warning', 'Warning') if x in output]:
+            return 'WARN'
+        return 'TXT3'
+    # ----------------------------------------------------------------------
 
-        elif args[0] == 'twopass':
-            self.thread_type = TwoPass(self.logname, durs, tseq, *args)
+    def append_output(self, lines):
+        """
+        Appends the ffmpeg output `lines`, a list of
+        (jobid, line) tuples, to the text control. The
+        consecutive lines with the same color are appended
+        at once.
+        """
+        block, color = [], None
+        for jobid, output in lines:
+            tag = '' if jobid is None else f'[{self.jobs[jobid]["label"]}] '
+            newcolor = LogOut.line_color(output)
+            if block and newcolor != color:
+                self.write_view(''.join(block), color)
+                block.clear()
+            block.append(f'{tag}{output}')
+            color = newcolor
+        if block:
+            self.write_view(''.join(block), color)
+    # ----------------------------------------------------------------------
 
-        elif args[0] == 'two pass EBU':
-            self.thread_type = Loudnorm(self.logname, durs, tseq, *args)
+    def write_view(self, text, color):
+        """
+        Appends `text` to the text control with the `color`
+        of the color scheme (key). Only the last lines are kept
+        by the text control, the previous ones can be loaded
+        back from disk (see `ScrollBack`).
+        """
+        remove = self.view.append(color, text)
+        if remove:
+            self.txtout.Remove(0, remove)
+            self.btn_earlier.Enable()
+        self.txtout.SetDefaultStyle(wx.TextAttr(self.clr[color]))
+        self.txtout.AppendText(text)
+    # ----------------------------------------------------------------------
 
-        elif args[0] == 'video_to_sequence':
-            self.with_eta = False
-            self.thread_type = PicturesFromVideo(self.logname, durs,
-                                                 tseq, *args
-                                                 )
-        elif args[0] == 'sequence_to_video':
-            self.thread_type = SlideshowMaker(self.logname, durs, *args)
+    def clear_view(self):
+        """
+        Clears the text control and its scrollback
+        """
+        self.txtout.Clear()
+        self.view.clear()
+        self.btn_earlier.Disable()
+    # ----------------------------------------------------------------------
 
-        elif args[0] == 'libvidstab':
-            self.thread_type = VidStab(self.logname, durs, tseq, *args)
+    def on_earlier(self, event):
+        """
+        Loads the previous segment of the output removed
+        from the text control, keeping the current position.
+        """
+        blocks = self.view.earlier()
+        if not blocks:
+            return
+        self.txtout.Freeze()
+        pos = 0
+        for color, text in blocks:
+            self.txtout.SetInsertionPoint(pos)
+            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr[color]))
+            self.txtout.WriteText(text)
+            pos += len(text)
+        self.txtout.SetInsertionPointEnd()
+        self.txtout.ShowPosition(pos)
+        self.txtout.Thaw()
+        self.btn_earlier.Enable(self.view.first > 0)
+    # ----------------------------------------------------------------------
 
-        elif args[0] == 'concat_demuxer':
-            self.with_eta = False
-            self.thread_type = ConcatDemuxer(self.logname, durs, *args)
+    def on_wheel(self, event):
+        """
+        Scrolling back beyond the top of the text control
+        loads the previous segment of the output, if any.
+        """
+        if (event.GetWheelRotation() > 0 and self.view.first
+                and self.txtout.GetScrollPos(wx.VERTICAL) == 0):
+            self.on_earlier(None)
+        event.Skip()
     # ----------------------------------------------------------------------
 
-    def update_display(self, output, duration, status):
+    def update_display(self, output, duration, status, jobid=None,
+                       progress=None):
         """
         Receive message from thread by pubsub UPDATE_EVT protol.
-        The received 'output' is parsed for calculate the bar
-        progress value, percentage label and errors management.
-        This method can be used even for non-loop threads.
+        The received `progress` (a `Progress` object parsed from
+        the ffmpeg's -progress output) is used for calculate the
+        bar progress value and the percentage label, while the
+        `output` lines (ffmpeg diagnostics) are displayed with
+        colors according to their content.
+        When several files are processed simultaneously, the
+        `jobid` argument identifies the file the message refers
+        to (see `update_job_progress`).
 
         NOTE: During conversion the ffmpeg errors do not stop all
               others tasks, if an error occurred it will be marked
@@ -231,125 +461,146 @@ class LogOut(wx.Panel):
               messages are errors, sometimes it happens to see more
               output marked with yellow color.
         """
+        tag = '' if jobid is None else f'[{self.jobs[jobid]["label"]}] '
+
         if not status == 0:  # error, exit status of the p.wait
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR1']))
-            self.txtout.AppendText(f"{LogOut.MSG_failed}\n")
+            self.write_view(f"{tag}{LogOut.MSG_failed}\n", 'ERR1')
             self.result.append('failed')
+            if jobid is not None:
+                self.end_job(jobid)
             return  # must be return here
 
-        if 'time=' in output:  # ...in processing
-            i = output.index('time=') + 5
-            pos = output[i:].split()[0]
-            msec = time_to_integer(pos)
-
-            if msec > duration:
-                self.barprog.SetValue(duration)
-            elif msec == 0:
-                self.barprog.SetValue(self.barprog.GetValue())
-            else:
-                self.barprog.SetValue(msec)
-
-            percentage = round((msec / duration) * 100 if
-                               duration != 0 else 100)
-            out = [a for a in "=".join(output.split()).split('=') if a]
-            ffprog = []
-            for key, val in pairwise(out):
-                ffprog.append(f"{key}: {val}")
-
-            if self.with_eta:
-                if 'speed=' in output:
-                    speed = output.split('speed=')[-1].strip().split('x')[0]
-                    if speed in ('N/A', '0'):
-                        eta = "   ETA: N/A"
-                    else:  # is float
-                        rem = (duration - msec) / float(speed)
-                        remaining = integer_to_time(round(rem))
-                        eta = f"   ETA: {remaining}"
-                else:
-                    eta = "   ETA: N/A"
-            else:
-                eta = ""
-            self.labprog.SetLabel(f'Processing: {str(int(percentage))}% {eta}')
-            self.labffmpeg.SetLabel(' | '.join(ffprog))
+        if progress is not None and jobid is not None:
+            self.update_job_progress(progress, jobid)
 
-            del output, duration
+        elif progress is not None:  # ...in processing
+            self.barprog.SetValue(min(progress.msec, self.barprog.GetRange()))
+            self.labprog.SetLabel(f'Processing: {progress.percent()}% '
+                                  f'{estimated_time(progress)}')
+            self.labffmpeg.SetLabel(progress.summary())
 
-        else:  # append all others lines on the textctrl and log file
-            if [x for x in ('info', 'Info') if x in output]:
-                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['INFO']))
-                self.txtout.AppendText(f'{output}')
+        elif 'time=' in output:  # stats line, without -progress
+            return
 
-            elif [x for x in ('Failed', 'failed', 'Error', 'error')
-                    if x in output]:
-                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR0']))
-                self.txtout.AppendText(f'{output}')
+        else:  # append all others lines on the textctrl
+            self.append_output([(jobid, output)])
+    # ----------------------------------------------------------------------
 
-            elif [x for x in ('warning', 'Warning') if x in output]:
-                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['WARN']))
-                self.txtout.AppendText(f'{output}')
+    def update_job_progress(self, progress, jobid):
+        """
+        Updates the progress of a single job when several files
+        are processed simultaneously. The progress bar shows the
+        progress of the whole batch, while the percentage and the
+        ETA of each running job are shown on the label below it.
+        """
+        job = self.jobs[jobid]
+        job['msec'] = progress.msec
+        job['percentage'] = progress.percent()
+        job['eta'] = estimated_time(progress)
+        if progress.usage is not None:
+            job['usage'] = f' (cpu {progress.usage.cpu_percent()}%)'
+        self.batch_progress()
+    # ----------------------------------------------------------------------
 
-            else:
-                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT3']))
-                self.txtout.AppendText(f'{output}')
+    def batch_progress(self):
+        """
+        Shows the overall progress of the batch and the
+        progress of each running job.
+        """
+        elapsed = self.batchdone + sum(x['msec'] for x in self.jobs.values())
+        if self.batchtotal:
+            percentage = min(round((elapsed / self.batchtotal) * 100), 100)
+        else:
+            percentage = 0
+        self.barprog.SetValue(percentage * 10)
+        self.labprog.SetLabel(_('Processing: {0}%   Running jobs: {1}'
+                                ).format(percentage, len(self.jobs)))
+        self.labffmpeg.SetLabel(' | '.join(
+            [f"{x['label']}: {x['percentage']}%{x['eta']}{x['usage']}"
+             for x in self.jobs.values()]))
+    # ----------------------------------------------------------------------
 
-            with open(self.logname, "a", encoding='utf8') as logerr:
-                logerr.write(f"[FFMPEG]: {output}")
+    def end_job(self, jobid):
+        """
+        Removes the job identified by `jobid` from the running
+        jobs on concurrent processing.
+        """
+        job = self.jobs.pop(jobid, None)
+        if job:
+            self.batchdone += job['duration']
+        self.batch_progress()
     # ----------------------------------------------------------------------
 
-    def update_count(self, count, fsource, destination, duration, end):
+    def update_count(self, count, fsource, destination, duration, end,
+                     jobid=None):
         """
         Receive messages from file count, loop or non-loop thread.
+        The `jobid` argument is given only on concurrent processing.
         """
+        if end == 'Done' and jobid is not None:
+            label = self.jobs[jobid]['label']
+            self.write_view(f"[{label}] {LogOut.MSG_done}\n", 'SUCCESS')
+            self.end_job(jobid)
+            return
+
         if end == 'Done':
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['SUCCESS']))
-            self.txtout.AppendText(f"{LogOut.MSG_done}\n")
+            self.write_view(f"{LogOut.MSG_done}\n", 'SUCCESS')
             # set end values for percentage and ETA
-            if self.with_eta:
-                newlab = self.labprog.GetLabel().split()
-                if 'Processing:' in newlab:
-                    newlab[1] = '100%   '
-                if 'ETA:' in newlab:
-                    newlab[3] = '00:00:00.000'
-                self.labprog.SetLabel(" ".join(newlab))
-            else:
-                self.labprog.SetLabel('Processing: 100%')
+            newlab = self.labprog.GetLabel().split()
+            if 'Processing:' in newlab:
+                newlab[1] = '100%   '
+            if 'ETA:' in newlab:
+                newlab[3] = '00:00:00.000'
+            self.labprog.SetLabel(" ".join(newlab))
             return
 
         # if STATUS_ERROR == 1:
         if end == 'error':
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['WARN']))
-            self.txtout.AppendText(f'\n{count}\n')
+            self.write_view(f'\n{count}\n', 'WARN')
             self.error = True
+            if jobid is not None:
+                self.jobs.pop(jobid, None)
         else:
-            self.barprog.SetRange(duration)  # set overall duration range
-            self.barprog.SetValue(0)  # reset bar progress
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
-            self.txtout.AppendText(f'\n{count}\n')
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
-            self.txtout.AppendText(f'{fsource}\n')
+            if jobid is not None:  # concurrent processing
+                self.jobs[jobid] = {'label': count.split('\n')[0],
+                                    'duration': duration,
+                                    'msec': 0, 'percentage': 0, 'eta': '',
+                                    'usage': ''}
+                self.barprog.SetRange(1000)  # per mille of the batch
+            else:
+                self.barprog.SetRange(duration)  # set overall duration range
+                self.barprog.SetValue(0)  # reset bar progress
+            self.write_view(f'\n{count}\n', 'TXT0')
+            self.write_view(f'{fsource}\n', 'TXT1')
             if destination:
-                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
-                self.txtout.AppendText(f'{destination}\n')
+                self.write_view(f'{destination}\n', 'TXT1')
 
         self.count += 1
     # ----------------------------------------------------------------------
 
-    def end_proc(self, msg):
+    def end_proc(self, msg, batch=None):
         """
-        At the end of the process
+        At the end of each batch of jobs, moves the processed files
+        (`msg`) to the trash folder if required. The end of the
+        whole process is reported at the end of the last batch.
         """
+        movetotrash = self.batches.pop(batch, self.parent.movetotrash)
+        if msg and movetotrash and not self.error and not self.abort:
+            trashdir = self.appdata['user_trashdir']
+            delete_file_source(msg, trashdir)  # filelist, dir
+
+        if self.batches:  # there are still queued batches
+            return
+
         if self.error:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
-            self.txtout.AppendText(f"\n{LogOut.MSG_fatalerror}\n")
+            self.write_view(f"\n{LogOut.MSG_fatalerror}\n", 'TXT0')
             notification_area(_("Fatal Error !"), LogOut.MSG_fatalerror,
                               wx.ICON_ERROR)
         elif self.abort:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ABORT']))
-            self.txtout.AppendText(f"\n{LogOut.MSG_interrupted}\n")
+            self.write_view(f"\n{LogOut.MSG_interrupted}\n", 'ABORT')
         else:
             if not self.result:
                 endmsg = LogOut.MSG_completed
-                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
                 notification_area(endmsg, _("Get your files at the "
                                             "destination you specified"),
                                   wx.ICON_INFORMATION,
@@ -357,36 +608,65 @@ class LogOut(wx.Panel):
             else:
                 if len(self.result) == self.count:
                     endmsg = LogOut.MSG_taskfailed
-                    self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
                     notification_area(endmsg, _("Check the current output "
                                                 "or read the related log "
                                                 "file for more information."),
                                       wx.ICON_ERROR,)
                 else:
                     endmsg = LogOut.MSG_unfinished
-                    self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
                     notification_area(endmsg, _("Check the current output "
                                                 "or read the related log "
                                                 "file for more information."),
                                       wx.ICON_WARNING, timeout=10)
 
             self.parent.statusbar_msg(_('...Finished'), None)
-            self.txtout.AppendText(f"\n{endmsg}\n")
+            self.write_view(f"\n{endmsg}\n", 'TXT0')
             self.barprog.SetValue(0)
 
-            if msg:  # move processed files to Videomass trash folder
-                if self.parent.movetotrash:
-                    trashdir = self.appdata['user_trashdir']
-                    delete_file_source(msg, trashdir)  # filelist, dir
-
-        self.txtout.AppendText('\n')
+        self.write_view('\n', 'TXT0')
         self.reset_all()
         pub.sendMessage("PROCESS TERMINATED", msg='Terminated')
     # ----------------------------------------------------------------------
 
+    def on_destroy(self, event):
+        """
+        Removes the scrollback file of the text control
+        """
+        if event.GetEventObject() is self:
+            self.view.close()
+        event.Skip()
+    # ----------------------------------------------------------------------
+
+    def on_pause(self, event):
+        """
+        Suspends the running processes or resumes them. While
+        paused, the processing label shows the progress at the
+        time of the pause; the paused time is not counted by the
+        ETA (see `JobEngine.pause`).
+        """
+        if self.thread_type is None:
+            return
+        if self.btn_pause.GetValue():
+            self.thread_type.pause()
+            self.deliver_messages(None)  # progress before the pause
+            label = self.labprog.GetLabel()
+            self.labprog.SetLabel(f"{_('Paused')} | {label}")
+            self.btn_pause.SetLabel(_('Resume'))
+            self.write_view(f"\n{LogOut.MSG_paused}\n", 'WARN')
+            self.parent.statusbar_msg(_('Paused'), LogOut.YELLOW, LogOut.BLACK)
+        else:
+            self.thread_type.resume()
+            self.labprog.SetLabel(self.labprog.GetLabel().split(' | ', 1)[-1])
+            self.btn_pause.SetLabel(_('Pause'))
+            self.write_view(f"{LogOut.MSG_resumed}\n", 'WARN')
+            self.parent.statusbar_msg(_('Processing...'), None)
+    # ----------------------------------------------------------------------
+
     def on_stop(self):
         """
-        The user change idea and was stop process
+        The user change idea and was stop process,
+        all the queued batches are aborted, paused
+        processes included.
         """
         self.thread_type.stop()
         self.parent.statusbar_msg(_("Please wait... interruption in progress"),
@@ -401,11 +681,18 @@ class LogOut(wx.Panel):
         """
         Reset to default at any process terminated
         """
+        self.timer.Stop()
+        self.btn_pause.SetValue(False)
+        self.btn_pause.SetLabel(_('Pause'))
+        self.btn_pause.Disable()
         self.logname = None
         self.thread_type = None
         self.abort = False
         self.error = False
         self.result.clear()
         self.count = 0
-        self.with_eta = True  # restoring time remaining display
+        self.jobs.clear()
+        self.batchtotal = 0
+        self.batchdone = 0
+        self.batches.clear()
     # ----------------------------------------------------------------------
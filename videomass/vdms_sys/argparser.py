@@ -6,7 +6,7 @@ Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: May.29.2023
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -30,11 +30,6 @@ from shutil import which
 import argparse
 import platform
 from videomass.vdms_sys.msg_info import current_release
-try:
-    import wx
-    MSGWX = f"{wx.version()}"
-except ModuleNotFoundError as errwx:
-    MSGWX = f"not installed! ({errwx})"
 
 
 def info_this_platform():
@@ -42,6 +37,11 @@ def info_this_platform():
     Get information about operating system, version of
     Python and wxPython.
     """
+    try:
+        import wx  # not imported by the headless mode
+        msgwx = f"{wx.version()}"
+    except ModuleNotFoundError as errwx:
+        msgwx = f"not installed! ({errwx})"
     osys = platform.system_alias(platform.system(),
                                  platform.release(),
                                  platform.version(),
@@ -51,7 +51,7 @@ def info_this_platform():
                 f"Release: {osys[1]}\n"
                 f"Architecture: {platform.architecture()}\n"
                 f"Python: {sys.version}\n"
-                f"wxPython: {MSGWX}"
+                f"wxPython: {msgwx}"
                 )
     return thisplat
 
@@ -59,7 +59,15 @@ def info_this_platform():
 def arguments():
     """Parser for command line options"""
     parser = argparse.ArgumentParser(description=('GUI for FFmpeg and '
-                                                  'yt-dlp'),)
+                                                  'yt-dlp'),
+                                     epilog=("Type 'videomass batch -h' "
+                                             "for help on the headless "
+                                             "batch processing, "
+                                             "'videomass watch -h' for "
+                                             "the hot folders and "
+                                             "'videomass worker -h' for "
+                                             "the worker daemon."),
+                                     )
     parser.add_argument('-v', '--version',
                         help="Show the current version and exit",
                         action="store_true",
@@ -119,3 +127,25 @@ def arguments():
         print("Type -h for help.")
 
     return vars(argmts)
+
+
+def main():
+    """
+    Entry point of Videomass. The `batch` command runs the
+    presets without starting the GUI, the `watch` command
+    converts the files of the hot folders and the `worker`
+    command runs the worker daemon, all without importing wx
+    (see `headless` module), the GUI is started otherwise.
+    """
+    if sys.argv[1:2] == ['batch']:
+        from videomass.vdms_sys.headless import batch
+        sys.exit(batch(sys.argv[2:]))
+    if sys.argv[1:2] == ['watch']:
+        from videomass.vdms_sys.headless import watch
+        sys.exit(watch(sys.argv[2:]))
+    if sys.argv[1:2] == ['worker']:
+        from videomass.vdms_sys.headless import worker
+        sys.exit(worker(sys.argv[2:]))
+
+    from videomass import gui_app
+    gui_app.main()
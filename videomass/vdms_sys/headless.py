@@ -0,0 +1,577 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: headless.py
+Porpose: batch processing, hot folders and worker daemon without GUI
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import builtins
+import argparse
+import contextlib
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from videomass.vdms_sys.configurator import DataSource
+from videomass.vdms_io.presets_manager_prop import json_data
+from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.output_manifest import OutputManifest
+from videomass.vdms_io.watch_folder import FolderWatcher, HotFolder
+from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_threads.job_engine import JobEngine
+from videomass.vdms_threads.engine_core import EngineSettings, EventSink
+from videomass.vdms_threads.remote_worker import WorkerDaemon, DEFAULT_PORT
+from videomass.vdms_threads.sched_policy import SchedPolicy
+from videomass.vdms_threads.verify_output import OutputVerifier
+from videomass.vdms_threads.disk_space import DiskGuard
+from videomass.vdms_threads.output_staging import OutputStaging
+from videomass.vdms_threads.proc_stats import ResourceMonitor
+from videomass.vdms_threads.one_pass import one_pass_batch
+from videomass.vdms_threads.two_pass import two_pass_batch
+from videomass.vdms_utils.utils import integer_to_time
+
+
+class Reporter(EventSink):
+    """
+    The event sink of the `JobEngine` in headless mode,
+    which prints the progress of the jobs on stdout as text
+    lines or as JSON lines (`jsonlines=True`), e.g.:
+
+        {"event": "progress", "job": "File 1/2", "percent": 42,
+         "eta": 61500, "speed": 2.1, "cpu": 385, "rss": 327155712}
+
+    The events are "start", "progress", "skipped", "done",
+    "failed", "error", "notice" (e.g. jobs held back by the free
+    space) and "end". The progress of each job is
+    printed once per `interval` seconds at most, with the CPU
+    usage (%) and resident memory (bytes) of its process if
+    sampled (see `ResourceMonitor`).
+    """
+    def __init__(self, jsonlines=False, interval=1.0):
+        self.jsonlines = jsonlines
+        self.interval = interval
+        self.lock = Lock()
+        self.labels = {}  # {jobid: label of the running step}
+        self.printed = {}  # {jobid: time of the last progress}
+
+    def send(self, topic, **kwargs):
+        with self.lock:
+            if topic == 'COUNT_EVT':
+                self.count_event(**kwargs)
+            elif topic == 'UPDATE_EVT':
+                self.update_event(**kwargs)
+            elif topic == 'END_EVT':
+                self.emit('end', None, files=kwargs['msg'])
+
+    def emit(self, event, jobid, **data):
+        """
+        Prints a single event
+        """
+        label = self.labels.get(jobid, '')
+        if self.jsonlines:
+            print(json.dumps({'event': event, 'job': label, **data}),
+                  flush=True)
+            return
+        if event == 'start':
+            text = f'{data["source"]} -> {data["destination"]}'
+        elif event == 'progress':
+            eta = data['eta']
+            eta = 'N/A' if eta is None else integer_to_time(eta)
+            text = (f'{data["percent"]}%  ETA: {eta}  '
+                    f'speed: {data["speed"]}x')
+            if 'cpu' in data:
+                text += f'  cpu: {data["cpu"]}%'
+        elif event == 'end':
+            text = f'{len(data["files"])} source file(s) processed'
+        else:
+            text = data.get('message', '')
+        print(f'[{label}] {event}: {text}' if label else f'{event}: {text}',
+              flush=True)
+
+    @staticmethod
+    def pathname(message):
+        """
+        Returns the pathname of a message such as
+        'Source:  "/path/to/file.mkv"'
+        """
+        return message.split(':', 1)[1].strip().strip('"')
+
+    def count_event(self, count, fsource, destination, duration, end,
+                    jobid=None):
+        """
+        Start and end of the steps, see `JobEngine.run_step`
+        """
+        if end == 'Done':
+            self.emit('done', jobid)
+        elif end == 'error':
+            self.emit('error', jobid, message=count.strip())
+        elif destination.startswith('Destination:'):
+            self.labels[jobid] = count.split('\n')[0]
+            self.printed[jobid] = 0
+            self.emit('start', jobid,
+                      source=Reporter.pathname(fsource),
+                      destination=Reporter.pathname(destination))
+        else:  # skipped step
+            self.labels[jobid] = count.split('\n')[0]
+            self.emit('skipped', jobid, message=destination)
+
+    def update_event(self, output, duration, status, jobid=None,
+                     progress=None):
+        """
+        Progress and failures of the steps, the output
+        lines of ffmpeg are written to the log file only.
+        """
+        if status:
+            self.emit('failed', jobid, status=status, message=output.strip())
+        elif jobid is None and not duration and progress is None:
+            self.emit('notice', None, message=output.strip())
+        elif progress is not None:
+            now = time.monotonic()
+            if (now - self.printed.get(jobid, 0) < self.interval
+                    and progress.state != 'end'):
+                return
+            self.printed[jobid] = now
+            usage = {}
+            if progress.usage is not None:  # see `ResourceMonitor`
+                usage = {'cpu': progress.usage.cpu_percent(),
+                         'rss': progress.usage.rss}
+            self.emit('progress', jobid,
+                      percent=progress.percent(),
+                      eta=progress.eta(),
+                      speed=progress.speed,
+                      **usage,
+                      )
+
+
+def batch_arguments(argv):
+    """
+    Parser for the command line options of `videomass batch`
+    """
+    parser = argparse.ArgumentParser(
+        prog='videomass batch',
+        description=('Converts the given files with a profile of the '
+                     'Presets Manager, without starting the GUI.'),
+    )
+    parser.add_argument('--preset', required=True,
+                        help='Name of the preset, e.g. "Video Streaming"')
+    parser.add_argument('--profile', required=True,
+                        help='Name of the profile of the preset')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        metavar='N',
+                        help=('Number of files processed at the same time '
+                              '(default: the "concurrent_jobs" setting)'))
+    parser.add_argument('-o', '--output-dir', metavar='DIRNAME',
+                        help=('Destination folder (default: the output '
+                              'folder of the settings)'))
+    parser.add_argument('--json', action='store_true',
+                        help='Print the progress as JSON lines')
+    parser.add_argument('-y', '--overwrite', action='store_true',
+                        help='Overwrite the existing output files')
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help=('Skip the files already converted with the '
+                              'same options from unchanged sources, '
+                              'overwriting the outdated ones'))
+    parser.add_argument('--verify', action='store_true',
+                        help=('Check the output files with ffprobe, a file '
+                              'fails if its duration or its streams do not '
+                              'match the source'))
+    parser.add_argument('files', nargs='+', help='Files to convert')
+    return parser.parse_args(argv)
+
+
+def load_appdata():
+    """
+    Returns the application data (see `DataSource`),
+    None on errors.
+    """
+    builtins.__dict__.setdefault('_', lambda msg: msg)  # no translations
+    with contextlib.redirect_stdout(sys.stderr):  # startup messages
+        appdata = DataSource({'make_portable': None}).get_fileconf()
+    if appdata.get('ERROR'):
+        sys.stderr.write(f"Videomass: {appdata['ERROR']}\n")
+        return None
+    return appdata
+
+
+def load_profile(appdata, preset, profile):
+    """
+    Returns the profile named `profile` of the `preset`,
+    None if not found.
+    """
+    path = os.path.join(appdata['confdir'], 'presets', f'{preset}.json')
+    collections = json_data(path, headless=True)
+    if collections == 'error':
+        return None
+    for item in collections:
+        if item.get('Name') == profile:
+            return item
+    sys.stderr.write(f'Videomass: No profile "{profile}" found '
+                     f'in "{path}"\n')
+    return None
+
+
+def file_duration(appdata, filename):
+    """
+    Returns the duration in milliseconds of `filename`,
+    0 if unknown. Raises OSError if the file cannot be read.
+    """
+    probe, error = ffprobe(filename, appdata['ffprobe_cmd'],
+                           hide_banner=None)
+    if error:
+        raise OSError(f'"{filename}": {error}')
+    try:
+        return round(float(probe['format']['duration']) * 1000)
+    except (KeyError, ValueError):
+        return 0
+
+
+def output_files(files, outputdir, outext):
+    """
+    Returns the output pathnames of the `files` with the
+    `outext` extension, the source one if empty (copy).
+    """
+    dest = []
+    for name in files:
+        basename, ext = os.path.splitext(os.path.basename(name))
+        dest.append(os.path.join(outputdir,
+                                 f'{basename}.{outext}' if outext
+                                 else f'{basename}{ext}'))
+    return dest
+
+
+def supported_extensions(profile):
+    """
+    Returns the list of the file extensions supported
+    by the `profile`, empty if any.
+    """
+    supported = ''.join(profile['Supported_list'].split()).split(',')
+    return [] if supported == [''] else supported
+
+
+def output_extension(profile):
+    """
+    Returns the extension of the output files of the
+    `profile`, empty to keep the source one (copy).
+    """
+    outext = profile['Output_extension']
+    return '' if outext == 'copy' else outext
+
+
+def profile_batch(appdata, profile, files, dest, durs, logname):
+    """
+    Returns the `Batch` which converts the `files` to the `dest`
+    pathnames with the `profile`, `durs` are the durations
+    of the files in milliseconds.
+    """
+    outext = output_extension(profile)
+    settings = EngineSettings.from_appdata(appdata)
+    if profile['Second_pass']:
+        args = ('twopass', files, outext, dest, None,
+                [' '.join(profile['First_pass'].split()),
+                 ' '.join(profile['Second_pass'].split())],
+                '', '', 'presets_manager.log', len(files))
+        return two_pass_batch(settings, logname, durs, ('', ''), *args)
+    args = ('onepass', files, outext, dest,
+            ' '.join(profile['First_pass'].split()),
+            None, '', '', 'presets_manager.log', len(files))
+    return one_pass_batch(settings, logname, durs, ('', ''), *args)
+
+
+def batch_maker(appdata, profile, outputdir, logname, overwrite=False,
+                on_error=None):
+    """
+    Returns the `make_batch` callable of a `HotFolder`, which
+    converts the new files with the `profile` to `outputdir`.
+    The files which can't be read by ffprobe and those whose
+    output already exists (unless `overwrite`) are reported
+    to `on_error` and left in place.
+    """
+    on_error = on_error or (lambda msg: None)
+
+    def make_batch(files):
+        todo, dest, durs = [], [], []
+        outext = output_extension(profile)
+        for name, out in zip(files, output_files(files, outputdir, outext)):
+            if os.path.exists(out) and not overwrite:
+                on_error(f'"{out}" already exists, "{name}" skipped')
+                continue
+            try:
+                durs.append(file_duration(appdata, name))
+            except OSError as err:
+                on_error(str(err))
+                continue
+            todo.append(name)
+            dest.append(out)
+        if not todo:
+            return None
+        return profile_batch(appdata, profile, todo, dest, durs, logname)
+    return make_batch
+
+
+def batch(argv):
+    """
+    Runs `videomass batch`, see `batch_arguments`. Returns
+    the exit status: 0 if all the files are successfully
+    processed, 1 otherwise.
+    """
+    argmts = batch_arguments(argv)
+    appdata = load_appdata()
+    if appdata is None:
+        return 1
+
+    profile = load_profile(appdata, argmts.preset, argmts.profile)
+    if profile is None:
+        return 1
+
+    files = [os.path.abspath(name) for name in argmts.files]
+    supported = supported_extensions(profile)
+    if supported:
+        excluded = [name for name in files
+                    if os.path.splitext(name)[1][1:] not in supported]
+        for name in excluded:
+            sys.stderr.write(f'Videomass: Format not supported by the '
+                             f'profile: "{name}"\n')
+        files = [name for name in files if name not in excluded]
+    if not files:
+        return 1
+
+    dest = output_files(files, argmts.output_dir or appdata['outputdir'],
+                        output_extension(profile))
+    exist = [name for name in dest if os.path.exists(name)]
+    if exist and not (argmts.overwrite or argmts.incremental):
+        sys.stderr.write('Videomass: Files already exist, use --overwrite '
+                         'to replace them:\n  {}\n'.format('\n  '.join(exist)))
+        return 1
+
+    jobs = argmts.jobs or appdata['concurrent_jobs']
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            durs = list(executor.map(lambda name: file_duration(appdata,
+                                                                name), files))
+    except OSError as err:
+        sys.stderr.write(f'Videomass: {err}\n')
+        return 1
+
+    logname = make_log_template('presets_manager.log', appdata['logdir'])
+    batchjobs = profile_batch(appdata, profile, files, dest, durs, logname)
+
+    if argmts.incremental:
+        OutputManifest().apply(batchjobs)
+    engine = JobEngine(Reporter(jsonlines=argmts.json), max_workers=jobs,
+                       tmpdir=os.path.join(appdata['cachedir'], 'tmp'),
+                       policy=SchedPolicy.from_settings(appdata),
+                       verifier=(OutputVerifier(appdata['ffprobe_cmd'])
+                                 if argmts.verify or appdata['verify_outputs']
+                                 else None),
+                       diskguard=DiskGuard.from_settings(appdata),
+                       staging=OutputStaging.from_settings(appdata),
+                       monitor=ResourceMonitor.from_settings(appdata))
+    engine.submit(batchjobs)
+    job_control(engine)
+    try:
+        engine.join()
+    except KeyboardInterrupt:
+        engine.stop()
+        engine.join()
+        return 130
+
+    if all(job.state == 'done' for job in batchjobs.jobs):
+        return 0
+    sys.stderr.write(f'Videomass: Not everything was successful, see the '
+                     f'log file: "{logname}"\n')
+    return 1
+
+
+def job_control(engine):
+    """
+    Suspending Videomass from the terminal (Ctrl+Z) also pauses
+    the ffmpeg processes of the `engine`, which do not belong
+    to the process group of the terminal (see `JobEngine.suspend`).
+    """
+    if not JobEngine.CAN_PAUSE:
+        return
+
+    def on_suspend(signum, frame):
+        engine.pause()
+        os.kill(os.getpid(), signal.SIGSTOP)
+
+    def on_continue(signum, frame):
+        engine.resume()
+
+    signal.signal(signal.SIGTSTP, on_suspend)
+    signal.signal(signal.SIGCONT, on_continue)
+
+
+def watch_arguments(argv, appdata):
+    """
+    Parser for the command line options of `videomass watch`,
+    whose defaults are the hot folders of the settings.
+    """
+    parser = argparse.ArgumentParser(
+        prog='videomass watch',
+        description=('Converts the files copied into the watched '
+                     'folders with a profile of the Presets Manager, '
+                     'once they have stopped growing, until interrupted. '
+                     'The defaults are the "Hot folders" settings.'),
+    )
+    parser.add_argument('--preset', default=appdata['watch_preset'],
+                        help='Name of the preset, e.g. "Video Streaming"')
+    parser.add_argument('--profile', default=appdata['watch_profile'],
+                        help='Name of the profile of the preset')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        metavar='N',
+                        help=('Number of files processed at the same time '
+                              '(default: the "concurrent_jobs" setting)'))
+    parser.add_argument('-o', '--output-dir', metavar='DIRNAME',
+                        default=appdata['outputdir'],
+                        help=('Destination folder (default: the output '
+                              'folder of the settings)'))
+    parser.add_argument('-a', '--archive', metavar='DIRNAME',
+                        default=appdata['watch_archive'] or None,
+                        help=('Folder where the sources are moved once '
+                              'converted (default: left in place)'))
+    parser.add_argument('--settle', type=float, default=5.0,
+                        metavar='SECONDS',
+                        help=('Time for which a file must not grow before '
+                              'it is converted (default: %(default)s)'))
+    parser.add_argument('--poll', action='store_true',
+                        help=('Scan the folders periodically instead of '
+                              'using inotify, e.g. for network shares'))
+    parser.add_argument('--json', action='store_true',
+                        help='Print the progress as JSON lines')
+    parser.add_argument('-y', '--overwrite', action='store_true',
+                        help='Overwrite the existing output files')
+    parser.add_argument('--verify', action='store_true',
+                        help='Check the output files with ffprobe')
+    parser.add_argument('folders', nargs='*',
+                        default=appdata['watch_folders'],
+                        help='Folders to watch')
+    return parser.parse_args(argv)
+
+
+def watch(argv):
+    """
+    Runs `videomass watch`, the hot folders daemon which
+    converts the files copied into the watched folders
+    (see `HotFolder`). Returns the exit status.
+    """
+    appdata = load_appdata()
+    if appdata is None:
+        return 1
+    argmts = watch_arguments(argv, appdata)
+    if not argmts.folders or not argmts.preset or not argmts.profile:
+        sys.stderr.write('Videomass: No folders, preset or profile to '
+                         'watch, see "videomass watch -h"\n')
+        return 1
+    folders = [os.path.abspath(x) for x in argmts.folders]
+    for folder in folders:
+        if not os.path.isdir(folder):
+            sys.stderr.write(f'Videomass: Not a folder: "{folder}"\n')
+            return 1
+    if os.path.abspath(argmts.output_dir) in folders:
+        sys.stderr.write('Videomass: The output folder must not be '
+                         'a watched folder\n')
+        return 1
+    profile = load_profile(appdata, argmts.preset, argmts.profile)
+    if profile is None:
+        return 1
+
+    def on_error(message):
+        sys.stderr.write(f'Videomass: {message}\n')
+
+    jobs = argmts.jobs or appdata['concurrent_jobs']
+    logname = make_log_template('hot_folders.log', appdata['logdir'])
+    engine = JobEngine(Reporter(jsonlines=argmts.json), max_workers=jobs,
+                       tmpdir=os.path.join(appdata['cachedir'], 'tmp'),
+                       policy=SchedPolicy.from_settings(appdata),
+                       verifier=(OutputVerifier(appdata['ffprobe_cmd'])
+                                 if argmts.verify or appdata['verify_outputs']
+                                 else None),
+                       diskguard=DiskGuard.from_settings(appdata),
+                       staging=OutputStaging.from_settings(appdata),
+                       monitor=ResourceMonitor.from_settings(appdata))
+    watcher = FolderWatcher(folders, supported_extensions(profile),
+                            settle=argmts.settle, polling=argmts.poll)
+    hot = HotFolder(watcher, engine,
+                    batch_maker(appdata, profile, argmts.output_dir, logname,
+                                argmts.overwrite, on_error),
+                    archive=argmts.archive, on_error=on_error)
+    mode = 'polling' if watcher.inotify is None else 'inotify'
+    print(f'Videomass watching ({mode}): {", ".join(folders)}', flush=True)
+    job_control(engine)
+    signal.signal(signal.SIGTERM, lambda signum, frame: hot.stop(True))
+    try:
+        hot.run()
+    except KeyboardInterrupt:
+        hot.stop(abort=True)
+    engine.join()
+    return 0
+
+
+def worker(argv):
+    """
+    Runs `videomass worker`, the daemon which executes the
+    jobs of other Videomass instances (see `WorkerDaemon`).
+    Returns the exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog='videomass worker',
+        description=('Executes the batch jobs sent by Videomass from '
+                     'other hosts (see the "Worker daemons" setting). '
+                     'Listen on trusted networks only and set the same '
+                     'VIDEOMASS_WORKER_TOKEN environment variable on '
+                     'the clients and on the worker: it is required to '
+                     'listen on non-loopback addresses. Without it, '
+                     'a Unix socket is only accessible to the user '
+                     'running the worker.'),
+    )
+    parser.add_argument('-l', '--listen', metavar='ADDRESS',
+                        default=f'127.0.0.1:{DEFAULT_PORT}',
+                        help=('host:port or pathname of a Unix socket '
+                              '(default: %(default)s)'))
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        metavar='N',
+                        help=('Number of jobs executed at the same time '
+                              '(default: the "concurrent_jobs" setting)'))
+    argmts = parser.parse_args(argv)
+    appdata = load_appdata()
+    if appdata is None:
+        return 1
+
+    logname = make_log_template('worker_daemon.log', appdata['logdir'])
+    try:
+        daemon = WorkerDaemon(argmts.listen,
+                              EngineSettings.from_appdata(appdata),
+                              jobs=argmts.jobs or appdata['concurrent_jobs'],
+                              logname=logname)
+    except OSError as err:
+        sys.stderr.write(f'Videomass: {argmts.listen}: {err}\n')
+        return 1
+    print(f'Videomass worker listening on {argmts.listen}', flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.shutdown()
+    return 0
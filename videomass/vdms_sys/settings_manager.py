@@ -77,6 +77,58 @@ class ConfigManager:
     ffthreads (str):
         Set the number of threads (from 0 to 32)
 
+    concurrent_jobs (int):
+        Number of files processed simultaneously by FFmpeg on
+        batch processing (from 1 to 32), default is 1 .
+
+    split_segments (int):
+        Number of segments in which the long video files are
+        split to be encoded simultaneously by the concurrent jobs
+        on one pass conversions (from 2 to 64), 0 to disable,
+        default is 0 .
+
+    auto_stream_copy (bool):
+        if True, the one pass video conversions copy the streams
+        of the files which already have the codec, profile, pixel
+        format and bitrate of the settings, without filters (see
+        `stream_copy`), default value is True
+
+    remote_workers (str):
+        Worker daemons (`videomass worker`) of other hosts which
+        execute the batch jobs too, e.g. "node1:8765*4, node2:8765"
+        where *4 is the number of jobs run at the same time by the
+        node (default 1), empty to disable, default is "" .
+
+    remote_pathmap (str):
+        Mapping of the shared folders as seen by the worker nodes,
+        e.g. "/home/user/Videos=/mnt/videos; D:/Media=/mnt/media",
+        default is "" .
+
+    job_nice (int):
+        Niceness of the FFmpeg processes of the jobs (from 0 to 19),
+        default is 0 .
+
+    job_ionice (str):
+        I/O scheduling class of the FFmpeg processes of the jobs,
+        `best-effort`, `idle` or "" for the system default (Linux
+        only), default is "" .
+
+    job_affinity (str):
+        Groups of CPUs separated by semicolons, e.g. "0-3; 4-7",
+        each concurrent job is pinned to the less used group
+        (Linux only), empty to disable, default is "" .
+
+    job_memlimit (int):
+        Address space limit of the FFmpeg processes of the jobs
+        in MiB, 0 to disable, default is 0 .
+
+    job_telemetry (bool):
+        if True, the CPU time, peak memory, storage I/O and context
+        switches of the FFmpeg processes of the jobs are sampled
+        (Linux only), shown live, written to the log of each job and
+        summed up at the end of the batch (see `ResourceMonitor`),
+        default value is True
+
     ffplay_loglev (str):
         -loglevel one of `quiet`, `fatal`, `error`, `warning`, `info`
 
@@ -118,6 +170,45 @@ class ConfigManager:
         some other dir.
         default value is False
 
+    incremental (bool):
+        if True, the files already converted by the same commands
+        from unchanged sources are skipped (see `OutputManifest`),
+        default value is False
+
+    verify_outputs (bool):
+        if True, the output files are checked with FFprobe at the
+        end of each job (duration and streams), a job fails if its
+        output does not match the source (see `OutputVerifier`),
+        default value is False
+
+    disk_reserve (int):
+        free space in MiB to be kept on the destination of the jobs
+        and on the scratch folder, the jobs are held back until their
+        estimated output fits, they fail if it never can (see
+        `DiskGuard`), 0 to disable, default is 0 .
+
+    staged_outputs (bool):
+        if True, the output files are written to hidden temporary
+        names, renamed only when the processing succeeds (see
+        `OutputStaging`), default value is True
+
+    scratch_dir (str):
+        folder of the temporary output files, e.g. on a fast local
+        disk, empty to use the output folders, default is "" .
+
+    watch_folders (list of str):
+        hot folders, whose new files are converted with the
+        `watch_preset` and `watch_profile` profile of the Presets
+        Manager (see `HotFolder`), default is [] .
+
+    watch_preset, watch_profile (str):
+        name of the preset and of its profile used by the hot
+        folders, default is "" .
+
+    watch_archive (str):
+        folder where the sources converted by the hot folders are
+        moved, empty to leave them in place, default is "" .
+
     user_trashdir (str):
         If None, it is set to "conf_trashdir" when the program runs
         (see configurator), user specified Path Name otherwise.
@@ -167,7 +258,7 @@ class ConfigManager:
         column width in the format code panel (ytdownloader).
 
     """
-    VERSION = 6.6
+    VERSION = 7.7
     DEFAULT_OPTIONS = {"confversion": VERSION,
                        "outputdir": f"{os.path.expanduser('~')}",
                        "outputdir_asinput": False,
@@ -176,6 +267,16 @@ class ConfigManager:
                        "ffmpeg_islocal": False,
                        "ffmpeg_loglev": "-loglevel info",
                        "ffthreads": "-threads 4",
+                       "concurrent_jobs": 1,
+                       "split_segments": 0,
+                       "auto_stream_copy": True,
+                       "remote_workers": "",
+                       "remote_pathmap": "",
+                       "job_nice": 0,
+                       "job_ionice": "",
+                       "job_affinity": "",
+                       "job_memlimit": 0,
+                       "job_telemetry": True,
                        "ffplay_cmd": "",
                        "ffplay_islocal": False,
                        "ffplay_loglev": "-loglevel error",
@@ -193,6 +294,15 @@ class ConfigManager:
                        "clearcache": True,
                        "clearlogfiles": False,
                        "move_file_to_trash": False,
+                       "incremental": False,
+                       "verify_outputs": False,
+                       "disk_reserve": 0,
+                       "staged_outputs": True,
+                       "scratch_dir": "",
+                       "watch_folders": [],
+                       "watch_preset": "",
+                       "watch_profile": "",
+                       "watch_archive": "",
                        "user_trashdir": None,
                        "locale_name": "Default",
                        "ydlp-outputdir": f"{os.path.expanduser('~')}",
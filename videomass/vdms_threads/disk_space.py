@@ -0,0 +1,332 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: disk_space.py
+Porpose: admission of the jobs by the free space of the destinations
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+import json
+import time
+import shutil
+import builtins
+from threading import Lock
+from videomass.vdms_io.output_manifest import OutputManifest, recipe
+from videomass.vdms_threads.output_staging import OutputStaging
+
+# translation macro (see gui_app), untranslated strings otherwise
+_ = builtins.__dict__.get('_', lambda msg: msg)
+
+MIB = 1048576
+BITRATE = re.compile(r'(?<![\w:-])-(?:b:[va]|[va]b|b)\s+'
+                     r'(\d+(?:\.\d+)?)([kKM]?)(?![\w:-])')
+SCALE = {'': 1, 'k': 1000, 'K': 1000, 'M': 1000000}
+
+
+def options_key(step):
+    """
+    Returns the options of the command of a `step`,
+    without the pathnames (quoted strings), so that
+    the conversions of all the files of a profile
+    have the same key.
+    """
+    text = step.cmd if isinstance(step.cmd, str) else recipe(step.cmd)
+    return re.sub(r'"[^"]*"', '', text)
+
+
+def bitrate_size(options, duration):
+    """
+    Returns the size in bytes of a file of `duration` ms
+    given by the explicit bitrates (e.g. -b:v 2M -b:a 128k)
+    of the `options`, 0 if none.
+    """
+    bps = sum(float(num) * SCALE[unit]
+              for num, unit in BITRATE.findall(options))
+    return int(bps * duration / 8000)
+
+
+class SizeHistory:
+    """
+    Average output rate in bytes per second of the past
+    conversions, by the options of their commands (see
+    `options_key`), stored as JSON file in the cache
+    directory of the application.
+
+        >>> history = SizeHistory('/path/to/cachedir')
+        >>> history.record(key, size, duration)
+        >>> history.rate(key)
+    """
+    FILENAME = 'output_sizes.json'
+    MAXENTRIES = 500
+
+    def __init__(self, cachedir=None):
+        self.filename = (os.path.join(cachedir, SizeHistory.FILENAME)
+                         if cachedir else None)
+        self.lock = Lock()
+        self.rates = {}  # {key: [bytes per second, last use]}
+        if self.filename:
+            try:
+                with open(self.filename, 'r', encoding='utf-8') as fhist:
+                    self.rates = json.load(fhist)
+            except (OSError, ValueError):
+                pass
+
+    def rate(self, key):
+        """
+        Returns the average output rate of the `key`
+        options in bytes per second, None if unknown.
+        """
+        with self.lock:
+            entry = self.rates.get(key)
+        return entry[0] if entry else None
+
+    def record(self, key, size, duration):
+        """
+        Adds an output file of `size` bytes and
+        `duration` ms made by the `key` options.
+        """
+        if duration <= 0 or size <= 0:
+            return
+        rate = size * 1000 / duration
+        with self.lock:
+            old = self.rates.get(key)
+            if old:  # moving average, the recent files weigh more
+                rate = old[0] * 0.7 + rate * 0.3
+            self.rates[key] = [rate, time.time()]
+            if len(self.rates) > SizeHistory.MAXENTRIES:
+                oldest = min(self.rates, key=lambda x: self.rates[x][1])
+                del self.rates[oldest]
+            if not self.filename:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+                with open(f'{self.filename}.tmp', 'w',
+                          encoding='utf-8') as fhist:
+                    json.dump(self.rates, fhist)
+                os.replace(f'{self.filename}.tmp', self.filename)
+            except OSError:
+                pass
+
+
+class DiskGuard:
+    """
+    Admission control of the jobs of the `JobEngine` by the free
+    space of their destination: a job is started only if the free
+    space, less the space still needed by the running jobs on the
+    same file system, is greater than its estimated output size
+    plus the `reserve` (bytes), so that a full output volume does
+    not make all the remaining jobs fail. The jobs held back are
+    started as soon as enough space is freed, those which do not
+    fit even with no other job on the file system are failed at
+    once (see `stuck`), since nothing would free the space. If
+    the outputs are written to temporary names by a `staging`
+    (see `OutputStaging`), the space already used is the one of
+    the temporary files, and the file system of the scratch
+    folder, if any, is checked too.
+
+    The output size is estimated by the rate of the past outputs
+    of the same options (see `SizeHistory`), otherwise by the
+    explicit bitrates of the command and the duration, otherwise
+    as large as the source (i.e. the worst case of most
+    conversions), with a margin of 10%.
+
+        >>> guard = DiskGuard(1024 * MIB, SizeHistory(cachedir))
+        >>> guard.acquire(job)  # True if the job can be started
+        >>> guard.release(job)
+    """
+    MARGIN = 1.1
+
+    def __init__(self, reserve, history=None, staging=None):
+        self.reserve = reserve
+        self.history = history or SizeHistory()
+        self.staging = staging
+        # {job.ident: (devices, file written, its device, estimate)}
+        self.active = {}
+        self.held = set()  # idents of the jobs held back
+        self.shortage = {}  # {job.ident: (folder, free, alone)}
+        self.free = {}  # {folder: (free bytes, time of the check)}
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Returns the guard of the "disk_reserve" setting (MiB),
+        None if disabled.
+        """
+        reserve = settings.get('disk_reserve', 0)
+        if not reserve:
+            return None
+        return cls(reserve * MIB, SizeHistory(settings.get('cachedir')),
+                   OutputStaging.from_settings(settings))
+
+    @staticmethod
+    def existing(folder):
+        """
+        Returns the nearest existing folder of `folder`,
+        which may be not yet created, None if none.
+        """
+        while folder and not os.path.isdir(folder):
+            parent = os.path.dirname(folder)
+            if parent == folder:
+                return None
+            folder = parent
+        return folder or None
+
+    def output(self, job):
+        """
+        Returns the output file of the `job` and its
+        existing folder, (None, None) if it has not.
+        """
+        if not job.steps or not job.steps[-1].destination:
+            return None, None
+        output = os.path.abspath(job.steps[-1].destination)
+        folder = self.existing(output if os.path.isdir(output)
+                               else os.path.dirname(output))
+        return (output, folder) if folder else (None, None)
+
+    def estimate(self, job):
+        """
+        Returns the estimated size in bytes of
+        the output file of the `job`.
+        """
+        step = job.steps[-1]
+        if step.cmd is None:  # skipped
+            return 0
+        rate = self.history.rate(options_key(step))
+        if rate and step.duration:
+            size = rate * step.duration / 1000
+        else:
+            size = bitrate_size(options_key(step), step.duration)
+        if not size:
+            size = sum(os.path.getsize(src) for src in job.sources
+                       if os.path.isfile(src))
+        return int(size * DiskGuard.MARGIN)
+
+    @staticmethod
+    def device(folder):
+        """
+        Returns the identifier of the file system of `folder`
+        """
+        return os.stat(folder).st_dev
+
+    def free_space(self, folder):
+        """
+        Returns the free space of the file system of `folder`,
+        which is checked once per second at most.
+        """
+        free, since = self.free.get(folder, (0, None))
+        if since is None or time.monotonic() - since > 1:
+            free = shutil.disk_usage(folder).free
+            self.free[folder] = (free, time.monotonic())
+        return free
+
+    def acquire(self, job):
+        """
+        Returns True if the `job` can be started, then its
+        output counts as used space until `release`. The
+        output is written to the file system of its folder
+        and to the one of the scratch folder, if any.
+        """
+        output, folder = self.output(job)
+        if output is None:
+            return True
+        written, folders = output, [folder]
+        if self.staging is not None:
+            written = self.staging.partname(output)
+            scratch = self.existing(self.staging.scratch)
+            if scratch:
+                folders.append(scratch)
+        estimate = self.estimate(job)
+        devices, writedev = [], None  # the output one first
+        for path in folders:
+            try:
+                device = self.device(path)
+                free = self.free_space(path)
+            except OSError:
+                continue  # ffmpeg will report the error
+            writedev = device  # of the scratch folder if any
+            if device in devices:
+                continue
+            devices.append(device)
+            needed, alone = estimate, True
+            for ident, (devs, out, outdev, size) in self.active.items():
+                if device not in devs or ident == job.ident:
+                    continue
+                alone = False
+                try:  # the part written so far is already used
+                    needed += (max(0, size - os.path.getsize(out))
+                               if device == outdev else size)
+                except OSError:
+                    needed += size
+            if free - needed < self.reserve:
+                self.shortage[job.ident] = (path, free, alone)
+                return False
+        self.active[job.ident] = (devices, written, writedev, estimate)
+        self.held.discard(job.ident)
+        self.shortage.pop(job.ident, None)
+        return True
+
+    def stuck(self, job):
+        """
+        Returns True if the `job` held back does not fit even
+        with no other job on the file system, so that waiting
+        would not free the space.
+        """
+        shortage = self.shortage.get(job.ident)
+        return bool(shortage and shortage[2])
+
+    def hold(self, job):
+        """
+        Returns the notice of the `job` held back, None
+        if it has been already given and it is waiting.
+        """
+        if job.ident in self.held and not self.stuck(job):
+            return None
+        self.held.add(job.ident)
+        output = self.output(job)[0]
+        folder, free = self.shortage[job.ident][:2]
+        text = (_('the job cannot be started.') if self.stuck(job)
+                else _('waiting for free space...'))
+        return _('Not enough free space on "{0}" for "{1}" (about {2} MiB '
+                 'needed, {3} MiB free, {4} MiB reserved): {5}').format(
+                     folder, os.path.basename(output),
+                     self.estimate(job) // MIB, free // MIB,
+                     self.reserve // MIB, text)
+
+    def release(self, job):
+        """
+        Releases the space of an ended `job`, learning
+        the output rate of its options if it is done.
+        """
+        self.active.pop(job.ident, None)
+        self.held.discard(job.ident)
+        self.shortage.pop(job.ident, None)
+        self.free.clear()
+        output = OutputManifest.output(job)
+        step = job.steps[-1] if job.steps else None
+        if job.state != 'done' or not output or step.cmd is None:
+            return
+        try:
+            self.history.record(options_key(step), os.path.getsize(output),
+                                step.duration)
+        except OSError:
+            pass
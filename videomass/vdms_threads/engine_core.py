@@ -0,0 +1,131 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: engine_core.py
+Porpose: settings and event sinks of the encoding engines
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import queue
+
+
+class EngineSettings(dict):
+    """
+    The settings used by the encoding engines (`JobEngine`, batch
+    builders, `FFmpegGenericTask`, `VolumeDetectThread`), taken
+    from the application data (see `DataSource.get_fileconf`),
+    which also holds objects that can't be shared with other
+    processes (e.g. functions). Being a plain mapping of strings
+    and numbers, it can be pickled, e.g. for a `multiprocessing`
+    worker, and it is a snapshot: later changes of the preferences
+    do not affect the batches already built.
+
+        >>> settings = EngineSettings.from_appdata(appdata)
+        >>> settings['ffmpeg_cmd']
+    """
+    KEYS = ('ostype',
+            'ffmpeg_cmd',
+            'ffprobe_cmd',
+            'ffmpeg_default_args',
+            'ffthreads',
+            'cachedir',
+            'logdir',
+            'concurrent_jobs',
+            'split_segments',
+            'remote_workers',
+            'remote_pathmap',
+            'job_nice',
+            'job_ionice',
+            'job_affinity',
+            'job_memlimit',
+            'job_telemetry',
+            'disk_reserve',
+            'staged_outputs',
+            'scratch_dir',
+            )
+    # the settings which are part of the ffmpeg command lines
+    COMMAND_KEYS = ('ffmpeg_cmd',
+                    'ffmpeg_default_args',
+                    'ffthreads',
+                    'split_segments',
+                    )
+
+    @classmethod
+    def from_appdata(cls, appdata):
+        """
+        Returns the settings of the engines
+        found in the `appdata` dict
+        """
+        return cls({key: appdata[key] for key in cls.KEYS if key in appdata})
+
+
+class EventSink:
+    """
+    Interface of the objects which receive the messages of the
+    encoding engines, by topic and keyword arguments, e.g.:
+
+        >>> sink.send("COUNT_EVT", count='File 1/1', ...)
+
+    The messages are sent from the worker threads. The topics
+    and the arguments are those of the pubsub protocol used by
+    the GUI (see `WxSink` in `wx_adapter`). The sinks are also
+    callable, so that a plain function with the same signature
+    can be used instead.
+    """
+    def send(self, topic, **kwargs):
+        """
+        Receives a message of the engine
+        """
+        raise NotImplementedError
+
+    def __call__(self, topic, **kwargs):
+        self.send(topic, **kwargs)
+
+
+class NullSink(EventSink):
+    """
+    Discards all the messages
+    """
+    def send(self, topic, **kwargs):
+        pass
+
+
+class QueueSink(EventSink):
+    """
+    Queues the messages, which are then taken by the
+    consumer thread in the same order with `drain`.
+    """
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+
+    def send(self, topic, **kwargs):
+        self.queue.put((topic, kwargs))
+
+    def drain(self):
+        """
+        Generator of the queued (topic, kwargs) messages,
+        it ends when the queue is empty.
+        """
+        while True:
+            try:
+                yield self.queue.get_nowait()
+            except queue.Empty:
+                return
@@ -0,0 +1,166 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: ffmpeg_progress.py
+Porpose: parsing of the FFmpeg's -progress output
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+PROGRESS_ARGS = ['-progress', 'pipe:1', '-nostats']
+
+
+def _number(value, cast=int):
+    """
+    Converts the `value` string to number, e.g. "N/A" or
+    "1.5x" (speed) to 0 and 1.5 respectively.
+    """
+    try:
+        return cast(value.rstrip('x').strip())
+    except ValueError:
+        return cast(0)
+
+
+class Progress:
+    """
+    A snapshot of the progress of an FFmpeg process,
+    parsed from a block of key=value lines of the
+    `-progress` output, e.g.:
+
+        frame=1178
+        fps=155.00
+        bitrate= 435.0kbits/s
+        total_size=2121728
+        out_time_us=39020000
+        speed=5.15x
+        progress=continue
+
+    `duration` is the overall duration of the processing
+    in milliseconds, 0 if unknown.
+    """
+    def __init__(self, values, duration=0):
+        self.values = values  # the parsed key=value pairs
+        self.frame = _number(values.get('frame', ''))
+        self.fps = _number(values.get('fps', ''), float)
+        self.bitrate = values.get('bitrate', 'N/A').strip()
+        self.total_size = _number(values.get('total_size', ''))
+        self.out_time_us = max(_number(values.get('out_time_us', '')), 0)
+        self.speed = _number(values.get('speed', ''), float)
+        self.dup_frames = _number(values.get('dup_frames', ''))
+        self.drop_frames = _number(values.get('drop_frames', ''))
+        self.state = values.get('progress', '')  # "continue" or "end"
+        self.duration = duration if isinstance(duration, int) else 0
+        self.usage = None  # resources of the process, see `proc_stats`
+
+    @property
+    def msec(self):
+        """
+        Current time position in milliseconds,
+        limited to the overall duration.
+        """
+        msec = self.out_time_us // 1000
+        if self.duration:
+            return min(msec, self.duration)
+        return msec
+
+    def percent(self):
+        """
+        Returns the percentage of progress (int),
+        100 if the duration is unknown.
+        """
+        if self.state == 'end' or not self.duration:
+            return 100
+        return round(self.msec / self.duration * 100)
+
+    def eta(self):
+        """
+        Returns the estimated time remaining in milliseconds,
+        None if unknown.
+        """
+        if self.state == 'end':
+            return 0
+        if not self.duration or not self.speed:
+            return None
+        return round((self.duration - self.msec) / self.speed)
+
+    def discount(self, elapsed, paused):
+        """
+        Excludes the `paused` seconds from the `elapsed` seconds
+        of the process, which ffmpeg counts as processing time:
+        the speed (and so the ETA) is recalculated on the time
+        spent running.
+        """
+        if self.speed and 0 < paused < elapsed:
+            self.speed = round(self.speed * elapsed / (elapsed - paused), 3)
+            self.values['speed'] = f'{self.speed}x'
+
+    def summary(self):
+        """
+        Returns a short description, e.g.
+        "frame: 1178 | fps: 155.0 | size: 2072kB | bitrate: 435.0kbits/s
+        | speed: 5.15x", followed by the resource usage if any.
+        """
+        items = []
+        if self.frame:
+            items.append(f'frame: {self.frame}')
+            items.append(f'fps: {self.fps}')
+        items.append(f'size: {self.total_size // 1024}kB')
+        items.append(f'bitrate: {self.bitrate}')
+        items.append(f'speed: {self.speed}x')
+        if self.usage is not None:
+            items.append(self.usage.summary())
+        return ' | '.join(items)
+
+
+def iter_progress(lines, duration=0):
+    """
+    Generator which yields a `Progress` object for each
+    block of the `-progress` output read from `lines`
+    (an iterable, e.g. the stdout of the process).
+    """
+    values = {}
+    for line in lines:
+        key, sep, value = line.strip().partition('=')
+        if not sep:
+            continue
+        values[key] = value
+        if key == 'progress':  # end of block
+            yield Progress(values, duration)
+            values = {}
+
+
+def with_progress(cmd):
+    """
+    Adds the options which write the progress to the stdout
+    of ffmpeg, replacing the `-stats` option (progress lines
+    on stderr), so that stderr carries only diagnostics.
+    `cmd` is a command line string (quoted executable first),
+    or a list of arguments.
+    """
+    if isinstance(cmd, list):
+        args = ['-nostats' if arg == '-stats' else arg for arg in cmd[1:]]
+        return cmd[:1] + PROGRESS_ARGS + args
+    if cmd.startswith('"'):
+        end = cmd.index('"', 1) + 1
+    else:
+        end = cmd.find(' ') if ' ' in cmd else len(cmd)
+    rest = f'{cmd[end:]} '.replace(' -stats ', ' -nostats ')
+    return f'{cmd[:end]} {" ".join(PROGRESS_ARGS)}{rest.rstrip()}'
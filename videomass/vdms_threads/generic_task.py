@@ -6,7 +6,7 @@ Compatibility: Python3 (Unix, Windows)
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Mar.04.2023
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -27,9 +27,8 @@ This file is part of Videomass.
 from threading import Thread
 import platform
 import subprocess
-import wx
-from pubsub import pub
 from videomass.vdms_utils.utils import Popen
+from videomass.vdms_threads.engine_core import NullSink
 if not platform.system() == 'Windows':
     import shlex
 
@@ -41,7 +40,7 @@ class FFmpegGenericTask(Thread):
     for debugging, however you can get the exit status message.
 
     USAGE:
-        >>> thread = FFmpegGenericTask(args)
+        >>> thread = FFmpegGenericTask(args, settings)
         >>> thread.join()
         >>> error = thread.status
         >>> if error:
@@ -50,17 +49,22 @@ class FFmpegGenericTask(Thread):
     Raise: `OSError` if not FFmpeg
     Return: None
 
+    In the GUI use `wx_adapter.generic_task` instead.
     """
-    get = wx.GetApp()
-    appdata = get.appset
-
-    def __init__(self, args, procname='Unknown', logfile='logfile.log'):
+    def __init__(self, args, settings, procname='Unknown',
+                 logfile='logfile.log', notify=None):
         """
         Attributes defined here:
 
         self.args, a string containing the command args
         of FFmpeg, excluding the command itself `ffmpeg`
 
+        self.settings, the `EngineSettings` which give the
+        ffmpeg command and its default arguments.
+
+        self.notify, the `EventSink` which receives the
+        "RESULT_EVT" message at the end of the task.
+
         self.status, If the exit status is true (which can be an
         exception or error message given by returncode) it must be
         handled appropriately, in the other case it is None.
@@ -69,6 +73,8 @@ class FFmpegGenericTask(Thread):
         self.logfile = logfile
         self.procname = procname
         self.args = args
+        self.settings = settings
+        self.notify = notify if notify is not None else NullSink()
         self.status = None
 
         Thread.__init__(self)
@@ -81,8 +87,8 @@ class FFmpegGenericTask(Thread):
         OSError exception. Otherwise the getted output is None
 
         """
-        cmd = (f'"{FFmpegGenericTask.appdata["ffmpeg_cmd"]}" '
-               f'{FFmpegGenericTask.appdata["ffmpeg_default_args"]} '
+        cmd = (f'"{self.settings["ffmpeg_cmd"]}" '
+               f'{self.settings["ffmpeg_default_args"]} '
                f'{self.args}'
                )
         self.logwrite(f'From: {self.procname}\n{cmd}\n')
@@ -108,10 +114,7 @@ class FFmpegGenericTask(Thread):
 
         if self.status:
             self.logerror()
-        wx.CallAfter(pub.sendMessage,
-                     "RESULT_EVT",
-                     status=''
-                     )
+        self.notify("RESULT_EVT", status='')
     # ----------------------------------------------------------------#
 
     def logwrite(self, cmd):
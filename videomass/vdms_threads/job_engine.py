@@ -0,0 +1,984 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: job_engine.py
+Porpose: central queue and scheduler of the FFmpeg processes
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import time
+import signal
+import builtins
+import itertools
+import subprocess
+import platform
+import tempfile
+import shutil
+from threading import Thread, Condition, current_thread
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_io.log_sink import log_sink
+from videomass.vdms_threads.ffmpeg_progress import with_progress, iter_progress
+from videomass.vdms_threads.proc_stats import usage_table
+if not platform.system() == 'Windows':
+    import shlex
+
+# translation macro (see gui_app), untranslated strings otherwise
+_ = builtins.__dict__.get('_', lambda msg: msg)
+
+
+class Step:
+    """
+    A single FFmpeg process of a `Job`.
+
+    cmd (str, list, callable):
+        the command line to execute. A list of command lines
+        is executed one after the other without real-time output,
+        sending the `echo` strings (list) as output on success.
+        If callable, it is called with the running job as argument
+        just before execution and must return a str or a list.
+        If the command resolves to None the step is skipped and the
+        `skipmsg` string is displayed instead.
+    count (str):
+        title of the step, e.g. 'File 1/10 - Pass One'
+    source, destination (str):
+        input and output pathnames (for messages and log only)
+    duration (int):
+        duration in milliseconds used to calculate the progress
+    parser (callable):
+        optional callable, called with each output line and
+        the running job as arguments.
+    progress (bool):
+        if True (default) the progress is read from the output
+        of the ffmpeg's `-progress` option, which is added to
+        the command line (see `ffmpeg_progress` module).
+    """
+    def __init__(self, cmd, count, source='', destination='', duration=0,
+                 parser=None, echo=None, skipmsg='', progress=True):
+        self.cmd = cmd
+        self.count = count
+        self.source = source
+        self.destination = destination
+        self.duration = duration if isinstance(duration, int) else 0
+        self.parser = parser
+        self.echo = echo
+        self.skipmsg = skipmsg
+        self.progress = progress
+
+    def resolve(self, job):
+        """
+        Returns the command line(s) of this step
+        """
+        if callable(self.cmd):
+            return self.cmd(job)
+        return self.cmd
+
+    def resolve_echo(self, job):
+        """
+        Returns the list of echo strings of this step
+        """
+        if callable(self.echo):
+            return self.echo(job)
+        return self.echo or []
+
+
+class Job:
+    """
+    A unit of work made of one or more `Step` objects executed
+    in sequence by a worker of the `JobEngine`. The job stops at
+    the first step that fails.
+
+    sources (list):
+        source files of this job, returned to the caller on success
+        (e.g. to be moved to the trash folder)
+    priority (int):
+        lower values run first, default is the batch priority
+    light (bool):
+        if True the job can also be run by the additional worker
+        reserved for light jobs (e.g. audio analysis)
+    requires (Job, list):
+        a job (or a list of jobs) that must be successfully
+        completed before this one is started; if any of them
+        fails this job is skipped.
+    gate (callable):
+        if given, the job is not started until it returns True
+    workdir (bool, Job):
+        if True a private temporary working directory is created
+        when the job starts (see `path`), if a Job is given its
+        working directory is shared. The directory is removed
+        when no more jobs use it.
+    on_end (callable):
+        called with the job as argument when the job ends.
+    """
+    FINAL = ('done', 'failed', 'aborted', 'skipped')
+
+    def __init__(self, steps, sources=(), label='', priority=None,
+                 light=False, requires=None, gate=None, workdir=False,
+                 on_end=None):
+        self.steps = steps
+        self.sources = list(sources)
+        self.label = label
+        self.priority = priority
+        self.light = light
+        self.requires = requires
+        self.gate = gate
+        self.workdir = workdir
+        self.on_end = on_end
+        self.state = 'queued'
+        self.path = None  # working directory, if any
+        self.data = {}  # data shared between steps and jobs
+        self.ident = None  # set by the engine
+        self.batch = None  # set by the engine
+        self.usage = None  # resources used, see `ResourceMonitor`
+
+    @property
+    def duration(self):
+        """
+        Overall duration of the steps in milliseconds
+        """
+        return sum(step.duration for step in self.steps)
+
+    def required(self):
+        """
+        Returns the list of the required jobs
+        """
+        if self.requires is None:
+            return []
+        if isinstance(self.requires, Job):
+            return [self.requires]
+        return list(self.requires)
+
+    def owner(self):
+        """
+        Returns the job which owns the working directory
+        used by this job, None otherwise.
+        """
+        if self.workdir is True:
+            return self
+        if isinstance(self.workdir, Job):
+            return self.workdir
+        return None
+
+
+class Batch:
+    """
+    A list of `Job` objects submitted together, e.g. all the
+    files of a conversion started from a panel. At the end of
+    the batch the engine sends the "END_EVT" message with the
+    successfully processed source files.
+
+    If a `journal` is given (see `BatchJournal`) each change of
+    state of the jobs is recorded to it, and it is closed at the
+    end of the batch.
+    """
+    HIGH, NORMAL, LOW = 0, 1, 2  # priorities
+
+    def __init__(self, jobs, logname, topic='', priority=NORMAL):
+        self.jobs = jobs
+        self.logname = logname
+        self.topic = topic
+        self.priority = priority
+        self.ident = None  # set by the engine
+        self.journal = None
+
+    @property
+    def duration(self):
+        """
+        Overall duration of the jobs in milliseconds
+        """
+        return sum(job.duration for job in self.jobs)
+
+    def finished(self):
+        """
+        Returns True if all the jobs are ended
+        """
+        return all(job.state in Job.FINAL for job in self.jobs)
+
+    def filedone(self):
+        """
+        Returns the source files of the successful jobs, except
+        the ones of the jobs with nothing to run (e.g. outputs
+        already up to date, see `OutputManifest`).
+        """
+        return [src for job in self.jobs if job.state == 'done'
+                and any(step.cmd is not None for step in job.steps)
+                for src in job.sources]
+
+
+class JobEngine:
+    """
+    Runs the jobs of one or more batches on a bounded pool of
+    `max_workers` threads, each one owning at most one FFmpeg
+    process at a time. Pending jobs are started by priority and
+    then by submission order; new batches can be submitted while
+    others are running. An additional worker runs the `light`
+    jobs only, so that they can be executed on spare cores while
+    the others workers are busy. The `remotes` workers (see
+    `RemoteWorker`) add their slots to the pool, executing the
+    jobs on worker daemons of other hosts. The local processes
+    are started with the scheduling `policy`, if any (see
+    `SchedPolicy`). The running jobs can be paused and resumed
+    (see `pause`), the paused time is not counted by the
+    estimated time remaining. If a `verifier` is given (see
+    `OutputVerifier`), the jobs which deliver output files are
+    "verifying" until their outputs are checked, then "done" or
+    "failed"; the batch does not end before. If a `diskguard` is
+    given (see `DiskGuard`), the jobs are not started until their
+    destination has enough free space, they fail if it can never
+    have it. With a `staging` (see
+    `OutputStaging`) the outputs are written to temporary names,
+    renamed to the destinations when the steps succeed. With a
+    `monitor` (see `ResourceMonitor`) the resources used by the
+    processes are sampled: they are written to the log file with
+    a summary table at the end of each batch, and sent live with
+    the progress.
+
+    The engine does not depend on the GUI: all messages are sent
+    to the `notify` sink (an `EventSink` of the `engine_core` module,
+    or any callable), called as notify(topic, **kwargs) with the
+    same topics and arguments of the pubsub protocol used
+    by the `LogOut` panel ("COUNT_EVT", "UPDATE_EVT", "END_EVT");
+    the progress of the processes is sent as `Progress` objects
+    by the `progress` argument of "UPDATE_EVT".
+    When more than one process may be running, messages carry the
+    `jobid` argument. The output of the processes is also written
+    to the log file of the batch.
+
+    Usage:
+        >>> engine = JobEngine(notify, max_workers=4, tmpdir='/tmp')
+        >>> engine.submit(Batch([Job([Step(cmd, 'File 1/1')])], logname))
+        >>> engine.join()
+    """
+    NOT_EXIST_MSG = _("Is 'ffmpeg' installed on your system?")
+    CAN_PAUSE = hasattr(signal, 'SIGSTOP')  # not on MS Windows
+
+    def __init__(self, notify, max_workers=1, tmpdir=None, remotes=None,
+                 policy=None, verifier=None, diskguard=None, staging=None,
+                 monitor=None):
+        """
+        `tmpdir` is the location of the working directories
+        of the jobs, the system default if None.
+        """
+        self.notify = notify
+        self.max_workers = max(1, max_workers)
+        self.tmpdir = tmpdir
+        self.remotes = remotes or []
+        self.policy = policy
+        self.verifier = verifier
+        self.diskguard = diskguard
+        self.staging = staging
+        self.monitor = monitor
+        self.verifying = 0  # jobs whose outputs are being checked
+        self.cpugroups = {}  # {job.ident: CPU group of the policy}
+        self.cond = Condition()
+        self.pending = []  # queued jobs
+        self.running = {}  # {job.ident: Popen or None}
+        self.batches = []  # unfinished batches
+        self.workers = {}  # {Thread: light (bool) or RemoteWorker}
+        self.workdirs = {}  # {pathname: number of users}
+        self.stopped = False
+        self.stop_on_error = True  # a missing ffmpeg stops all the jobs
+        self.paused = False  # no jobs are started if True
+        self.pauses = {}  # {job.ident: [paused seconds, paused since]}
+        self.concurrent = (self.max_workers > 1  # send `jobid` if True
+                           or bool(self.remotes))
+        self.jobcount = itertools.count(1)
+        self.batchcount = itertools.count(1)
+
+    def submit(self, batch):
+        """
+        Queues the jobs of `batch` and starts the workers.
+        Returns the batch.
+        """
+        with self.cond:
+            batch.ident = next(self.batchcount)
+            self.batches.append(batch)
+            for job in batch.jobs:
+                job.ident = next(self.jobcount)
+                job.batch = batch
+                if job.priority is None:
+                    job.priority = batch.priority
+                if job.light:
+                    self.concurrent = True
+                if job.state in Job.FINAL:  # e.g. done on a resumed batch
+                    continue
+                if self.stopped:
+                    self.set_state(job, 'aborted')
+                else:
+                    self.pending.append(job)
+            self.check_batch(batch)
+            self.spawn()
+            self.cond.notify_all()
+        return batch
+
+    def spawn(self):
+        """
+        Starts the missing workers. Must be called with
+        `self.cond` acquired.
+        """
+        if not self.pending:
+            return
+        normal = len([x for x in self.workers.values() if not x])
+        for num in range(self.max_workers - normal):
+            self.start_worker(False)
+        if (any(job.light for job in self.pending)
+                and True not in self.workers.values()):
+            self.start_worker(True)
+        for remote in self.remotes:
+            if remote.offline:
+                continue
+            running = [x for x in self.workers.values() if x is remote]
+            for num in range(remote.slots - len(running)):
+                self.start_worker(remote)
+
+    def start_worker(self, light):
+        """
+        Starts a new worker thread, `light` is a bool
+        or the `RemoteWorker` used by the thread.
+        """
+        work = Thread(target=self.worker, args=(light,), daemon=True)
+        self.workers[work] = light
+        work.start()
+
+    def worker(self, light):
+        """
+        Worker thread: runs jobs until there are none left
+        """
+        while True:
+            with self.cond:
+                job = self.next_job(light)
+                if job is None:
+                    del self.workers[current_thread()]
+                    self.cond.notify_all()
+                    return
+            if isinstance(light, bool):
+                self.run_job(job)
+            elif light.available():
+                self.run_job(job, light)
+            else:  # the daemon can't be reached, give the job back
+                with self.cond:
+                    if self.diskguard is not None:
+                        self.diskguard.release(job)
+                    self.running.pop(job.ident, None)
+                    self.set_state(job, 'queued')
+                    self.pending.append(job)
+                    self.spawn()
+                    self.cond.notify_all()
+
+    def ready(self, job):
+        """
+        Returns True if the `job` can be started
+        """
+        if any(req.state != 'done' for req in job.required()):
+            return False
+        return job.gate is None or job.gate()
+
+    def next_job(self, light):
+        """
+        Returns the next job to run, waiting until one is
+        ready. Returns None if there are no more jobs for this
+        worker. Must be called with `self.cond` acquired.
+        """
+        while not self.stopped:
+            for job in [x for x in self.pending
+                        if any(req.state in Job.FINAL and req.state != 'done'
+                               for req in x.required())]:
+                self.pending.remove(job)
+                self.set_state(job, 'skipped')  # the required job failed
+                self.job_finished(job)
+
+            if isinstance(light, bool):
+                mine = [x for x in self.pending if x.light or not light]
+            else:
+                mine = [x for x in self.pending if light.accepts(x)]
+            if not mine:
+                return None
+            if self.paused:
+                self.cond.wait(.5)
+                continue
+            ready = [x for x in mine if self.ready(x)]
+            for job in sorted(ready, key=lambda x: (x.priority, x.ident)):
+                if self.admitted(job):
+                    self.pending.remove(job)
+                    self.set_state(job, 'running')
+                    self.running[job.ident] = None
+                    return job
+            self.cond.wait(.5)
+        return None
+
+    def admitted(self, job):
+        """
+        Returns True if the destination of the `job` has enough
+        free space (see `DiskGuard`), notifies that the job is
+        held back otherwise. The job fails if the space cannot
+        be freed by the other jobs. Must be called with
+        `self.cond` acquired.
+        """
+        if self.diskguard is None or self.diskguard.acquire(job):
+            return True
+        notice = self.diskguard.hold(job)
+        if notice:
+            logwrite('', notice, job.batch.logname)
+            self.notify("UPDATE_EVT",
+                        output=f'{notice}\n',
+                        duration=0,
+                        status=0,
+                        )
+        if self.diskguard.stuck(job):  # nothing would free the space
+            self.pending.remove(job)
+            self.set_state(job, 'failed')
+            label = f'[{job.label}] ' if job.label else ''
+            self.notify("UPDATE_EVT",
+                        output=f'{label}{notice}',
+                        duration=0,
+                        status=1,
+                        )
+            self.diskguard.release(job)
+            self.job_finished(job)
+        return False
+
+    def run_job(self, job, remote=None):
+        """
+        Executes the steps of the `job` in sequence,
+        on the `remote` worker if given.
+        """
+        jobid = job.ident if self.concurrent else None
+        owner = job.owner()
+        with self.cond:
+            if owner is job:
+                if self.tmpdir:
+                    os.makedirs(self.tmpdir, exist_ok=True)
+                job.path = tempfile.mkdtemp(prefix='job-', dir=self.tmpdir)
+                users = [x for x in self.pending if x.workdir is job]
+                self.workdirs[job.path] = 1 + len(users)
+            elif owner is not None:
+                job.path = owner.path
+            if self.policy and remote is None:
+                self.cpugroups[job.ident] = self.policy.acquire()
+
+        if job.ident in self.cpugroups:
+            desc = self.policy.describe(self.cpugroups[job.ident])
+            tag = f'[{job.label}] ' if jobid is not None and job.label else ''
+            log_sink().write(job.batch.logname, f'[POLICY]: {tag}{desc}\n')
+
+        status = 0
+        for step in job.steps:
+            status = self.run_step(job, step, jobid, remote)
+            if status != 0:
+                break
+
+        with self.cond:
+            self.running.pop(job.ident, None)
+            self.pauses.pop(job.ident, None)
+            if job.ident in self.cpugroups:
+                self.policy.release(self.cpugroups.pop(job.ident))
+            if status == 0 and self.verifier and self.verifier.accepts(job):
+                self.set_state(job, 'verifying')
+                self.verifying += 1
+            elif status == 0:
+                self.set_state(job, 'done')
+            elif self.stopped or status is None:
+                self.set_state(job, 'aborted')
+            else:
+                self.set_state(job, 'failed')
+
+        if job.state == 'verifying':
+            self.verifier.submit(job, self.verified)
+        else:
+            self.end_job(job)
+
+    def verified(self, job, problems):
+        """
+        Called by the `verifier` when the output of the `job`
+        has been checked, the job fails if there are `problems`.
+        """
+        if problems:
+            label = f'[{job.label}] ' if job.label else ''
+            text = _('Verification of the output file failed: {0}').format(
+                '; '.join(problems))
+            logwrite('', f'{label}{text}', job.batch.logname)
+            self.notify("UPDATE_EVT",  # no `jobid`, the job is ended
+                        output=f'{label}{text}\n',
+                        duration=0,
+                        status=0,
+                        )
+            self.notify("UPDATE_EVT",
+                        output=f'{label}{text}',
+                        duration=0,
+                        status=1,
+                        )
+        with self.cond:
+            self.verifying -= 1
+            self.set_state(job, 'failed' if problems else 'done')
+        self.end_job(job)
+
+    def end_job(self, job):
+        """
+        Flushes the log and runs the end callback
+        of a finished `job`, then releases it. An error of
+        the callback is logged, the job ends anyway.
+        """
+        log_sink().flush(job.batch.logname)
+        if job.on_end:
+            try:
+                job.on_end(job)
+            except Exception as err:
+                label = f'[{job.label}] ' if job.label else ''
+                logwrite('', f'{label}{err}', job.batch.logname)
+
+        with self.cond:
+            if self.diskguard is not None:
+                self.diskguard.release(job)
+            self.job_finished(job)
+            self.cond.notify_all()
+
+    def run_step(self, job, step, jobid, remote=None):
+        """
+        Executes a single step of the `job`.
+        Returns the exit status, None if the step was
+        interrupted or ffmpeg cannot be executed.
+        """
+        logname = job.batch.logname
+        tag = f'[{job.label}] ' if jobid is not None and job.label else ''
+        if self.stopped:
+            return None
+
+        cmd = step.resolve(job)
+        if cmd is None:  # nothing to do
+            self.notify("COUNT_EVT",
+                        count=step.count,
+                        fsource=f'Source:  "{step.source}"',
+                        destination=step.skipmsg,
+                        duration=step.duration,
+                        end='',
+                        jobid=jobid,
+                        )
+            logwrite(f'{step.count}\nSource: "{step.source}"\n'
+                     f'{step.skipmsg}', '', logname)
+            self.notify("COUNT_EVT",
+                        count='',
+                        fsource='',
+                        destination='',
+                        duration=step.duration,
+                        end='Done',
+                        jobid=jobid,
+                        )
+            return 0
+
+        part = None
+        if self.staging is not None:
+            cmd, part = self.staging.stage(cmd, step.destination,
+                                           local=remote is None)
+        cmdlist = cmd if isinstance(cmd, list) else [cmd]
+        commands = '\n'.join(cmdlist)
+        self.notify("COUNT_EVT",
+                    count=step.count,
+                    fsource=f'Source:  "{step.source}"',
+                    destination=f'Destination:  "{step.destination}"',
+                    duration=step.duration,
+                    end='',
+                    jobid=jobid,
+                    )
+        logwrite(f'{step.count}\nSource: "{step.source}"\nDestination: '
+                 f'"{step.destination}"\n\n[COMMAND]:\n{commands}',
+                 '', logname)  # write n/n + command only
+
+        echo = step.resolve_echo(job)
+        for num, line in enumerate(cmdlist):
+            if isinstance(cmd, list):
+                status = self.execute(job, line, step, jobid, tag,
+                                      quiet=True, remote=remote)
+                if status == 0 and num < len(echo):
+                    self.notify("UPDATE_EVT",
+                                output=echo[num],
+                                duration=0,
+                                status=0,
+                                jobid=jobid,
+                                )
+            else:
+                status = self.execute(job, line, step, jobid, tag,
+                                      remote=remote)
+
+            if (status is None or self.stopped or status) and part:
+                self.staging.discard(part)
+            if status is None or self.stopped:
+                return None
+            if status:  # will add '..failed' to txtctrl
+                self.notify("UPDATE_EVT",
+                            output='',
+                            duration=step.duration,
+                            status=status,
+                            jobid=jobid,
+                            )
+                return status
+
+        if part:
+            try:
+                self.staging.commit(part, step.destination)
+            except OSError as err:
+                self.staging.discard(part)
+                logwrite('', f'{tag}{err}', logname)
+                self.notify("UPDATE_EVT",
+                            output=f'{tag}{err}\n',
+                            duration=step.duration,
+                            status=0,
+                            jobid=jobid,
+                            )
+                self.notify("UPDATE_EVT",
+                            output='',
+                            duration=step.duration,
+                            status=1,
+                            jobid=jobid,
+                            )
+                return 1
+
+        self.notify("COUNT_EVT",
+                    count='',
+                    fsource='',
+                    destination='',
+                    duration=step.duration,
+                    end='Done',
+                    jobid=jobid,
+                    )
+        return 0
+
+    def execute(self, job, cmd, step, jobid, tag, quiet=False, remote=None):
+        """
+        Runs the FFmpeg process of the `cmd` command line.
+        With `quiet` the output is written to the log file
+        on errors only. If the step has `progress` enabled,
+        the progress is read from the `-progress` output of
+        ffmpeg on stdout and sent as `Progress` object, while
+        stderr carries the diagnostics only. Returns the exit
+        status of the process, None if it cannot be executed.
+        With `remote` the command runs on a worker daemon.
+        """
+        if remote is not None:
+            return remote.execute(self, job, cmd, step, jobid, tag, quiet)
+        logname = job.batch.logname
+        progress = step.progress and not quiet
+        if progress:
+            cmd = with_progress(cmd)
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        if job.ident in self.cpugroups:
+            schedargs = self.policy.popen_args(self.cpugroups[job.ident])
+        else:
+            schedargs = {}
+        if JobEngine.CAN_PAUSE:
+            schedargs['start_new_session'] = True  # see `suspend`
+        started, paused = time.monotonic(), self.paused_time(job)
+        try:
+            with Popen(cmd,
+                       stdout=subprocess.PIPE if progress else None,
+                       stderr=subprocess.PIPE,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding='utf8',
+                       cwd=job.path,
+                       **schedargs,
+                       ) as proc:
+                if job.ident in self.cpugroups:
+                    self.policy.apply(proc.pid, self.cpugroups[job.ident])
+                if JobEngine.CAN_PAUSE and job.batch.journal is not None:
+                    job.batch.journal.started(job.batch.jobs.index(job),
+                                              proc.pid,
+                                              os.path.basename(cmd[0]))
+                with self.cond:
+                    self.running[job.ident] = proc
+                    if self.pauses.get(job.ident, [0, None])[1]:
+                        self.suspend(proc, True)
+                if self.monitor is not None:
+                    self.monitor.watch(job.ident, proc.pid)
+                if self.stopped:
+                    proc.terminate()
+
+                if quiet:
+                    error = proc.communicate()[1]
+                    if proc.returncode:
+                        logwrite('', f"Exit status: {proc.returncode}\n"
+                                 f"{error}", logname)
+                    return proc.returncode
+
+                if progress:
+                    reader = Thread(target=self.read_stderr,
+                                    args=(proc, job, step, jobid, tag),
+                                    daemon=True)
+                    reader.start()
+                    for prog in iter_progress(proc.stdout, step.duration):
+                        prog.discount(time.monotonic() - started,
+                                      self.paused_time(job) - paused)
+                        if self.monitor is not None:
+                            prog.usage = self.monitor.current(job.ident)
+                        self.notify("UPDATE_EVT",
+                                    output='',
+                                    duration=step.duration,
+                                    status=0,
+                                    jobid=jobid,
+                                    progress=prog,
+                                    )
+                        if self.stopped:
+                            proc.terminate()
+                            break
+                    reader.join()
+                else:
+                    self.read_stderr(proc, job, step, jobid, tag)
+
+                self.record_usage(job, tag)  # before it is reaped
+                if proc.wait():
+                    logwrite('', f"Exit status: {proc.wait()}", logname)
+                return proc.wait()
+
+        except (OSError, FileNotFoundError) as err:
+            excepterr = f"{err}\n  {JobEngine.NOT_EXIST_MSG}"
+            self.notify("COUNT_EVT",
+                        count=excepterr,
+                        fsource='',
+                        destination='',
+                        duration=0,
+                        end='error',
+                        jobid=jobid,
+                        )
+            if not self.stop_on_error:
+                return 1  # fails this job only
+            self.stop()  # fatal error, do not start any other job
+            return None
+
+        finally:
+            self.record_usage(job, tag)
+            with self.cond:
+                if job.ident in self.running:
+                    self.running[job.ident] = None
+
+    def record_usage(self, job, tag):
+        """
+        Ends the sampling of the process of the `job`, if any,
+        adding its resource usage to the job and writing it to
+        the log file.
+        """
+        usage = (self.monitor.unwatch(job.ident)
+                 if self.monitor is not None else None)
+        if usage is None:
+            return
+        if job.usage is None:
+            job.usage = usage
+        else:
+            job.usage.add(usage)
+        log_sink().write(job.batch.logname,
+                         f'[RESOURCES]: {tag}{usage.describe()}\n')
+
+    def read_stderr(self, proc, job, step, jobid, tag):
+        """
+        Reads the diagnostics of the process, which are
+        displayed, written to the log file and passed to
+        the parser of the step, if any.
+        """
+        for line in proc.stderr:
+            self.notify("UPDATE_EVT",
+                        output=line,
+                        duration=step.duration,
+                        status=0,
+                        jobid=jobid,
+                        )
+            if 'time=' not in line:  # progress line of -stats
+                self.log_output(f'{tag}{line}', job.batch.logname)
+            if step.parser:
+                step.parser(line, job)
+            if self.stopped:
+                proc.terminate()
+                break
+
+    @staticmethod
+    def log_output(line, logname):
+        """
+        Appends an output line of ffmpeg to the log file,
+        without waiting for the disk I/O (see `LogSink`).
+        """
+        log_sink().write(logname, f"[FFMPEG]: {line}")
+
+    @staticmethod
+    def set_state(job, state):
+        """
+        Sets the `state` of the `job`, recording it to the
+        journal of its batch before going on.
+        """
+        job.state = state
+        if job.batch.journal is not None:
+            job.batch.journal.update(job.batch.jobs.index(job), state)
+
+    def job_finished(self, job):
+        """
+        Releases the working directory of an ended job and
+        checks for the end of its batch. Must be called with
+        `self.cond` acquired.
+        """
+        owner = job.owner()
+        if owner is not None and owner.path in self.workdirs:
+            self.workdirs[owner.path] -= 1
+            if self.workdirs[owner.path] <= 0:
+                del self.workdirs[owner.path]
+                shutil.rmtree(owner.path, ignore_errors=True)
+        self.check_batch(job.batch)
+
+    def check_batch(self, batch):
+        """
+        Sends the "END_EVT" message if all the jobs of the
+        `batch` are ended. Must be called with `self.cond`
+        acquired.
+        """
+        if batch in self.batches and batch.finished():
+            self.batches.remove(batch)
+            if batch.journal is not None:
+                batch.journal.close()
+            table = usage_table(batch.jobs)
+            if table:
+                log_sink().write(batch.logname, f'\n{table}\n')
+                self.notify("UPDATE_EVT",
+                            output=f'\n{table}\n',
+                            duration=0,
+                            status=0,
+                            )
+            log_sink().flush(batch.logname, close=True)
+            self.notify("END_EVT", msg=batch.filedone(), batch=batch.ident)
+
+    def cancel(self, job):
+        """
+        Aborts a single `job`, pending or running
+        """
+        with self.cond:
+            if job in self.pending:
+                self.pending.remove(job)
+                self.set_state(job, 'aborted')
+                self.job_finished(job)
+                self.cond.notify_all()
+            elif self.running.get(job.ident) is not None:
+                self.running[job.ident].terminate()
+                self.resume_processes([job.ident])
+
+    def stop(self):
+        """
+        Aborts all the pending jobs and terminates the
+        running processes.
+        """
+        with self.cond:
+            self.stopped = True
+            self.paused = False
+            for job in list(self.pending):
+                self.pending.remove(job)
+                self.set_state(job, 'aborted')
+                self.job_finished(job)
+            for proc in self.running.values():
+                if proc is not None:
+                    proc.terminate()
+            self.resume_processes(list(self.pauses))  # to terminate
+            self.cond.notify_all()
+
+    def pause(self, job=None):
+        """
+        Suspends the processes of the `job`, which can be a pending
+        job too, or of all the running jobs if None; in the latter
+        case no other job is started until `resume`.
+        """
+        with self.cond:
+            if job is None:
+                self.paused = True
+            for ident in list(self.running) if job is None else [job.ident]:
+                pause = self.pauses.setdefault(ident, [0, None])
+                if pause[1] is None:
+                    pause[1] = time.monotonic()
+                    self.suspend(self.running.get(ident), True)
+
+    def resume(self, job=None):
+        """
+        Resumes the processes suspended by `pause`
+        """
+        with self.cond:
+            if job is None:
+                self.paused = False
+            self.resume_processes(list(self.pauses) if job is None
+                                  else [job.ident])
+            self.cond.notify_all()
+
+    def resume_processes(self, idents):
+        """
+        Resumes the processes of the paused jobs of `idents`,
+        adding the time elapsed to their paused time. Must be
+        called with `self.cond` acquired.
+        """
+        for ident in idents:
+            pause = self.pauses.get(ident)
+            if pause and pause[1] is not None:
+                pause[0] += time.monotonic() - pause[1]
+                pause[1] = None
+                self.suspend(self.running.get(ident), False)
+
+    def paused_time(self, job):
+        """
+        Returns the time for which the `job` has been paused
+        in seconds, including the current pause.
+        """
+        with self.cond:
+            seconds, since = self.pauses.get(job.ident, [0, None])
+        return seconds + (time.monotonic() - since if since else 0)
+
+    @staticmethod
+    def suspend(proc, pause):
+        """
+        Suspends (`pause` is True) or resumes a running process,
+        sending SIGSTOP or SIGCONT to its process group, i.e. to
+        ffmpeg and its children. The jobs on the worker daemons
+        (`RemoteConnection`) are paused by the daemon.
+        """
+        if proc is None:
+            return
+        if not isinstance(proc, subprocess.Popen):
+            proc.pause(pause)
+        elif JobEngine.CAN_PAUSE:
+            try:
+                os.killpg(proc.pid, signal.SIGSTOP if pause
+                          else signal.SIGCONT)
+            except OSError:  # already terminated
+                pass
+
+    def is_alive(self):
+        """
+        Returns True if some worker is still running
+        """
+        with self.cond:
+            return bool(self.workers or self.verifying)
+
+    def join(self):
+        """
+        Waits until all the workers are terminated, the
+        outputs verified and their log messages written.
+        """
+        while True:
+            with self.cond:
+                workers = list(self.workers)
+                if not workers and self.verifying:
+                    self.cond.wait(.5)
+                    continue
+            if not workers:
+                log_sink().flush(wait=True)
+                return
+            for work in workers:
+                work.join()
@@ -2,11 +2,11 @@
 """
 Name: one_pass.py
 Porpose: FFmpeg long processing task for one pass processing
-Compatibility: Python3, wxPython4 Phoenix
+Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.17.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -24,156 +24,64 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
-from threading import Thread
-import time
 import itertools
-import subprocess
-import platform
-import wx
-from pubsub import pub
-from videomass.vdms_utils.utils import Popen
-from videomass.vdms_io.make_filelog import logwrite
-if not platform.system() == 'Windows':
-    import shlex
+from videomass.vdms_threads.job_engine import Step, Job, Batch
 
 
-class OnePass(Thread):
+def one_pass_cmd(appdata, infile, outfile, command, vol, timeseq):
     """
-    This class represents a separate thread for running processes,
-    which need to read the stdout/stderr in real time.
-
-    capturing output in real-time (Windows, Unix):
-    https://stackoverflow.com/questions/1388753/how-to-get-output-
-    from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
+    Returns the ffmpeg command line of the one pass
+    processing of `infile`.
     """
-    get = wx.GetApp()  # get videomass wx.App attributes
-    appdata = get.appset
-    NOT_EXIST_MSG = _("Is 'ffmpeg' installed on your system?")
-    # ---------------------------------------------------------------
-
-    def __init__(self, logname, duration, timeseq, *args):
-        """
-        Called from `long_processing_task.topic_thread`.
-        Also see `main_frame.switch_to_processing`.
-        """
-        self.stop_work_thread = False  # process terminate
-        self.input_flist = args[1]  # list of infile (items)
-        self.command = args[4]  # comand set on single pass
-        self.output_flist = args[3]  # output path
-        self.duration = duration  # duration list
-        self.volume = args[7]  # (lista norm.)se non richiesto rimane None
-        self.count = 0  # count first for loop
-        self.countmax = len(args[1])  # length file list
-        self.logname = logname  # title name of file log
-        self.timeseq = timeseq  # ss, t tuple
-
-        Thread.__init__(self)
-
-        self.start()  # start the thread
-
-    def run(self):
-        """
-        Thread started.
-        """
-        filedone = []
-        for (infile,
-             outfile,
-             volume,
-             duration) in itertools.zip_longest(self.input_flist,
-                                                self.output_flist,
-                                                self.volume,
-                                                self.duration,
-                                                fillvalue='',
-                                                ):
-            cmd = (f'"{OnePass.appdata["ffmpeg_cmd"]}" '
-                   f'{self.timeseq[0]} '
-                   f'{OnePass.appdata["ffmpeg_default_args"]} '
-                   f'-i "{infile}" '
-                   f'{self.timeseq[1]} '
-                   f'{self.command} '
-                   f'{volume} '
-                   f'{OnePass.appdata["ffthreads"]} '
-                   f'-y "{outfile}"'
-                   )
-            self.count += 1
-            count = f'File {self.count}/{self.countmax}'
-            com = (f'{count}\nSource: "{infile}"\nDestination: "{outfile}"'
-                   f'\n\n[COMMAND]:\n{cmd}')
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=count,
-                         fsource=f'Source:  "{infile}"',
-                         destination=f'Destination:  "{outfile}"',
-                         duration=duration,
-                         end='',
-                         )
-            logwrite(com, '', self.logname)  # write n/n + command only
-
-            if not platform.system() == 'Windows':
-                cmd = shlex.split(cmd)
-
-            try:
-                with Popen(cmd,
-                           stderr=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding='utf8',
-                           ) as proc:
-                    for line in proc.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=duration,
-                                     status=0,
-                                     )
-                        if self.stop_work_thread:
-                            proc.terminate()
-                            break  # break second 'for' loop
-
-                    if proc.wait():  # error
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='',
-                                     duration=duration,
-                                     status=proc.wait(),
-                                     )
-                        logwrite('',
-                                 f"Exit status: {proc.wait()}",
-                                 self.logname,
-                                 )  # append exit error number
-                    else:  # ok
-                        filedone.append(infile)
-                        wx.CallAfter(pub.sendMessage,
-                                     "COUNT_EVT",
-                                     count='',
-                                     fsource='',
-                                     destination='',
-                                     duration=duration,
-                                     end='Done'
-                                     )
-            except (OSError, FileNotFoundError) as err:
-                excepterr = f"{err}\n  {OnePass.NOT_EXIST_MSG}"
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count=excepterr,
-                             fsource='',
-                             destination='',
-                             duration=0,
-                             end='error',
-                             )
-                break
-
-            if self.stop_work_thread:
-                proc.terminate()
-                break  # break second 'for' loop
+    return (f'"{appdata["ffmpeg_cmd"]}" '
+            f'{timeseq[0]} '
+            f'{appdata["ffmpeg_default_args"]} '
+            f'-i "{infile}" '
+            f'{timeseq[1]} '
+            f'{command} '
+            f'{vol} '
+            f'{appdata["ffthreads"]} '
+            f'-y "{outfile}"'
+            )
+
+
+def file_command(command, index):
+    """
+    Returns the command of the `index` file, `command` is
+    the same for all the files or the list of each one
+    (see `stream_copy.copy_plan`).
+    """
+    return command[index] if isinstance(command, list) else command
 
-        time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT", msg=filedone)
-    # --------------------------------------------------------------------#
 
-    def stop(self):
-        """
-        Sets the stop work thread to terminate the process
-        """
-        self.stop_work_thread = True
+def one_pass_batch(appdata, logname, duration, timeseq, *args):
+    """
+    Returns a `Batch` of one pass processing, one job for each
+    file which is executed by the `JobEngine`.
+    Called from `long_processing_task.topic_thread`.
+    Also see `main_frame.switch_to_processing`.
+    """
+    input_flist = args[1]  # list of infile (items)
+    command = args[4]  # comand set on single pass, or list of (per file)
+    output_flist = args[3]  # output path
+    volume = args[7]  # (lista norm.)se non richiesto rimane None
+    countmax = len(args[1])  # length file list
+    jobs = []
+
+    for index, (infile,
+                outfile,
+                vol,
+                dur) in enumerate(itertools.zip_longest(input_flist,
+                                                        output_flist,
+                                                        volume,
+                                                        duration,
+                                                        fillvalue='',
+                                                        ), start=1):
+        cmd = one_pass_cmd(appdata, infile, outfile,
+                           file_command(command, index - 1), vol, timeseq)
+        count = f'File {index}/{countmax}'
+        jobs.append(Job([Step(cmd, count, infile, outfile, dur)],
+                        sources=[infile],
+                        label=count,
+                        ))
+    return Batch(jobs, logname, topic='onepass')
@@ -0,0 +1,129 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: output_staging.py
+Porpose: writes the output files to temporary names until they are done
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import shutil
+import hashlib
+
+
+class OutputStaging:
+    """
+    Makes ffmpeg write the output file of each step to a
+    temporary name, which is renamed to the destination only
+    when the step succeeds, so that a stopped or failed job
+    never leaves a truncated file with the final name (e.g.
+    picked up by other programs watching the folder). The
+    temporary files of the failed steps are removed, as are
+    the ones left by a crash when the job runs again (also see
+    `BatchJournal.partial_outputs`).
+
+    The temporary name keeps the extension, which ffmpeg needs
+    to choose the output format, and is hidden: "clip.mkv" is
+    written as ".clip.part.mkv" in the same folder, so that the
+    rename is atomic. If a `scratch` folder is given (e.g. on a
+    fast local disk) the files are written there, then copied to
+    the destination folder, where they are renamed.
+
+        >>> staging = OutputStaging()
+        >>> cmd, part = staging.stage(cmd, '/videos/clip.mkv')
+        >>> staging.commit(part, '/videos/clip.mkv')  # on success
+        >>> staging.discard(part)  # otherwise
+    """
+    def __init__(self, scratch=None):
+        self.scratch = scratch
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Returns the staging of the "staged_outputs" and
+        "scratch_dir" settings, None if disabled.
+        """
+        if not settings.get('staged_outputs', True):
+            return None
+        return cls(settings.get('scratch_dir') or None)
+
+    def partname(self, destination, local=True):
+        """
+        Returns the temporary pathname of `destination`, in
+        the scratch folder if any and the process is `local`.
+        """
+        folder, name = os.path.split(destination)
+        base, ext = os.path.splitext(name)
+        if self.scratch and local:
+            digest = hashlib.sha1(folder.encode('utf8')).hexdigest()[:8]
+            return os.path.join(self.scratch, f'.{base}-{digest}.part{ext}')
+        return os.path.join(folder, f'.{base}.part{ext}')
+
+    def stage(self, cmd, destination, local=True):
+        """
+        Returns the command line `cmd` (or list of) which writes
+        to the temporary name of `destination`, and that name.
+        The command is unchanged and the name is None if the
+        destination is not a single file found once in `cmd`,
+        e.g. a folder or a sequence of pictures.
+        """
+        if (not destination or not os.path.isabs(destination)
+                or os.path.isdir(destination)
+                or '%' in os.path.basename(destination)):
+            return cmd, None
+        quoted = f'"{destination}"'
+        lines = cmd if isinstance(cmd, list) else [cmd]
+        if sum(line.count(quoted) for line in lines) != 1:
+            return cmd, None
+        part = self.partname(destination, local)
+        if self.scratch and local:
+            os.makedirs(self.scratch, exist_ok=True)
+        self.discard(part)  # left by a crash
+        lines = [line.replace(quoted, f'"{part}"') for line in lines]
+        return (lines if isinstance(cmd, list) else lines[0]), part
+
+    def commit(self, part, destination):
+        """
+        Moves the `part` file into place with an atomic rename,
+        through a copy in the destination folder if the file is
+        in the scratch folder. Raises OSError on errors.
+        """
+        if os.path.dirname(part) != os.path.dirname(destination):
+            local = self.partname(destination, local=False)
+            try:
+                shutil.copyfile(part, local)
+            except OSError:
+                self.discard(local)
+                raise
+            self.discard(part)
+            part = local
+        os.replace(part, destination)
+
+    @staticmethod
+    def discard(part):
+        """
+        Removes a temporary file, if any
+        """
+        if part:
+            try:
+                os.remove(part)
+            except OSError:
+                pass
@@ -0,0 +1,285 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: proc_stats.py
+Porpose: resource usage of the ffmpeg processes from /proc
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import time
+import builtins
+from threading import Thread, Condition
+
+# translation macro (see gui_app), untranslated strings otherwise
+_ = builtins.__dict__.get('_', lambda msg: msg)
+
+MIB = 1048576
+PROCDIR = '/proc'
+CLOCK_TICKS = (os.sysconf('SC_CLK_TCK')
+               if hasattr(os, 'sysconf') else 100)  # per second
+STATUS = {'VmRSS': 'rss', 'VmHWM': 'peak_rss',
+          'voluntary_ctxt_switches': 'voluntary',
+          'nonvoluntary_ctxt_switches': 'involuntary'}
+IO = {'read_bytes': 'read_bytes', 'write_bytes': 'write_bytes'}
+
+
+def read_proc(pid, procdir=PROCDIR):
+    """
+    Returns the resource usage of the process `pid` read
+    from the `procdir` file system, as dict of "cpu" time
+    (seconds), "rss" and "peak_rss" (bytes), "read_bytes"
+    and "write_bytes" (storage I/O), "voluntary" and
+    "involuntary" context switches. The values which
+    cannot be read (e.g. of a process just ended) are
+    missing, None if the process does not exist.
+    """
+    path = os.path.join(procdir, str(pid))
+    values = {}
+    try:
+        with open(os.path.join(path, 'stat'), encoding='utf8') as fstat:
+            fields = fstat.read().rpartition(')')[2].split()
+        values['cpu'] = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except (OSError, ValueError, IndexError):
+        return None
+    try:
+        with open(os.path.join(path, 'status'), encoding='utf8') as fstat:
+            for line in fstat:
+                key, sep, value = line.partition(':')
+                if sep and key in STATUS:
+                    number = int(value.split()[0])
+                    values[STATUS[key]] = (number * 1024 if 'kB' in value
+                                           else number)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        with open(os.path.join(path, 'io'), encoding='utf8') as fio:
+            for line in fio:
+                key, sep, value = line.partition(':')
+                if sep and key in IO:
+                    values[IO[key]] = int(value)
+    except (OSError, ValueError):  # not allowed on some systems
+        pass
+    return values
+
+
+class Usage:
+    """
+    The resource usage of one or more processes (see `read_proc`)
+    and their running time `wall` in seconds.
+    """
+    FIELDS = ('cpu', 'rss', 'peak_rss', 'read_bytes', 'write_bytes',
+              'voluntary', 'involuntary')
+
+    def __init__(self, values=None, wall=0.0):
+        values = values or {}
+        self.cpu = values.get('cpu', 0.0)
+        self.rss = values.get('rss', 0)
+        self.peak_rss = max(values.get('peak_rss', 0), self.rss)
+        self.read_bytes = values.get('read_bytes', 0)
+        self.write_bytes = values.get('write_bytes', 0)
+        self.voluntary = values.get('voluntary', 0)
+        self.involuntary = values.get('involuntary', 0)
+        self.wall = wall
+
+    def cpu_percent(self):
+        """
+        Returns the CPU time as percentage of the running
+        time, e.g. 400 for four busy cores.
+        """
+        return round(self.cpu / self.wall * 100) if self.wall else 0
+
+    def add(self, other):
+        """
+        Adds the usage of the `other` processes, which
+        were executed one after another.
+        """
+        self.cpu += other.cpu
+        self.rss = other.rss
+        self.peak_rss = max(self.peak_rss, other.peak_rss)
+        self.read_bytes += other.read_bytes
+        self.write_bytes += other.write_bytes
+        self.voluntary += other.voluntary
+        self.involuntary += other.involuntary
+        self.wall += other.wall
+
+    def summary(self):
+        """
+        Returns a short description of the live values, e.g.
+        "cpu: 385% | rss: 312 MiB"
+        """
+        return (f'cpu: {self.cpu_percent()}% | '
+                f'rss: {self.rss // MIB} MiB')
+
+    def describe(self):
+        """
+        Returns the description of all the values.
+        """
+        return (f'wall {self.wall:.1f}s, cpu {self.cpu:.1f}s '
+                f'({self.cpu_percent()}%), peak rss '
+                f'{self.peak_rss // MIB} MiB, read '
+                f'{self.read_bytes // MIB} MiB, write '
+                f'{self.write_bytes // MIB} MiB, context switches '
+                f'{self.voluntary} voluntary / {self.involuntary} '
+                f'involuntary')
+
+
+def usage_table(jobs):
+    """
+    Returns the text table of the usage of the `jobs`
+    which have one, an empty string if none.
+    """
+    rows = [(job.label or job.steps[0].count, job.usage)
+            for job in jobs if job.usage is not None]
+    if not rows:
+        return ''
+    width = max(12, max(len(label) for label, usage in rows))
+    lines = [_('Resource usage of the jobs:'),
+             f'{"Job":<{width}} {"Wall s":>8} {"CPU s":>8} {"CPU%":>6} '
+             f'{"Peak MiB":>9} {"Read MiB":>9} {"Write MiB":>9} '
+             f'{"Ctx vol":>9} {"Ctx inv":>9}']
+    for label, usage in rows:
+        lines.append(f'{label:<{width}} {usage.wall:>8.1f} '
+                     f'{usage.cpu:>8.1f} {usage.cpu_percent():>6} '
+                     f'{usage.peak_rss // MIB:>9} '
+                     f'{usage.read_bytes // MIB:>9} '
+                     f'{usage.write_bytes // MIB:>9} '
+                     f'{usage.voluntary:>9} {usage.involuntary:>9}')
+    return '\n'.join(lines)
+
+
+class ResourceMonitor:
+    """
+    Samples the resource usage of the ffmpeg processes of the
+    `JobEngine` from the /proc file system (Linux only), once
+    per `interval` seconds by a single thread for all of them,
+    which runs only while some process is watched. The latest
+    sample of each process is given by `current`, e.g. to show
+    it live, the final one by `unwatch`.
+
+    The cumulative values (CPU time, I/O bytes and context
+    switches) are the ones of the last sample, which is taken
+    again when the process ends (see `refresh`) as long as it
+    is not reaped yet.
+
+        >>> monitor = ResourceMonitor()
+        >>> monitor.watch(key, proc.pid)
+        >>> monitor.current(key)  # `Usage`
+        >>> monitor.refresh(key)  # output ended
+        >>> monitor.unwatch(key)  # `Usage`
+    """
+    INTERVAL = 2.0
+
+    def __init__(self, interval=INTERVAL, procdir=PROCDIR):
+        self.interval = interval
+        self.procdir = procdir
+        self.cond = Condition()
+        self.watched = {}  # {key: [pid, values, start time]}
+        self.thread = None
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Returns the monitor of the "job_telemetry" setting,
+        None if disabled or not supported.
+        """
+        if not settings.get('job_telemetry', True):
+            return None
+        if not os.path.isdir(os.path.join(PROCDIR, 'self')):
+            return None
+        return cls()
+
+    def watch(self, key, pid):
+        """
+        Starts sampling the process `pid`, identified by `key`
+        """
+        values = read_proc(pid, self.procdir) or {}
+        with self.cond:
+            self.watched[key] = [pid, values, time.monotonic()]
+            if self.thread is None:
+                self.thread = Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def refresh(self, key):
+        """
+        Samples the process of `key` at once
+        """
+        with self.cond:
+            entry = self.watched.get(key)
+        if entry is None:
+            return
+        values = read_proc(entry[0], self.procdir)
+        with self.cond:
+            if values and key in self.watched:
+                self.merge(self.watched[key], values)
+
+    def current(self, key):
+        """
+        Returns the latest `Usage` of `key`, None if not watched
+        """
+        with self.cond:
+            entry = self.watched.get(key)
+            if entry is None:
+                return None
+            return Usage(entry[1], time.monotonic() - entry[2])
+
+    def unwatch(self, key):
+        """
+        Stops sampling the process of `key`.
+        Returns its final `Usage`, None if not watched.
+        """
+        self.refresh(key)
+        with self.cond:
+            entry = self.watched.pop(key, None)
+            self.cond.notify_all()
+        if entry is None:
+            return None
+        return Usage(entry[1], time.monotonic() - entry[2])
+
+    @staticmethod
+    def merge(entry, values):
+        """
+        Updates the values of a watched `entry` with a new
+        sample, keeping the peak memory of the previous ones
+        (a process which is ending has no memory values).
+        """
+        peak = max(entry[1].get('peak_rss', 0), entry[1].get('rss', 0),
+                   values.get('peak_rss', 0), values.get('rss', 0))
+        entry[1] = dict(entry[1], **values)
+        entry[1]['peak_rss'] = peak
+
+    def run(self):
+        """
+        Samples the watched processes until there is none.
+        """
+        while True:
+            with self.cond:
+                self.cond.wait(self.interval)
+                if not self.watched:
+                    self.thread = None
+                    return
+                pids = {key: entry[0] for key, entry in self.watched.items()}
+            samples = {key: read_proc(pid, self.procdir)
+                       for key, pid in pids.items()}
+            with self.cond:
+                for key, values in samples.items():
+                    if values and key in self.watched:
+                        self.merge(self.watched[key], values)
@@ -0,0 +1,451 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: remote_worker.py
+Porpose: execution of the ffmpeg jobs on remote worker daemons
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import socket
+import hmac
+import ipaddress
+import socketserver
+from threading import Event, Lock
+from videomass.vdms_threads.job_engine import JobEngine, Batch, Job, Step
+from videomass.vdms_threads.ffmpeg_progress import Progress
+from videomass.vdms_threads.sched_policy import SchedPolicy
+
+TOKEN_ENV = 'VIDEOMASS_WORKER_TOKEN'  # shared secret, see `WorkerDaemon`
+DEFAULT_PORT = 8765
+
+
+def parse_address(address):
+    """
+    Returns the socket family and address of an address string,
+    a "host:port" (TCP) or a pathname (Unix socket), e.g.:
+
+        >>> parse_address('node1:8765')
+        (AF_INET, ('node1', 8765))
+    """
+    if os.sep in address:
+        return getattr(socket, 'AF_UNIX', None), address
+    host, sep, port = address.rpartition(':')
+    if not sep:
+        return socket.AF_INET, (address, DEFAULT_PORT)
+    return socket.AF_INET, (host or 'localhost', int(port))
+
+
+def is_loopback(host):
+    """
+    Returns True if all the addresses of the `host` name
+    are loopback ones, reachable from the local host only.
+    """
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except (OSError, UnicodeError):
+        return False
+    return bool(infos) and all(
+        ipaddress.ip_address(info[4][0].split('%')[0]).is_loopback
+        for info in infos)
+
+
+def parse_pathmap(pathmap):
+    """
+    Returns the list of (local, remote) path prefixes of a
+    "local=remote; local=remote" string, the mapping of the
+    shared folders as seen by the worker nodes.
+    """
+    pairs = []
+    for item in pathmap.split(';'):
+        local, sep, remote = item.partition('=')
+        if sep and local.strip() and remote.strip():
+            pairs.append((local.strip(), remote.strip()))
+    return pairs
+
+
+def parse_workers(workers, pathmap=''):
+    """
+    Returns the list of the `RemoteWorker` given by the
+    `remote_workers` and `remote_pathmap` settings, e.g.
+    "node1:8765*4, node2:8765" (node2 runs 1 job at a time).
+    """
+    remotes = []
+    for item in workers.replace(',', ' ').split():
+        address, sep, slots = item.partition('*')
+        remotes.append(RemoteWorker(address,
+                                    int(slots) if sep else 1,
+                                    parse_pathmap(pathmap)))
+    return remotes
+
+
+def map_paths(args, pathmap):
+    """
+    Replaces the local path prefixes of the quoted pathnames of
+    the `args` command line with the remote ones of `pathmap`.
+    """
+    for local, remote in pathmap:
+        args = args.replace(f'"{local}', f'"{remote}')
+    return args
+
+
+def command_args(cmd):
+    """
+    Returns the arguments of a command line string,
+    without the executable (quoted or not).
+    """
+    if cmd.startswith('"'):
+        return cmd[cmd.index('"', 1) + 1:].strip()
+    return cmd.partition(' ')[2].strip()
+
+
+def send_message(wfile, message):
+    """
+    Writes a message (dict) as JSON line
+    """
+    wfile.write(f'{json.dumps(message)}\n'.encode('utf8'))
+    wfile.flush()
+
+
+class RemoteConnection:
+    """
+    The connection of a job running on a worker daemon, which
+    can be paused and terminated by the `JobEngine` like a process.
+    """
+    def __init__(self, sock):
+        self.sock = sock
+
+    def pause(self, pause):
+        """
+        Asks the daemon to suspend (`pause` is True)
+        or to resume the job.
+        """
+        try:
+            self.sock.sendall(f'{json.dumps({"pause": pause})}\n'
+                              .encode('utf8'))
+        except OSError:
+            pass
+
+    def terminate(self):
+        """
+        Closes the connection, the daemon stops the job
+        """
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class RemoteWorker:
+    """
+    A worker daemon (see `WorkerDaemon`) which runs up to `slots`
+    jobs of the `JobEngine` at the same time. The commands are sent
+    without the ffmpeg executable (the daemon uses its own) and
+    with the pathnames mapped by `pathmap`, so the input and output
+    files must be on folders shared with the worker node.
+
+    Only the jobs which do not use a private working directory and
+    are not `light` are executed remotely. If the daemon can't be
+    reached, the worker is set `offline` and its jobs are executed
+    by the other workers.
+    """
+    def __init__(self, address, slots=1, pathmap=None):
+        self.address = address
+        self.slots = max(1, slots)
+        self.pathmap = pathmap or []
+        self.offline = False
+        self.token = os.environ.get(TOKEN_ENV, '')
+
+    def __repr__(self):
+        return f'RemoteWorker({self.address!r}, {self.slots})'
+
+    def accepts(self, job):
+        """
+        Returns True if the `job` can run on this worker
+        """
+        return not self.offline and not job.light and job.owner() is None
+
+    def connect(self, timeout=10):
+        """
+        Returns a socket connected to the daemon
+        """
+        family, address = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        return sock
+
+    def available(self):
+        """
+        Checks whether the daemon can be reached, sets
+        `offline` and returns False otherwise.
+        """
+        try:
+            self.connect(timeout=5).close()
+        except OSError:
+            self.offline = True
+        return not self.offline
+
+    def execute(self, engine, job, cmd, step, jobid, tag, quiet=False):
+        """
+        Runs the `cmd` command line of a step of the `job` on the
+        daemon, like `JobEngine.execute`: the output and progress
+        received are sent to the engine sink and the output is also
+        written to the log file. Returns the exit status, None if
+        the job was interrupted.
+        """
+        logname = job.batch.logname
+        request = {'token': self.token,
+                   'args': map_paths(command_args(cmd), self.pathmap),
+                   'count': step.count,
+                   'duration': step.duration,
+                   'progress': step.progress and not quiet,
+                   }
+        try:
+            sock = self.connect()
+        except OSError as err:
+            engine.log_output(f'{tag}{self.address}: {err}\n', logname)
+            return 1
+        conn = RemoteConnection(sock)
+        with engine.cond:
+            engine.running[job.ident] = conn
+            if engine.pauses.get(job.ident, [0, None])[1]:
+                conn.pause(True)
+        if engine.stopped:
+            conn.terminate()
+        output, status = [], None
+        try:
+            with sock, sock.makefile('rwb') as stream:
+                send_message(stream, request)
+                for line in stream:
+                    message = json.loads(line)
+                    if 'progress' in message:
+                        engine.notify("UPDATE_EVT",
+                                      output='',
+                                      duration=step.duration,
+                                      status=0,
+                                      jobid=jobid,
+                                      progress=Progress(message['progress'],
+                                                        step.duration),
+                                      )
+                    elif 'output' in message:
+                        text = message['output']
+                        if quiet:
+                            output.append(text)
+                            continue
+                        engine.notify("UPDATE_EVT",
+                                      output=text,
+                                      duration=step.duration,
+                                      status=0,
+                                      jobid=jobid,
+                                      )
+                        engine.log_output(f'{tag}{text}', logname)
+                    elif 'state' in message:
+                        status = message['status']
+                        break
+        except (OSError, ValueError) as err:  # connection lost
+            output.append(f'{self.address}: {err}\n')
+        finally:
+            with engine.cond:
+                if job.ident in engine.running:
+                    engine.running[job.ident] = None
+
+        if status is None and not engine.stopped:  # daemon lost
+            output.append(f'{self.address}: connection closed\n')
+            status = 1
+        if status:
+            engine.log_output(f'{tag}{"".join(output)}'
+                              f'Exit status: {status}\n', logname)
+        return status
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """
+    Handles a connection of the `WorkerDaemon`: a single job
+    request, to which the daemon replies with the output lines
+    and the progress of the job (JSON lines), then with its state
+    and exit status, e.g.:
+
+        <- {"token": "", "args": "-i \\"in.mkv\\" ...", "count": ...}
+        -> {"output": "Input #0, matroska, from 'in.mkv':\\n"}
+        -> {"progress": {"frame": "25", "out_time_us": "1000000", ...}}
+        -> {"state": "done", "status": 0}
+
+    The client can pause and resume the job by sending
+    {"pause": true} and {"pause": false}, closing the
+    connection stops the job.
+    """
+    def handle(self):
+        daemon = self.server.worker
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if not hmac.compare_digest(str(request.get('token', '')),
+                                   daemon.token):
+            send_message(self.wfile, {'output': 'Authentication failed\n'})
+            send_message(self.wfile, {'state': 'failed', 'status': 1})
+            return
+        done = Event()
+        job = daemon.submit(request, self.wfile, done)
+        for line in self.rfile:  # until the client closes
+            try:
+                pause = json.loads(line)['pause']
+            except (ValueError, KeyError, TypeError):
+                break
+            if pause:
+                daemon.engine.pause(job)
+            else:
+                daemon.engine.resume(job)
+        if not done.is_set():
+            daemon.engine.cancel(job)
+        done.wait()
+
+
+class WorkerDaemon:
+    """
+    A daemon which runs the ffmpeg jobs requested by the
+    `RemoteWorker` of other Videomass instances on a local
+    `JobEngine` of `jobs` workers, listening on a TCP or
+    Unix socket `address` (see `parse_address`).
+    The ffmpeg executable is the one of `settings`.
+
+    NOTE: Any client can write files wherever the user running
+          the daemon can, listen on trusted networks only and
+          set the same shared secret on the clients and the
+          daemon with the VIDEOMASS_WORKER_TOKEN environment
+          variable. The secret is required to listen on any
+          TCP address other than the loopback ones, otherwise
+          PermissionError is raised. The Unix socket is only
+          accessible to the user running the daemon, its file
+          permissions are the access control when no secret
+          is set. A job whose ffmpeg cannot be executed fails
+          without stopping the other jobs of the daemon.
+
+        >>> daemon = WorkerDaemon('0.0.0.0:8765', settings, jobs=4)
+        >>> daemon.serve_forever()
+    """
+    def __init__(self, address, settings, jobs=1, logname=None):
+        self.token = os.environ.get(TOKEN_ENV, '')
+        family, address = parse_address(address)
+        if (family == socket.AF_INET and not self.token
+                and not is_loopback(address[0])):
+            raise PermissionError(f'the {TOKEN_ENV} environment variable '
+                                  f'must be set to listen on a '
+                                  f'non-loopback address')
+        self.settings = settings
+        self.logname = logname or os.devnull
+        self.engine = JobEngine(self.dispatch, max_workers=jobs,
+                                tmpdir=os.path.join(settings['cachedir'],
+                                                    'tmp'),
+                                policy=SchedPolicy.from_settings(settings))
+        self.engine.concurrent = True  # messages always carry `jobid`
+        self.engine.stop_on_error = False  # serves the other clients
+        self.clients = {}  # {job ident: [wfile, exit status]}
+        self.lock = Lock()
+        if family != socket.AF_INET:
+            if os.path.exists(address):
+                os.remove(address)
+            server = socketserver.ThreadingUnixStreamServer
+        else:
+            server = socketserver.ThreadingTCPServer
+        server.allow_reuse_address = True
+        server.daemon_threads = True
+        self.server = server(address, DaemonHandler)
+        self.server.worker = self
+        self.address = self.server.server_address
+        if family != socket.AF_INET:
+            os.chmod(self.address, 0o600)  # the owner only
+
+    def serve_forever(self):
+        """
+        Handles the requests until `shutdown` is called
+        """
+        self.server.serve_forever()
+
+    def shutdown(self):
+        """
+        Stops the daemon and all the running jobs
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        self.engine.stop()
+        self.engine.join()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+    def submit(self, request, wfile, done):
+        """
+        Submits the job of a `request` to the engine, the
+        messages are sent to `wfile`, `done` is set at the
+        end of the job. Returns the job.
+        """
+        cmd = f'"{self.settings["ffmpeg_cmd"]}" {request["args"]}'
+
+        def on_end(job):
+            client = self.clients.pop(job.ident)
+            status = client[1] or (0 if job.state == 'done' else None)
+            self.reply(client[0], {'state': job.state, 'status': status})
+            done.set()
+
+        job = Job([Step(cmd, request['count'],
+                        duration=request['duration'],
+                        progress=request['progress'])],
+                  on_end=on_end)
+        with self.engine.cond:  # no messages before registering
+            self.engine.submit(Batch([job], self.logname))
+            self.clients[job.ident] = [wfile, 0]
+        return job
+
+    def reply(self, wfile, message):
+        """
+        Sends a message to a client, ignoring
+        the closed connections.
+        """
+        with self.lock:
+            try:
+                send_message(wfile, message)
+            except (OSError, ValueError):
+                pass
+
+    def dispatch(self, topic, **kwargs):
+        """
+        The event sink of the engine, which forwards the
+        messages of each job to its client.
+        """
+        client = self.clients.get(kwargs.get('jobid'))
+        if client is None:
+            return
+        if topic == 'UPDATE_EVT' and kwargs['status']:
+            client[1] = kwargs['status']
+        elif topic == 'UPDATE_EVT' and kwargs.get('progress') is not None:
+            self.reply(client[0], {'progress': kwargs['progress'].values})
+        elif topic == 'UPDATE_EVT':
+            self.reply(client[0], {'output': kwargs['output']})
+        elif topic == 'COUNT_EVT' and kwargs['end'] == 'error':
+            self.reply(client[0], {'output': f"{kwargs['count']}\n"})
+            client[1] = 1
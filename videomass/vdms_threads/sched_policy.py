@@ -0,0 +1,291 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: sched_policy.py
+Porpose: scheduling policy of the ffmpeg processes of the jobs
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import platform
+import subprocess
+try:
+    import resource
+except ImportError:  # MS Windows
+    resource = None
+
+IOCLASSES = {'realtime': 1, 'best-effort': 2, 'idle': 3}
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+SYS_IOPRIO_SET = {'x86_64': 251, 'amd64': 251, 'i386': 289, 'i686': 289,
+                  'aarch64': 30, 'arm64': 30, 'riscv64': 30, 'armv7l': 314,
+                  'ppc64le': 273, 'ppc64': 273, 's390x': 282,
+                  }  # Linux system call numbers
+
+
+def parse_cpus(text):
+    """
+    Returns the list of the CPU groups (sets of CPU numbers) of
+    the `text` string, where the groups are separated by
+    semicolons, e.g.:
+
+        >>> parse_cpus('0-3; 4-7')
+        [{0, 1, 2, 3}, {4, 5, 6, 7}]
+        >>> parse_cpus('0,2')
+        [{0, 2}]
+
+    Raises ValueError if the string is not valid.
+    """
+    groups = []
+    for item in text.split(';'):
+        cpus = set()
+        for span in [x.strip() for x in item.split(',') if x.strip()]:
+            first, sep, last = span.partition('-')
+            first, last = int(first), int(last if sep else first)
+            if first < 0 or last < first:
+                raise ValueError(f'Invalid CPU range: {span}')
+            cpus.update(range(first, last + 1))
+        if cpus:
+            groups.append(cpus)
+    return groups
+
+
+def format_cpus(cpus):
+    """
+    Returns the `cpus` set as a string of ranges,
+    e.g. {0, 1, 2, 5} becomes "0-2,5".
+    """
+    spans = []
+    for cpu in sorted(cpus):
+        if spans and spans[-1][1] == cpu - 1:
+            spans[-1][1] = cpu
+        else:
+            spans.append([cpu, cpu])
+    return ','.join(str(a) if a == b else f'{a}-{b}' for a, b in spans)
+
+
+def ioprio_setter():
+    """
+    Returns a function which sets the I/O priority of a thread,
+    called as setter(tid, value), None if the platform does not
+    support it (Linux only).
+    """
+    number = SYS_IOPRIO_SET.get(platform.machine().lower())
+    if platform.system() != 'Linux' or number is None:
+        return None
+    try:
+        import ctypes  # pylint: disable=import-outside-toplevel
+        syscall = ctypes.CDLL(None, use_errno=True).syscall
+    except (ImportError, OSError, AttributeError):
+        return None
+    return lambda tid, value: syscall(number, IOPRIO_WHO_PROCESS,
+                                      tid, value)
+
+
+def threads(pid):
+    """
+    Returns the identifiers of the threads of the process
+    `pid` (Linux only), as the niceness, the I/O priority and
+    the affinity are attributes of the threads, [pid] otherwise.
+    """
+    try:
+        return [int(x) for x in os.listdir(f'/proc/{pid}/task')]
+    except (OSError, ValueError):
+        return [pid]
+
+
+class SchedPolicy:
+    """
+    The scheduling policy of the ffmpeg processes run by the
+    `JobEngine`: niceness, I/O scheduling class, CPU affinity
+    and address space limit. The policy is applied by Videomass
+    to the ffmpeg process right after starting it (see `apply`),
+    so that Videomass itself keeps its own priority and the child
+    of the multi-threaded engine does not run any Python code
+    before executing ffmpeg.
+
+    The CPU groups are shared by the running jobs, each job
+    being pinned to the group which is less used when it starts
+    (see `acquire`), so that concurrent jobs run on separate
+    cores when there are enough groups. Unsupported features
+    are ignored: the affinity and the I/O class require Linux,
+    only the niceness is supported on MS Windows, by the
+    priority class of the process.
+
+        >>> policy = SchedPolicy.from_settings(settings)
+        >>> group = policy.acquire()
+        >>> proc = Popen(cmd, **policy.popen_args(group))
+        >>> policy.apply(proc.pid, group)
+        >>> policy.release(group)
+    """
+    def __init__(self, nice=0, ioclass='', cpus='', memlimit=0):
+        """
+        `nice` is the niceness increment (0 to 19), `ioclass` is
+        a key of IOCLASSES or an empty string, `cpus` the CPU
+        groups (see `parse_cpus`) and `memlimit` the limit of
+        the address space of the processes in MiB, 0 for none.
+        Raises ValueError if `cpus` is not valid.
+        """
+        self.nice = max(0, min(19, int(nice or 0)))
+        self.ioclass = ioclass if ioclass in IOCLASSES else ''
+        self.memlimit = max(0, int(memlimit or 0))
+        self.groups = []
+        if hasattr(os, 'sched_setaffinity'):
+            allowed = os.sched_getaffinity(0)
+            self.groups = [x & allowed for x in parse_cpus(cpus)
+                           if x & allowed]
+        self.users = [0] * len(self.groups)  # running jobs per group
+        self.setprio = ioprio_setter() if self.ioclass else None
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Returns the policy of the `settings` mapping (application
+        data or `EngineSettings`), None if there is no policy.
+        Invalid CPU groups are ignored.
+        """
+        kwargs = {'nice': settings.get('job_nice', 0),
+                  'ioclass': settings.get('job_ionice', ''),
+                  'cpus': settings.get('job_affinity', ''),
+                  'memlimit': settings.get('job_memlimit', 0),
+                  }
+        try:
+            policy = cls(**kwargs)
+        except ValueError:
+            policy = cls(**dict(kwargs, cpus=''))
+        return policy if policy.enabled() else None
+
+    def enabled(self):
+        """
+        Returns True if the policy changes anything
+        on the current platform.
+        """
+        if platform.system() == 'Windows':
+            return bool(self.nice)
+        return bool(self.nice or self.setprio or self.groups
+                    or (self.memlimit and resource))
+
+    def acquire(self):
+        """
+        Returns the index of the less used CPU group, which is
+        then used by the job until `release`, None if there
+        are no groups. The caller must hold the engine lock.
+        """
+        if not self.groups:
+            return None
+        group = self.users.index(min(self.users))
+        self.users[group] += 1
+        return group
+
+    def release(self, group):
+        """
+        The job pinned to the `group` is finished.
+        The caller must hold the engine lock.
+        """
+        if group is not None:
+            self.users[group] -= 1
+
+    def ioprio(self):
+        """
+        Returns the I/O priority value of the class, the level
+        of the best-effort class follows the niceness as the
+        Linux kernel does by default.
+        """
+        level = 0 if self.ioclass == 'idle' else (self.nice + 20) // 5
+        return IOCLASSES[self.ioclass] << IOPRIO_CLASS_SHIFT | min(level, 7)
+
+    def describe(self, group=None):
+        """
+        Returns the description of the policy in
+        effect for the CPU `group`, for the log files.
+        """
+        items = []
+        if self.nice:
+            items.append(f'nice {self.nice}')
+        if self.setprio:
+            items.append(f'ionice {self.ioclass}')
+        if group is not None:
+            items.append(f'CPUs {format_cpus(self.groups[group])}')
+        if self.memlimit and resource:
+            items.append(f'memory limit {self.memlimit} MiB')
+        return ', '.join(items) or 'default'
+
+    def popen_args(self, group=None):
+        """
+        Returns the keyword arguments of `Popen` which apply the
+        part of the policy which cannot be set by `apply`, for
+        the CPU `group`: the priority class on MS Windows and the
+        address space limit where `resource.prlimit` is missing.
+        """
+        if platform.system() == 'Windows':
+            if self.nice >= 15:
+                return {'creationflags': subprocess.IDLE_PRIORITY_CLASS}
+            if self.nice:
+                return {'creationflags':
+                        subprocess.BELOW_NORMAL_PRIORITY_CLASS}
+            return {}
+        if self.memlimit and resource and not hasattr(resource, 'prlimit'):
+            return {'preexec_fn': self.preexec()}
+        return {}
+
+    def preexec(self):
+        """
+        Returns the function executed by the child process before
+        ffmpeg, which only sets the address space limit: the
+        child of a multi-threaded process must only make system
+        calls. Failures are ignored, running ffmpeg anyway.
+        """
+        limit = self.memlimit * 1048576
+
+        def setlimit():
+            try:
+                resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+            except (OSError, ValueError):
+                pass
+        return setlimit
+
+    def apply(self, pid, group=None):
+        """
+        Applies the policy of the CPU `group` to the running
+        process `pid` and to its threads, from the parent.
+        Failures are ignored, e.g. if the process is ended.
+        """
+        if platform.system() == 'Windows':
+            return
+        if self.memlimit and resource and hasattr(resource, 'prlimit'):
+            limit = self.memlimit * 1048576
+            try:
+                resource.prlimit(pid, resource.RLIMIT_AS, (limit, limit))
+            except (OSError, ValueError):
+                pass
+        nice = min(19, os.getpriority(os.PRIO_PROCESS, 0) + self.nice)
+        ioprio = self.ioprio() if self.setprio else 0
+        cpus = self.groups[group] if group is not None else None
+        for tid in threads(pid):
+            try:
+                if self.nice:
+                    os.setpriority(os.PRIO_PROCESS, tid, nice)
+                if cpus:
+                    os.sched_setaffinity(tid, cpus)
+            except OSError:
+                pass
+            if self.setprio:
+                self.setprio(tid, ioprio)  # returns -1, does not raise
@@ -2,11 +2,11 @@
 """
 Name: slideshow.py
 Porpose: FFmpeg long processing task
-Compatibility: Python3, wxPython4 Phoenix
+Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.18.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -25,353 +25,62 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-import tempfile
-from threading import Thread
-import time
-import subprocess
-import platform
-import wx
-from pubsub import pub
-from videomass.vdms_utils.utils import Popen
-from videomass.vdms_io.make_filelog import logwrite
-if not platform.system() == 'Windows':
-    import shlex
+from videomass.vdms_threads.job_engine import Step, Job, Batch
 
 
-def convert_images(*varargs):
+def slideshow_batch(appdata, logname, duration, timeseq, *args):
     """
-    Convert images to PNG format and assign
-    progressive digits to them.
+    Returns a `Batch` made of a single job which produces a video
+    from a sequence of images: the images are first converted to
+    BMP format assigning them progressive digits and optionally
+    resized in the private working directory of the job, which
+    is then used as input of the video production.
+    Called from `long_processing_task.topic_thread`.
+    Also see `main_frame.switch_to_processing`.
     """
-    get = wx.GetApp()  # get videomass wx.App attribute
-    appdata = get.appset
-    opsystem = appdata['ostype']
-    not_exist_msg = _("Is 'ffmpeg' installed on your system?")
-    flist = varargs[0]
-    tmpdir = varargs[1]
-    logname = varargs[2]
-    imagenames = varargs[3]
-
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count='Preparing temporary files...',
-                 fsource='Source: Imported file list',
-                 destination=f'Destination: "{tmpdir}"',
-                 duration=len(flist),
-                 end='',
-                 )
-    prognum = 0
-    args = (f'"{appdata["ffmpeg_cmd"]}" '
-            f'{appdata["ffmpeg_default_args"]} ')
-    logwrite(f'Preparing temporary files...\n'
-             f'\n[COMMAND:]\n{args}', '', logname)
-
-    for files in flist:
-        prognum += 1
-        tmpf = os.path.join(tmpdir, f'{imagenames}{prognum}.bmp')
-        cmd_1 = f'{args} -i "{files}" "{tmpf}"'
-
-        if not opsystem == 'Windows':
-            cmd_1 = shlex.split(cmd_1)
-        try:
-            with Popen(cmd_1,
-                       stderr=subprocess.PIPE,
-                       bufsize=1,
-                       universal_newlines=True,
-                       encoding='utf8',
-                       ) as proc1:
-                error = proc1.communicate()
-
-            if proc1.returncode:  # ffmpeg error
-                if error[1]:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='',
-                                 duration=0,
-                                 status=proc1.wait(),
-                                 )
-                    logwrite('',
-                             f"Exit status: {proc1.wait()}\n{error[1]}",
-                             logname,
-                             )  # append exit error number
-                    return error[1]
-
-            else:  # ok
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output=f' |{prognum}|  {files}  >  {tmpf}\n',
-                             duration=0,
-                             status=0,
-                             )
-        except (OSError, FileNotFoundError) as err:  # cmd not found
-            excepterr = f"{err}\n  {not_exist_msg}"
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=excepterr,
-                         fsource='',
-                         destination='',
-                         duration=0,
-                         end='error',
-                         )
-            return err
-
-    time.sleep(.5)
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count='',
-                 fsource='',
-                 destination='',
-                 duration=0,
-                 end='Done'
-                 )
-    return None
-
-
-def resizing_process(*varargs):
-    """
-    After the images have been converted to the required format,
-    this process performs the resizing using ffmpeg filters.
-    This is a necessary workaround for proper video playback.
-    """
-    get = wx.GetApp()  # get videomass wx.App attribute
-    appdata = get.appset
-    opsystem = appdata['ostype']
-    not_exist_msg = _("Is 'ffmpeg' installed on your system?")
-    flist = varargs[0]
-    tmpdir = varargs[1]
-    cmdargs = varargs[2]
-    logname = varargs[3]
-
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count='File resizing...',
-                 fsource='Source: Temporary directory',
-                 destination=f'Destination: "{tmpdir}"',
-                 duration=len(flist),
-                 end='',
-                 )
-
-    tmpf = os.path.join(tmpdir, 'TMP_%d.bmp')
-    tmpfout = os.path.join(tmpdir, 'IMAGE_%d.bmp')
-    cmd_1 = (f'"{appdata["ffmpeg_cmd"]}" '
-             f'{appdata["ffmpeg_default_args"]} '
-             f'-i "{tmpf}" {cmdargs} "{tmpfout}"'
-             )
-    logwrite(f'\nFile resizing...\n\n[COMMAND]:\n{cmd_1}', '', logname)
-
-    if not opsystem == 'Windows':
-        cmd_1 = shlex.split(cmd_1)
-    try:
-        with Popen(cmd_1,
-                   stderr=subprocess.PIPE,
-                   bufsize=1,
-                   universal_newlines=True,
-                   encoding='utf8',
-                   ) as proc1:
-            error = proc1.communicate()
-
-        if proc1.returncode:  # ffmpeg error
-            if error[1]:
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output='',
-                             duration=0,
-                             status=proc1.wait(),
-                             )
-                logwrite('',
-                         f"Exit status: {proc1.wait()}\n{error[1]}",
-                         logname,
-                         )  # append exit error number
-                return error[1]
-
-        else:  # ok
-            wx.CallAfter(pub.sendMessage,
-                         "UPDATE_EVT",
-                         output='',
-                         duration=0,
-                         status=0,
-                         )
-    except (OSError, FileNotFoundError) as err:  # cmd not found
-        excepterr = f"{err}\n  {not_exist_msg}"
-        wx.CallAfter(pub.sendMessage,
-                     "COUNT_EVT",
-                     count=excepterr,
-                     fsource='',
-                     destination='',
-                     duration=0,
-                     end='error',
-                     )
-        return err
-
-    time.sleep(.5)
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count='',
-                 fsource='',
-                 destination='',
-                 duration=0,
-                 end='Done'
-                 )
-    return None
-
-
-class SlideshowMaker(Thread):
-    """
-    Represents the ffmpeg subprocess to produce a video in
-    mkv format from a sequence of images already converted
-    and resized in a temporary context.
-    """
-    get = wx.GetApp()  # get videomass wx.App attribute
-    appdata = get.appset
-    OS = appdata['ostype']
-    SUFFIX = appdata['filesuffix']
-    NOT_EXIST_MSG = _("Is 'ffmpeg' installed on your system?")
-
-    def __init__(self, logname, duration, *args):
-        """
-        Called from `long_processing_task.topic_thread`.
-        Also see `main_frame.switch_to_processing`.
-        """
-        Thread.__init__(self)
-
-        self.filelist = args[1]  # input file list (items)
-        # self.destdir = varargs[2]  # destination dir
-        self.filedest = args[3]  # filename destination
-        self.args_0 = args[4][0]  # args for temporary process
-        self.preinput_1 = args[5]  # pre-input args for processing
-        self.args_1 = args[4][1]  # args for processing
-        self.duration = duration * 1000  # duration in milliseconds
-        self.countmax = args[9]  # length file list
-        self.count = 0  # count first for loop
-        self.logname = logname  # log name
-        self.stop_work_thread = False  # process terminate
-
-        self.start()  # start the thread (va in self.run())
-
-    def run(self):
-        """
-        Subprocess initialize thread.
-        """
-        imgtmpnames = 'TMP_' if self.args_0 else 'IMAGE_'
-        filedone = []
-        with tempfile.TemporaryDirectory() as tempdir:  # make tmp dir
-            tmpproc1 = convert_images(self.filelist,
-                                      tempdir,
-                                      self.logname,
-                                      imgtmpnames,
-                                      )
-            if tmpproc1 is not None:
-                self.end_process(filedone)
-                return
-
-            if self.stop_work_thread:  # break second 'for' loop
-                self.end_process(filedone)
-                return
-
-            if imgtmpnames == 'TMP_':
-                tmpproc2 = resizing_process(self.filelist,
-                                            tempdir,
-                                            self.args_0,
-                                            self.logname,
-                                            )
-                if tmpproc2 is not None:
-                    self.end_process(filedone)
-                    return
-
-                if self.stop_work_thread:  # break second 'for' loop
-                    self.end_process(filedone)
-                    return
-
-            # ------------------------------- make video
-            tmpgroup = os.path.join(tempdir, 'IMAGE_%d.bmp')
-            cmd_2 = (f'"{SlideshowMaker.appdata["ffmpeg_cmd"]}" '
-                     f'{SlideshowMaker.appdata["ffmpeg_default_args"]} '
-                     f'{self.preinput_1} '
-                     f'-i "{tmpgroup}" '
-                     f'{self.args_1} '
-                     f'"{self.filedest}"'
-                     )
-            count = '\nVideo production...'
-            log = (f'{count}\nSource: "{tempdir}"\n'
-                   f'Destination: "{self.filedest}"\n\n[COMMAND]:\n{cmd_2}')
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=count,
-                         fsource=f'Source:  "{tempdir}"',
-                         destination=f'Destination:  "{self.filedest}"',
-                         duration=self.duration,
-                         end='',
-                         )
-
-            logwrite(log, '', self.logname)
-            time.sleep(1)
-
-            if not SlideshowMaker.OS == 'Windows':
-                cmd_2 = shlex.split(cmd_2)
-
-            try:
-                with Popen(cmd_2,
-                           stderr=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding='utf8',
-                           ) as proc2:
-                    for line in proc2.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=self.duration,
-                                     status=0,
-                                     )
-                        if self.stop_work_thread:  # break second 'for' loop
-                            proc2.terminate()
-                            break
-
-                    if proc2.wait():  # error
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='',
-                                     duration=self.duration,
-                                     status=proc2.wait(),
-                                     )
-                        logwrite('',
-                                 f"Exit status: {proc2.wait()}",
-                                 self.logname,
-                                 )  # append exit error number
-                        time.sleep(1)
-
-                    else:  # status ok
-                        filedone = self.filelist
-                        wx.CallAfter(pub.sendMessage,
-                                     "COUNT_EVT",
-                                     count='',
-                                     fsource='',
-                                     destination='',
-                                     duration=self.duration,
-                                     end='Done'
-                                     )
-            except (OSError, FileNotFoundError) as err:
-                excepterr = f"{err}\n  {SlideshowMaker.NOT_EXIST_MSG}"
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count=excepterr,
-                             fsource='',
-                             destination='',
-                             duration=0,
-                             end='error',
-                             )
-        self.end_process(filedone)
-
-    def end_process(self, filedone):
-        """
-        The process is finished
-        """
-        time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT", msg=filedone)
-
-    def stop(self):
-        """
-        Sets the stop work thread to terminate the process
-        """
-        self.stop_work_thread = True
+    filelist = args[1]  # input file list (items)
+    filedest = args[3]  # filename destination
+    args_0 = args[4][0]  # args for temporary process
+    preinput_1 = args[5]  # pre-input args for processing
+    args_1 = args[4][1]  # args for processing
+    imgtmpnames = 'TMP_' if args_0 else 'IMAGE_'
+    ffmpeg = (f'"{appdata["ffmpeg_cmd"]}" '
+              f'{appdata["ffmpeg_default_args"]}')
+
+    def tmpname(job, name):
+        return os.path.join(job.path, name)
+
+    def convert_images(job):
+        """Convert images and assign progressive digits to them"""
+        return [f'{ffmpeg} -i "{files}" '
+                f'"{tmpname(job, f"{imgtmpnames}{num}.bmp")}"'
+                for num, files in enumerate(filelist, start=1)]
+
+    def converted(job):
+        return [f' |{num}|  {files}  >  '
+                f'{tmpname(job, f"{imgtmpnames}{num}.bmp")}\n'
+                for num, files in enumerate(filelist, start=1)]
+
+    def resizing(job):
+        """Resizing with ffmpeg filters, required for proper playback"""
+        return [f'{ffmpeg} -i "{tmpname(job, "TMP_%d.bmp")}" {args_0} '
+                f'"{tmpname(job, "IMAGE_%d.bmp")}"']
+
+    def make_video(job):
+        return (f'{ffmpeg} {preinput_1} '
+                f'-i "{tmpname(job, "IMAGE_%d.bmp")}" '
+                f'{args_1} '
+                f'"{filedest}"'
+                )
+
+    steps = [Step(convert_images, 'Preparing temporary files...',
+                  'Imported file list', 'Temporary directory',
+                  echo=converted)]
+    if args_0:
+        steps.append(Step(resizing, 'File resizing...',
+                          'Temporary directory', 'Temporary directory'))
+    steps.append(Step(make_video, 'Video production...',
+                      'Temporary directory', filedest, duration * 1000))
+
+    return Batch([Job(steps, sources=filelist, label='File 1/1',
+                      workdir=True)], logname, topic='sequence_to_video')
@@ -0,0 +1,187 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: split_stitch.py
+Porpose: FFmpeg long processing task for chunked parallel encoding
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import builtins
+import itertools
+from videomass.vdms_threads.job_engine import Step, Job, Batch
+from videomass.vdms_threads.one_pass import one_pass_cmd, file_command
+from videomass.vdms_threads.verify_output import has_option
+
+# translation macro (see gui_app), untranslated strings otherwise
+_ = builtins.__dict__.get('_', lambda msg: msg)
+
+SEGMENT_MIN = 60000  # minimum duration of a segment in milliseconds
+
+
+def split_points(duration, segments):
+    """
+    Returns the list of the times (in seconds) at which a
+    file of `duration` milliseconds is split in `segments`
+    parts, an empty list if the file is too short to be split.
+    The segment muxer cuts at the first keyframe after each time.
+    """
+    if not isinstance(duration, int):
+        return []
+    segments = min(segments, duration // SEGMENT_MIN)
+    if segments < 2:
+        return []
+    return [round(duration * num / segments / 1000, 3)
+            for num in range(1, segments)]
+
+
+def split_stitch_jobs(appdata, infile, outfile, dur, passlist, vol,
+                      hasaudio, count):
+    """
+    Returns the jobs which encode a single file in segments:
+
+        - the video stream is split at keyframes in N segments
+          by stream copy (fast);
+        - the segments are encoded in parallel with the video
+          options, each one by a separate job;
+        - the audio is encoded once by a separate job, to avoid
+          gaps at the joins;
+        - the encoded segments are joined using the concat demuxer
+          and muxed with the audio, the subtitles, the chapters
+          and the metadata of the source file.
+
+    All the jobs share the private working directory of the
+    first one. Returns None if the file is too short to be split.
+    """
+    points = split_points(dur, appdata['split_segments'])
+    if not points:
+        return None
+    video, audio, muxing = passlist
+    ext = os.path.splitext(outfile)[1]
+    nseg = len(points) + 1
+    ffmpeg = (f'"{appdata["ffmpeg_cmd"]}" '
+              f'{appdata["ffmpeg_default_args"]}')
+    withaudio = hasaudio and '-an' not in audio.split()
+
+    def tmpname(job, name):
+        return os.path.join(job.path, name)
+
+    def split(job):
+        times = ','.join(str(t) for t in points)
+        return (f'{ffmpeg} -i "{infile}" -map 0:v:0 -c copy -an -sn -dn '
+                f'-f segment -segment_times {times} -reset_timestamps 1 '
+                f'-y "{tmpname(job, "seg%03d.mkv")}"')
+
+    def encode(num):
+        def segment(job):
+            source = tmpname(job, f'seg{num:03d}.mkv')
+            if not os.path.exists(source):  # no keyframe in the range
+                return None
+            return (f'{ffmpeg} -i "{source}" {video} -an -sn -dn '
+                    f'{appdata["ffthreads"]} '
+                    f'-y "{tmpname(job, f"enc{num:03d}{ext}")}"')
+        return segment
+
+    def encode_audio(job):
+        return (f'{ffmpeg} -i "{infile}" -vn -sn -dn {audio} {vol} '
+                f'{appdata["ffthreads"]} -y "{tmpname(job, f"audio{ext}")}"')
+
+    def stitch(job):
+        segments = sorted(name for name in os.listdir(job.path)
+                          if name.startswith('enc'))
+        with open(tmpname(job, 'segments.txt'), 'w',
+                  encoding='utf8') as flist:
+            flist.write(''.join(f"file '{name}'\n" for name in segments))
+        if withaudio:
+            ainput = f'-i "{tmpname(job, f"audio{ext}")}" -map 2:a -c:a copy'
+        else:
+            ainput = ''
+        return (f'{ffmpeg} -i "{infile}" -f concat -safe 0 '
+                f'-i "{tmpname(job, "segments.txt")}" {ainput} '
+                f'-map 1:v -c:v copy -map_chapters 0 -map_metadata 0 '
+                f'{muxing} -y "{outfile}"')
+
+    splitter = Job([Step(split, f'{count} - Splitting in {nseg} segments',
+                         infile, 'seg%03d.mkv', dur)],
+                   label=f'{count} split', workdir=True)
+    jobs = [splitter]
+    for num in range(nseg):
+        jobs.append(Job([Step(encode(num),
+                              f'{count} - Segment {num + 1}/{nseg}',
+                              infile, f'enc{num:03d}{ext}', dur // nseg,
+                              skipmsg=_('No keyframe in this segment, '
+                                        'it is part of the previous one.'))],
+                        label=f'{count} seg. {num + 1}/{nseg}',
+                        requires=splitter, workdir=splitter))
+    if withaudio:
+        jobs.append(Job([Step(encode_audio, f'{count} - Audio', infile,
+                              f'audio{ext}', dur)],
+                        label=f'{count} audio',
+                        requires=splitter, workdir=splitter))
+    jobs.append(Job([Step(stitch, f'{count} - Joining the segments',
+                          infile, outfile, dur)],
+                    sources=[infile], label=count,
+                    requires=jobs[1:], workdir=splitter))
+    return jobs
+
+
+def split_stitch_batch(appdata, logname, duration, timeseq, *args):
+    """
+    Returns a `Batch` of one pass processing in which the long
+    files are encoded in segments executed at the same time (see
+    `split_stitch_jobs`), and the shorter ones as usual.
+    Called from `long_processing_task.topic_thread`.
+    Also see `main_frame.switch_to_processing`.
+    """
+    input_flist = args[1]  # list of infile (items)
+    output_flist = args[3]  # output path
+    command = args[4]  # comand set on single pass, or list of (per file)
+    passlist = args[5]  # [video, audio, muxing] options
+    hasaudio = args[6]  # True for each file which has audio streams
+    volume = args[7]  # volume compensation data
+    countmax = len(args[1])  # length file list
+    jobs = []
+
+    for index, (infile,
+                outfile,
+                vol,
+                dur,
+                audio) in enumerate(itertools.zip_longest(input_flist,
+                                                          output_flist,
+                                                          volume,
+                                                          duration,
+                                                          hasaudio,
+                                                          fillvalue='',
+                                                          ), start=1):
+        count = f'File {index}/{countmax}'
+        options = file_command(command, index - 1)
+        if not has_option(options, '-c:v', 'copy'):  # not a stream copy
+            chunks = split_stitch_jobs(appdata, infile, outfile, dur,
+                                       passlist, vol, audio, count)
+            if chunks:
+                jobs.extend(chunks)
+                continue
+        cmd = one_pass_cmd(appdata, infile, outfile, options, vol, timeseq)
+        jobs.append(Job([Step(cmd, count, infile, outfile, dur)],
+                        sources=[infile],
+                        label=count,
+                        ))
+    return Batch(jobs, logname, topic='split_stitch')
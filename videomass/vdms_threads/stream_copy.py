@@ -0,0 +1,193 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: stream_copy.py
+Porpose: stream copy of the sources which already match the conversion
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import re
+
+# codec names given by FFprobe of the encoders of `AV_Conv`
+VIDEO_CODECS = {'libx264': 'h264', 'libx265': 'hevc', 'libvpx': 'vp8',
+                'libvpx-vp9': 'vp9', 'libaom-av1': 'av1', 'mpeg4': 'mpeg4',
+                'libtheora': 'theora'}
+AUDIO_CODECS = {'aac': 'aac', 'ac3': 'ac3', 'alac': 'alac', 'flac': 'flac',
+                'libmp3lame': 'mp3', 'libopus': 'opus',
+                'libvorbis': 'vorbis', 'pcm_s16le': 'pcm_s16le',
+                'pcm_s24le': 'pcm_s24le', 'pcm_s32le': 'pcm_s32le'}
+# audio codecs of the containers when the audio codec is "Auto"
+DEFAULT_AUDIO = {'mp4': 'aac', 'm4v': 'aac', 'mkv': 'vorbis',
+                 'webm': 'opus', 'ogv': 'vorbis', 'avi': 'mp3'}
+# FFprobe levels of the H.264 and H.265 streams are scaled by
+LEVEL_SCALE = {'h264': 10, 'hevc': 30}
+SCALE = {'': 1, 'k': 1000, 'K': 1000, 'M': 1000000}
+# options of the panel which change the pictures or the timing
+FILTERS = ('VFilters', 'AspectRatio', 'FPS', 'Vidstabdetect')
+
+
+def option_value(options, default=''):
+    """
+    Returns the value of an option string of `AV_Conv`,
+    e.g. "high" for "-profile:v high", `default` if unset.
+    """
+    words = options.split() if options else []
+    return words[-1] if len(words) > 1 else default
+
+
+def bitrate(value):
+    """
+    Returns the bits per second of a rate such as "2M", "5000k"
+    or "128000", None if it is not a rate.
+    """
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([kKM]?)', str(value or ''))
+    return float(match.group(1)) * SCALE[match.group(2)] if match else None
+
+
+def simplify(profile):
+    """
+    Returns a profile name without cases, spaces and separators,
+    so that the FFprobe "High 10" and "Main 10" are the same as
+    the encoder "high10" and "main10".
+    """
+    return re.sub(r'[\s:_-]', '', str(profile).lower())
+
+
+def video_matches(opt, stream, overall=None):
+    """
+    Returns True if the video `stream` has the codec, profile,
+    level, pixel format and bitrate limits of the `opt` options,
+    `overall` is the bitrate of the whole file, used when the
+    stream has not its own.
+    """
+    codec = VIDEO_CODECS.get(option_value(opt['VideoCodec']))
+    if not codec or stream.get('codec_name') != codec:
+        return False
+    profile = simplify(option_value(opt['Profile']))
+    if profile and simplify(stream.get('profile', '')) not in (
+            profile, f'constrained{profile}'):
+        return False
+    level = bitrate(option_value(opt['Level']))
+    if level and codec in LEVEL_SCALE:
+        if not 0 < stream.get('level', 0) <= level * LEVEL_SCALE[codec]:
+            return False
+    pixfmt = option_value(opt['PixFmt'])
+    if pixfmt and stream.get('pix_fmt') != pixfmt:
+        return False
+    rate = bitrate(stream.get('bit_rate'))
+    average = rate or overall  # the whole file exceeds its video
+    for key in ('VideoBitrate', 'MaxRate'):  # upper limits
+        limit = bitrate(option_value(opt[key]))
+        if limit and (average is None or average > limit):
+            return False
+    minrate = bitrate(option_value(opt['MinRate']))
+    return not minrate or (rate or 0) >= minrate
+
+
+def audio_matches(opt, stream, index, extension):
+    """
+    Returns True if the audio `stream` of the `index` output
+    audio stream is encoded as the `opt` options would do in
+    a file with the `extension` container.
+    """
+    encoder = opt['AudioCodec'][1]
+    if encoder == 'copy':
+        return True
+    if not encoder or opt['AudioMap'][1] not in ('', str(index)):
+        codec = DEFAULT_AUDIO.get(extension)
+    else:
+        codec = AUDIO_CODECS.get(encoder)
+    if not codec or stream.get('codec_name') != codec:
+        return False
+    if opt['AudioDepth'][1]:
+        return False
+    samplerate = option_value(opt['AudioRate'][1])
+    if samplerate and stream.get('sample_rate') != samplerate:
+        return False
+    channels = option_value(opt['AudioChannel'][1])
+    if channels and str(stream.get('channels')) != channels:
+        return False
+    limit = bitrate(option_value(opt['AudioBitrate'][1]))
+    rate = bitrate(stream.get('bit_rate'))
+    return not limit or (rate is not None and rate <= limit)
+
+
+def can_copy(opt, probe, volume='', timeseq=''):
+    """
+    Returns True if all the video and audio streams of the
+    FFprobe data `probe` of a source file already match the
+    `opt` options of the video conversions of `AV_Conv`, so
+    that they can be copied (remuxed) instead of encoded
+    again. Never if filters are enabled, the audio `volume`
+    of the file is changed or a `timeseq` part is cut (the
+    cuts of the stream copies are not accurate).
+    """
+    if volume or timeseq or any(opt.get(key) for key in FILTERS):
+        return False
+    streams = probe.get('streams', [])
+    videos = [x for x in streams if x.get('codec_type') == 'video']
+    audios = [x for x in streams if x.get('codec_type') == 'audio']
+    if not videos:
+        return False
+    overall = bitrate(probe.get('format', {}).get('bit_rate'))
+    if not all(video_matches(opt, x, overall) for x in videos):
+        return False
+    if opt['AudioCodec'][1] == '-an':
+        return True
+    index = re.search(r'0:a:(\d+)', opt['AudioMap'][0])
+    if index:  # only this audio stream is mapped
+        audios = audios[int(index.group(1)):int(index.group(1)) + 1]
+        return all(audio_matches(opt, x, 0, opt['OutputFormat'])
+                   for x in audios)
+    return all(audio_matches(opt, x, num, opt['OutputFormat'])
+               for num, x in enumerate(audios))
+
+
+def copy_command(opt):
+    """
+    Returns the options of the stream copy of the
+    files matched by `can_copy`.
+    """
+    audio = '-an' if opt['AudioCodec'][1] == '-an' else '-c:a copy'
+    command = (f'-c:v copy -map 0:v? -map_chapters 0 '
+               f'{opt["SubtitleMap"]} {audio} {opt["AudioMap"][0]} '
+               f'{opt["WebOptim"]} -map_metadata 0')
+    return " ".join(command.split())
+
+
+def copy_plan(opt, probes, command, volumes=(), timeseq=''):
+    """
+    Returns the list of the commands of each source file of
+    the FFprobe data `probes`: the stream copy if `can_copy`,
+    otherwise the given `command`; and the indexes of the
+    files copied.
+
+        >>> commands, copied = copy_plan(opt, data_files, command)
+    """
+    commands, copied = [], []
+    for num, probe in enumerate(probes):
+        volume = volumes[num] if num < len(volumes) else ''
+        if can_copy(opt, probe, volume, timeseq):
+            commands.append(copy_command(opt))
+            copied.append(num)
+        else:
+            commands.append(command)
+    return commands, copied
@@ -0,0 +1,342 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: target_size.py
+Porpose: choice of the CRF which meets a size budget by sample encodes
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+import math
+import queue
+import builtins
+import platform
+import tempfile
+import subprocess
+from threading import Thread, Lock
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_threads.engine_core import NullSink
+from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.measurement_cache import MeasurementCache
+if not platform.system() == 'Windows':
+    import shlex
+
+# translation macro (see gui_app), untranslated strings otherwise
+_ = builtins.__dict__.get('_', lambda msg: msg)
+
+MIB = 1048576
+SAMPLES = 3  # samples of each source
+SAMPLE_LENGTH = 4000  # duration of the samples in milliseconds
+MARGIN = 0.97  # of the budget, for the errors of the model
+CRF = re.compile(r'(?<![\w:-])-crf\s+\S+')
+
+
+def with_crf(command, crf):
+    """
+    Returns the ffmpeg options `command` with
+    the CRF value replaced by `crf`.
+    """
+    if CRF.search(command):
+        return CRF.sub(f'-crf {crf}', command)
+    return f'{command} -crf {crf}'
+
+
+def candidates(crfmax):
+    """
+    Returns the CRF values of the sample encodes of
+    an encoder whose CRF scale goes from 0 to `crfmax`
+    (e.g. 51 for x264 and x265, 63 for VP9 and AV1).
+    """
+    return tuple(round(crfmax * ratio) for ratio in (0.35, 0.5, 0.67))
+
+
+def sample_starts(duration, offset=0):
+    """
+    Returns the [(start, length), ...] in milliseconds of the
+    samples of a source of `duration` ms from `offset`, spread
+    over the source, a single sample of the whole source if it
+    is too short.
+    """
+    if duration <= SAMPLES * SAMPLE_LENGTH * 2:
+        return [(offset, duration)]
+    step = duration / SAMPLES
+    return [(offset + int(step * num + (step - SAMPLE_LENGTH) / 2),
+             SAMPLE_LENGTH) for num in range(SAMPLES)]
+
+
+def fit_model(points):
+    """
+    Returns the (a, b) coefficients of the model of the
+    output rate by CRF, ln(rate) = a + b * crf, fitted by
+    least squares to the [(crf, bytes per second), ...]
+    `points` of the samples, None if it cannot be fitted.
+    """
+    points = [(crf, math.log(rate)) for crf, rate in points if rate > 0]
+    if len({crf for crf, rate in points}) < 2:
+        return None
+    meanx = sum(x for x, y in points) / len(points)
+    meany = sum(y for x, y in points) / len(points)
+    slope = (sum((x - meanx) * (y - meany) for x, y in points)
+             / sum((x - meanx) ** 2 for x, y in points))
+    if slope >= 0:  # the size does not decrease by the CRF
+        return None
+    return meany - slope * meanx, slope
+
+
+def predict_crf(model, budget, duration, crfmax):
+    """
+    Returns the lowest (best quality) integer CRF from 0
+    to `crfmax` whose output of `duration` ms fits in the
+    `budget` bytes by the `model`, and the predicted size.
+    """
+    rate = budget * MARGIN * 1000 / duration
+    crf = math.ceil((math.log(rate) - model[0]) / model[1])
+    crf = min(max(crf, 0), crfmax)
+    size = math.exp(model[0] + model[1] * crf) * duration / 1000
+    return crf, int(size)
+
+
+class TargetSizeThread(Thread):
+    """
+    This class represents a separate thread which chooses, for
+    each source file, the CRF value at which its conversion
+    fits in a size budget, before the conversion starts.
+
+    A few short samples of each source are encoded at some CRF
+    values by a pool of worker threads, each one running its own
+    ffmpeg process, then a model of the size by the CRF is fitted
+    (see `fit_model`). The sample sizes are stored in the
+    `MeasurementCache`, so that other budgets of the same files
+    and options are predicted at once. The completion of each
+    sample is sent to the `notify` sink as "POPUP_MSG_EVT"
+    message, and the whole process can be interrupted by
+    calling `stop`.
+
+        self.data: it is a tuple containing the list of
+                   (crf, predicted size) of each file and
+                   None, or the string error if errors.
+    """
+    MSG_interrupted = _('Interrupted Process !')
+
+    def __init__(self, filelist, durations, command, extension, budget,
+                 crfmax, ffmpeg_url, logdir, cachedir, offset=0,
+                 notify=None):
+        """
+        `command` are the ffmpeg options of the conversion, whose
+        output files have the `extension` format and the `budget`
+        size in bytes, `durations` are the durations in ms of the
+        files (from `offset` ms) and `crfmax` the maximum CRF of
+        the encoder.
+        """
+        self.filelist = filelist
+        self.durations = durations
+        self.command = command
+        self.extension = extension
+        self.budget = budget
+        self.crfmax = crfmax
+        self.offset = offset
+        self.ffmpeg_url = ffmpeg_url
+        self.notify = notify if notify is not None else NullSink()
+        self.status = None
+        self.data = None
+        self.logf = os.path.join(logdir, 'target_size.log')
+        make_log_template('target_size.log', logdir)
+        self.cache = MeasurementCache(cachedir)
+        self.tmpdir = os.path.join(cachedir, 'tmp')
+        self.stop_work_thread = False  # process terminate
+        self.sizes = {}  # {(index, crf): [(size, length), ...]}
+        self.processes = {}  # running processes {task: Popen}
+        self.lock = Lock()  # protects the above and log file
+        self.done = 0  # number of completed samples
+        self.total = 0
+
+        Thread.__init__(self)
+        self.start()  # start the thread (va in self.run())
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        The CRF values are getted by the thread's caller using
+        the thread.data attribute (see io_tools).
+        """
+        points, tasks = {}, queue.Queue()
+        for index, (files, dur) in enumerate(zip(self.filelist,
+                                                 self.durations)):
+            if not dur:  # unknown, cannot be predicted
+                continue
+            cached = self.cache.get(files, 'crf_model', self.options(),
+                                    self.offset, dur)
+            if cached:
+                self.logwrite(f'"{files}": CRF model loaded from cache '
+                              f'{cached}')
+                points[index] = cached
+                continue
+            for crf in candidates(self.crfmax):
+                for start, length in sample_starts(dur, self.offset):
+                    tasks.put((index, crf, start, length))
+        self.total = tasks.qsize()
+        os.makedirs(self.tmpdir, exist_ok=True)
+        workers = min(max(1, (os.cpu_count() or 1) // 2),
+                      max(1, self.total))
+        with tempfile.TemporaryDirectory(dir=self.tmpdir) as tmp:
+            threads = [Thread(target=self.worker, args=(tasks, tmp))
+                       for n in range(workers)]
+            for work in threads:
+                work.start()
+            for work in threads:
+                work.join()
+
+        if self.stop_work_thread and not self.status:
+            self.status = TargetSizeThread.MSG_interrupted
+        if self.status:
+            self.logerror()
+            self.data = (None, self.status)
+            self.notify("RESULT_EVT", status='')
+            return
+
+        sampled = {}
+        for (index, crf), samples in sorted(self.sizes.items()):
+            rate = (sum(size for size, length in samples) * 1000
+                    / sum(length for size, length in samples))
+            sampled.setdefault(index, []).append([crf, rate])
+        results = []
+        for index, (files, dur) in enumerate(zip(self.filelist,
+                                                 self.durations)):
+            model = fit_model(points.get(index) or sampled.get(index, []))
+            if model is None or not dur:
+                self.status = _('Cannot predict the size of "{0}" by '
+                                'the CRF').format(files)
+                self.logerror()
+                break
+            if index in sampled:
+                self.cache.set(files, 'crf_model', sampled[index],
+                               self.options(), self.offset, dur)
+            results.append(predict_crf(model, self.budget, dur,
+                                       self.crfmax))
+        self.data = (None if self.status else results, self.status)
+        self.notify("RESULT_EVT", status='')
+    # ----------------------------------------------------------------#
+
+    def options(self):
+        """
+        Returns the options of the conversion without the CRF,
+        the key of the cached sample sizes.
+        """
+        return " ".join(CRF.sub('', self.command).split())
+    # ----------------------------------------------------------------#
+
+    def worker(self, tasks, tmp):
+        """
+        Takes the samples from `tasks` until it is empty,
+        an error occurs or the process is stopped.
+        """
+        while not self.stop_work_thread:
+            try:
+                task = tasks.get_nowait()
+            except queue.Empty:
+                break
+            self.encode(task, tmp)
+
+            with self.lock:
+                self.done += 1
+                msg = _("Wait....\nSample encodes: {0}/{1}"
+                        ).format(self.done, self.total)
+            self.notify("POPUP_MSG_EVT", msg=msg)
+    # ----------------------------------------------------------------#
+
+    def encode(self, task, tmp):
+        """
+        Encodes a sample of the `task` (index, crf, start, length)
+        and stores its size in `self.sizes`.
+        """
+        index, crf, start, length = task
+        output = os.path.join(tmp, f'{index}-{crf}-{start}.{self.extension}')
+        cmd = (f'"{self.ffmpeg_url}" -hide_banner -nostdin '
+               f'-ss {start / 1000:.3f} '
+               f'-i "{self.filelist[index]}" '
+               f'-t {length / 1000:.3f} '
+               f'{with_crf(self.command, crf)} '
+               f'-y "{output}"'
+               )
+        self.logwrite(cmd)
+
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        try:
+            with Popen(cmd,
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.STDOUT,
+                       universal_newlines=True,
+                       encoding='utf8',
+                       ) as proc:
+                with self.lock:
+                    self.processes[task] = proc
+                output_text = proc.communicate()[0]
+
+                if self.stop_work_thread:
+                    return
+
+                if proc.returncode:  # if error occurred
+                    self.status = output_text
+                    self.stop()
+                    return
+                size = os.path.getsize(output)
+                with self.lock:
+                    self.sizes.setdefault((index, crf), []).append(
+                        (size, length))
+
+        except OSError as err:  # ffmpeg do not exist
+            self.status = err
+            self.stop()
+
+        finally:
+            with self.lock:
+                self.processes.pop(task, None)
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread and terminates all
+        the running processes.
+        """
+        self.stop_work_thread = True
+        with self.lock:
+            for proc in self.processes.values():
+                proc.terminate()
+    # ----------------------------------------------------------------#
+
+    def logwrite(self, cmd):
+        """
+        write ffmpeg command log
+        """
+        with self.lock:
+            with open(self.logf, "a", encoding='utf8') as log:
+                log.write(f"{cmd}\n")
+    # ----------------------------------------------------------------#
+
+    def logerror(self):
+        """
+        write ffmpeg sample encodes errors
+        """
+        with open(self.logf, "a", encoding='utf8') as logerr:
+            logerr.write(f"\n[FFMPEG] target size "
+                         f"ERRORS:\n{self.status}\n")
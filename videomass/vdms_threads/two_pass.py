@@ -2,11 +2,11 @@
 """
 Name: two_pass.py
 Porpose: FFmpeg long processing task on 2 pass conversion
-Compatibility: Python3, wxPython4 Phoenix
+Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.17.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -24,233 +24,83 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
-from threading import Thread
-import time
+import os
 import itertools
-import subprocess
-import platform
-import wx
-from pubsub import pub
-from videomass.vdms_utils.utils import Popen
-from videomass.vdms_io.make_filelog import logwrite
-if not platform.system() == 'Windows':
-    import shlex
+from videomass.vdms_threads.job_engine import Step, Job, Batch
 
 
-class TwoPass(Thread):
+def two_pass_batch(appdata, logname, duration, timeseq, *args):
     """
-    This class represents a separate thread which need to read the
-    stdout/stderr in real time mode. The subprocess module is instantiated
-    twice for two different tasks: the process on the first video pass and
-    the process on the second video pass for video only.
+    Returns a `Batch` of two pass processing: one job for each
+    file made of the first and the second video pass.
 
-    NOTE capturing output in real-time (Windows, Unix):
-
-    https://stackoverflow.com/questions/1388753/how-to-get-output-
-    from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
+    Each job has its own private working directory (see `Job`)
+    given to ffmpeg also via `-passlogfile`, so that the pass log
+    files of several jobs executed at the same time are isolated,
+    even for encoders which write their statistics in the current
+    directory such as libx265. It is removed at the end of the job.
 
+    Called from `long_processing_task.topic_thread`.
+    Also see `main_frame.switch_to_processing`.
     """
-    get = wx.GetApp()  # get videomass wx.App attribute
-    appdata = get.appset
-    OS = appdata['ostype']
-    NOT_EXIST_MSG = _("Is 'ffmpeg' installed on your system?")
-
-    def __init__(self, logname, duration, timeseq, *args):
-        """
-        Called from `long_processing_task.topic_thread`.
-        Also see `main_frame.switch_to_processing`.
-        """
-        self.stop_work_thread = False  # process terminate
-        self.input_flist = args[1]  # list of infile (elements)
-        self.passlist = args[5]  # comand list set for double-pass
-        self.output_flist = args[3]  # output path
-        self.duration = duration  # duration list
-        self.time_seq = timeseq  # a time segment list
-        self.volume = args[7]  # volume compensation data
-        self.count = 0  # count first for loop
-        self.countmax = len(args[1])  # length file list
-        self.logname = logname  # title name of file log
-        self.nul = 'NUL' if TwoPass.OS == 'Windows' else '/dev/null'
-
-        Thread.__init__(self)
-        self.start()  # start the thread (va in self.run())
-
-    def run(self):
-        """
-        Thread started.
-        """
-        filedone = []
-        for (infile,
-             outfile,
-             volume,
-             duration) in itertools.zip_longest(self.input_flist,
-                                                self.output_flist,
-                                                self.volume,
-                                                self.duration,
-                                                fillvalue='',
-                                                ):
-            # --------------- first pass
-            pass1 = (f'"{TwoPass.appdata["ffmpeg_cmd"]}" '
-                     f'{TwoPass.appdata["ffmpeg_default_args"]} '
-                     f'{self.time_seq[0]} '
-                     f'-i "{infile}" '
-                     f'{self.time_seq[1]} '
-                     f'{self.passlist[0]} '
-                     f'{TwoPass.appdata["ffthreads"]} '
-                     f'-y {self.nul}'
-                     )
-            self.count += 1
-            count = f'File {self.count}/{self.countmax} - Pass One'
-            cmd = (f'{count}\nSource: "{infile}"\nDestination: "{self.nul}"'
-                   f'\n\n[COMMAND]:\n{pass1}'
-                   )
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=count,
-                         fsource=f'Source:  "{infile}"',
-                         destination=f'Destination:  "{self.nul}"',
-                         duration=duration,
-                         end='',
-                         )
-            logwrite(cmd, '', self.logname)  # write n/n + command only
-
-            if not TwoPass.OS == 'Windows':
-                pass1 = shlex.split(pass1)
-            try:
-                with Popen(pass1,
-                           stderr=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding='utf8',
-                           ) as proc1:
-
-                    for line in proc1.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=duration,
-                                     status=0
-                                     )
-                        if self.stop_work_thread:  # break second 'for' loop
-                            proc1.terminate()
-                            break
-
-                    if proc1.wait():  # will add '..failed' to txtctrl
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='',
-                                     duration=duration,
-                                     status=proc1.wait(),
-                                     )
-                        logwrite('',
-                                 f"Exit status: {proc1.wait()}",
-                                 self.logname,
-                                 )  # append exit error number
-
-            except (OSError, FileNotFoundError) as err:
-                excepterr = f"{err}\n  {TwoPass.NOT_EXIST_MSG}"
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count=excepterr,
-                             fsource='',
-                             destination='',
-                             duration=0,
-                             end='error',
-                             )
-                break
-
-            if self.stop_work_thread:  # break first 'for' loop
-                proc1.terminate()
-                break  # fermo il ciclo for, altrimenti passa avanti
-
-            if proc1.wait() == 0:  # will add '..terminated' to txtctrl
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count='',
-                             fsource='',
-                             destination='',
-                             duration=duration,
-                             end='Done'
-                             )
-            # --------------- second pass ----------------#
-            pass2 = (f'"{TwoPass.appdata["ffmpeg_cmd"]}" '
-                     f'{TwoPass.appdata["ffmpeg_default_args"]} '
-                     f'{self.time_seq[0]} '
-                     f'-i "{infile}" '
-                     f'{self.time_seq[1]} '
-                     f'{self.passlist[1]} '
-                     f'{volume} '
-                     f'{TwoPass.appdata["ffthreads"]} '
-                     f'-y "{outfile}"'
-                     )
-            count = f'File {self.count}/{self.countmax} - Pass Two'
-            cmd = (f'{count}\nSource: "{infile}"\nDestination: "{outfile}"'
-                   f'\n\n[COMMAND]:\n{pass2}'
-                   )
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=count,
-                         fsource=f'Source:  "{infile}"',
-                         destination=f'Destination:  "{outfile}"',
-                         duration=duration,
-                         end='',
-                         )
-            logwrite(cmd, '', self.logname)
-
-            if not TwoPass.OS == 'Windows':
-                pass2 = shlex.split(pass2)
-
-            with Popen(pass2,
-                       stderr=subprocess.PIPE,
-                       bufsize=1,
-                       universal_newlines=True,
-                       encoding='utf8',
-                       ) as proc2:
-
-                for line2 in proc2.stderr:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output=line2,
-                                 duration=duration,
-                                 status=0,
-                                 )
-                    if self.stop_work_thread:
-                        proc2.terminate()
-                        break
-
-                if proc2.wait():  # will add '..failed' to txtctrl
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='',
-                                 duration=duration,
-                                 status=proc2.wait(),
-                                 )
-                    logwrite('',
-                             f"Exit status: {proc2.wait()}",
-                             self.logname,
-                             )  # append exit error number
-
-            if self.stop_work_thread:  # break first 'for' loop
-                proc2.terminate()
-                break  # fermo il ciclo for, altrimenti passa avanti
-
-            if proc2.wait() == 0:  # will add '..terminated' to txtctrl
-                filedone.append(infile)
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count='',
-                             fsource='',
-                             destination='',
-                             duration=duration,
-                             end='Done'
-                             )
-        time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT", msg=filedone)
-    # --------------------------------------------------------------------#
-
-    def stop(self):
-        """
-        Sets the stop work thread to terminate the process
-        """
-        self.stop_work_thread = True
+    input_flist = args[1]  # list of infile (elements)
+    passlist = args[5]  # comand list set for double-pass
+    output_flist = args[3]  # output path
+    volume = args[7]  # volume compensation data
+    countmax = len(args[1])  # length file list
+    nul = 'NUL' if appdata['ostype'] == 'Windows' else '/dev/null'
+    jobs = []
+
+    for index, (infile,
+                outfile,
+                vol,
+                dur) in enumerate(itertools.zip_longest(input_flist,
+                                                        output_flist,
+                                                        volume,
+                                                        duration,
+                                                        fillvalue='',
+                                                        ), start=1):
+        # --------------- first pass
+        pass1 = (f'"{appdata["ffmpeg_cmd"]}" '
+                 f'{appdata["ffmpeg_default_args"]} '
+                 f'{timeseq[0]} '
+                 f'-i "{os.path.abspath(infile)}" '
+                 f'{timeseq[1]} '
+                 f'{passlist[0]} '
+                 f'-passlogfile "{{passlogfile}}" '
+                 f'{appdata["ffthreads"]} '
+                 f'-y {nul}'
+                 )
+        # --------------- second pass ----------------#
+        pass2 = (f'"{appdata["ffmpeg_cmd"]}" '
+                 f'{appdata["ffmpeg_default_args"]} '
+                 f'{timeseq[0]} '
+                 f'-i "{os.path.abspath(infile)}" '
+                 f'{timeseq[1]} '
+                 f'{passlist[1]} '
+                 f'-passlogfile "{{passlogfile}}" '
+                 f'{vol} '
+                 f'{appdata["ffthreads"]} '
+                 f'-y "{os.path.abspath(outfile)}"'
+                 )
+        count = f'File {index}/{countmax}'
+        steps = [Step(passlog_cmd(pass1), f'{count} - Pass One',
+                      infile, nul, dur),
+                 Step(passlog_cmd(pass2), f'{count} - Pass Two',
+                      infile, outfile, dur),
+                 ]
+        jobs.append(Job(steps, sources=[infile], label=count, workdir=True))
+
+    return Batch(jobs, logname, topic='twopass')
+
+
+def passlog_cmd(cmd):
+    """
+    Returns a callable which replaces the `{passlogfile}`
+    placeholder of `cmd` with the pass log file pathname
+    on the working directory of the running job.
+    """
+    def resolve(job):
+        passlogfile = os.path.join(job.path, 'ffmpeg2pass')
+        return cmd.replace('{passlogfile}', passlogfile)
+    return resolve
@@ -2,11 +2,11 @@
 """
 Name: two_pass_EBU.py
 Porpose: FFmpeg long processing task with EBU normalization
-Compatibility: Python3, wxPython4 Phoenix
+Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.17.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -24,255 +24,172 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
-from threading import Thread
-import time
+import os
 import itertools
-import subprocess
-import platform
-import wx
-from pubsub import pub
-from videomass.vdms_utils.utils import Popen
-from videomass.vdms_io.make_filelog import logwrite
-if not platform.system() == 'Windows':
-    import shlex
+from videomass.vdms_threads.job_engine import Step, Job, Batch, _
+from videomass.vdms_threads.two_pass import passlog_cmd
+from videomass.vdms_io.measurement_cache import MeasurementCache
 
+SUMMARY_KEYS = ('Input Integrated:', 'Input True Peak:', 'Input LRA:',
+                'Input Threshold:', 'Output Integrated:', 'Output True Peak:',
+                'Output LRA:', 'Output Threshold:', 'Normalization Type:',
+                'Target Offset:')
+LOOKAHEAD = 2  # max number of files measured in advance
 
-class Loudnorm(Thread):
-    """
-    Like `TwoPass_Thread` but execute -loudnorm parsing from first
-    pass and has definitions to apply on second pass.
 
-    NOTE capturing output in real-time (Windows, Unix):
+def parse_summary(line, job):
+    """
+    Parses the loudnorm summary from the first pass output
+    (see `Step.parser`)
+    """
+    summary = job.data['summary']
+    for k in summary:
+        if line.startswith(k):
+            summary[k] = line.split(':')[1].split()[0]
 
-    https://stackoverflow.com/questions/1388753/how-to-get-output-
-    from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
 
+def loudnorm_batch(appdata, logname, duration, timeseq, *args):
     """
-    get = wx.GetApp()  # get videomass wx.App attribute
-    appdata = get.appset
-    OS = appdata['ostype']
-    NOT_EXIST_MSG = _("Is 'ffmpeg' installed on your system?")
+    Returns a `Batch` of EBU R128 two pass processing: like
+    `two_pass_batch`, but execute -loudnorm parsing from first
+    pass and has definitions to apply on second pass.
 
-    def __init__(self, logname, duration, timeseq, *args):
-        """
-        Called from `long_processing_task.topic_thread`.
-        Also see `main_frame.switch_to_processing`.
-        """
-        self.stop_work_thread = False  # process terminate
-        self.input_flist = args[1]  # list of infile (elements)
-        self.passlist = args[5]  # comand list
-        self.audio_outmap = args[6]  # map output list
-        self.output_flist = args[3]  # output path
-        self.duration = duration  # durations list
-        self.time_seq = timeseq  # time segments list
-        self.count = 0  # count first for loop
-        self.countmax = len(args[1])  # length file list
-        self.logname = logname  # title name of file log
-        self.nul = 'NUL' if Loudnorm.OS == 'Windows' else '/dev/null'
+    The two passes of each file are separate jobs, so that they
+    can be pipelined: the first pass (measurements) is a `light`
+    job which can be executed on the spare worker of the engine
+    while the previous file is encoded by its second pass. The
+    measurements can be at most `LOOKAHEAD` files ahead of the
+    encoding. The second pass shares the working directory of
+    the first, which can also be a video first pass.
 
-        Thread.__init__(self)
-        self.start()  # start the thread (va in self.run())
+    When the first pass is audio only, the measurements are stored
+    in the persistent `MeasurementCache` and reused on the next
+    runs of the same source files, skipping the first pass.
 
-    def run(self):
-        """
-        Subprocess initialize thread.
-        """
-        filedone = []
-        summary = {'Input Integrated:': None, 'Input True Peak:': None,
-                   'Input LRA:': None, 'Input Threshold:': None,
-                   'Output Integrated:': None, 'Output True Peak:': None,
-                   'Output LRA:': None, 'Output Threshold:': None,
-                   'Normalization Type:': None, 'Target Offset:': None
-                   }
-        for (infile,
-             outfile,
-             duration) in itertools.zip_longest(self.input_flist,
-                                                self.output_flist,
-                                                self.duration,
-                                                fillvalue='',
-                                                ):
-            # --------------- first pass
-            pass1 = (f'"{Loudnorm.appdata["ffmpeg_cmd"]}" '
-                     f'{Loudnorm.appdata["ffmpeg_default_args"]} '
-                     f'{self.time_seq[0]} '
-                     f'-i "{infile}" '
-                     f'{self.time_seq[1]} '
-                     f'{self.passlist[0]} '
-                     f'{Loudnorm.appdata["ffthreads"]} '
-                     f'-y {self.nul}'
+    Called from `long_processing_task.topic_thread`.
+    Also see `main_frame.switch_to_processing`.
+    """
+    input_flist = args[1]  # list of infile (elements)
+    passlist = args[5]  # comand list
+    audio_outmap = args[6]  # map output list
+    output_flist = args[3]  # output path
+    countmax = len(args[1])  # length file list
+    nul = 'NUL' if appdata['ostype'] == 'Windows' else '/dev/null'
+    if '-vn' in passlist[0].split():  # no video stats file needed
+        cache = MeasurementCache(appdata['cachedir'])
+    else:
+        cache = None
+    params = (passlist[0], timeseq)
+    jobs = []
+    encoders = []
+
+    for index, (infile,
+                outfile,
+                dur) in enumerate(itertools.zip_longest(input_flist,
+                                                        output_flist,
+                                                        duration,
+                                                        fillvalue='',
+                                                        ), start=1):
+        # --------------- first pass
+        pass1 = (f'"{appdata["ffmpeg_cmd"]}" '
+                 f'{appdata["ffmpeg_default_args"]} '
+                 f'{timeseq[0]} '
+                 f'-i "{os.path.abspath(infile)}" '
+                 f'{timeseq[1]} '
+                 f'{passlist[0]} '
+                 f'-passlogfile "{{passlogfile}}" '
+                 f'{appdata["ffthreads"]} '
+                 f'-y {nul}'
+                 )
+        # --------------- second pass ----------------#
+        pass2 = (f'"{appdata["ffmpeg_cmd"]}" '
+                 f'{appdata["ffmpeg_default_args"]} '
+                 f'{timeseq[0]} '
+                 f'-i "{os.path.abspath(infile)}" '
+                 f'{timeseq[1]} '
+                 f'{passlist[1]} '
+                 f'-passlogfile "{{passlogfile}}" '
+                 f'-filter:a:{audio_outmap[1]} '
+                 f'{{filters}} '
+                 f'{appdata["ffthreads"]} '
+                 f'-y "{os.path.abspath(outfile)}"'
+                 )
+        count = f'File {index}/{countmax}'
+        gate = None
+        if index > LOOKAHEAD:
+            ahead = index - LOOKAHEAD - 1  # encoder to wait for
+            gate = (lambda n=ahead: encoders[n].state != 'queued')
+
+        measure = Job([Step(first_pass(pass1, infile, cache, params),
+                            (f'{count} - Pass One\n Loudnorm ebu: '
+                             f'Getting statistics for measurements...'),
+                            infile, nul, dur, parser=parse_summary,
+                            skipmsg=_('Measurements loaded from cache.'))],
+                      label=f'{count} - Pass One',
+                      light=True,
+                      gate=gate,
+                      workdir=True,
+                      on_end=store_summary(infile, cache, params),
+                      )
+        encode = Job([Step(second_pass(pass2, passlist[2]),
+                           (f'{count} - Pass Two\n'
+                            f'Loudnorm ebu: apply EBU R128...'),
+                           infile, outfile, dur)],
+                     sources=[infile],
+                     label=f'{count} - Pass Two',
+                     requires=measure,
+                     workdir=measure,
                      )
-            self.count += 1
-            count = (f'File {self.count}/{self.countmax} - Pass One\n '
-                     f'Loudnorm ebu: Getting statistics for measurements...')
-            cmd = (f'{count}\nSource: "{infile}"\nDestination: '
-                   f'"{self.nul}"\n\n'
-                   f'[COMMAND]:\n{pass1}')
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=count,
-                         fsource=f'Source:  "{infile}"',
-                         destination=f'Destination: "{self.nul}"',
-                         duration=duration,
-                         end='',
-                         )
-            logwrite(cmd, '', self.logname)  # write n/n + command only
+        encoders.append(encode)
+        jobs.extend((measure, encode))
 
-            if not Loudnorm.OS == 'Windows':
-                pass1 = shlex.split(pass1)
-            try:
-                with Popen(pass1,
-                           stderr=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding='utf8',
-                           ) as proc1:
+    return Batch(jobs, logname, topic='two pass EBU')
 
-                    for line in proc1.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=duration,
-                                     status=0
-                                     )
-                        if self.stop_work_thread:  # break first 'for' loop
-                            proc1.terminate()
-                            break
 
-                        for k in summary:
-                            if line.startswith(k):
-                                summary[k] = line.split(':')[1].split()[0]
-
-                    if proc1.wait():  # will add '..failed' to txtctrl
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='',
-                                     duration=duration,
-                                     status=proc1.wait(),
-                                     )
-                        logwrite('',
-                                 f"Exit status: {proc1.wait()}",
-                                 self.logname,
-                                 )  # append exit error number
-                        break
-
-            except (OSError, FileNotFoundError) as err:
-                excepterr = f"{err}\n  {Loudnorm.NOT_EXIST_MSG}"
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count=excepterr,
-                             fsource='',
-                             destination='',
-                             duration=0,
-                             end='error'
-                             )
-                break
-
-            if self.stop_work_thread:  # break first 'for' loop
-                proc1.terminate()
-                break  # fermo il ciclo for, altrimenti passa avanti
+def first_pass(cmd, infile, cache, params):
+    """
+    Returns a callable which gets the first pass command of the
+    running job, None if the measurements are in the cache.
+    """
+    def resolve(job):
+        cached = cache.get(infile, 'loudnorm', *params) if cache else None
+        if cached:
+            job.data['summary'] = cached
+            job.data['cached'] = True
+            return None
+        job.data['summary'] = dict.fromkeys(SUMMARY_KEYS)
+        return passlog_cmd(cmd)(job)
+    return resolve
+
+
+def store_summary(infile, cache, params):
+    """
+    Returns a callable which stores the measurements of the
+    ended first pass job in the cache.
+    """
+    def on_end(job):
+        summary = job.data.get('summary')
+        if (cache and job.state == 'done' and summary
+                and not job.data.get('cached')
+                and None not in summary.values()):
+            cache.set(infile, 'loudnorm', summary, *params)
+    return on_end
 
-            if proc1.wait() == 0:  # will add '..terminated' to txtctrl
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count='',
-                             fsource='',
-                             destination='',
-                             duration=duration,
-                             end='Done'
-                             )
-            # --------------- second pass ----------------#
-            filters = (f'{self.passlist[2]}'
-                       f':measured_I={summary["Input Integrated:"]}'
-                       f':measured_LRA={summary["Input LRA:"]}'
-                       f':measured_TP={summary["Input True Peak:"]}'
-                       f':measured_thresh={summary["Input Threshold:"]}'
-                       f':offset={summary["Target Offset:"]}'
-                       f':linear=true:dual_mono=true'
-                       )
-            time.sleep(.5)
 
-            pass2 = (f'"{Loudnorm.appdata["ffmpeg_cmd"]}" '
-                     f'{Loudnorm.appdata["ffmpeg_default_args"]} '
-                     f'{self.time_seq[0]} '
-                     f'-i "{infile}" '
-                     f'{self.time_seq[1]} '
-                     f'{self.passlist[1]} '
-                     f'-filter:a:{self.audio_outmap[1]} '
-                     f'{filters} '
-                     f'{Loudnorm.appdata["ffthreads"]} '
-                     f'-y "{outfile}"'
-                     )
-            count = (f'File {self.count}/{self.countmax} - Pass Two\n'
-                     f'Loudnorm ebu: apply EBU R128...'
-                     )
-            cmd = (f'\n{count}\nSource: "{infile}"\n'
-                   f'Destination: "{outfile}"\n\n'
-                   f'[COMMAND]:\n{pass2}'
+def second_pass(cmd, loudfilter):
+    """
+    Returns a callable which applies the measurements of the
+    required first pass job to the second pass command.
+    """
+    def resolve(job):
+        summary = job.requires.data['summary']
+        filters = (f'{loudfilter}'
+                   f':measured_I={summary["Input Integrated:"]}'
+                   f':measured_LRA={summary["Input LRA:"]}'
+                   f':measured_TP={summary["Input True Peak:"]}'
+                   f':measured_thresh={summary["Input Threshold:"]}'
+                   f':offset={summary["Target Offset:"]}'
+                   f':linear=true:dual_mono=true'
                    )
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=count,
-                         fsource=f'Source:  "{infile}"',
-                         destination=f'Destination: "{outfile}"',
-                         duration=duration,
-                         end='',
-                         )
-            logwrite(cmd, '', self.logname)
-
-            if not Loudnorm.OS == 'Windows':
-                pass2 = shlex.split(pass2)
-            with Popen(pass2,
-                       stderr=subprocess.PIPE,
-                       bufsize=1,
-                       universal_newlines=True,
-                       encoding='utf8',
-                       ) as proc2:
-
-                for line2 in proc2.stderr:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output=line2,
-                                 duration=duration,
-                                 status=0,
-                                 )
-                    if self.stop_work_thread:  # break first 'for' loop
-                        proc2.terminate()
-                        break
-
-                if proc2.wait():  # will add '..failed' to txtctrl
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='',
-                                 duration=duration,
-                                 status=proc2.wait(),
-                                 )
-                    logwrite('',
-                             f"Exit status: {proc2.wait()}",
-                             self.logname,
-                             )  # append exit error number
-
-            if self.stop_work_thread:  # break first 'for' loop
-                proc2.terminate()
-                break  # fermo il ciclo for, altrimenti passa avanti
-
-            if proc2.wait() == 0:  # will add '..terminated' to txtctrl
-                filedone.append(infile)
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count='',
-                             fsource='',
-                             destination='',
-                             duration=duration,
-                             end='Done'
-                             )
-        time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT", msg=filedone)
-    # --------------------------------------------------------------------#
-
-    def stop(self):
-        """
-        Sets the stop work thread to terminate the process
-        """
-        self.stop_work_thread = True
+        return passlog_cmd(cmd.replace('{filters}', filters))(job)
+    return resolve
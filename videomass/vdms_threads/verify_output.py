@@ -0,0 +1,201 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: verify_output.py
+Porpose: verification of the output files of the jobs with ffprobe
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+import builtins
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from videomass.vdms_io.output_manifest import OutputManifest, recipe
+from videomass.vdms_threads.ffprobe import ffprobe
+
+# translation macro (see gui_app), untranslated strings otherwise
+_ = builtins.__dict__.get('_', lambda msg: msg)
+
+NOAUDIO = ('.gif', '.apng', '.webp', '.png', '.jpg', '.jpeg', '.bmp',
+           '.tif', '.tiff')  # output formats without audio
+DISABLE = {'video': '-vn', 'audio': '-an'}
+COPY = {'video': ('-c', '-codec', '-c:v', '-codec:v', '-vcodec'),
+        'audio': ('-c', '-codec', '-c:a', '-codec:a', '-acodec')}
+
+
+def has_option(options, name, value=None):
+    """
+    Returns True if the `options` string contains the
+    option `name`, followed by `value` if given.
+    """
+    pattern = re.escape(name) + (rf'\s+{re.escape(value)}' if value else '')
+    return re.search(rf'(?<![\w:-]){pattern}(?![\w:-])', options) is not None
+
+
+def streams(probe):
+    """
+    Returns the streams of the ffprobe data by type,
+    e.g. {'video': [...], 'audio': [...]}, without the
+    cover pictures.
+    """
+    kinds = {}
+    for stream in probe.get('streams', []):
+        if stream.get('disposition', {}).get('attached_pic'):
+            continue
+        kinds.setdefault(stream.get('codec_type'), []).append(stream)
+    return kinds
+
+
+def compare(output, probe, source=None, duration=0, options=''):
+    """
+    Compares the ffprobe data of an `output` file (`probe`) with
+    what is expected from its `source` data and the `options` of
+    its command line. `duration` is the expected duration in
+    milliseconds, 0 if unknown or changed by the filters.
+    Returns the list of the problems found, empty if the
+    output is fine.
+    """
+    problems = []
+    try:
+        outdur = float(probe['format']['duration']) * 1000
+    except (KeyError, TypeError, ValueError):
+        outdur = 0
+    if re.search(r'setpts|atempo', options):  # speed changed
+        duration = 0
+    if duration and abs(outdur - duration) > 1000 + duration * 0.01:
+        problems.append(_('duration {0:.1f} s instead of {1:.1f} s'
+                          ).format(outdur / 1000, duration / 1000))
+    outstreams = streams(probe)
+    if not outstreams:
+        problems.append(_('no streams'))
+    if not source:
+        return problems
+
+    srcstreams = streams(source)
+    noaudio = os.path.splitext(output)[1].lower() in NOAUDIO
+    for kind in ('video', 'audio'):
+        if (not srcstreams.get(kind) or has_option(options, DISABLE[kind])
+                or (kind == 'audio' and noaudio)):
+            continue
+        if has_option(options, '-map', '0'):  # all the streams
+            if len(outstreams.get(kind, [])) != len(srcstreams[kind]):
+                problems.append(_('{0} {1} streams instead of {2}').format(
+                    len(outstreams.get(kind, [])), kind,
+                    len(srcstreams[kind])))
+        elif not outstreams.get(kind) and not has_option(options, '-map'):
+            problems.append(_('no {0} stream').format(kind))
+        if outstreams.get(kind) and any(has_option(options, name, 'copy')
+                                        for name in COPY[kind]):
+            codec = outstreams[kind][0].get('codec_name')
+            expected = srcstreams[kind][0].get('codec_name')
+            if codec != expected:
+                problems.append(_('{0} codec {1} instead of {2}').format(
+                    kind, codec, expected))
+    return problems
+
+
+class OutputVerifier:
+    """
+    Verifies the output files of the ended jobs on a pool of
+    `workers` threads, so that the workers of the `JobEngine`
+    can start other jobs in the meantime. Each output is read
+    by ffprobe and compared with the data of its source (see
+    `compare`), e.g. to detect the files truncated by a full
+    disk or a network share. The `probes` of the sources, as
+    already read by the GUI, are {pathname: ffprobe data}; the
+    missing ones are read on demand.
+
+        >>> verifier = OutputVerifier('ffprobe', probes)
+        >>> verifier.submit(job, callback)  # callback(job, problems)
+    """
+    def __init__(self, ffprobe_cmd, probes=None, workers=4):
+        self.ffprobe_cmd = ffprobe_cmd
+        self.probes = dict(probes or {})
+        self.lock = Lock()
+        self.pool = ThreadPoolExecutor(max_workers=workers,
+                                       thread_name_prefix='verify')
+
+    @staticmethod
+    def accepts(job):
+        """
+        Returns True if the `job` delivers an output file
+        """
+        return OutputManifest.output(job) is not None
+
+    def submit(self, job, callback):
+        """
+        Queues the verification of the output of the `job`,
+        `callback` is called with the job and the list of
+        the problems found.
+        """
+        self.pool.submit(lambda: callback(job, self.verify(job)))
+
+    def add_sources(self, probes):
+        """
+        Adds the ffprobe data of other source files
+        """
+        with self.lock:
+            self.probes.update(probes)
+
+    def source(self, pathname):
+        """
+        Returns the ffprobe data of a source file,
+        None if it can't be read.
+        """
+        with self.lock:
+            if pathname in self.probes:
+                return self.probes[pathname]
+        try:
+            probe = ffprobe(pathname, self.ffprobe_cmd, hide_banner=None)[0]
+        except ValueError:
+            probe = None
+        with self.lock:
+            self.probes[pathname] = probe
+        return probe
+
+    def verify(self, job):
+        """
+        Returns the list of the problems of the
+        output file of the `job`, empty if any.
+        """
+        output = OutputManifest.output(job)
+        step = job.steps[-1]
+        if step.cmd is None:  # skipped, up to date
+            return []
+        try:
+            probe, error = ffprobe(output, self.ffprobe_cmd,
+                                   hide_banner=None)
+        except ValueError as err:
+            probe, error = None, err
+        if error or not probe:
+            return [str(error).strip() or _('unreadable file')]
+        source = None
+        if len(job.sources) == 1:
+            source = self.source(os.path.abspath(job.sources[0]))
+        return compare(output, probe, source, step.duration,
+                       recipe(step.cmd))
+
+    def shutdown(self):
+        """
+        Waits for the verifications in progress
+        """
+        self.pool.shutdown(wait=True)
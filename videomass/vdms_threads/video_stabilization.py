@@ -2,11 +2,11 @@
 """
 Name: video_stabilization.py
 Porpose: FFmpeg long processing vidstab
-Compatibility: Python3, wxPython4 Phoenix
+Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.17.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -25,324 +25,97 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-from threading import Thread
-import time
 import itertools
-import subprocess
-import platform
-import wx
-from pubsub import pub
-from videomass.vdms_utils.utils import Popen
-from videomass.vdms_io.make_filelog import logwrite
-if not platform.system() == 'Windows':
-    import shlex
+from videomass.vdms_threads.job_engine import Step, Job, Batch
 
 
-class VidStab(Thread):
+def vidstab_batch(appdata, logname, duration, timeseq, *args):
     """
-    This class represents a separate thread which need
-    to read the stdout/stderr in real time mode for
-    different tasks.
+    Returns a `Batch` of video stabilization processing: one job
+    for each file made of the detect pass, the transform pass and
+    optionally the making of the duo file.
 
-    NOTE capturing output in real-time (Windows, Unix):
-
-    https://stackoverflow.com/questions/1388753/how-to-get-output-
-    from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
+    Each job has its own private working directory (see `Job`),
+    where the detect pass writes the "transforms.trf" file read
+    by the transform pass, so that the jobs executed at the same
+    time never use the motion data of another file.
 
+    Called from `long_processing_task.topic_thread`.
+    Also see `main_frame.switch_to_processing`.
     """
-    get = wx.GetApp()  # get videomass wx.App attribute
-    appdata = get.appset
-    OS = appdata['ostype']
-    NOT_EXIST_MSG = _("Is 'ffmpeg' installed on your system?")
-
-    def __init__(self, logname, duration, timeseq, *args):
-        """
-        Called from `long_processing_task.topic_thread`.
-        Also see `main_frame.switch_to_processing`.
-        """
-        self.stop_work_thread = False  # process terminate
-        self.input_flist = args[1]  # list of infile (elements)
-        self.passlist = args[5]  # comand list set for double-pass
-        self.makeduo = args[4]  # one more process for the duo file
-        self.output_flist = args[3]  # output path
-        self.duration = duration  # duration list
-        self.time_seq = timeseq  # a time segment
-        self.volume = args[7]  # volume compensation data
-        self.count = 0  # count first for loop
-        self.countmax = len(args[1])  # length file list
-        self.logname = logname  # title name of file log
-        self.nul = 'NUL' if VidStab.OS == 'Windows' else '/dev/null'
-
-        # this block is needed when other filters are enabled
-        spl = args[6].split('-vf ')[1]
-        addspl = ','.join([x for x in spl.split(',') if '-vf'
-                           not in x and 'vidstabtransform' not in x
-                           and 'unsharp' not in x])
-        self.addflt = '' if addspl == '' else f'{addspl},'
-
-        Thread.__init__(self)
-        self.start()  # start the thread (va in self.run())
-
-    def run(self):
-        """
-        Subprocess initialize thread.
-        """
-        filedone = []
-        for (infile,
-             outfile,
-             volume,
-             duration) in itertools.zip_longest(self.input_flist,
-                                                self.output_flist,
-                                                self.volume,
-                                                self.duration,
-                                                fillvalue='',
-                                                ):
-            # --------------- first pass
-            pass1 = (f'"{VidStab.appdata["ffmpeg_cmd"]}" '
-                     f'{VidStab.appdata["ffmpeg_default_args"]} '
-                     f'{self.time_seq[0]} '
-                     f'-i "{infile}" '
-                     f'{self.time_seq[1]} '
-                     f'{self.passlist[0]} '
-                     f'{VidStab.appdata["ffthreads"]} '
-                     f'-y {self.nul}'
-                     )
-            self.count += 1
-            count = (f'File {self.count}/{self.countmax} - Pass One\n'
-                     f'Video stabilization detect...'
-                     )
-            cmd = (f'{count}\nSource: "{infile}"\nDestination: "{self.nul}"'
-                   f'\n\n[COMMAND]:\n{pass1}'
-                   )
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=count,
-                         fsource=f'Source:  "{infile}"',
-                         destination=f'Destination:  "{self.nul}"',
-                         duration=duration,
-                         end='',
-                         )
-            logwrite(cmd, '', self.logname)  # write n/n + command only
-
-            if not VidStab.OS == 'Windows':
-                pass1 = shlex.split(pass1)
-            try:
-                with Popen(pass1,
-                           stderr=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding='utf8',
-                           ) as proc1:
-
-                    for line in proc1.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=duration,
-                                     status=0
-                                     )
-                        if self.stop_work_thread:  # break second 'for' loop
-                            proc1.terminate()
-                            break
-
-                    if proc1.wait():  # will add '..failed' to txtctrl
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='',
-                                     duration=duration,
-                                     status=proc1.wait(),
-                                     )
-                        logwrite('',
-                                 f"Exit status: { proc1.wait()}",
-                                 self.logname,
-                                 )  # append exit error number
-
-            except (OSError, FileNotFoundError) as err:
-                excepterr = f"{err}\n  {VidStab.NOT_EXIST_MSG}"
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count=excepterr,
-                             fsource='',
-                             destination='',
-                             duration=0,
-                             end='error',
-                             )
-                break
-
-            if self.stop_work_thread:  # break first 'for' loop
-                proc1.terminate()
-                break  # fermo il ciclo for, altrimenti passa avanti
-
-            if proc1.wait() == 0:  # will add '..terminated' to txtctrl
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count='',
-                             fsource='',
-                             destination='',
-                             duration=duration,
-                             end='Done'
-                             )
-            # --------------- second pass ----------------#
-            pass2 = (f'"{VidStab.appdata["ffmpeg_cmd"]}" '
-                     f'{VidStab.appdata["ffmpeg_default_args"]} '
-                     f'{self.time_seq[0]} '
-                     f'-i "{infile}" '
-                     f'{self.time_seq[1]} '
-                     f'{self.passlist[1]} '
-                     f'{volume} '
-                     f'{VidStab.appdata["ffthreads"]} '
-                     f'-y "{outfile}"'
+    input_flist = args[1]  # list of infile (elements)
+    passlist = args[5]  # comand list set for double-pass
+    makeduo = args[4]  # one more process for the duo file
+    output_flist = args[3]  # output path
+    volume = args[7]  # volume compensation data
+    countmax = len(args[1])  # length file list
+    nul = 'NUL' if appdata['ostype'] == 'Windows' else '/dev/null'
+
+    # this block is needed when other filters are enabled
+    spl = args[6].split('-vf ')[1]
+    addspl = ','.join([x for x in spl.split(',') if '-vf'
+                       not in x and 'vidstabtransform' not in x
+                       and 'unsharp' not in x])
+    addflt = '' if addspl == '' else f'{addspl},'
+    jobs = []
+
+    for index, (infile,
+                outfile,
+                vol,
+                dur) in enumerate(itertools.zip_longest(input_flist,
+                                                        output_flist,
+                                                        volume,
+                                                        duration,
+                                                        fillvalue='',
+                                                        ), start=1):
+        # --------------- first pass
+        pass1 = (f'"{appdata["ffmpeg_cmd"]}" '
+                 f'{appdata["ffmpeg_default_args"]} '
+                 f'{timeseq[0]} '
+                 f'-i "{os.path.abspath(infile)}" '
+                 f'{timeseq[1]} '
+                 f'{passlist[0]} '
+                 f'{appdata["ffthreads"]} '
+                 f'-y {nul}'
+                 )
+        # --------------- second pass ----------------#
+        pass2 = (f'"{appdata["ffmpeg_cmd"]}" '
+                 f'{appdata["ffmpeg_default_args"]} '
+                 f'{timeseq[0]} '
+                 f'-i "{os.path.abspath(infile)}" '
+                 f'{timeseq[1]} '
+                 f'{passlist[1]} '
+                 f'{vol} '
+                 f'{appdata["ffthreads"]} '
+                 f'-y "{os.path.abspath(outfile)}"'
+                 )
+        count = f'File {index}/{countmax}'
+        steps = [Step(pass1, f'{count} - Pass One\nVideo stabilization '
+                      f'detect...', infile, nul, dur),
+                 Step(pass2, f'{count} - Pass Two\nVideo transform...',
+                      infile, outfile, dur),
+                 ]
+        # --------------- make duo ----------------#
+        if makeduo:
+            duoname = os.path.splitext(outfile)
+            outduo = f'{duoname[0]}_DUO{duoname[1]}'
+            pass3 = (f'"{appdata["ffmpeg_cmd"]}" '
+                     f'{appdata["ffmpeg_default_args"]} '
+                     f'{timeseq[0]} '
+                     f'-i "{os.path.abspath(infile)}" '
+                     f'{timeseq[1]} '
+                     f'-i "{os.path.abspath(outfile)}" '
+                     f'{timeseq[1]} '
+                     f'{vol} '
+                     f'{appdata["ffthreads"]} '
+                     f'-filter_complex '
+                     f'"[0:v:0] '
+                     f'{addflt}pad=2*iw:ih[bg];'
+                     f'[bg][1:v:0]overlay=main_w/2:0" '
+                     f'-y "{os.path.abspath(outduo)}"'
                      )
-            count = (f'File {self.count}/{self.countmax} - Pass Two\n'
-                     f'Video transform...'
-                     )
-            cmd = (f'{count}\nSource: "{infile}"\nDestination: "{outfile}"'
-                   f'\n\n[COMMAND]:\n{pass2}'
-                   )
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=count,
-                         fsource=f'Source:  "{infile}"',
-                         destination=f'Destination:  "{outfile}"',
-                         duration=duration,
-                         end='',
-                         )
-            logwrite(cmd, '', self.logname)
-
-            if not VidStab.OS == 'Windows':
-                pass2 = shlex.split(pass2)
-
-            with Popen(pass2,
-                       stderr=subprocess.PIPE,
-                       bufsize=1,
-                       universal_newlines=True,
-                       encoding='utf8',
-                       ) as proc2:
-
-                for line2 in proc2.stderr:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output=line2,
-                                 duration=duration,
-                                 status=0,
-                                 )
-                    if self.stop_work_thread:
-                        proc2.terminate()
-                        break
-
-                if proc2.wait():  # will add '..failed' to txtctrl
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='',
-                                 duration=duration,
-                                 status=proc2.wait(),
-                                 )
-                    logwrite('',
-                             f"Exit status: {proc2.wait()}",
-                             self.logname,
-                             )  # append exit status error
-
-            if self.stop_work_thread:  # break first 'for' loop
-                proc2.terminate()
-                break  # fermo il ciclo for, altrimenti passa avanti
-
-            if proc2.wait() == 0:  # will add '..terminated' to txtctrl
-                filedone.append(infile)
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count='',
-                             fsource='',
-                             destination='',
-                             duration=duration,
-                             end='Done'
-                             )
-            # --------------- make duo ----------------#
-            if self.makeduo:
-                duoname = os.path.splitext(outfile)
-                outduo = f'{duoname[0]}_DUO{duoname[1]}'
-
-                pass3 = (f'"{VidStab.appdata["ffmpeg_cmd"]}" '
-                         f'{VidStab.appdata["ffmpeg_default_args"]} '
-                         f'{self.time_seq[0]} '
-                         f'-i "{infile}" '
-                         f'{self.time_seq[1]} '
-                         f'-i "{outfile}" '
-                         f'{self.time_seq[1]} '
-                         f'{volume} '
-                         f'{VidStab.appdata["ffthreads"]} '
-                         f'-filter_complex '
-                         f'"[0:v:0] '
-                         f'{self.addflt}pad=2*iw:ih[bg];'
-                         f'[bg][1:v:0]overlay=main_w/2:0" '
-                         f'-y "{outduo}"'
-                         )
-                count = f'File {self.count}/{self.countmax}\nMake duo...'
-                cmd = (f'{count}\nSource: "{infile}"\n'
-                       f'Destination: "{outduo}"\n\n[COMMAND]:\n{pass3}'
-                       )
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count=count,
-                             fsource=f'Source:  "{infile}"',
-                             destination=f'Destination: "{outduo}"',
-                             duration=duration,
-                             end='',
-                             )
-                logwrite(cmd, '', self.logname)
-
-                if not VidStab.OS == 'Windows':
-                    pass3 = shlex.split(pass3)
-
-                with Popen(pass3,
-                           stderr=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding='utf8',
-                           ) as proc3:
-
-                    for line3 in proc3.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line3,
-                                     duration=duration,
-                                     status=0,
-                                     )
-                        if self.stop_work_thread:
-                            proc3.terminate()
-                            break
-
-                    if proc3.wait():  # will add '..failed' to txtctrl
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='',
-                                     duration=duration,
-                                     status=proc3.wait(),
-                                     )
-                        logwrite('',
-                                 f"Exit status: {proc3.wait()}",
-                                 self.logname,
-                                 )  # append exit error number
-
-                if self.stop_work_thread:  # break first 'for' loop
-                    proc3.terminate()
-                    break  # fermo il ciclo for, altrimenti passa avanti
-
-                if proc3.wait() == 0:  # will add '..terminated' to txtctrl
-                    wx.CallAfter(pub.sendMessage,
-                                 "COUNT_EVT",
-                                 count='',
-                                 fsource='',
-                                 destination='',
-                                 duration=duration,
-                                 end='Done'
-                                 )
-        time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_EVT", msg=filedone)
-    # --------------------------------------------------------------------#
+            steps.append(Step(pass3, f'{count}\nMake duo...',
+                              infile, outduo, dur))
+        jobs.append(Job(steps, sources=[infile], label=count, workdir=True))
 
-    def stop(self):
-        """
-        Sets the stop work thread to terminate the process
-        """
-        self.stop_work_thread = True
+    return Batch(jobs, logname, topic='libvidstab')
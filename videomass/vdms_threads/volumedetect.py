@@ -2,11 +2,11 @@
 """
 Name: volumedetect.py
 Porpose: Audio Peak level volume analyzes
-Compatibility: Python3, wxPython Phoenix
+Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Feb.17.2024
+Rev: Oct.17.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -25,16 +25,21 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-from threading import Thread
+import builtins
+from threading import Thread, Lock
 import subprocess
 import platform
-import wx
-from pubsub import pub
+import queue
 from videomass.vdms_utils.utils import Popen
+from videomass.vdms_threads.engine_core import NullSink
 from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.measurement_cache import MeasurementCache
 if not platform.system() == 'Windows':
     import shlex
 
+# translation macro (see gui_app), untranslated strings otherwise
+_ = builtins.__dict__.get('_', lambda msg: msg)
+
 
 class VolumeDetectThread(Thread):
     """
@@ -42,15 +47,28 @@ class VolumeDetectThread(Thread):
     audio volume peak level when required for audio normalization
     process.
 
+    The files are analyzed in parallel by a pool of worker threads
+    sized to the number of CPUs, each one running its own ffmpeg
+    process. The results are returned in the same order as the
+    file list, the completion of each file is sent to the `notify`
+    sink as "POPUP_MSG_EVT" message and the whole analysis can be
+    interrupted by calling `stop`.
+
     NOTE: all error handling (including verification of the
     existence of files) is entrusted to ffmpeg, except for the
     lack of ffmpeg of course.
 
     """
+    MSG_interrupted = _('Interrupted Process !')
 
-    def __init__(self, timeseq, filelist, audiomap, logdir, ffmpeg_url):
+    def __init__(self, timeseq, filelist, audiomap, logdir, ffmpeg_url,
+                 cachedir=None, notify=None):
         """
         Replace /dev/null with NUL on Windows.
+        If `cachedir` is given, the results are stored in
+        and retrieved from the `MeasurementCache`.
+        The messages are sent to the `notify` sink (an
+        `EventSink`), e.g. `WxSink` in the GUI.
 
         self.status: None, if nothing error,
                      'str error' if errors.
@@ -63,12 +81,20 @@ class VolumeDetectThread(Thread):
         self.time_seq = timeseq
         self.audiomap = audiomap
         self.ffmpeg_url = ffmpeg_url
+        self.notify = notify if notify is not None else NullSink()
         self.status = None
         self.data = None
         self.nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
         self.logf = os.path.join(logdir, 'volumedected.log')
         make_log_template('volumedected.log', logdir)
         # set initial file LOG
+        self.cache = MeasurementCache(cachedir) if cachedir else None
+        self.stop_work_thread = False  # process terminate
+        self.results = [None] * len(filelist)  # ordered results
+        self.processes = {}  # running processes {index: Popen}
+        self.lock = Lock()  # protects `self.processes` and log file
+        self.done = 0  # number of completed files
+        self.workers = min(os.cpu_count() or 1, max(1, len(filelist)))
 
         Thread.__init__(self)
         self.start()  # start the thread (va in self.run())
@@ -78,71 +104,139 @@ class VolumeDetectThread(Thread):
         """
         Audio volume data is getted by the thread's caller using
         the thread.data method (see io_tools).
-        NOTE: wx.callafter(pub...) do not send data to pop-up
+        NOTE: the "RESULT_EVT" message do not send data to pop-up
               dialog, but a empty string that is useful to get
               the end of the process to close of the pop-up
 
         """
-        volume = []
-
-        for files in self.filelist:
-            cmd = (f'"{self.ffmpeg_url}" -hide_banner '
-                   f'{self.time_seq[0]} '
-                   f'-i "{files}" '
-                   f'{self.time_seq[1]} '
-                   f'{self.audiomap} '
-                   f'-af volumedetect -vn -sn -dn -f null '
-                   f'{self.nul}'
-                   )
-            self.logwrite(cmd)
-
-            if not platform.system() == 'Windows':
-                cmd = shlex.split(cmd)
-            try:
-                with Popen(cmd,
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.STDOUT,
-                           universal_newlines=True,
-                           encoding='utf8',
-                           ) as proc:
-
-                    output = proc.communicate()
-
-                    if proc.returncode:  # if error occurred
-                        self.status = output[0]
-                        break
-
-                    raw_list = output[0].split()  # splitta tutti gli spazi
-                    if 'mean_volume:' in raw_list:
-                        mean_volume = raw_list.index("mean_volume:")
-                        # mean_volume is indx integear
-                        medvol = f"{raw_list[mean_volume + 1]} dB"
-                        max_volume = raw_list.index("max_volume:")
-                        # max_volume is indx integear
-                        maxvol = f"{raw_list[max_volume + 1]} dB"
-                        volume.append([maxvol, medvol])
-
-            except (OSError, FileNotFoundError) as err:  # ffmpeg do not exist
-                self.status = err
-                break
+        jobqueue = queue.Queue()
+        for index, files in enumerate(self.filelist):
+            jobqueue.put((index, files))
+
+        workers = [Thread(target=self.worker, args=(jobqueue,))
+                   for n in range(self.workers)]
+        for work in workers:
+            work.start()
+        for work in workers:
+            work.join()
+
+        if self.stop_work_thread and not self.status:
+            self.status = VolumeDetectThread.MSG_interrupted
 
+        volume = [vol for vol in self.results if vol is not None]
         self.data = (volume, self.status)
 
         if self.status:
             self.logerror()
 
-        wx.CallAfter(pub.sendMessage,
-                     "RESULT_EVT",
-                     status=''
-                     )
+        self.notify("RESULT_EVT", status='')
+    # ----------------------------------------------------------------#
+
+    def worker(self, jobqueue):
+        """
+        Takes the files from `jobqueue` until it is empty,
+        an error occurs or the process is stopped.
+        """
+        while not self.stop_work_thread:
+            try:
+                index, files = jobqueue.get_nowait()
+            except queue.Empty:
+                break
+            self.detect(index, files)
+
+            with self.lock:
+                self.done += 1
+                msg = _("Wait....\nAudio peak analysis: {0}/{1} files"
+                        ).format(self.done, len(self.filelist))
+            self.notify("POPUP_MSG_EVT", msg=msg)
+    # ----------------------------------------------------------------#
+
+    def detect(self, index, files):
+        """
+        Gets the volume data of a single file and stores
+        it in `self.results` at the given `index`.
+        """
+        if self.cache:
+            cached = self.cache.get(files, 'volumedetect',
+                                    self.audiomap, self.time_seq)
+            if cached:
+                self.logwrite(f'"{files}": volumedetect loaded from '
+                              f'cache {cached}')
+                self.results[index] = cached
+                return
+
+        cmd = (f'"{self.ffmpeg_url}" -hide_banner '
+               f'{self.time_seq[0]} '
+               f'-i "{files}" '
+               f'{self.time_seq[1]} '
+               f'{self.audiomap} '
+               f'-af volumedetect -vn -sn -dn -f null '
+               f'{self.nul}'
+               )
+        self.logwrite(cmd)
+
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        try:
+            with Popen(cmd,
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.STDOUT,
+                       universal_newlines=True,
+                       encoding='utf8',
+                       ) as proc:
+                with self.lock:
+                    self.processes[index] = proc
+                output = proc.communicate()
+
+                if self.stop_work_thread:
+                    return
+
+                if proc.returncode:  # if error occurred
+                    self.status = output[0]
+                    self.stop()
+                    return
+
+                raw_list = output[0].split()  # splitta tutti gli spazi
+                if 'mean_volume:' in raw_list:
+                    mean_volume = raw_list.index("mean_volume:")
+                    # mean_volume is indx integear
+                    medvol = f"{raw_list[mean_volume + 1]} dB"
+                    max_volume = raw_list.index("max_volume:")
+                    # max_volume is indx integear
+                    maxvol = f"{raw_list[max_volume + 1]} dB"
+                    self.results[index] = [maxvol, medvol]
+                    if self.cache:
+                        self.cache.set(files, 'volumedetect',
+                                       [maxvol, medvol],
+                                       self.audiomap, self.time_seq)
+
+        except (OSError, FileNotFoundError) as err:  # ffmpeg do not exist
+            self.status = err
+            self.stop()
+
+        finally:
+            with self.lock:
+                self.processes.pop(index, None)
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread and terminates all
+        the running processes.
+        """
+        self.stop_work_thread = True
+        with self.lock:
+            for proc in self.processes.values():
+                proc.terminate()
     # ----------------------------------------------------------------#
 
     def logwrite(self, cmd):
         """
         write ffmpeg command log
         """
-        with open(self.logf, "a", encoding='utf8') as log:
-            log.write(f"{cmd}\n")
+        with self.lock:
+            with open(self.logf, "a", encoding='utf8') as log:
+                log.write(f"{cmd}\n")
     # ----------------------------------------------------------------#
 
     def logerror(self):
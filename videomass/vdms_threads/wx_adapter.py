@@ -0,0 +1,56 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: wx_adapter.py
+Porpose: connects the encoding engines to the wx GUI
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.17.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import wx
+from pubsub import pub
+from videomass.vdms_threads.engine_core import EngineSettings, EventSink
+from videomass.vdms_threads.generic_task import FFmpegGenericTask
+
+
+class WxSink(EventSink):
+    """
+    Sends the messages of the engines to the main
+    thread by pubsub protocol.
+    """
+    def send(self, topic, **kwargs):
+        wx.CallAfter(pub.sendMessage, topic, **kwargs)
+
+
+def app_settings():
+    """
+    Returns the `EngineSettings` of the running wx.App
+    """
+    return EngineSettings.from_appdata(wx.GetApp().appset)
+
+
+def generic_task(args, procname='Unknown', logfile='logfile.log'):
+    """
+    Starts a `FFmpegGenericTask` with the current settings,
+    whose end is notified by pubsub "RESULT_EVT" protocol.
+    Returns the running thread.
+    """
+    return FFmpegGenericTask(args, app_settings(), procname, logfile,
+                             notify=WxSink())